@@ -0,0 +1,152 @@
+import argparse
+import json
+from pathlib import Path
+
+import pandas as pd
+
+# =========================
+# Figures of a benchmark suite run (scripts/benchmark/suite)
+#
+#   python bench/viz_suite.py (--results bench/bench_out_suite/results.json) (--out bench/bench_out_suite/figures)
+#
+# BAG (panden, EPSG:28992): encoded size, encode/decode time and MB/s per codec,
+# at the largest size tier of the run.
+# OSM (synthetic, EPSG:4326): size relative to GeoJSON vs number of features per
+# geometry type (one panel per attribute profile), and vs attribute profile at
+# the largest size tier. Replaces viz_bag.py / viz_size.py, which read the CSV
+# files of the removed bench_01_size.py / bench_02_bag.py.
+# =========================
+
+RESULTS_FORMAT = "sfproto-bench"  # as scripts/benchmark/suite/conftest.py
+
+BAG_CODECS = ["v3_BAG", "v4_BAG", "v7"]
+OSM_CODECS = ["v4", "v5", "v7", "v7_batched"]  # the codecs that store properties
+ATTR_ORDER = ["none", "few", "medium", "many"]
+GEOMETRIES = ["Point", "LineString", "Polygon", "mixed"]
+
+
+def load(path: Path) -> pd.DataFrame:
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    if doc.get("format") != RESULTS_FORMAT:
+        raise SystemExit(f"{path}: not a {RESULTS_FORMAT} results file")
+    rows = []
+    for case, r in doc["results"].items():
+        rows.append({
+            "case": case,
+            "codec": r["codec"],
+            "dataset": r["dataset"],
+            "geometry": r["geometry"],
+            "profile": r["profile"],
+            "N": r["size"],
+            "encoded_bytes": r["encoded_bytes"],
+            "rel_size": r["encoded_bytes"] / r["geojson_bytes"],
+            "encode_ms": r["encode"]["best_s"] * 1e3,
+            "decode_ms": r["decode"]["best_s"] * 1e3,
+            "encode_MBps": r["encode"]["mb_per_s"],
+            "decode_MBps": r["decode"]["mb_per_s"],
+        })
+    return pd.DataFrame(rows)
+
+
+def _bar(plt, df: pd.DataFrame, columns: dict, ylabel: str, title: str, out: Path) -> None:
+    # columns: {column: legend label}
+    ax = df[list(columns)].rename(columns=columns).plot(kind="bar", width=0.75)
+    ax.set_ylabel(ylabel)
+    ax.set_xlabel("Codec")
+    ax.set_title(title)
+    ax.grid(axis="y", alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(out, dpi=300)
+    plt.close()
+
+
+def plot_bag(plt, df: pd.DataFrame, out_dir: Path) -> None:
+    bag = df[df["dataset"] == "bag"]
+    if bag.empty:
+        return
+    n = bag["N"].max()
+    s = bag[bag["N"] == n].set_index("codec").reindex([c for c in BAG_CODECS if c in set(bag["codec"])])
+
+    plt.figure()
+    plt.bar(s.index, s["encoded_bytes"] / 2**20)
+    plt.ylabel("Size (MiB)")
+    plt.xlabel("Codec")
+    plt.title(f"Encoded size, BAG panden (N={n})")
+    plt.tight_layout()
+    plt.savefig(out_dir / "bag_size.png", dpi=300)
+    plt.close()
+
+    _bar(plt, s, {"encode_ms": "encode", "decode_ms": "decode"}, "Best time (ms)",
+         f"Encode vs decode, BAG panden (N={n})", out_dir / "bag_time.png")
+    _bar(plt, s, {"encode_MBps": "encode", "decode_MBps": "decode"}, "MB/s (encoded bytes)",
+         f"Throughput, BAG panden (N={n})", out_dir / "bag_throughput.png")
+
+
+def plot_osm(plt, df: pd.DataFrame, out_dir: Path) -> None:
+    osm = df[(df["dataset"] == "osm") & df["codec"].isin(OSM_CODECS)]
+    if osm.empty:
+        return
+    osm = osm.assign(profile=pd.Categorical(osm["profile"], categories=ATTR_ORDER, ordered=True))
+    codecs = [c for c in OSM_CODECS if c in set(osm["codec"])]
+
+    # A: relative size vs N, one figure per geometry, one panel per attribute profile
+    for geometry in GEOMETRIES:
+        sub = osm[osm["geometry"] == geometry]
+        if sub.empty:
+            continue
+        fig, axes = plt.subplots(2, 2, figsize=(12, 8), sharex=True, sharey=True)
+        fig.suptitle(f"Size relative to GeoJSON vs N — {geometry}", y=0.98)
+        for ax, profile in zip(axes.flat, ATTR_ORDER):
+            for codec in codecs:
+                s = sub[(sub["profile"] == profile) & (sub["codec"] == codec)].sort_values("N")
+                ax.plot(s["N"], s["rel_size"], marker="o", label=codec)
+            ax.axhline(1.0, linestyle="--", linewidth=1)
+            ax.set_xscale("log")
+            ax.set_title(f"attributes: {profile}")
+            ax.set_xlabel("N features (log)")
+            ax.set_ylabel("size / GeoJSON")
+        axes[0, 0].legend()
+        plt.tight_layout()
+        plt.savefig(out_dir / f"osm_rel_vs_N_{geometry}.png", dpi=200)
+        plt.close()
+
+    # B: relative size vs attribute profile at the largest N
+    n = osm["N"].max()
+    for geometry in GEOMETRIES:
+        sub = osm[(osm["geometry"] == geometry) & (osm["N"] == n)]
+        if sub.empty:
+            continue
+        plt.figure(figsize=(9, 5))
+        plt.title(f"Size relative to GeoJSON vs attribute profile — {geometry} (N={n})")
+        for codec in codecs:
+            s = sub[sub["codec"] == codec].sort_values("profile")
+            plt.plot(s["profile"].astype(str), s["rel_size"], marker="o", label=codec)
+        plt.axhline(1.0, linestyle="--", linewidth=1)
+        plt.xlabel("Attribute profile")
+        plt.ylabel("size / GeoJSON")
+        plt.legend()
+        plt.tight_layout()
+        plt.savefig(out_dir / f"osm_rel_vs_attr_{geometry}_N{n}.png", dpi=200)
+        plt.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Plot the results of a benchmark suite run")
+    ap.add_argument("--results", type=Path, default=Path("bench/bench_out_suite/results.json"))
+    ap.add_argument("--out", type=Path, default=Path("bench/bench_out_suite/figures"))
+    args = ap.parse_args()
+
+    df = load(args.results)
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    plot_bag(plt, df, args.out)
+    plot_osm(plt, df, args.out)
+    print(f"Figures written to: {args.out.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
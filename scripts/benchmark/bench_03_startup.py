@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import csv
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# =========================================================
+# Startup benchmark
+# Every sample is a fresh interpreter, so import time is included:
+#   - cli_help:      `sfproto --help`
+#   - first_encode:  import the api + encode one small Feature (v7)
+#   - import_api:    only `import sfproto.geojson.api`
+# =========================================================
+
+FIRST_ENCODE_SNIPPET = """
+from sfproto.geojson.api import encode_geojson
+encode_geojson(
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [4.9, 52.37]}, "properties": {"name": "a"}},
+    delta=True,
+)
+"""
+
+FIRST_ENCODE_UNKNOWN_SRID_SNIPPET = """
+from sfproto.geojson.api import encode_geojson
+encode_geojson(
+    {"type": "Feature", "geometry": {"type": "Point", "coordinates": [4.9, 52.37]}, "properties": {"name": "a"},
+     "crs": {"type": "name", "properties": {"name": "EPSG:3006"}}},
+    delta=True,
+)
+"""
+
+CASES = {
+    "cli_help": [sys.executable, "-m", "sfproto.cli.main", "--help"],
+    "import_api": [sys.executable, "-c", "import sfproto.geojson.api"],
+    "first_encode": [sys.executable, "-c", FIRST_ENCODE_SNIPPET],
+    # an EPSG code outside the built-in table -> pyproj is imported
+    "first_encode_pyproj": [sys.executable, "-c", FIRST_ENCODE_UNKNOWN_SRID_SNIPPET],
+}
+
+# =========================================================
+# Helpers
+# =========================================================
+
+def _stats(samples_ns: List[int]) -> Dict[str, float]:
+    ms = [s / 1e6 for s in samples_ns]
+    return {
+        "mean_ms": statistics.mean(ms),
+        "median_ms": statistics.median(ms),
+        "stdev_ms": statistics.pstdev(ms) if len(ms) > 1 else 0.0,
+        "min_ms": min(ms),
+        "max_ms": max(ms),
+    }
+
+
+def _run_once(cmd: List[str]) -> int:
+    t0 = time.perf_counter_ns()
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter_ns() - t0
+
+
+def run_startup_benchmark(
+    csv_path: Path = Path("bench/bench_out_startup/results.csv"),
+    runs: int = 20,
+    warmup: int = 2,
+) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+
+    # baseline: bare interpreter startup, to subtract mentally
+    cases = {"python_baseline": [sys.executable, "-c", "pass"], **CASES}
+
+    for label, cmd in cases.items():
+        for _ in range(warmup):
+            _run_once(cmd)
+        samples = [_run_once(cmd) for _ in range(runs)]
+        row = {"case": label, **_stats(samples)}
+        rows.append(row)
+        print(f"{label:<22} median {row['median_ms']:8.1f} ms   min {row['min_ms']:8.1f} ms")
+
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    with csv_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"Benchmark complete. CSV written to: {csv_path.resolve()}")
+    return rows
+
+# =========================================================
+# Entry point
+# =========================================================
+
+if __name__ == "__main__":
+    run_startup_benchmark()
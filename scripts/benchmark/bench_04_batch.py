@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from sfproto.geojson.v7.geojson import geojson_to_bytes_v7, bytes_to_geojson_v7
+from sfproto.geojson.v7.geojson_batch import encode_many, decode_many
+
+GeoJSON = Dict[str, Any]
+
+# =========================================================
+# Microbenchmark: many tiny payloads (single-Point Features)
+# per-call geojson_to_bytes_v7 / bytes_to_geojson_v7 vs encode_many / decode_many
+# =========================================================
+
+N_FEATURES = 10_000
+SRID = 4326
+SCALE = 10_000_000
+
+
+def make_point_features(n: int, seed: int = 0) -> List[GeoJSON]:
+    rnd = random.Random(seed)
+    return [
+        {
+            "type": "Feature",
+            "id": str(i),
+            "geometry": {"type": "Point", "coordinates": [4.7 + rnd.random() * 0.4, 52.2 + rnd.random() * 0.3]},
+            "properties": {"name": f"poi {i}", "kind": rnd.choice(["cafe", "shop", "bench"])},
+        }
+        for i in range(n)
+    ]
+
+
+def _time(fn: Callable[[], Any], runs: int) -> List[float]:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _report(label: str, samples: List[float], n: int) -> float:
+    best = min(samples)
+    print(
+        f"{label:<28} median {statistics.median(samples) * 1e3:8.1f} ms   "
+        f"best {best * 1e3:8.1f} ms   {n / best:>10,.0f} features/s"
+    )
+    return best
+
+
+def run(n: int = N_FEATURES, runs: int = 5) -> None:
+    feats = make_point_features(n)
+    blobs = [geojson_to_bytes_v7(f, srid=SRID, scale=SCALE) for f in feats]
+    framed = encode_many(feats, srid=SRID, scale=SCALE, framed=True)
+
+    print(f"=== {n:,} single-Point Features ===")
+    enc_single = _report("encode per call", _time(lambda: [geojson_to_bytes_v7(f, srid=SRID, scale=SCALE) for f in feats], runs), n)
+    enc_many = _report("encode_many (list)", _time(lambda: encode_many(feats, srid=SRID, scale=SCALE), runs), n)
+    _report("encode_many (framed)", _time(lambda: encode_many(feats, srid=SRID, scale=SCALE, framed=True), runs), n)
+
+    dec_single = _report("decode per call", _time(lambda: [bytes_to_geojson_v7(b) for b in blobs], runs), n)
+    dec_many = _report("decode_many (list)", _time(lambda: decode_many(blobs), runs), n)
+    _report("decode_many (framed)", _time(lambda: decode_many(framed), runs), n)
+
+    print(f"speedup encode: {enc_single / enc_many:.2f}x   decode: {dec_single / dec_many:.2f}x")
+
+
+if __name__ == "__main__":
+    run()
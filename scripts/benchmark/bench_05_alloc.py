@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+GeoJSON = Dict[str, Any]
+
+# =========================================================
+# Allocation benchmark: encoding 100k features
+# Every case runs in a fresh interpreter, so the numbers are not polluted by
+# earlier cases:
+#   - tracemalloc peak: Python-level allocations during one encode
+#   - rss growth:       peak RSS during the encode minus RSS before it
+#                       (also covers the protobuf runtime's own allocations)
+#   - time:             best of a few encodes, without tracemalloc
+# =========================================================
+
+N_FEATURES = 100_000
+RUNS = 3
+
+
+def make_features(n: int, seed: int = 0) -> GeoJSON:
+    # mix of Points, LineStrings and Polygons with a few properties (WGS84)
+    rnd = random.Random(seed)
+    feats: List[GeoJSON] = []
+    for i in range(n):
+        x, y = 4.7 + rnd.random() * 0.4, 52.2 + rnd.random() * 0.3
+        kind = i % 3
+        if kind == 0:
+            geom = {"type": "Point", "coordinates": [x, y]}
+        elif kind == 1:
+            geom = {"type": "LineString", "coordinates": [[x + k * 1e-4, y + k * 5e-5] for k in range(8)]}
+        else:
+            d = 1e-4
+            geom = {"type": "Polygon", "coordinates": [[[x, y], [x + d, y], [x + d, y + d], [x, y + d], [x, y]]]}
+        feats.append({
+            "type": "Feature",
+            "id": str(i),
+            "geometry": geom,
+            "properties": {"name": f"feature {i}", "kind": rnd.choice(["a", "b", "c"]), "level": i % 7},
+        })
+    return {"type": "FeatureCollection", "features": feats}
+
+
+def make_panden(n: int, seed: int = 0) -> GeoJSON:
+    # BAG-like panden in EPSG:28992
+    rnd = random.Random(seed)
+    doelen = ["woonfunctie", "kantoorfunctie", "winkelfunctie", "industriefunctie"]
+    feats: List[GeoJSON] = []
+    for i in range(n):
+        x, y = round(80000 + rnd.random() * 20000, 3), round(440000 + rnd.random() * 20000, 3)
+        ring = [[x, y], [x + 10, y], [x + 10, y + 12.5], [x, y + 12.5], [x, y]]
+        ident = f"{363100012000000 + i:016d}"
+        feats.append({
+            "type": "Feature",
+            "id": "pand.%08x-0000-4000-8000-%012x" % (i, i),
+            "geometry": {"type": "Polygon", "coordinates": [ring]},
+            "bbox": [x, y, x + 10, y + 12.5],
+            "properties": {
+                "identificatie": ident,
+                "bouwjaar": rnd.randint(1900, 2024),
+                "status": "Pand in gebruik",
+                "gebruiksdoel": rnd.choice(doelen),
+                "aantal_verblijfsobjecten": rnd.randint(0, 5),
+                "oppervlakte_min": 50,
+                "oppervlakte_max": 100,
+            },
+        })
+    return {"type": "FeatureCollection", "features": feats}
+
+
+def _case_v7() -> Callable[[GeoJSON], bytes]:
+    from sfproto.geojson.v7.geojson_featurecollection import geojson_featurecollection_to_bytes_v7
+    return lambda fc: geojson_featurecollection_to_bytes_v7(fc, srid=4326, scale=10_000_000)
+
+
+def _case_v5() -> Callable[[GeoJSON], bytes]:
+    from sfproto.geojson.v5.geojson_featurecollection import geojson_featurecollection_to_bytes_v5
+    return lambda fc: geojson_featurecollection_to_bytes_v5(fc, srid=4326, scale=10_000_000)
+
+
+def _case_v4() -> Callable[[GeoJSON], bytes]:
+    from sfproto.geojson.v4.geojson_featurecollection import geojson_featurecollection_to_bytes_v4
+    return lambda fc: geojson_featurecollection_to_bytes_v4(fc, srid=4326)
+
+
+def _case_bag_v3() -> Callable[[GeoJSON], bytes]:
+    from sfproto.geojson.v3_BAG.geojson_bag import geojson_pand_featurecollection_to_bytes
+    return lambda fc: geojson_pand_featurecollection_to_bytes(fc)
+
+
+CASES = {
+    "v7_featurecollection": (_case_v7, make_features),
+    "v5_featurecollection": (_case_v5, make_features),
+    "v4_featurecollection": (_case_v4, make_features),
+    "bag_v3": (_case_bag_v3, make_panden),
+}
+
+# =========================================================
+# Helpers
+# =========================================================
+
+def _rss_kb() -> int:
+    # current RSS (Linux); falls back to the peak where /proc is not available
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * (resource.getpagesize() // 1024)
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_case(name: str, n: int, runs: int) -> Dict[str, Any]:
+    make_encoder, make_input = CASES[name]
+    encode = make_encoder()
+    fc = make_input(n)
+    encode(make_input(10))  # warm up imports / descriptor pools
+
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        data = encode(fc)
+        times.append(time.perf_counter() - t0)
+    del data
+
+    rss_before = _rss_kb()
+    tracemalloc.start()
+    data = encode(fc)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+    return {
+        "case": name,
+        "features": n,
+        "best_s": min(times),
+        "features_per_s": n / min(times),
+        "tracemalloc_peak_mb": peak / 2**20,
+        "rss_growth_mb": max(rss_growth, 0) / 1024,
+        "size_bytes": len(data),
+    }
+
+
+def run_alloc_benchmark(
+    csv_path: Path = Path("bench/bench_out_alloc/results.csv"),
+    n: int = N_FEATURES,
+    runs: int = RUNS,
+) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for name in CASES:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--case", name, "-n", str(n), "--runs", str(runs)],
+            check=True, capture_output=True, text=True,
+        )
+        row = json.loads(proc.stdout)
+        rows.append(row)
+        print(
+            f"{name:<22} {row['best_s'] * 1e3:9.1f} ms  {row['features_per_s']:>10,.0f} features/s   "
+            f"tracemalloc peak {row['tracemalloc_peak_mb']:8.1f} MB   rss growth {row['rss_growth_mb']:8.1f} MB"
+        )
+
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    with csv_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"Benchmark complete. CSV written to: {csv_path.resolve()}")
+    return rows
+
+# =========================================================
+# Entry point
+# =========================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--case", choices=sorted(CASES), help="run one case in this process (prints JSON)")
+    parser.add_argument("-n", type=int, default=N_FEATURES)
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args.n, args.runs)))
+    else:
+        run_alloc_benchmark(n=args.n, runs=args.runs)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import statistics
+import time
+from typing import Any, Callable, List
+
+import numpy as np
+
+from sfproto.sf.v7 import geometry_pb2
+from sfproto.wire import varint_pack, varint_unpack, zigzag_decode, zigzag_encode
+
+# =========================================================
+# Microbenchmark: packed sint32 field (dxy) codec throughput
+# sfproto.wire (NumPy) vs the protobuf runtime (repeated field + serialize/parse)
+# MB/s is measured on the encoded (varint) bytes.
+# =========================================================
+
+N_VALUES = 2_000_000
+RUNS = 5
+
+# typical coordinate deltas: mostly 1-2 byte varints, some larger jumps
+DISTRIBUTIONS = {
+    "small (|d| < 64)": lambda rng, n: rng.integers(-63, 64, n),
+    "mixed (|d| < 2^14)": lambda rng, n: rng.integers(-2**14, 2**14, n),
+    "large (|d| < 2^31)": lambda rng, n: rng.integers(-2**31, 2**31, n),
+}
+
+
+def _time(fn: Callable[[], Any], runs: int) -> List[float]:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _report(label: str, samples: List[float], nbytes: int) -> float:
+    best = min(samples)
+    print(
+        f"  {label:<22} median {statistics.median(samples) * 1e3:8.1f} ms   "
+        f"best {best * 1e3:8.1f} ms   {nbytes / best / 2**20:8.1f} MB/s"
+    )
+    return best
+
+
+def _pb_encode(values: List[int]) -> bytes:
+    g = geometry_pb2.StreamGeometry()
+    g.dxy.extend(values)
+    return g.SerializeToString()
+
+
+def _pb_decode(data: bytes) -> np.ndarray:
+    return np.asarray(geometry_pb2.StreamGeometry.FromString(data).dxy, dtype=np.int64)
+
+
+def run(n: int = N_VALUES, runs: int = RUNS) -> None:
+    rng = np.random.default_rng(0)
+    for label, make in DISTRIBUTIONS.items():
+        values = make(rng, n).astype(np.int64)
+        body = varint_pack(zigzag_encode(values))
+        message = _pb_encode(values.tolist())
+        print(f"=== {n:,} values, {label}: {len(body) / n:.2f} bytes/value ===")
+
+        enc_np = _report("encode wire", _time(lambda: varint_pack(zigzag_encode(values)), runs), len(body))
+        enc_pb = _report("encode protobuf", _time(lambda: _pb_encode(values.tolist()), runs), len(body))
+        dec_np = _report("decode wire", _time(lambda: zigzag_decode(varint_unpack(body)), runs), len(body))
+        dec_pb = _report("decode protobuf", _time(lambda: _pb_decode(message), runs), len(body))
+        print(f"  speedup encode: {enc_pb / enc_np:.2f}x   decode: {dec_pb / dec_np:.2f}x")
+
+
+if __name__ == "__main__":
+    run()
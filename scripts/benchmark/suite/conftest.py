@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+# =========================================================
+# Codec benchmark suite: options, measurement, JSON results, regression gate
+#
+#   python -m pytest scripts/benchmark/suite -q
+#   python -m pytest scripts/benchmark/suite -q --bench-sizes small medium large
+#   python -m pytest scripts/benchmark/suite -q --bench-baseline bench/bench_out_suite/baseline.json --bench-threshold 10
+#
+# Every case is timed runs times (after one warm-up call) with the GC collected
+# between runs, and run once more under tracemalloc for the peak of the Python
+# heap (NumPy buffers are traced, the protobuf runtime's C heap is not).
+# With a baseline (a results file of an earlier run) a case fails when one of
+# the GATED metrics is more than threshold % worse; cases the baseline does
+# not have are only recorded. Compare results of the same machine only, and
+# gate on the small tier or larger: the tiny cases take about a millisecond.
+# =========================================================
+
+SIZE_TIERS = {"tiny": 100, "small": 1_000, "medium": 10_000, "large": 100_000}
+DEFAULT_TIERS = ["small"]  # medium: ~12 min, most of it the tracemalloc runs
+DEFAULT_RUNS = 3
+DEFAULT_THRESHOLD = 10.0  # %
+DEFAULT_JSON = "bench/bench_out_suite/results.json"
+
+RESULTS_FORMAT = "sfproto-bench"
+RESULTS_VERSION = 1
+
+# (phase or None for the case itself, metric): lower is better for all of them;
+# best_s rather than median_s, the minimum is the least noisy estimate
+GATED = [
+    ("encode", "best_s"),
+    ("decode", "best_s"),
+    ("encode", "peak_bytes"),
+    ("decode", "peak_bytes"),
+    (None, "encoded_bytes"),
+]
+# time differences below this are timer and scheduler noise, never a regression
+NOISE_FLOOR_S = 0.0005
+
+_results_key = pytest.StashKey[Dict[str, Dict[str, Any]]]()
+_baseline_key = pytest.StashKey[Optional[Dict[str, Dict[str, Any]]]]()
+
+
+def pytest_addoption(parser) -> None:
+    group = parser.getgroup("sfproto-bench")
+    group.addoption("--bench-sizes", nargs="+", default=DEFAULT_TIERS, choices=list(SIZE_TIERS),
+                    help=f"Size tiers to run (default: {' '.join(DEFAULT_TIERS)})")
+    group.addoption("--bench-runs", type=int, default=DEFAULT_RUNS, help="Timed runs per phase")
+    group.addoption("--bench-json", default=DEFAULT_JSON, help="Write the results to this JSON file")
+    group.addoption("--bench-baseline", default=None, help="Results JSON of an earlier run to compare against")
+    group.addoption("--bench-threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="Fail a case when a gated metric is more than this many %% worse than the baseline")
+
+
+def pytest_configure(config) -> None:
+    if config.getoption("bench_runs") < 1:
+        raise pytest.UsageError("--bench-runs must be at least 1")
+    config.stash[_results_key] = {}
+    config.stash[_baseline_key] = None
+    path = config.getoption("bench_baseline")
+    if path:
+        config.stash[_baseline_key] = load_results(path)
+
+
+def pytest_generate_tests(metafunc) -> None:
+    # "size" parameter: the selected tiers
+    if "size" in metafunc.fixturenames:
+        tiers = metafunc.config.getoption("bench_sizes")
+        metafunc.parametrize("size", [SIZE_TIERS[t] for t in tiers], ids=tiers)
+
+
+def pytest_collection_modifyitems(session, config, items) -> None:
+    # cases on the same dataset next to each other, so it is generated once
+    def key(item) -> Tuple[str, ...]:
+        params = getattr(item, "callspec", None)
+        params = params.params if params else {}
+        return tuple(str(params.get(name, "")).zfill(12) for name in ("size", "dataset", "geometry", "profile"))
+
+    items.sort(key=key)
+
+
+def pytest_sessionfinish(session, exitstatus) -> None:
+    results = session.config.stash.get(_results_key, {})
+    path = session.config.getoption("bench_json")
+    if not results or not path:
+        return
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    doc = {
+        "format": RESULTS_FORMAT,
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": _machine(),
+        "runs": session.config.getoption("bench_runs"),
+        "results": dict(sorted(results.items())),
+    }
+    out.write_text(json.dumps(doc, indent=1), encoding="utf-8")
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    results = config.stash.get(_results_key, {})
+    if not results:
+        return
+    baseline = config.stash.get(_baseline_key, None) or {}
+    tr = terminalreporter
+    tr.section("sfproto benchmarks")
+    tr.write_line(
+        f"{'case':<34} {'bytes':>11} {'enc ms':>9} {'dec ms':>9} {'enc feat/s':>11} "
+        f"{'dec MB/s':>9} {'peak MiB':>9}  {'vs baseline':>11}"
+    )
+    for case, r in sorted(results.items()):
+        enc, dec = r["encode"], r["decode"]
+        vs = ""
+        if case in baseline:
+            vs = f"{(enc['best_s'] + dec['best_s']) / _time(baseline[case]) * 100 - 100:+.1f}%"
+        tr.write_line(
+            f"{case:<34} {r['encoded_bytes']:>11,} {enc['best_s'] * 1e3:>9.2f} {dec['best_s'] * 1e3:>9.2f} "
+            f"{enc['features_per_s']:>11,.0f} {dec['mb_per_s']:>9.1f} "
+            f"{max(enc['peak_bytes'], dec['peak_bytes']) / 2**20:>9.1f}  {vs:>11}"
+        )
+    if config.getoption("bench_json"):
+        tr.write_line(f"results: {config.getoption('bench_json')}")
+
+
+# =========================================================
+# Results files and comparison
+# =========================================================
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    doc = json.loads(Path(path).read_text(encoding="utf-8"))
+    if doc.get("format") != RESULTS_FORMAT or doc.get("version") != RESULTS_VERSION:
+        raise pytest.UsageError(f"{path}: not a {RESULTS_FORMAT} v{RESULTS_VERSION} results file")
+    return doc["results"]
+
+
+def _metric(result: Dict[str, Any], phase: Optional[str], metric: str) -> float:
+    return float(result[phase][metric] if phase else result[metric])
+
+
+def _time(result: Dict[str, Any]) -> float:
+    return result["encode"]["best_s"] + result["decode"]["best_s"]
+
+
+def regressions(result: Dict[str, Any], base: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    GATED metrics of result more than threshold % worse than in base.
+    """
+    out = []
+    for phase, metric in GATED:
+        new, old = _metric(result, phase, metric), _metric(base, phase, metric)
+        if metric.endswith("_s") and new - old < NOISE_FLOOR_S:
+            continue
+        if old > 0 and new > old * (1 + threshold / 100):
+            name = f"{phase}.{metric}" if phase else metric
+            out.append(f"{name}: {old:.6g} -> {new:.6g} ({new / old * 100 - 100:+.1f}%)")
+    return out
+
+
+def _machine() -> Dict[str, Any]:
+    import google.protobuf
+    import numpy
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "protobuf": google.protobuf.__version__,
+        "argv": sys.argv[1:],
+    }
+
+
+# =========================================================
+# Measurement
+# =========================================================
+
+def _timed(fn: Callable[[Any], Any], arg: Any, runs: int) -> Tuple[List[float], Any]:
+    out = fn(arg)  # warm-up
+    samples = []
+    for _ in range(runs):
+        del out
+        gc.collect()
+        t0 = time.perf_counter()
+        out = fn(arg)
+        samples.append(time.perf_counter() - t0)
+    return samples, out
+
+
+def _peak(fn: Callable[[Any], Any], arg: Any) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(arg)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _phase(samples: List[float], peak: int, features: int, nbytes: int) -> Dict[str, Any]:
+    best = min(samples)
+    return {
+        "median_s": statistics.median(samples),
+        "best_s": best,
+        "features_per_s": features / best if best else 0.0,
+        "mb_per_s": nbytes / best / 2**20 if best else 0.0,  # of the encoded bytes
+        "peak_bytes": peak,
+    }
+
+
+@pytest.fixture
+def bench(request) -> Callable[..., Dict[str, Any]]:
+    """
+    bench(case, fc, encode, decode, **meta): measure one codec on one dataset,
+    record the result under case and check it against the baseline.
+    """
+    config = request.config
+    runs = config.getoption("bench_runs")
+
+    def run(
+        case: str,
+        fc: Dict[str, Any],
+        encode: Callable[[Dict[str, Any]], bytes],
+        decode: Callable[[bytes], Dict[str, Any]],
+        **meta: Any,
+    ) -> Dict[str, Any]:
+        features = len(fc["features"])
+        enc_samples, data = _timed(encode, fc, runs)
+        dec_samples, out = _timed(decode, data, runs)
+        if len(out["features"]) != features:
+            pytest.fail(f"{case}: decoded {len(out['features'])} of {features} features")
+        del out
+        geojson_bytes = len(json.dumps(fc, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+        result = dict(
+            meta,
+            features=features,
+            geojson_bytes=geojson_bytes,
+            encoded_bytes=len(data),
+            ratio=geojson_bytes / len(data) if data else 0.0,
+            encode=_phase(enc_samples, _peak(encode, fc), features, len(data)),
+            decode=_phase(dec_samples, _peak(decode, data), features, len(data)),
+        )
+        config.stash[_results_key][case] = result
+
+        baseline = config.stash[_baseline_key]
+        if baseline and case in baseline:
+            worse = regressions(result, baseline[case], config.getoption("bench_threshold"))
+            if worse:
+                pytest.fail(f"{case} regressed:\n  " + "\n  ".join(worse), pytrace=False)
+        return result
+
+    return run
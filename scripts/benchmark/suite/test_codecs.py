@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+from sfproto.benchmark_profiles import ATTRIBUTE_PROFILES
+from sfproto.synthetic import generate
+
+GeoJSON = Dict[str, Any]
+Codec = Tuple[Callable[[GeoJSON], bytes], Callable[[bytes], GeoJSON]]
+
+# =========================================================
+# Codec matrix: version x geometry type x attribute profile x size tier
+# on seeded synthetic data (sfproto.synthetic), see conftest.py for the options.
+#
+# v1, v2 and v6 store geometries only, so they run with the "none" profile.
+# The BAG codecs run on synthetic panden (EPSG:28992), next to v7 on the same data.
+# =========================================================
+
+SEED = 0
+SCALE_DEGREE = 10_000_000  # v2 / v5 / v6 / v7 on EPSG:4326, ~cm
+GEOMETRIES = ["Point", "LineString", "Polygon", "mixed"]
+
+
+def _codecs() -> Dict[str, Codec]:
+    from sfproto.geojson.v1.geojson import bytes_to_geojson, geojson_to_bytes
+    from sfproto.geojson.v2.geojson import bytes_to_geojson_v2, geojson_to_bytes_v2
+    from sfproto.geojson.v4.geojson import bytes_to_geojson_v4, geojson_to_bytes_v4
+    from sfproto.geojson.v5.geojson import bytes_to_geojson_v5, geojson_to_bytes_v5
+    from sfproto.geojson.v6.geojson import bytes_to_geojson_v6, geojson_to_bytes_v6
+    from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+    from sfproto.geojson.v7.geojson_batched import geojson_featurecollection_to_batched_bytes_v7
+
+    return {
+        "v1": (lambda fc: geojson_to_bytes(fc, srid=4326), bytes_to_geojson),
+        "v2": (lambda fc: geojson_to_bytes_v2(fc, srid=4326, scale=SCALE_DEGREE), bytes_to_geojson_v2),
+        "v4": (lambda fc: geojson_to_bytes_v4(fc, srid=4326), bytes_to_geojson_v4),
+        "v5": (lambda fc: geojson_to_bytes_v5(fc, srid=4326, scale=SCALE_DEGREE), bytes_to_geojson_v5),
+        "v6": (lambda fc: geojson_to_bytes_v6(fc, srid=4326, scale=SCALE_DEGREE), bytes_to_geojson_v6),
+        "v7": (lambda fc: geojson_to_bytes_v7(fc, srid=4326, scale=SCALE_DEGREE), bytes_to_geojson_v7),
+        "v7_batched": (
+            lambda fc: geojson_featurecollection_to_batched_bytes_v7(fc, srid=4326, scale=SCALE_DEGREE),
+            bytes_to_geojson_v7,
+        ),
+    }
+
+
+def _bag_codecs() -> Dict[str, Codec]:
+    from sfproto.geojson.v3_BAG.geojson_bag import (
+        bytes_to_geojson_pand_featurecollection,
+        geojson_pand_featurecollection_to_bytes,
+    )
+    from sfproto.geojson.v4_BAG.geojson_bag import (
+        bytes_to_geojson_pand_featurecollection_v4,
+        geojson_pand_featurecollection_to_bytes_v4,
+    )
+    from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+
+    return {
+        "v3_BAG": (geojson_pand_featurecollection_to_bytes, bytes_to_geojson_pand_featurecollection),
+        "v4_BAG": (geojson_pand_featurecollection_to_bytes_v4, bytes_to_geojson_pand_featurecollection_v4),
+        "v7": (lambda fc: geojson_to_bytes_v7(fc, srid=28992, scale=1000), bytes_to_geojson_v7),
+    }
+
+
+GEOMETRY_ONLY = {"v1", "v2", "v6"}
+CODECS = ["v1", "v2", "v4", "v5", "v6", "v7", "v7_batched"]
+BAG_CODECS = ["v3_BAG", "v4_BAG", "v7"]
+
+MATRIX = [
+    pytest.param(codec, geometry, profile, id=f"{codec}-{geometry}-{profile}")
+    for codec in CODECS
+    for geometry in GEOMETRIES
+    for profile in (["none"] if codec in GEOMETRY_ONLY else ATTRIBUTE_PROFILES)
+]
+
+
+@lru_cache(maxsize=1)
+def _osm(geometry: str, profile: str, size: int) -> GeoJSON:
+    if geometry == "mixed":
+        return generate("osm", size, seed=SEED, regime="mixed", profile=profile)
+    # one type: taken from a mixed set three times the size (a third of each type, the rest Points)
+    fc = generate("osm", 3 * size + 3, seed=SEED, regime="mixed", profile=profile)
+    features: List[GeoJSON] = [f for f in fc["features"] if f["geometry"]["type"] == geometry][:size]
+    assert len(features) == size
+    return dict(fc, features=features)
+
+
+@lru_cache(maxsize=1)
+def _bag(size: int) -> GeoJSON:
+    return generate("bag", size, seed=SEED)
+
+
+@pytest.mark.parametrize("codec,geometry,profile", MATRIX)
+def test_codec(bench, codec, geometry, profile, size):
+    encode, decode = _codecs()[codec]
+    bench(
+        f"{codec}-{geometry}-{profile}-{size}",
+        _osm(geometry, profile, size),
+        encode,
+        decode,
+        codec=codec,
+        dataset="osm",
+        geometry=geometry,
+        profile=profile,
+        size=size,
+    )
+
+
+@pytest.mark.parametrize("codec", BAG_CODECS)
+def test_bag_codec(bench, codec, size):
+    encode, decode = _bag_codecs()[codec]
+    bench(
+        f"bag-{codec}-{size}",
+        _bag(size),
+        encode,
+        decode,
+        codec=codec,
+        dataset="bag",
+        geometry="Polygon",
+        profile="bag",
+        size=size,
+    )
@@ -2,6 +2,14 @@ import json
 from collections import defaultdict
 from pathlib import Path
 
+from sfproto.benchmark_profiles import (
+    ATTRIBUTE_PROFILE_MAP,
+    ATTRIBUTE_PROFILES,
+    GEOMETRY_RATIOS,
+    GEOMETRY_REGIMES,
+    SIZES,
+)
+
 # =============================
 # User configuration
 # =============================
@@ -9,9 +17,7 @@ from pathlib import Path
 INPUT_GEOJSON = "data/osm_mixed.geojson"
 OUT_DIR = Path("data/benchmarks")
 
-SIZES = [10, 100, 1000, 10_000, 100_000]
-ATTRIBUTE_PROFILES = ["none", "few", "medium", "many"]
-GEOMETRY_REGIMES = ["mixed", "geometry_heavy", "attribute_heavy"]
+# SIZES, ATTRIBUTE_PROFILES, GEOMETRY_REGIMES: sfproto.benchmark_profiles (shared with sfproto.synthetic)
 
 # =============================
 # Attribute schema
@@ -30,34 +36,8 @@ ATTRIBUTE_SCHEMA = {
     "lanes": lambda f: f["properties"].get("lanes"),
 }
 
-ATTRIBUTE_PROFILE_MAP = {
-    "none": [],
-    "few": ["id", "kind"],
-    "medium": ["id", "kind", "name"],
-    "many": list(ATTRIBUTE_SCHEMA.keys()),
-}
-
-# =============================
-# Geometry regimes
-# =============================
-
-GEOMETRY_RATIOS = {
-    "mixed": {
-        "Point": 1 / 3,
-        "LineString": 1 / 3,
-        "Polygon": 1 / 3,
-    },
-    "geometry_heavy": {
-        "Point": 0.10,
-        "LineString": 0.20,
-        "Polygon": 0.70,
-    },
-    "attribute_heavy": {
-        "Point": 0.80,
-        "LineString": 0.10,
-        "Polygon": 0.10,
-    },
-}
+# ATTRIBUTE_PROFILE_MAP (profile -> keys of ATTRIBUTE_SCHEMA) and the
+# GEOMETRY_RATIOS of each regime: sfproto.benchmark_profiles
 
 # =============================
 # Load input GeoJSON
@@ -0,0 +1,62 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+from sfproto.benchmark_profiles import ATTRIBUTE_PROFILES, GEOMETRY_REGIMES, SIZES
+from sfproto.synthetic import generate, generate_osm
+
+# =============================
+# Synthetic stand-ins for the downloaded benchmark data
+# =============================
+#
+# Writes seeded synthetic files under the paths filter_osm.py, download_bag_geojson.py
+# and download_overture.py write to, for machines without the source data:
+#
+#   data/benchmarks/osm_{regime}_{size}_{profile}.geojson
+#   data/bag_data/bag_pand_{size}.geojson
+#   data/overture_data/overture_buildings_{size}.geojson
+#
+# The FlatGeobuf reference files (data/benchmarks_fgb_no_index) still need GDAL.
+
+BAG_SIZES = [10_000, 100_000]
+OVERTURE_SIZES = [100_000]
+
+
+def _write(fc, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(fc, f, ensure_ascii=False)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Write seeded synthetic benchmark datasets.")
+    ap.add_argument("--out", default="data", help="Data directory (default: data)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="OSM dataset sizes")
+    args = ap.parse_args()
+    out = Path(args.out)
+
+    t0 = time.perf_counter()
+    for size in args.sizes:
+        for regime in GEOMETRY_REGIMES:
+            for profile in ATTRIBUTE_PROFILES:
+                path = out / "benchmarks" / f"osm_{regime}_{size}_{profile}.geojson"
+                _write(generate_osm(size, regime, profile, seed=args.seed), path)
+                print(f"Wrote {path.name} | size={size}, regime={regime}, attrs={profile}")
+
+    for size in BAG_SIZES:
+        path = out / "bag_data" / f"bag_pand_{size}.geojson"
+        _write(generate("bag", size, seed=args.seed), path)
+        print(f"Wrote {path.name} | size={size}")
+
+    for size in OVERTURE_SIZES:
+        path = out / "overture_data" / f"overture_buildings_{size}.geojson"
+        _write(generate("overture", size, seed=args.seed), path)
+        print(f"Wrote {path.name} | size={size}")
+
+    print(f"\nAll synthetic datasets generated in {time.perf_counter() - t0:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
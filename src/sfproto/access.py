@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from sfproto.scan import _fcv7_payload, scan
+from sfproto.util import copy_geojson
+
+GeoJSON = Dict[str, Any]
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Random access to single features of a v7 (FCV7 / FCB7) or BAG v3 file.
+#
+#   feat = read_feature(path, 12345)
+#   feats = read_features(path, [7, 3, 12345])
+#
+# The file is mmapped and only the requested Feature sub-messages are parsed
+# (repeated message fields can be parsed on their own). Their offsets come from
+# the wire scanner (sfproto.scan); the scan table of a file is kept in a small LRU,
+# keyed by (path, mtime, size), so after the first call a read costs one small
+# parse per feature. Indices are positions in the file (stored order; for a
+# spatially sorted collection that is the sorted order).
+#
+# read(path, where=[...]) decodes a whole v7 file with a property filter: batches
+# whose statistics rule out a match are skipped unparsed, and the properties of the
+# other features are tested before their geometry is decoded (see geojson_stats.py).
+# Delta segments of a batched file (see geojson_delta.py) apply to both: read()
+# merges them; a positional read returns the replacement of a replaced feature and
+# raises IndexError for a deleted one (new features have no position until the
+# file is compacted).
+
+MAX_TABLES = 16
+
+_tables: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def _table(key: Tuple[str, int, int], mm: mmap.mmap) -> Dict[str, Any]:
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is not None:
+            _tables.move_to_end(key)
+            return table
+    table = scan(mm)
+    with _tables_lock:
+        _tables[key] = table
+        while len(_tables) > MAX_TABLES:
+            _tables.popitem(last=False)
+    return table
+
+
+def feature_table(path: PathLike) -> Dict[str, Any]:
+    """
+    Scan table of a file (see sfproto.scan), cached; treat it as read-only.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _table(_file_key(path, f), mm)
+
+
+def clear_tables() -> None:
+    with _tables_lock:
+        _tables.clear()
+
+
+def _file_key(path: PathLike, f) -> Tuple[str, int, int]:
+    # from the opened file, so table and mmap belong to the same version of it
+    st = os.fstat(f.fileno())
+    if st.st_size == 0:
+        raise ValueError("Invalid payload: empty file")
+    return os.path.realpath(path), st.st_mtime_ns, st.st_size
+
+
+def _deltas(key: Tuple[str, int, int], mm: mmap.mmap, table: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # net change of the delta segments of a batched file (cached), None without any
+    if table["format"] != "v7_batched":
+        return None
+    from sfproto.geojson.v7.geojson_delta import file_delta_state
+
+    return file_delta_state(key, mm)
+
+
+def _patch(feat: GeoJSON, state: Optional[Dict[str, Any]], i: int) -> GeoJSON:
+    # a base feature as the delta segments left it
+    if state is None or feat.get("id") not in state["replace"]:
+        return feat
+    new = state["replace"][feat["id"]]
+    if new is None:
+        raise IndexError(f"feature {i} was deleted (delta segment)")
+    return copy_geojson(new)
+
+
+def file_deltas(path: PathLike) -> Optional[Dict[str, Any]]:
+    """
+    Net change of the delta segments of a batched v7 file (see
+    geojson_delta.delta_state), None when it has none; treat it as read-only.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        key = _file_key(path, f)
+        return _deltas(key, mm, _table(key, mm))
+
+
+def _v7_decoder(mm: mmap.mmap, table: Dict[str, Any]):
+    from google.protobuf.struct_pb2 import Struct
+
+    from sfproto.geojson.v7.geojson_featurecollection import (
+        _decode_stream_geometry,
+        _feature_from_pb,
+        _shared_entry,
+        _struct_to_dict,
+    )
+    from sfproto.sf.v7 import geometry_pb2
+
+    def shared(rows, ref: int) -> bytes:
+        off, n = _shared_entry(rows, ref)
+        return mm[off:off + n]
+
+    def decode(i: int) -> GeoJSON:
+        batch = table["batches"][table["batch"][i]]
+        start, scale = batch["global_start"], batch["scale"]
+        off, n = table["offset"][i], table["length"][i]
+        feat_pb = geometry_pb2.Feature.FromString(mm[off:off + n])
+
+        if feat_pb.geometry_ref:
+            g = geometry_pb2.StreamGeometry.FromString(shared(batch["shared_geometries"], feat_pb.geometry_ref))
+        else:
+            g = feat_pb.geometry
+        geom = _decode_stream_geometry(g, start, scale)
+
+        if feat_pb.properties_ref:
+            props = _struct_to_dict(Struct.FromString(shared(batch["shared_properties"], feat_pb.properties_ref)))
+        else:
+            props = _struct_to_dict(feat_pb.properties)
+        return _feature_from_pb(feat_pb, geom, props)
+
+    return decode
+
+
+def _bag_decoder(mm: mmap.mmap, table: Dict[str, Any]):
+    from sfproto.geojson.v3_BAG.geojson_bag import _decode_pand_feature, pand_pb2
+
+    scale = table["batches"][0]["scale"]
+    revision = table["batches"][0]["revision"]
+
+    def decode(i: int) -> GeoJSON:
+        off, n = table["offset"][i], table["length"][i]
+        return _decode_pand_feature(pand_pb2.PandFeature.FromString(mm[off:off + n]), scale, revision)
+
+    return decode
+
+
+def read_features(path: PathLike, indices: Iterable[int]) -> List[GeoJSON]:
+    """
+    Decode the features at the given indices (negative indices count from the end),
+    in the order given.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        key = _file_key(path, f)
+        table = _table(key, mm)
+        n = len(table["offset"])
+        decode = _bag_decoder(mm, table) if table["format"] == "bag_v3" else _v7_decoder(mm, table)
+        state = _deltas(key, mm, table)
+
+        out: List[GeoJSON] = []
+        for i in indices:
+            i = int(i)
+            if not -n <= i < n:
+                raise IndexError(f"feature index {i} out of range ({n} features)")
+            out.append(_patch(decode(i % n), state, i))
+        return out
+
+
+def read_feature(path: PathLike, i: int) -> GeoJSON:
+    return read_features(path, [i])[0]
+
+
+def read(
+    path: PathLike,
+    where: Optional[Sequence[Tuple[str, str, Any]]] = None,
+    preserve_order: bool = False,
+    stats: Optional[Dict[str, Any]] = None,
+    lod: Optional[int] = None,
+) -> GeoJSON:
+    """
+    v7 file (FCV7 / FCB7) -> GeoJSON FeatureCollection with the features that satisfy
+    all predicates of where, e.g. [("bouwjaar", ">=", 2000), ("status", "==", "Pand in gebruik")].
+    stats (optional dict) receives batches, batches_skipped and features.
+    lod: geometries at this level of detail (see geojson_lod.py).
+    """
+    from sfproto.geojson.v7.geojson import _TAG_FC7, _TAG_FCB7, _TAG_LEN, _TAG_STV7
+    from sfproto.geojson.v7.geojson_batched import frame_tag, iter_frames, merge_batches
+    from sfproto.geojson.v7.geojson_delta import apply_deltas, delta_state
+    from sfproto.geojson.v7.geojson_featurecollection import _decode_featurecollection_pb
+    from sfproto.geojson.v7.geojson_stats import batch_may_match, check_where, compile_where
+    from sfproto.sf.v7 import geometry_pb2
+
+    preds = check_where(where)
+    keep = compile_where(preds) if preds else None
+    counts = {"batches": 0, "batches_skipped": 0}
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        tag = mm[:_TAG_LEN]
+
+        def decode(offset: int, end: int, batch_keep) -> GeoJSON:
+            start, stop = _fcv7_payload(mm, offset, end)
+            fc = geometry_pb2.FeatureCollection.FromString(mm[start:stop])
+            return _decode_featurecollection_pb(fc, preserve_order, batch_keep, lod)
+
+        if tag == _TAG_FC7:
+            counts["batches"] = 1
+            out = decode(0, len(mm), keep)
+        elif tag == _TAG_FCB7:
+            def batches():
+                batch_stats = None
+                for offset, blob in iter_frames(mm):
+                    kind = frame_tag(blob)
+                    if kind == _TAG_STV7:
+                        batch_stats = geometry_pb2.BatchStats.FromString(blob[_TAG_LEN:])
+                    elif kind == _TAG_FC7:
+                        counts["batches"] += 1
+                        if preds and batch_stats is not None and not batch_may_match(batch_stats, preds):
+                            counts["batches_skipped"] += 1
+                            if counts["batches"] == 1:
+                                # the collection members come from the first batch
+                                yield decode(offset, offset + len(blob), lambda s: False)
+                        else:
+                            yield decode(offset, offset + len(blob), keep)
+                        batch_stats = None
+
+            state = delta_state(mm, keep)
+            out = merge_batches(batches() if state is None else apply_deltas(batches(), state))
+        else:
+            raise ValueError(f"Expected v7 FeatureCollection payload (FCV7/FCB7), got tag {tag!r}")
+
+    if stats is not None:
+        stats.update(counts, features=len(out["features"]))
+    return out
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import asyncio
+import mmap
+import os
+import struct
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Union
+
+from sfproto.access import _file_key
+from sfproto.geojson.v7.geojson import DEFAULT_SCALE, _TAG_LEN, _TAG_DLV7, _TAG_FC7, _TAG_FCB7, bytes_to_geojson_v7
+from sfproto.geojson.v7.geojson_batched import (
+    DEFAULT_BATCH_SIZE,
+    decode_batch_v7,
+    encode_batch_v7,
+    merge_batches,
+)
+from sfproto.geojson.v7.geojson_delta import _apply_batch, _rest_batch, delta_state, file_delta_state
+from sfproto.util import copy_geojson
+
+GeoJSON = Dict[str, Any]
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Async counterparts of reading/writing encoded v7 files, for asyncio services.
+#   - file I/O runs in the loop's default executor (never blocks the event loop)
+#   - CPU work (decode/encode of a batch) runs in a bounded executor
+#   - at most max_pending batches are in flight, so reading the next batch
+#     overlaps with decoding the previous ones while memory stays bounded
+# Batched files (FCB7, see geojson_batched.py) are streamed batch by batch;
+# other v7 payloads are read completely and decoded as one unit.
+# Delta segments (DLV7, see geojson_delta.py) are applied as by iter_batches_v7. Of a
+# path they are read up front; a stream has them at its end, so its batches are
+# held back until the stream is exhausted.
+#
+# executor: any concurrent.futures.Executor. Default is a small shared thread pool;
+# a ProcessPoolExecutor also works (all submitted functions are module-level).
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_PENDING = 4
+READ_CHUNK_SIZE = 1 << 20
+
+_U32 = struct.Struct(">I")
+
+ReadFn = Callable[[int], Awaitable[bytes]]
+
+
+@lru_cache(maxsize=1)
+def _default_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix="sfproto-aio")
+
+
+def _executor_or_default(executor: Optional[Executor]) -> Executor:
+    return executor if executor is not None else _default_executor()
+
+
+# -------------------- readers --------------------
+
+def _stream_read_fn(stream) -> ReadFn:
+    # asyncio.StreamReader (or anything with async readexactly/read)
+    async def read(n: int) -> bytes:
+        if hasattr(stream, "readexactly"):
+            try:
+                return await stream.readexactly(n)
+            except asyncio.IncompleteReadError as e:
+                return e.partial
+        parts: List[bytes] = []
+        remaining = n
+        while remaining > 0:
+            part = await stream.read(remaining)
+            if not part:
+                break
+            parts.append(part)
+            remaining -= len(part)
+        return b"".join(parts)
+
+    return read
+
+
+def _file_read_fn(f) -> ReadFn:
+    loop = asyncio.get_running_loop()
+
+    async def read(n: int) -> bytes:
+        return await loop.run_in_executor(None, f.read, n)
+
+    return read
+
+
+async def _read_rest(read: ReadFn) -> bytes:
+    parts: List[bytes] = []
+    while True:
+        part = await read(READ_CHUNK_SIZE)
+        if not part:
+            return b"".join(parts)
+        parts.append(part)
+
+
+def _file_delta_state(path: PathLike, f) -> Optional[Dict[str, Any]]:
+    # delta state of an opened FCB7 file (a copy: the cached one is shared), None without segments
+    error: Optional[str] = None
+    key = _file_key(path, f)
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:_TAG_LEN] != _TAG_FCB7:
+            return None
+        try:
+            state = file_delta_state(key, mm)
+        except ValueError as e:
+            # re-raised once the mmap is closed: the traceback holds views of it
+            error = str(e)
+    if error is not None:
+        raise ValueError(error)
+    return None if state is None else copy_geojson(state)
+
+
+def _segments_state(segments: List[bytes]) -> Optional[Dict[str, Any]]:
+    # delta_state of the DLV7 frames of a stream
+    return delta_state(_TAG_FCB7 + b"".join(_U32.pack(len(blob)) + blob for blob in segments))
+
+
+async def _iter_batches(
+    read: ReadFn,
+    executor: Executor,
+    max_pending: int,
+    state: Optional[Dict[str, Any]] = None,
+    stream: bool = False,
+) -> AsyncIterator[GeoJSON]:
+    # state: delta state read up front (path); stream: collect the delta segments
+    loop = asyncio.get_running_loop()
+
+    tag = await read(_TAG_LEN)
+    if tag != _TAG_FCB7:
+        # not streamable: one payload, one decode
+        data = tag + await _read_rest(read)
+        yield await loop.run_in_executor(executor, bytes_to_geojson_v7, data)
+        return
+
+    pending: Deque[asyncio.Future] = deque()
+    held: List[GeoJSON] = []  # stream: decoded batches waiting for the delta segments
+    segments: List[bytes] = []
+    done: set = set()
+
+    def emit(batch: GeoJSON) -> List[GeoJSON]:
+        if stream:
+            held.append(batch)
+            return []
+        return [batch if state is None else _apply_batch(batch, state["replace"], done)]
+
+    while True:
+        header = await read(_U32.size)
+        if not header:
+            break
+        if len(header) < _U32.size:
+            raise ValueError("Invalid batched payload: truncated frame header")
+        (n,) = _U32.unpack(header)
+        blob = await read(n)
+        if len(blob) < n:
+            raise ValueError("Invalid batched payload: truncated frame")
+        tag = blob[:_TAG_LEN]
+        if tag == _TAG_DLV7 and stream:
+            segments.append(blob)
+        if tag != _TAG_FC7:
+            continue  # metadata frame, or a delta segment (applied below)
+
+        pending.append(loop.run_in_executor(executor, decode_batch_v7, blob))
+        if len(pending) >= max_pending:
+            for batch in emit(await pending.popleft()):
+                yield batch
+
+    while pending:
+        for batch in emit(await pending.popleft()):
+            yield batch
+
+    if stream:
+        state = await loop.run_in_executor(executor, _segments_state, segments) if segments else None
+        for batch in held:
+            yield batch if state is None else _apply_batch(batch, state["replace"], done)
+    if state is not None:
+        rest = _rest_batch(state, done)
+        if rest is not None:
+            yield rest
+
+
+async def aiter_batches(
+    source: Union[PathLike, Any],
+    executor: Optional[Executor] = None,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> AsyncIterator[GeoJSON]:
+    """
+    Yield decoded batches (FeatureCollections) in file order.
+    source: a path, or a stream with async readexactly(n)/read(n) (e.g. asyncio.StreamReader).
+    """
+    if max_pending <= 0:
+        raise ValueError("max_pending must be positive")
+    executor = _executor_or_default(executor)
+
+    if isinstance(source, (str, os.PathLike)):
+        loop = asyncio.get_running_loop()
+        f = await loop.run_in_executor(None, open, source, "rb")
+        try:
+            state = await loop.run_in_executor(None, _file_delta_state, source, f)
+            async for batch in _iter_batches(_file_read_fn(f), executor, max_pending, state=state):
+                yield batch
+        finally:
+            await loop.run_in_executor(None, f.close)
+        return
+
+    async for batch in _iter_batches(_stream_read_fn(source), executor, max_pending, stream=True):
+        yield batch
+
+
+async def aiter_features(
+    source: Union[PathLike, Any],
+    executor: Optional[Executor] = None,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> AsyncIterator[GeoJSON]:
+    """
+    Yield GeoJSON Features as their batches finish decoding (in file order).
+    """
+    async for batch in aiter_batches(source, executor=executor, max_pending=max_pending):
+        if batch.get("type") == "FeatureCollection":
+            for feat in batch["features"]:
+                yield feat
+        else:
+            yield batch
+
+
+async def aread_collection(
+    path: PathLike,
+    executor: Optional[Executor] = None,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> GeoJSON:
+    """
+    Async counterpart of bytes_to_geojson_v7(path.read_bytes()).
+    """
+    batches = [b async for b in aiter_batches(path, executor=executor, max_pending=max_pending)]
+    if len(batches) == 1:
+        return batches[0]
+    return merge_batches(batches)
+
+
+# -------------------- writer --------------------
+
+async def _aiter_items(items: Union[Iterable[GeoJSON], AsyncIterable[GeoJSON]]) -> AsyncIterator[GeoJSON]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def awrite_collection(
+    path: PathLike,
+    features: Union[GeoJSON, Iterable[GeoJSON], AsyncIterable[GeoJSON]],
+    srid: int = 0,
+    scale: int = DEFAULT_SCALE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Optional[Executor] = None,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    stats: bool = False,
+) -> int:
+    """
+    Write features as a batched v7 file (FCB7), atomically. Encoding of the next batches overlaps
+    with writing the previous ones. features: a FeatureCollection dict, or a (async)
+    iterable of Features. stats: write per-batch property statistics.
+    Returns the number of bytes written.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    if max_pending <= 0:
+        raise ValueError("max_pending must be positive")
+    executor = _executor_or_default(executor)
+    loop = asyncio.get_running_loop()
+
+    members: Optional[GeoJSON] = None
+    if isinstance(features, dict):
+        if features.get("type") != "FeatureCollection":
+            raise ValueError(f"Expected FeatureCollection, got {features.get('type')!r}")
+        members = {k: v for k, v in features.items() if k not in ("type", "features")}
+        features = features.get("features") or []
+
+    # written next to path and renamed over it at the end, as util.atomic_writer:
+    # a failed or cancelled write leaves no partial file behind
+    path = os.fspath(path)
+    tmp = f"{path}.{os.getpid()}.{id(asyncio.current_task())}.tmp"
+    f = await loop.run_in_executor(None, open, tmp, "wb")
+    written = 0
+    ok = False
+    pending: Deque[asyncio.Future] = deque()
+
+    def submit(batch: List[GeoJSON], batch_members: Optional[GeoJSON]) -> None:
+        # run_in_executor takes no keywords; a partial of a module-level function still pickles
+        encode = partial(encode_batch_v7, batch, srid=srid, scale=scale, members=batch_members, stats=stats)
+        pending.append(loop.run_in_executor(executor, encode))
+
+    async def flush_one() -> None:
+        nonlocal written
+        data = await pending.popleft()
+        await loop.run_in_executor(None, f.write, data)
+        written += len(data)
+
+    try:
+        await loop.run_in_executor(None, f.write, _TAG_FCB7)
+        written += len(_TAG_FCB7)
+
+        batch: List[GeoJSON] = []
+        first = True
+        async for feat in _aiter_items(features):
+            batch.append(feat)
+            if len(batch) < batch_size:
+                continue
+            submit(batch, members if first else None)
+            batch, first = [], False
+            if len(pending) >= max_pending:
+                await flush_one()
+
+        if batch:
+            submit(batch, members if first else None)
+        while pending:
+            await flush_one()
+        ok = True
+    finally:
+        for fut in pending:
+            fut.cancel()
+        await loop.run_in_executor(None, f.close)
+        if ok:
+            await loop.run_in_executor(None, os.replace, tmp, path)
+        else:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    return written
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+# Shape of the OSM benchmark datasets: sizes, geometry regimes and attribute
+# profiles. scripts/download_data/filter_osm.py cuts the real datasets to this
+# shape and sfproto.synthetic generates look-alikes, so both read it from here.
+
+SIZES: List[int] = [10, 100, 1000, 10_000, 100_000]
+ATTRIBUTE_PROFILES: List[str] = ["none", "few", "medium", "many"]
+GEOMETRY_REGIMES: List[str] = ["mixed", "geometry_heavy", "attribute_heavy"]
+
+ATTRIBUTES: List[str] = ["id", "name", "kind", "source", "surface", "lanes"]
+ATTRIBUTE_PROFILE_MAP: Dict[str, List[str]] = {
+    "none": [],
+    "few": ["id", "kind"],
+    "medium": ["id", "kind", "name"],
+    "many": ATTRIBUTES,
+}
+
+# share of each geometry type per regime; counts are rounded down per type and
+# the rest goes to the Points
+GEOMETRY_RATIOS: Dict[str, Dict[str, float]] = {
+    "mixed": {"Point": 1 / 3, "LineString": 1 / 3, "Polygon": 1 / 3},
+    "geometry_heavy": {"Point": 0.10, "LineString": 0.20, "Polygon": 0.70},
+    "attribute_heavy": {"Point": 0.80, "LineString": 0.10, "Polygon": 0.10},
+}
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from sfproto.util import copy_geojson
+
+GeoJSON = Dict[str, Any]
+Decoder = Callable[[bytes], GeoJSON]
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Opt-in LRU cache around a decoder (default: bytes_to_geojson_v7), for services
+# that decode the same payloads over and over.
+#
+#   decode = cached_decoder(max_entries=256, max_bytes=512 * 2**20)
+#   fc = decode(data)              # keyed by a hash of the payload
+#   fc = decode.read(path)         # keyed by (path, mtime, size); no read on a hit
+#   decode.cache_info()            # hits, misses, evictions, entries, bytes
+#
+# Entries are evicted least recently used first, when either bound is exceeded.
+# The byte bound counts encoded payload bytes (a cheap, stable proxy for the size
+# of the decoded object). Results are returned as copies (copy=True, default), so
+# callers can modify them without corrupting the cache; copy=False returns the
+# cached object itself and the caller must treat it as read-only.
+
+DEFAULT_MAX_ENTRIES = 128
+
+_HASH_DIGEST_SIZE = 16
+
+
+def payload_key(data: Union[bytes, memoryview]) -> Tuple[str, int, bytes]:
+    # blake2b runs at memory speed and a 128-bit digest makes collisions a non-issue
+    return ("payload", len(data), hashlib.blake2b(data, digest_size=_HASH_DIGEST_SIZE).digest())
+
+
+def path_key(path: PathLike) -> Tuple[str, str, int, int]:
+    st = os.stat(path)
+    return ("path", os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+
+def _default_decoder() -> Decoder:
+    from sfproto.geojson.v7.geojson import bytes_to_geojson_v7
+
+    return bytes_to_geojson_v7
+
+
+def cached_decoder(
+    decode: Optional[Decoder] = None,
+    max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+    max_bytes: Optional[int] = None,
+    copy: bool = True,
+) -> Callable[[bytes], GeoJSON]:
+    """
+    Wrap decode (bytes -> GeoJSON) with an LRU cache.
+
+    max_entries / max_bytes: bounds (None = unbounded); at least one is required.
+    The returned function has .read(path), .cache_info() and .cache_clear().
+    """
+    if max_entries is None and max_bytes is None:
+        raise ValueError("cached_decoder needs max_entries and/or max_bytes")
+    if max_entries is not None and max_entries <= 0:
+        raise ValueError("max_entries must be positive")
+    if max_bytes is not None and max_bytes <= 0:
+        raise ValueError("max_bytes must be positive")
+
+    if decode is None:
+        decode = _default_decoder()
+
+    entries: "OrderedDict[tuple, Tuple[GeoJSON, int]]" = OrderedDict()
+    lock = threading.Lock()
+    stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+    def _out(value: GeoJSON) -> GeoJSON:
+        return copy_geojson(value) if copy else value
+
+    def _lookup(key: tuple) -> Optional[GeoJSON]:
+        with lock:
+            hit = entries.get(key)
+            if hit is None:
+                stats["misses"] += 1
+                return None
+            entries.move_to_end(key)
+            stats["hits"] += 1
+            return hit[0]
+
+    def _store(key: tuple, value: GeoJSON, size: int) -> None:
+        if max_bytes is not None and size > max_bytes:
+            return  # would evict everything else and itself
+        with lock:
+            old = entries.pop(key, None)
+            if old is not None:
+                stats["bytes"] -= old[1]
+            entries[key] = (value, size)
+            stats["bytes"] += size
+            while (max_entries is not None and len(entries) > max_entries) or \
+                    (max_bytes is not None and stats["bytes"] > max_bytes):
+                _, (_, evicted_size) = entries.popitem(last=False)
+                stats["bytes"] -= evicted_size
+                stats["evictions"] += 1
+
+    def cached(data: bytes) -> GeoJSON:
+        key = payload_key(data)
+        value = _lookup(key)
+        if value is None:
+            # decoded outside the lock: concurrent misses on one key decode twice, which is harmless
+            value = decode(data)
+            _store(key, value, len(data))
+        return _out(value)
+
+    def read(path: PathLike) -> GeoJSON:
+        key = path_key(path)
+        value = _lookup(key)
+        if value is None:
+            with open(path, "rb") as f:
+                # key from the opened file, in case it was replaced after the stat
+                st = os.fstat(f.fileno())
+                key = key[:2] + (st.st_mtime_ns, st.st_size)
+                data = f.read()
+            value = decode(data)
+            _store(key, value, len(data))
+        return _out(value)
+
+    def cache_info() -> Dict[str, Any]:
+        with lock:
+            lookups = stats["hits"] + stats["misses"]
+            return {
+                **stats,
+                "entries": len(entries),
+                "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+                "max_entries": max_entries,
+                "max_bytes": max_bytes,
+            }
+
+    def cache_clear() -> None:
+        with lock:
+            entries.clear()
+            stats.update(hits=0, misses=0, evictions=0, bytes=0)
+
+    cached.read = read
+    cached.cache_info = cache_info
+    cached.cache_clear = cache_clear
+    cached.__wrapped__ = decode
+    return cached
@@ -3,7 +3,7 @@ import json
 from pathlib import Path
 import sys
 
-from sfproto.geojson.api import encode_geojson, decode_geojson
+from sfproto.geojson.api import encode_geojson, decode_geojson, estimate_scale
 
 
 def read_json(path: Path):
@@ -24,19 +24,72 @@ def write_bytes(path: Path, data: bytes):
     path.write_bytes(data)
 
 
+def parse_scale(value: str):
+    if value == "auto":
+        return value
+    try:
+        scale = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("scale must be an integer or 'auto'")
+    if scale <= 0:
+        raise argparse.ArgumentTypeError("scale must be positive")
+    return scale
+
+
 def cmd_encode(args):
+    if args.index and not (args.output and args.delta):
+        raise SystemExit("--index needs --delta and -o/--output")
+
     geojson = read_json(args.input)
-    data = encode_geojson(geojson, delta=args.delta)
+
+    scale = args.scale
+    if scale == "auto":
+        est = estimate_scale(geojson, tolerance=args.tolerance)
+        if not est["within_tolerance"]:
+            raise SystemExit(
+                f"auto scale: no scale keeps the error within tolerance {est['tolerance']:.3g} "
+                f"(max error {est['max_error']:.3g} at scale {est['scale']})"
+            )
+        scale = est["scale"]
+        print(
+            f"auto scale: {scale} (max error {est['max_error']:.3g} "
+            f"<= tolerance {est['tolerance']:.3g}, {est['sampled']} coordinates sampled)",
+            file=sys.stderr,
+        )
+
+    stats = {}
+    data = encode_geojson(
+        geojson,
+        delta=args.delta,
+        sort=args.sort,
+        store_order=args.store_order,
+        scale=scale,
+        dedup=args.dedup,
+        stats=stats,
+        lod_tolerances=args.lod_tolerances,
+    )
+
+    if args.dedup and stats:
+        print(
+            f"dedup: {stats['unique_geometries']}/{stats['features']} unique geometries, "
+            f"{stats['unique_properties']}/{stats['features']} unique properties "
+            f"(dedup ratio {stats['dedup_ratio']:.1%})",
+            file=sys.stderr,
+        )
 
     if args.output:
         write_bytes(args.output, data)
+        if args.index:
+            from sfproto.index import build_index
+
+            print(f"index: {build_index(args.output)}", file=sys.stderr)
     else:
         sys.stdout.buffer.write(data)
 
 
 def cmd_decode(args):
     data = read_bytes(args.input)
-    geojson = decode_geojson(data, delta=args.delta)
+    geojson = decode_geojson(data, delta=args.delta, preserve_order=args.preserve_order, lod=args.lod)
 
     if args.output:
         write_json(args.output, geojson)
@@ -44,6 +97,82 @@ def cmd_decode(args):
         json.dump(geojson, sys.stdout, indent=2)
 
 
+def cmd_tile(args):
+    from sfproto.tiles import generate_tiles
+
+    stats = generate_tiles(
+        args.input,
+        args.output,
+        minzoom=args.minzoom,
+        maxzoom=args.maxzoom,
+        format=args.format,
+        layer=args.layer,
+        workers=args.workers,
+    )
+    print(
+        f"tiles: {stats['tiles']} in {stats['seconds']:.1f} s ({stats['tiles_per_second']:.0f} tiles/s), "
+        f"{stats['bytes']} bytes",
+        file=sys.stderr,
+    )
+
+
+def cmd_append(args):
+    from sfproto.geojson.v7.geojson_delta import append_delta
+
+    if args.features is None and args.delete_ids is None:
+        raise SystemExit("append needs --features and/or --delete-ids")
+    features = read_json(args.features) if args.features else None
+    deleted = None
+    if args.delete_ids:
+        deleted = [line.strip() for line in args.delete_ids.read_text(encoding="utf-8").splitlines() if line.strip()]
+    out = append_delta(args.input, features=features, deleted=deleted)
+    print(f"delta: {out['features']} features, {out['deleted']} deleted, {out['bytes']} bytes", file=sys.stderr)
+
+
+def cmd_compact(args):
+    from sfproto.geojson.v7.geojson_delta import compact
+
+    out = compact(args.input, sort=None if args.sort == "none" else args.sort, batch_size=args.batch_size)
+    print(
+        f"compacted: {out['features']} features, {out['segments']} delta segments merged, "
+        f"{out['bytes_before']} -> {out['bytes_after']} bytes",
+        file=sys.stderr,
+    )
+
+
+def cmd_partition(args):
+    from sfproto.dataset import write_dataset
+
+    if (args.shards is None) == (args.shard_size is None):
+        raise SystemExit("partition needs either --shards or --shard-size")
+    if args.by == "hilbert" and args.shards is None:
+        raise SystemExit("--by hilbert needs --shards")
+    manifest = write_dataset(
+        read_json(args.input),
+        args.output,
+        partition=args.by,
+        shards=args.shards,
+        shard_size=args.shard_size,
+        batch_size=args.batch_size,
+        stats=args.stats,
+    )
+    print(
+        f"dataset: {manifest['features']} features in {len(manifest['shards'])} shards "
+        f"({sum(s['bytes'] for s in manifest['shards'])} bytes)",
+        file=sys.stderr,
+    )
+
+
+def cmd_serve(args):
+    from sfproto.serve import DEFAULT_WORKERS, serve
+
+    print(f"serving {args.root} on http://{args.host}:{args.port}/", file=sys.stderr)
+    try:
+        serve(args.root, host=args.host, port=args.port, workers=args.workers or DEFAULT_WORKERS, index=args.index)
+    except KeyboardInterrupt:
+        pass
+
+
 def main():
     parser = argparse.ArgumentParser(prog="sfproto")
     subparsers = parser.add_subparsers(required=True)
@@ -57,6 +186,47 @@ def main():
         action="store_true",
         help="Use delta encoding (v7). Default is non-delta (v4).",
     )
+    encode.add_argument(
+        "--sort",
+        choices=["hilbert", "zorder"],
+        default=None,
+        help="Spatially sort the features (v7 only). Default keeps input order.",
+    )
+    encode.add_argument(
+        "--scale",
+        type=parse_scale,
+        default=None,
+        help="Coordinate scale (v7 only): an integer or 'auto'. Default depends on the CRS.",
+    )
+    encode.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help="Max coordinate error in CRS units for --scale auto.",
+    )
+    encode.add_argument(
+        "--store-order",
+        action="store_true",
+        help="With --sort, store the input order so it can be restored on decode.",
+    )
+    encode.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Store repeated geometries and properties only once (v7 only).",
+    )
+    encode.add_argument(
+        "--index",
+        action="store_true",
+        help="Also write a sidecar id index (<output>.idx) for lookups by feature id (v7 only).",
+    )
+    encode.add_argument(
+        "--lod-tolerances",
+        type=float,
+        nargs="+",
+        default=None,
+        metavar="TOL",
+        help="Also store simplified geometries, one level of detail per tolerance in CRS units (v7 only).",
+    )
     encode.set_defaults(func=cmd_encode)
 
     # decode
@@ -68,9 +238,114 @@ def main():
         action="store_true",
         help="Decode using delta encoding (v7).",
     )
+    decode.add_argument(
+        "--preserve-order",
+        action="store_true",
+        help="Restore the input order of a spatially sorted file (v7).",
+    )
+    decode.add_argument(
+        "--lod",
+        type=int,
+        default=None,
+        help="Decode the geometries of this level of detail (index into --lod-tolerances, v7).",
+    )
     decode.set_defaults(func=cmd_decode)
 
+    # tile
+    tile = subparsers.add_parser("tile", help="Write z/x/y vector tiles of a v7 or BAG file")
+    tile.add_argument("input", type=Path)
+    tile.add_argument("-o", "--output", type=Path, required=True, help="Output directory, or a .zip archive.")
+    tile.add_argument("--minzoom", type=int, default=0)
+    tile.add_argument("--maxzoom", type=int, default=14)
+    tile.add_argument(
+        "--format",
+        choices=["mvt", "sfproto"],
+        default="mvt",
+        help="Mapbox Vector Tiles or v7 FeatureCollections in tile coordinates.",
+    )
+    tile.add_argument("--layer", default=None, help="MVT layer name. Default is the input file name.")
+    tile.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes. Default uses all cores; 1 renders in-process.",
+    )
+    tile.set_defaults(func=cmd_tile)
+
+    # append
+    append = subparsers.add_parser("append", help="Append a delta segment to a batched v7 file")
+    append.add_argument("input", type=Path)
+    append.add_argument(
+        "--features",
+        type=Path,
+        default=None,
+        help="GeoJSON FeatureCollection with new features and replacements (by id).",
+    )
+    append.add_argument("--delete-ids", type=Path, default=None, help="Text file with one feature id per line to delete.")
+    append.set_defaults(func=cmd_append)
+
+    # compact
+    comp = subparsers.add_parser("compact", help="Rewrite a batched v7 file with its delta segments merged")
+    comp.add_argument("input", type=Path)
+    comp.add_argument(
+        "--sort",
+        choices=["hilbert", "zorder", "none"],
+        default="hilbert",
+        help="Spatial order of the rewritten file. Default is hilbert.",
+    )
+    comp.add_argument("--batch-size", type=int, default=None, help="Features per batch. Default keeps the current size.")
+    comp.set_defaults(func=cmd_compact)
+
+    # partition
+    part = subparsers.add_parser("partition", help="Split GeoJSON into a sharded v7 dataset with a manifest")
+    part.add_argument("input", type=Path)
+    part.add_argument("-o", "--output", type=Path, required=True, help="Output directory.")
+    part.add_argument(
+        "--by",
+        choices=["hilbert", "count"],
+        default="hilbert",
+        help="Shard by Hilbert key range (spatially compact shards) or by feature count in input order.",
+    )
+    part.add_argument("--shards", type=int, default=None, help="Number of shards.")
+    part.add_argument("--shard-size", type=int, default=None, help="Features per shard (--by count).")
+    part.add_argument("--batch-size", type=int, default=None, help="Features per batch within a shard.")
+    part.add_argument("--stats", action="store_true", help="Write per-batch property statistics.")
+    part.set_defaults(func=cmd_partition)
+
+    # serve
+    srv = subparsers.add_parser("serve", help="Serve the files of a directory over HTTP")
+    srv.add_argument("root", type=Path)
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8080)
+    srv.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Threads decoding features. Default is min(4, cores).",
+    )
+    srv.add_argument(
+        "--index",
+        action="store_true",
+        help="Build the missing and stale sidecar indexes (.idx) of the files before serving; /ids/<id> needs them.",
+    )
+    srv.set_defaults(func=cmd_serve)
+
     args = parser.parse_args()
+    if args.func is cmd_encode and not args.delta:
+        # options of the v7 encoder, rejected here rather than as a traceback from encode_geojson
+        for flag, value in (("--scale", args.scale), ("--sort", args.sort), ("--dedup", args.dedup),
+                            ("--lod-tolerances", args.lod_tolerances)):
+            if value not in (None, False):
+                parser.error(f"{flag} needs --delta (v7)")
+    if args.func is cmd_encode and args.tolerance is not None and args.scale != "auto":
+        parser.error("--tolerance needs --scale auto")
+    if args.func is cmd_encode and args.store_order and args.sort is None:
+        parser.error("--store-order needs --sort")
+    if args.func is cmd_decode and not args.delta:
+        # options of the v7 decoder, likewise
+        for flag, value in (("--preserve-order", args.preserve_order or None), ("--lod", args.lod)):
+            if value is not None:  # --lod 0 is a level too
+                parser.error(f"{flag} needs --delta (v7)")
     args.func(args)
 
 
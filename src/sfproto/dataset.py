@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from sfproto.spatial import bbox_hits, feature_bboxes
+from sfproto.util import atomic_writer, write_atomic
+
+GeoJSON = Dict[str, Any]
+PathLike = Union[str, "os.PathLike[str]"]
+FeaturesInput = Union[GeoJSON, str, Iterable[GeoJSON]]
+
+# Sharded datasets: one collection split over several batched v7 (FCB7) files,
+# described by a small JSON manifest.
+#
+#   write_dataset(fc, "out/", shards=16)                       # Hilbert ranges
+#   write_dataset(iter_features(), "out/", partition="count", shard_size=1_000_000)
+#   fc = read_dataset("out/", bbox=(4.8, 52.3, 5.0, 52.4), where=[("bouwjaar", ">=", 2000)])
+#
+# partition="hilbert" orders all features by the Hilbert key of their bbox centroid
+# (sfproto.spatial, over the extent of the whole dataset) and cuts that order into
+# shards of equal count, so every shard covers one key range and a compact area.
+# partition="count" streams the input in its own order into shards of shard_size
+# features; only one shard is held in memory.
+#
+# The manifest (manifest.json) records srid and scale (all shards share them, as
+# the v7 encoder's CRS metadata), the property schema, the collection members and
+# per shard its file, feature count, bytes, bbox and (Hilbert) key range. Readers
+# skip the shards whose bbox misses the query, read the others in parallel and
+# concatenate the results in shard order. A plain bbox query decodes only the
+# features whose scanned bbox intersects it; with a property filter or lod a shard
+# is read with sfproto.access.read (batch statistics and delta segments apply).
+
+MANIFEST = "manifest.json"
+MANIFEST_FORMAT = "sfproto-dataset"
+MANIFEST_VERSION = 1
+
+PARTITIONS = ("hilbert", "count")
+
+SHARD_NAME = "shard-{:05d}.sfproto"
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+_RESERVED_MEMBERS = ("type", "features", "crs", "bbox")
+
+
+# -------------------- helpers --------------------
+
+def _union(bbox: Optional[List[float]], bboxes: np.ndarray) -> Optional[List[float]]:
+    if len(bboxes) == 0:
+        return bbox
+    b = [float(bboxes[:, 0].min()), float(bboxes[:, 1].min()), float(bboxes[:, 2].max()), float(bboxes[:, 3].max())]
+    if bbox is None:
+        return b
+    return [min(bbox[0], b[0]), min(bbox[1], b[1]), max(bbox[2], b[2]), max(bbox[3], b[3])]
+
+
+def _update_schema(schema: Dict[str, str], features: List[GeoJSON]) -> None:
+    # property name -> kind (number, string, bool, other), "mixed" or "null"
+    from sfproto.geojson.v7.geojson_stats import _kind
+
+    for f in features:
+        for name, value in (f.get("properties") or {}).items():
+            kind = _kind(value) or "null"
+            seen = schema.get(name)
+            if seen is None or seen == "null":
+                schema[name] = kind
+            elif kind != seen and kind != "null":
+                schema[name] = "mixed"
+
+
+def _input(features: FeaturesInput) -> Tuple[Iterable[GeoJSON], GeoJSON]:
+    # (features, collection) of a FeatureCollection (dict / JSON) or a feature iterable
+    if isinstance(features, str):
+        features = json.loads(features)
+    if isinstance(features, dict):
+        if features.get("type") != "FeatureCollection":
+            raise ValueError(f"Expected FeatureCollection, got {features.get('type')!r}")
+        return features.get("features") or [], features
+    return features, {}
+
+
+# -------------------- write --------------------
+
+def _hilbert_shards(
+    features: List[GeoJSON], shards: int,
+) -> Tuple[Iterator[Tuple[List[GeoJSON], np.ndarray, Tuple[int, int]]], Dict[str, Any]]:
+    from sfproto.spatial import DEFAULT_BITS, spatial_keys
+
+    bboxes = feature_bboxes(features)
+    keys = spatial_keys(bboxes, "hilbert")
+    order = np.argsort(keys, kind="stable")
+    cx = (bboxes[:, 0] + bboxes[:, 2]) * 0.5
+    cy = (bboxes[:, 1] + bboxes[:, 3]) * 0.5
+    grid = {"bits": DEFAULT_BITS, "extent": [float(cx.min()), float(cy.min()), float(cx.max()), float(cy.max())]}
+
+    def parts():
+        for idx in np.array_split(order, min(shards, len(features))):
+            key_range = (int(keys[idx[0]]), int(keys[idx[-1]]))
+            yield [features[i] for i in idx], bboxes[idx], key_range
+
+    return parts(), grid
+
+
+def _count_shards(features: Iterable[GeoJSON], shard_size: int) -> Iterator[Tuple[List[GeoJSON], np.ndarray, None]]:
+    from sfproto.geojson.v7.geojson_batched import iter_feature_batches
+
+    for part in iter_feature_batches(features, shard_size):
+        yield part, feature_bboxes(part), None
+
+
+def _write_shard(
+    path: str,
+    features: List[GeoJSON],
+    srid: int,
+    scale: int,
+    batch_size: int,
+    members: GeoJSON,
+    stats: bool,
+) -> int:
+    from sfproto.geojson.v7.geojson import _TAG_FCB7
+    from sfproto.geojson.v7.geojson_batched import encode_batch_v7, iter_feature_batches
+
+    with atomic_writer(path) as f:
+        f.write(_TAG_FCB7)
+        for i, batch in enumerate(iter_feature_batches(features, batch_size)):
+            f.write(encode_batch_v7(batch, srid=srid, scale=scale, members=members if i == 0 else None, stats=stats))
+        size = f.tell()
+    return size
+
+
+def write_dataset(
+    features: FeaturesInput,
+    out_dir: PathLike,
+    partition: str = "hilbert",
+    shards: Optional[int] = None,
+    shard_size: Optional[int] = None,
+    srid: Optional[int] = None,
+    scale: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    stats: bool = False,
+) -> Dict[str, Any]:
+    """
+    Split features (FeatureCollection, or an iterable of features) into shard files
+    in out_dir plus a manifest; returns the manifest.
+
+    partition="hilbert" needs shards (the number of files); partition="count" takes
+    shard_size (features per file, streamed) or shards (of equal count).
+    srid: default from the collection's crs member, scale: default for the srid
+    (sfproto.geojson.api). batch_size and stats as for batched v7 files.
+    """
+    from sfproto.geojson.api import extract_srid, get_scaler
+    from sfproto.geojson.v7.geojson_batched import DEFAULT_BATCH_SIZE
+
+    if partition not in PARTITIONS:
+        raise ValueError(f"Unsupported partition: {partition!r} (expected one of {PARTITIONS})")
+    if shards is not None and shards <= 0 or shard_size is not None and shard_size <= 0:
+        raise ValueError("shards and shard_size must be positive")
+
+    feats, collection = _input(features)
+    srid = extract_srid(collection) if srid is None else int(srid)
+    scale = get_scaler(srid) if scale is None else int(scale)
+    members = {k: v for k, v in collection.items() if k not in _RESERVED_MEMBERS}
+
+    grid = None
+    if partition == "hilbert":
+        if shards is None or shard_size is not None:
+            raise ValueError("partition='hilbert' needs shards (and no shard_size)")
+        feats = list(feats)
+        if not feats:
+            raise ValueError("No features to write")
+        parts, grid = _hilbert_shards(feats, shards)
+    else:
+        if (shards is None) == (shard_size is None):
+            raise ValueError("partition='count' needs either shards or shard_size")
+        if shard_size is None:
+            feats = list(feats)
+            shard_size = max(1, -(-len(feats) // shards))
+        parts = _count_shards(feats, shard_size)
+
+    out = os.fspath(out_dir)
+    os.makedirs(out, exist_ok=True)
+    schema: Dict[str, str] = {}
+    entries: List[Dict[str, Any]] = []
+    bbox: Optional[List[float]] = None
+
+    for i, (part, bboxes, key_range) in enumerate(parts):
+        name = SHARD_NAME.format(i)
+        size = _write_shard(
+            os.path.join(out, name), part, srid, scale, batch_size or DEFAULT_BATCH_SIZE, members, stats,
+        )
+        _update_schema(schema, part)
+        entry: Dict[str, Any] = {"path": name, "features": len(part), "bytes": size, "bbox": _union(None, bboxes)}
+        if key_range is not None:
+            entry["keys"] = list(key_range)
+        entries.append(entry)
+        bbox = _union(bbox, bboxes)
+
+    if not entries:
+        raise ValueError("No features to write")
+
+    manifest: Dict[str, Any] = {
+        "format": MANIFEST_FORMAT,
+        "version": MANIFEST_VERSION,
+        "srid": srid,
+        "scale": scale,
+        "partition": partition,
+        "features": sum(e["features"] for e in entries),
+        "bbox": bbox,
+        "schema": schema,
+        "members": members,
+    }
+    if grid is not None:
+        manifest["grid"] = grid
+    manifest["shards"] = entries
+
+    # last, so the manifest only ever lists complete shards
+    write_atomic(os.path.join(out, MANIFEST), json.dumps(manifest, indent=1).encode("utf-8"))
+    return manifest
+
+
+# -------------------- read --------------------
+
+def read_manifest(path: PathLike) -> Dict[str, Any]:
+    """
+    Manifest of a dataset (its directory or the manifest file).
+    """
+    path = os.fspath(path)
+    if os.path.isdir(path):
+        path = os.path.join(path, MANIFEST)
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != MANIFEST_FORMAT or manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Not a sfproto dataset manifest (version {MANIFEST_VERSION}): {path!r}")
+    manifest["root"] = os.path.dirname(os.path.abspath(path))
+    return manifest
+
+
+def _query_shard(
+    path: str,
+    bbox: Optional[Sequence[float]],
+    where: Optional[Sequence[Tuple[str, str, Any]]],
+    lod: Optional[int],
+) -> Tuple[List[GeoJSON], Dict[str, Any]]:
+    from sfproto.access import _file_key, _table, _v7_decoder, read
+    from sfproto.geojson.v7.geojson_delta import file_delta_state
+
+    if bbox is not None and not where and lod is None:
+        # bbox only: decode just the features the scan table puts in the bbox
+        # (not with delta segments, which the scan table does not cover)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            key = _file_key(path, f)
+            if file_delta_state(key, mm) is None:
+                table = _table(key, mm)
+                hit = np.flatnonzero(bbox_hits(table["bbox"], bbox))
+                decode = _v7_decoder(mm, table)
+                feats = [decode(int(i)) for i in hit]
+                hit_batches = np.unique(table["batch"][hit])
+                return feats, {"batches": len(table["batches"]), "batches_skipped": len(table["batches"]) - len(hit_batches)}
+
+    counts: Dict[str, Any] = {}
+    feats = read(path, where=where, stats=counts, lod=lod)["features"]
+    if bbox is not None and feats:
+        hit = bbox_hits(feature_bboxes(feats), bbox)
+        feats = [f for f, h in zip(feats, hit.tolist()) if h]
+    return feats, counts
+
+
+def read_dataset(
+    path: PathLike,
+    bbox: Optional[Sequence[float]] = None,
+    where: Optional[Sequence[Tuple[str, str, Any]]] = None,
+    lod: Optional[int] = None,
+    workers: Optional[int] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> GeoJSON:
+    """
+    Dataset -> GeoJSON FeatureCollection with the features whose bbox intersects
+    bbox (minx, miny, maxx, maxy in CRS units) and that satisfy where (see
+    sfproto.access.read), read from the matching shards by workers threads.
+    stats (optional dict) receives shards, shards_skipped, batches, batches_skipped
+    and features.
+    """
+    from sfproto.geojson.v7.geojson_stats import check_where
+
+    manifest = read_manifest(path)
+    where = check_where(where)
+    if bbox is not None:
+        bbox = [float(v) for v in bbox]
+        if len(bbox) != 4:
+            raise ValueError(f"bbox must be [minx, miny, maxx, maxy], got {bbox!r}")
+
+    shards = manifest["shards"]
+    wanted = shards
+    if bbox is not None:
+        # shards without a bbox (no features) are NaN rows: never hit
+        boxes = np.array([s.get("bbox") or [np.nan] * 4 for s in shards], dtype=np.float64).reshape(-1, 4)
+        wanted = [s for s, hit in zip(shards, bbox_hits(boxes, bbox).tolist()) if hit]
+    paths = [os.path.join(manifest["root"], s["path"]) for s in wanted]
+
+    workers = max(1, min(workers or DEFAULT_WORKERS, len(paths) or 1))
+    if workers == 1:
+        results = [_query_shard(p, bbox, where, lod) for p in paths]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda p: _query_shard(p, bbox, where, lod), paths))
+
+    out: GeoJSON = {"type": "FeatureCollection"}
+    out.update(manifest.get("members") or {})
+    out["features"] = [f for feats, _ in results for f in feats]
+
+    if stats is not None:
+        stats.update(
+            shards=len(shards),
+            shards_skipped=len(shards) - len(wanted),
+            batches=sum(c["batches"] for _, c in results),
+            batches_skipped=sum(c["batches_skipped"] for _, c in results),
+            features=len(out["features"]),
+        )
+    return out
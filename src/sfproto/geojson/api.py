@@ -1,19 +1,17 @@
-from typing import Dict, Any, Union
-from pyproj import CRS
-
-from sfproto.geojson.v4.geojson import (
-    geojson_to_bytes_v4,
-    bytes_to_geojson_v4,
-)
-from sfproto.geojson.v7.geojson import (
-    geojson_to_bytes_v7,
-    bytes_to_geojson_v7,
-)
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Union
+
+# The codecs (v4/v7), numpy and pyproj are imported where they are used,
+# so importing the api (e.g. for `sfproto --help`) stays cheap.
 
 GeoJSON = Dict[str, Any]
 
 DEFAULT_SRID = 4326
 
+# 'auto' scale: candidate scales are powers of ten (1 .. 1e9)
+AUTO_SCALES = [10 ** k for k in range(10)]
+AUTO_SAMPLE_SIZE = 10_000  # features sampled (all their coordinates) to measure the precision
+
 
 def extract_srid(geojson: GeoJSON) -> int:
     crs = geojson.get("crs")
@@ -35,32 +33,221 @@ def extract_srid(geojson: GeoJSON) -> int:
         return DEFAULT_SRID
 
 
-def get_scaler(srid: int) -> int:
+# scalers for cm accuracy: EPSG[degree]: 1e7;    EPSG[m]: 100;   EPSG[foot]: 3048;
+SCALE_DEGREE = 10_000_000
+SCALE_METRE = 100
+SCALE_FOOT = 3048
+
+# Built-in table for common EPSG codes, so pyproj (slow to import, and
+# CRS.from_epsg is not free either) is only needed for unknown codes.
+_KNOWN_SCALES: Dict[int, int] = {
+    # geographic (degrees)
+    4326: SCALE_DEGREE,   # WGS 84
+    4258: SCALE_DEGREE,   # ETRS89
+    4269: SCALE_DEGREE,   # NAD83
+    4283: SCALE_DEGREE,   # GDA94
+    4979: SCALE_DEGREE,   # WGS 84 (3D)
+    # projected (metre)
+    3857: SCALE_METRE,    # WGS 84 / Pseudo-Mercator
+    900913: SCALE_METRE,  # legacy Google Mercator
+    3395: SCALE_METRE,    # WGS 84 / World Mercator
+    3035: SCALE_METRE,    # ETRS89 / LAEA Europe
+    28992: SCALE_METRE,   # Amersfoort / RD New
+    31370: SCALE_METRE,   # Belge 1972 / Belgian Lambert 72
+    2154: SCALE_METRE,    # RGF93 / Lambert-93
+    27700: SCALE_METRE,   # OSGB36 / British National Grid
+    # projected (US survey foot)
+    2263: SCALE_FOOT,     # NAD83 / New York Long Island (ftUS)
+    2227: SCALE_FOOT,     # NAD83 / California zone 3 (ftUS)
+}
+
+# UTM zones (metre): WGS 84 north/south and ETRS89
+for _zone in range(1, 61):
+    _KNOWN_SCALES[32600 + _zone] = SCALE_METRE
+    _KNOWN_SCALES[32700 + _zone] = SCALE_METRE
+for _zone in range(28, 39):
+    _KNOWN_SCALES[25800 + _zone] = SCALE_METRE
+
+
+def _scaler_from_pyproj(srid: int) -> int:
+    # imported here: pyproj costs hundreds of ms of import time
+    from pyproj import CRS
+
     crs = CRS.from_epsg(srid)
 
     if crs.is_geographic:
-        return 10_000_000
+        return SCALE_DEGREE
 
     if crs.is_projected:
         unit = (crs.axis_info[0].unit_name or "").lower()
         if "metre" in unit or "meter" in unit:
-            return 100
+            return SCALE_METRE
         if "foot" in unit:
-            return 3048
+            return SCALE_FOOT
+
+    return SCALE_METRE
+
+
+@lru_cache(maxsize=None)
+def get_scaler(srid: int) -> int:
+    """
+    SRID -> scale for ~cm accuracy. Common EPSG codes come from a built-in
+    table, other codes are resolved once with pyproj and memoized.
+    """
+    scale = _KNOWN_SCALES.get(int(srid))
+    if scale is not None:
+        return scale
+    return _scaler_from_pyproj(int(srid))
+
+
+def _iter_coords(obj: Any) -> Iterator[List[float]]:
+    # walk any GeoJSON object and yield its [x, y] positions
+    if isinstance(obj, dict):
+        t = obj.get("type")
+        if t == "FeatureCollection":
+            for f in obj.get("features") or []:
+                yield from _iter_coords(f)
+        elif t == "Feature":
+            yield from _iter_coords(obj.get("geometry"))
+        elif t == "GeometryCollection":
+            for g in obj.get("geometries") or []:
+                yield from _iter_coords(g)
+        else:
+            yield from _iter_coords(obj.get("coordinates"))
+    elif isinstance(obj, list) and obj:
+        if isinstance(obj[0], (int, float)):
+            yield obj
+        else:
+            for c in obj:
+                yield from _iter_coords(c)
+
+
+def _sample_coords(geojson: GeoJSON, sample_size: Optional[int]):
+    # deterministic sample: every k-th feature/geometry over the whole collection,
+    # with all of its coordinates, so that the head of a big collection (which may
+    # have a different precision than its tail) does not decide alone
+    items: List[Any] = [geojson]
+    t = geojson.get("type")
+    if t == "FeatureCollection":
+        items = geojson.get("features") or []
+    elif t == "GeometryCollection":
+        items = geojson.get("geometries") or []
+
+    if sample_size is None or len(items) <= sample_size:
+        step = 1
+    else:
+        step = -(-len(items) // max(1, sample_size))
 
-    return 100
+    coords: List[float] = []
+    for item in items[::step]:
+        for c in _iter_coords(item):
+            coords.append(c[0])
+            coords.append(c[1])
+
+    import numpy as np
+
+    return np.asarray(coords, dtype=np.float64)
+
+
+def estimate_scale(
+    geojson: GeoJSON,
+    tolerance: Optional[float] = None,
+    srid: Optional[int] = None,
+    sample_size: Optional[int] = AUTO_SAMPLE_SIZE,
+) -> Dict[str, Any]:
+    """
+    Pick the smallest power-of-ten scale whose quantization round trip keeps
+    the error on the sampled coordinates within tolerance.
+
+    tolerance: max allowed absolute error in CRS units. Defaults to one step
+    of the fixed scale for the CRS (~1 cm), so 'auto' never picks a larger
+    scale than get_scaler would.
+    sample_size: number of features to sample, spread evenly over the collection
+    (None = all coordinates).
+
+    Returns {"scale", "max_error", "tolerance", "sampled", "within_tolerance"};
+    within_tolerance is False when even the largest scale misses the tolerance.
+    """
+    if srid is None:
+        srid = extract_srid(geojson)
+    if tolerance is None:
+        tolerance = 1.0 / get_scaler(srid)
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+
+    import numpy as np
+
+    values = _sample_coords(geojson, sample_size)
+
+    scale = AUTO_SCALES[-1]
+    max_error = 0.0
+    for candidate in AUTO_SCALES:
+        if values.size:
+            err = float(np.max(np.abs(np.rint(values * candidate) / candidate - values)))
+        else:
+            err = 0.0
+        scale, max_error = candidate, err
+        if err <= tolerance:
+            break
+
+    return {
+        "scale": scale,
+        "max_error": max_error,
+        "tolerance": float(tolerance),
+        "sampled": int(values.size // 2),
+        "within_tolerance": max_error <= tolerance,
+    }
 
 
 def encode_geojson(
     geojson: GeoJSON,
     *,
     delta: bool = False,
+    sort: Optional[str] = None,
+    store_order: bool = False,
+    scale: Union[int, str, None] = None,
+    tolerance: Optional[float] = None,
+    dedup: bool = False,
+    stats: Optional[Dict[str, Any]] = None,
+    lod_tolerances: Optional[Sequence[float]] = None,
 ) -> bytes:
+    """
+    scale (v7 only): None = fixed scale for the CRS (get_scaler),
+    "auto" = smallest scale within tolerance (estimate_scale), or an explicit int.
+    dedup (v7 only): store repeated geometries/properties once; stats (optional dict)
+    receives the encode statistics, e.g. the dedup ratio.
+    lod_tolerances (v7 only): also store simplified geometries, one level of detail per tolerance.
+    """
     srid = extract_srid(geojson)
 
     if delta:
-        scale = get_scaler(srid)
-        return geojson_to_bytes_v7(geojson, srid=srid, scale=scale)
+        from sfproto.geojson.v7.geojson import geojson_to_bytes_v7
+
+        if scale is None:
+            scale = get_scaler(srid)
+        elif scale == "auto":
+            est = estimate_scale(geojson, tolerance=tolerance, srid=srid)
+            if not est["within_tolerance"]:
+                raise ValueError(
+                    f"No scale keeps the coordinate error within {est['tolerance']:.3g} "
+                    f"(max error {est['max_error']:.3g} at scale {est['scale']})"
+                )
+            scale = est["scale"]
+        return geojson_to_bytes_v7(
+            geojson, srid=srid, scale=scale, sort=sort, store_order=store_order, dedup=dedup, stats=stats,
+            lod_tolerances=lod_tolerances,
+        )
+
+    if sort is not None:
+        raise ValueError("Spatial sort is only supported with delta encoding (v7)")
+    if scale is not None:
+        raise ValueError("A scale is only used with delta encoding (v7)")
+    if dedup:
+        raise ValueError("Dedup is only supported with delta encoding (v7)")
+    if lod_tolerances:
+        raise ValueError("Levels of detail are only supported with delta encoding (v7)")
+
+    from sfproto.geojson.v4.geojson import geojson_to_bytes_v4
 
     return geojson_to_bytes_v4(geojson, srid=srid)
 
@@ -69,8 +256,16 @@ def decode_geojson(
     data: bytes,
     *,
     delta: bool = False,
+    preserve_order: bool = False,
+    lod: Optional[int] = None,
 ) -> GeoJSON:
     if delta:
-        return bytes_to_geojson_v7(data)
+        from sfproto.geojson.v7.geojson import bytes_to_geojson_v7
+
+        return bytes_to_geojson_v7(data, preserve_order=preserve_order, lod=lod)
+    if lod is not None:
+        raise ValueError("Levels of detail are only supported with delta encoding (v7)")
+
+    from sfproto.geojson.v4.geojson import bytes_to_geojson_v4
 
     return bytes_to_geojson_v4(data)
@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Union, Tuple, Optional
 #
 # Adjust the import below to match your generated filename.
 from sfproto.sf.v3_BAG import geometry_pb2 as pand_pb2
+from sfproto.spatial import feature_sort_order, restore_order
 
 
 GeoJSON = Dict[str, Any]
@@ -47,6 +48,46 @@ GEBRUIKSDOEL_MAP = {
 GEBRUIKSDOEL_MAP_REV = {v: k for k, v in GEBRUIKSDOEL_MAP.items()}
 
 
+# --- Gebruiksdoel bitmask (schema revision 2) ---
+# bit (d - 1) per Gebruiksdoel d; with 10 functions every combination fits in
+# 10 bits, so decoding is one lookup in a table of precomputed joined strings.
+# Revision 0/1 collections (written before the field existed, or with it set
+# to 1) store the repeated gebruiksdoelen enum instead.
+
+SCHEMA_REVISION = 2
+_MASK_REVISION = 2  # first revision with gebruiksdoel_mask
+
+GEBRUIKSDOEL_BITS = len(GEBRUIKSDOEL_MAP)
+GEBRUIKSDOEL_LUT = [
+    ",".join(GEBRUIKSDOEL_MAP_REV[d] for d in sorted(GEBRUIKSDOEL_MAP_REV) if mask & (1 << (d - 1)))
+    for mask in range(1 << GEBRUIKSDOEL_BITS)
+]
+_GEBRUIKSDOEL_MASK_ALL = (1 << GEBRUIKSDOEL_BITS) - 1
+
+# memo of parsed gebruiksdoel strings: BAG has only a few dozen distinct combinations
+_MASK_CACHE_MAX = 4096
+_mask_by_string: Dict[str, int] = {}
+
+
+def _gebruiksdoel_mask(value: Any) -> int:
+    if not isinstance(value, str):
+        return 0
+    mask = _mask_by_string.get(value)
+    if mask is None:
+        mask = 0
+        for token in value.split(","):
+            enum_val = GEBRUIKSDOEL_MAP.get(token.strip())
+            if enum_val is not None:
+                mask |= 1 << (enum_val - 1)
+        if len(_mask_by_string) < _MASK_CACHE_MAX:
+            _mask_by_string[value] = mask
+    return mask
+
+
+def _gebruiksdoel_string(mask: int) -> str:
+    return GEBRUIKSDOEL_LUT[mask & _GEBRUIKSDOEL_MASK_ALL]
+
+
 
 # --- Quantization helpers ---
 
@@ -58,15 +99,13 @@ def _uq(val_q: int, scale: int) -> float:
     return val_q / float(scale)
 
 
-def _bbox_to_bboxq(bbox: List[float], scale: int) -> pand_pb2.BBoxQ:
+def _fill_bboxq(out: pand_pb2.BBoxQ, bbox: List[float], scale: int) -> None:
     if len(bbox) != 4:
         raise ValueError(f"Expected bbox length 4, got {len(bbox)}")
-    return pand_pb2.BBoxQ(
-        minx=_q(bbox[0], scale),
-        miny=_q(bbox[1], scale),
-        maxx=_q(bbox[2], scale),
-        maxy=_q(bbox[3], scale),
-    )
+    out.minx = _q(bbox[0], scale)
+    out.miny = _q(bbox[1], scale)
+    out.maxx = _q(bbox[2], scale)
+    out.maxy = _q(bbox[3], scale)
 
 
 def _bboxq_to_bbox(b: pand_pb2.BBoxQ, scale: int) -> List[float]:
@@ -106,7 +145,7 @@ def _ring_drop_closing_point(coords: List[List[float]]) -> List[List[float]]:
     return coords
 
 
-def _encode_delta_ring(ring_coords: List[List[float]], scale: int) -> pand_pb2.DeltaRing:
+def _fill_delta_ring(out: pand_pb2.DeltaRing, ring_coords: List[List[float]], scale: int) -> None:
     """
     Encode a ring as start + dx/dy, with implicit closure:
     closing point is omitted if present in input.
@@ -128,11 +167,10 @@ def _encode_delta_ring(ring_coords: List[List[float]], scale: int) -> pand_pb2.D
         dy.append(y - prevy)
         prevx, prevy = x, y
 
-    return pand_pb2.DeltaRing(
-        start=pand_pb2.CoordinateQ(x=startx, y=starty),
-        dx=dx,
-        dy=dy,
-    )
+    out.start.x = startx
+    out.start.y = starty
+    out.dx.extend(dx)
+    out.dy.extend(dy)
 
 
 def _decode_delta_ring(r: pand_pb2.DeltaRing, scale: int) -> List[List[float]]:
@@ -158,7 +196,7 @@ def _decode_delta_ring(r: pand_pb2.DeltaRing, scale: int) -> List[List[float]]:
     return [[_uq(px, scale), _uq(py, scale)] for px, py in pts_q]
 
 
-def _encode_polygon(geojson_geom: GeoJSON, scale: int) -> pand_pb2.Polygon:
+def _fill_polygon(out: pand_pb2.Polygon, geojson_geom: GeoJSON, scale: int) -> None:
     if geojson_geom.get("type") != "Polygon":
         raise ValueError(f"Expected geometry type Polygon, got {geojson_geom.get('type')!r}")
 
@@ -166,13 +204,10 @@ def _encode_polygon(geojson_geom: GeoJSON, scale: int) -> pand_pb2.Polygon:
     if not isinstance(coords, list) or not coords:
         raise ValueError("Polygon.coordinates must be a non-empty list")
 
-    rings: List[pand_pb2.DeltaRing] = []
     for ring in coords:
         if not isinstance(ring, list) or not ring:
             raise ValueError("Polygon ring must be a non-empty list")
-        rings.append(_encode_delta_ring(ring, scale=scale))
-
-    return pand_pb2.Polygon(rings=rings)
+        _fill_delta_ring(out.rings.add(), ring, scale=scale)
 
 
 def _decode_polygon(poly: pand_pb2.Polygon, scale: int) -> GeoJSON:
@@ -184,7 +219,7 @@ def _decode_polygon(poly: pand_pb2.Polygon, scale: int) -> GeoJSON:
 
 # --- Properties helpers (PandProperties) ---
 
-def _encode_properties(props: GeoJSON) -> pand_pb2.PandProperties:
+def _fill_properties(out: pand_pb2.PandProperties, props: GeoJSON) -> None:
     if not isinstance(props, dict):
         raise ValueError("Feature.properties must be an object")
 
@@ -200,30 +235,18 @@ def _encode_properties(props: GeoJSON) -> pand_pb2.PandProperties:
     status_str = str(props.get("status", ""))
     status_enum = STATUS_MAP.get(status_str, pand_pb2.PAND_STATUS_UNSPECIFIED)
 
-    # --- FIX: multi-valued gebruiksdoel ---
-    gebruiksdoel_raw = props.get("gebruiksdoel", "")
-    doelen: List[int] = []
-
-    if isinstance(gebruiksdoel_raw, str) and gebruiksdoel_raw.strip():
-        for token in gebruiksdoel_raw.split(","):
-            token = token.strip()
-            enum_val = GEBRUIKSDOEL_MAP.get(token)
-            if enum_val is not None:
-                doelen.append(enum_val)
+    # multi-valued gebruiksdoel -> bitmask (revision 2)
+    doel_mask = _gebruiksdoel_mask(props.get("gebruiksdoel", ""))
 
     aantal_vo = props.get("aantal_verblijfsobjecten", 0)
     if not isinstance(aantal_vo, int):
         raise ValueError("properties.aantal_verblijfsobjecten must be an int")
 
-    out = pand_pb2.PandProperties(
-        identificatie=ident_u64,
-        bouwjaar=bouwjaar,
-        status=status_enum,
-        aantal_verblijfsobjecten=aantal_vo,
-    )
-
-    # add repeated enums
-    out.gebruiksdoelen.extend(doelen)
+    out.identificatie = ident_u64
+    out.bouwjaar = bouwjaar
+    out.status = status_enum
+    out.aantal_verblijfsobjecten = aantal_vo
+    out.gebruiksdoel_mask = doel_mask
 
     # optional fields
     if props.get("oppervlakte_min") is not None:
@@ -231,11 +254,9 @@ def _encode_properties(props: GeoJSON) -> pand_pb2.PandProperties:
     if props.get("oppervlakte_max") is not None:
         out.oppervlakte_max = int(props["oppervlakte_max"])
 
-    return out
-
 
 
-def _decode_properties(p: pand_pb2.PandProperties) -> GeoJSON:
+def _decode_properties(p: pand_pb2.PandProperties, revision: int = SCHEMA_REVISION) -> GeoJSON:
     props: GeoJSON = {
         "identificatie": f"{p.identificatie:016d}",
         "bouwjaar": int(p.bouwjaar),
@@ -244,8 +265,8 @@ def _decode_properties(p: pand_pb2.PandProperties) -> GeoJSON:
         "rdf_seealso": f"http://bag.basisregistraties.overheid.nl/bag/id/pand/{p.identificatie:016d}",
     }
 
-    # --- FIX: repeated gebruiksdoelen ---
-    if p.gebruiksdoelen:
+    if revision < _MASK_REVISION:
+        # revision 0/1 layout: repeated enum, kept in stored order
         doelen = [
             GEBRUIKSDOEL_MAP_REV.get(d, "")
             for d in p.gebruiksdoelen
@@ -253,7 +274,7 @@ def _decode_properties(p: pand_pb2.PandProperties) -> GeoJSON:
         ]
         props["gebruiksdoel"] = ",".join(doelen)
     else:
-        props["gebruiksdoel"] = ""
+        props["gebruiksdoel"] = _gebruiksdoel_string(p.gebruiksdoel_mask)
 
     if p.HasField("oppervlakte_min"):
         props["oppervlakte_min"] = int(p.oppervlakte_min)
@@ -270,6 +291,8 @@ def geojson_pand_featurecollection_to_bytes(
     obj_or_json: Union[GeoJSON, str],
     srid: int = DEFAULT_SRID,
     scale: int = DEFAULT_SCALE,
+    sort: Optional[str] = None,
+    store_order: bool = False,
 ) -> bytes:
     """
     Convert BAG 'pand' GeoJSON FeatureCollection -> PandFeatureCollection Protobuf bytes.
@@ -279,6 +302,11 @@ def geojson_pand_featurecollection_to_bytes(
     - Geometry is Polygon
     - Polygon ring closure is implicit in Protobuf (closing point omitted)
     - identificatie stored as uint64
+    - gebruiksdoel stored as bitmask (schema revision 2; decoded in enum order)
+
+    sort: None (input order), "hilbert" or "zorder" to write the panden spatially sorted.
+    store_order: with sort, also store the input position of every pand
+    so the decoder can restore the original order (preserve_order=True).
     """
     if isinstance(obj_or_json, str):
         obj = json.loads(obj_or_json)
@@ -293,18 +321,26 @@ def geojson_pand_featurecollection_to_bytes(
         raise ValueError("FeatureCollection.features must be a list")
 
     fc = pand_pb2.PandFeatureCollection()
+    fc.revision = SCHEMA_REVISION
     fc.crs.srid = int(srid)
     fc.crs.scale = int(scale)
 
     # collection bbox (optional)
     if "bbox" in obj and isinstance(obj["bbox"], list) and len(obj["bbox"]) == 4:
-        fc.bbox.CopyFrom(_bbox_to_bboxq(obj["bbox"], scale=scale))
+        _fill_bboxq(fc.bbox, obj["bbox"], scale=scale)
+
+    if sort is not None and features:
+        order = feature_sort_order(features, scale, sort)
+        features = [features[i] for i in order]
+        if store_order:
+            fc.original_index.extend(order)
 
     for feat in features:
         if not isinstance(feat, dict) or feat.get("type") != "Feature":
             raise ValueError("Each item in features must be a GeoJSON Feature object")
 
-        f = pand_pb2.PandFeature()
+        # filled in place: no per-feature temporary messages + CopyFrom
+        f = fc.features.add()
 
         # id -> uuid bytes
         fid = feat.get("id")
@@ -312,36 +348,58 @@ def geojson_pand_featurecollection_to_bytes(
             f.uuid = _feature_id_to_uuid_bytes(fid)
 
         # properties
-        f.properties.CopyFrom(_encode_properties(feat.get("properties", {})))
+        _fill_properties(f.properties, feat.get("properties", {}))
 
         # feature bbox (optional)
         if "bbox" in feat and isinstance(feat["bbox"], list) and len(feat["bbox"]) == 4:
-            f.bbox.CopyFrom(_bbox_to_bboxq(feat["bbox"], scale=scale))
+            _fill_bboxq(f.bbox, feat["bbox"], scale=scale)
 
         # geometry
         geom = feat.get("geometry")
         if not isinstance(geom, dict):
             raise ValueError("Feature.geometry must be an object")
-        f.geometry.CopyFrom(_encode_polygon(geom, scale=scale))
-
-        fc.features.append(f)
+        _fill_polygon(f.geometry, geom, scale=scale)
 
     return fc.SerializeToString()
 
 
-def bytes_to_geojson_pand_featurecollection(data: bytes) -> GeoJSON:
+def _decode_pand_feature(f: pand_pb2.PandFeature, scale: int, revision: int = SCHEMA_REVISION) -> GeoJSON:
+    feat: GeoJSON = {
+        "type": "Feature",
+        "properties": _decode_properties(f.properties, revision),
+        "geometry": _decode_polygon(f.geometry, scale=scale),
+    }
+
+    if f.uuid:
+        feat["id"] = _uuid_bytes_to_feature_id(f.uuid)
+
+    if f.HasField("bbox"):
+        feat["bbox"] = _bboxq_to_bbox(f.bbox, scale=scale)
+
+    return feat
+
+
+def bytes_to_geojson_pand_featurecollection(data: bytes, preserve_order: bool = False) -> GeoJSON:
     """
     Convert PandFeatureCollection Protobuf bytes -> GeoJSON FeatureCollection.
     Reconstructs:
     - ring closure (appends start point)
     - identificatie as 16-digit string
     - rdf_seealso from identificatie
+    Reads both schema layouts, by fc.revision: 0/1 repeated gebruiksdoelen,
+    2 gebruiksdoel_mask.
+
+    preserve_order: restore the input order of a spatially sorted collection
+    (only possible when it was written with store_order=True).
     """
     fc = pand_pb2.PandFeatureCollection()
     fc.ParseFromString(data)
 
     scale = int(fc.crs.scale) if fc.HasField("crs") else DEFAULT_SCALE
     srid = int(fc.crs.srid) if fc.HasField("crs") else 0
+    revision = int(fc.revision)
+    if revision > SCHEMA_REVISION:
+        raise ValueError(f"Unsupported PandFeatureCollection revision {revision} (max {SCHEMA_REVISION})")
 
     out: GeoJSON = {
         "type": "FeatureCollection",
@@ -357,18 +415,9 @@ def bytes_to_geojson_pand_featurecollection(data: bytes) -> GeoJSON:
         out["bbox"] = _bboxq_to_bbox(fc.bbox, scale=scale)
 
     for f in fc.features:
-        feat: GeoJSON = {
-            "type": "Feature",
-            "properties": _decode_properties(f.properties),
-            "geometry": _decode_polygon(f.geometry, scale=scale),
-        }
-
-        if f.uuid:
-            feat["id"] = _uuid_bytes_to_feature_id(f.uuid)
-
-        if f.HasField("bbox"):
-            feat["bbox"] = _bboxq_to_bbox(f.bbox, scale=scale)
+        out["features"].append(_decode_pand_feature(f, scale, revision))
 
-        out["features"].append(feat)
+    if preserve_order and len(fc.original_index):
+        out["features"] = restore_order(out["features"], fc.original_index)
 
     return out
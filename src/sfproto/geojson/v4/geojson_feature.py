@@ -28,15 +28,6 @@ _RESERVED_TOPLEVEL = {"type", "geometry", "properties", "id", "bbox"}
 def _loads_if_needed(obj_or_json: GeoJSONInput) -> GeoJSON:
     return json.loads(obj_or_json) if isinstance(obj_or_json, str) else obj_or_json
 
-# protobuf struct is string type as key and any type as value
-def _dict_to_struct(d: Optional[Dict[str, Any]]) -> Struct:
-    s = Struct()
-    if d is None:
-        return s  # empty struct as "null" convention
-    s.update(d)
-    return s
-
-
 def _struct_to_dict(s: Struct) -> Dict[str, Any]:
     # Struct -> python dict (JSON-ish)
     return MessageToDict(s)
@@ -69,19 +60,11 @@ def _encode_geometry_to_bytes(geometry: GeoJSON, srid: int) -> bytes:
     raise ValueError(f"Unsupported Feature geometry type: {gtype!r}")
 
 
-def geojson_feature_to_bytes_v4(obj_or_json: GeoJSONInput, srid: int = 0) -> bytes:
+def _fill_feature_v4(feat: geometry_pb2.Feature, obj: GeoJSON, srid: int = 0) -> None:
     """
-    Convert GeoJSON Feature -> Protobuf sf.v4.Feature bytes.
-
-    Encodes:
-      - geometry (via existing v1 geometry encoders)
-      - properties (Struct)
-      - id (stored as string if present)
-      - bbox (repeated double if present)
-      - any other top-level keys in Feature.extra (Struct)
+    Fill an empty sf.v4.Feature in place (e.g. fc.features.add()),
+    without temporary messages that would be deep-copied with CopyFrom.
     """
-    obj = _loads_if_needed(obj_or_json)
-
     if obj.get("type") != "Feature":
         raise ValueError(f"Expected GeoJSON type=Feature, got: {obj.get('type')!r}")
 
@@ -95,15 +78,14 @@ def geojson_feature_to_bytes_v4(obj_or_json: GeoJSONInput, srid: int = 0) -> byt
     if props is not None and not isinstance(props, dict):
         raise ValueError("Feature.properties must be an object or null")
 
-    # geometry -> bytes -> sf.v4.Geometry msg
-    geom_bytes = _encode_geometry_to_bytes(geometry, srid=srid)
-    geom_msg = geometry_pb2.Geometry.FromString(geom_bytes)
-
-    feat = geometry_pb2.Feature()
-    feat.geometry.CopyFrom(geom_msg)
+    # geometry -> bytes, parsed straight into feat.geometry (schema matches)
+    feat.geometry.MergeFromString(_encode_geometry_to_bytes(geometry, srid=srid))
 
-    # properties
-    feat.properties.CopyFrom(_dict_to_struct(props))
+    # properties (empty struct as "null" convention)
+    if props:
+        feat.properties.update(props)
+    else:
+        feat.properties.SetInParent()
 
     # id (optional): GeoJSON allows string/number; store as string
     fid = obj.get("id")
@@ -118,8 +100,22 @@ def geojson_feature_to_bytes_v4(obj_or_json: GeoJSONInput, srid: int = 0) -> byt
     # extra (optional): any other top-level keys
     extra = _extract_extra(obj)
     if extra:
-        feat.extra.CopyFrom(_dict_to_struct(extra))
+        feat.extra.update(extra)
 
+
+def geojson_feature_to_bytes_v4(obj_or_json: GeoJSONInput, srid: int = 0) -> bytes:
+    """
+    Convert GeoJSON Feature -> Protobuf sf.v4.Feature bytes.
+
+    Encodes:
+      - geometry (via existing v1 geometry encoders)
+      - properties (Struct)
+      - id (stored as string if present)
+      - bbox (repeated double if present)
+      - any other top-level keys in Feature.extra (Struct)
+    """
+    feat = geometry_pb2.Feature()
+    _fill_feature_v4(feat, _loads_if_needed(obj_or_json), srid=srid)
     return feat.SerializeToString()
 
 
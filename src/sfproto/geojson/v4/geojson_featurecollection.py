@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Union
 
 from google.protobuf.struct_pb2 import Struct
 from google.protobuf.json_format import MessageToDict
 
 from sfproto.sf.v4 import geometry_pb2
 from sfproto.geojson.v4.geojson_feature import (
-    geojson_feature_to_bytes_v4,
+    _fill_feature_v4,
     bytes_to_geojson_feature_v4,
 )
 
@@ -23,14 +23,6 @@ def _loads_if_needed(obj_or_json: GeoJSONInput) -> GeoJSON:
     return json.loads(obj_or_json) if isinstance(obj_or_json, str) else obj_or_json
 
 
-def _dict_to_struct(d: Optional[Dict[str, Any]]) -> Struct:
-    s = Struct()
-    if d is None:
-        return s
-    s.update(d)
-    return s
-
-
 def _struct_to_dict(s: Struct) -> Dict[str, Any]:
     return MessageToDict(s)
 
@@ -92,8 +84,7 @@ def geojson_featurecollection_to_bytes_v4(obj_or_json: GeoJSONInput, srid: int =
 
     # --- features ---
     for f in feats:
-        feat_bytes = geojson_feature_to_bytes_v4(f, srid=srid)
-        fc.features.append(geometry_pb2.Feature.FromString(feat_bytes))
+        _fill_feature_v4(fc.features.add(), _loads_if_needed(f), srid=srid)
 
     # --- bbox (optional) ---
     bbox = obj.get("bbox")
@@ -117,7 +108,7 @@ def geojson_featurecollection_to_bytes_v4(obj_or_json: GeoJSONInput, srid: int =
     # --- extra (optional) ---
     extra = _extract_extra_fcol(obj)
     if extra:
-        fc.extra.CopyFrom(_dict_to_struct(extra))
+        fc.extra.update(extra)
 
     return fc.SerializeToString()
 
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import json
+import uuid
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from sfproto.sf.v4_BAG import geometry_pb2 as pand_pb2
+from sfproto.geojson.v3_BAG.geojson_bag import (
+    DEFAULT_SRID,
+    DEFAULT_SCALE,
+    STATUS_MAP,
+    STATUS_MAP_REV,
+    _gebruiksdoel_mask,
+    _gebruiksdoel_string,
+    _ring_drop_closing_point,
+)
+from sfproto.spatial import feature_sort_order, quantize_points, restore_order
+
+# Columnar BAG 'pand' layout (bag.pand.v4), same GeoJSON in and out as v3_BAG.
+# Features are processed per batch: a Python pass collects the column values,
+# then quantization, deltas, bboxes and the string formatting of ids run on
+# whole columns (numpy / one hex() call) instead of per-feature messages.
+
+GeoJSON = Dict[str, Any]
+
+DEFAULT_BATCH_SIZE = 10_000
+
+_INT32_MIN = -(1 << 31)
+_INT32_MAX = (1 << 31) - 1
+
+_RDF_SEEALSO = "http://bag.basisregistraties.overheid.nl/bag/id/pand/"
+
+
+# --- Column value helpers ---
+
+def _uuid_bytes(feature_id: Any) -> bytes:
+    """
+    "pand.4a7241b2-e5e6-4850-b084-687ab8f675c8" -> 16 bytes.
+    bytes.fromhex for the canonical form, uuid.UUID for anything else.
+    """
+    if not isinstance(feature_id, str):
+        raise ValueError("Feature.id must be a string")
+    if feature_id.startswith("pand."):
+        feature_id = feature_id[len("pand."):]
+    if len(feature_id) == 36:
+        try:
+            return bytes.fromhex(feature_id.replace("-", ""))
+        except ValueError:
+            pass
+    return uuid.UUID(feature_id).bytes
+
+
+def _format_uuids(blob: bytes, n: int) -> List[str]:
+    # n 16-byte uuids -> "pand.<uuid>" ids (as v3_BAG, also for the nil UUID)
+    h = blob.hex()
+    out: List[str] = []
+    for i in range(0, 32 * n, 32):
+        s = h[i:i + 32]
+        out.append(f"pand.{s[:8]}-{s[8:12]}-{s[12:16]}-{s[16:20]}-{s[20:]}")
+    return out
+
+
+def _missing_ids(batch: pand_pb2.PandBatch, n: int) -> np.ndarray:
+    # all-zero uuids that are not flagged as the nil UUID: features without an id
+    u = np.frombuffer(batch.uuids, dtype=np.uint8).reshape(n, 16)
+    missing = ~u.any(axis=1)
+    if batch.nil_uuids:
+        missing &= ~np.unpackbits(np.frombuffer(batch.nil_uuids, dtype=np.uint8), count=n).astype(bool)
+    return missing
+
+
+def _check_int32(a: np.ndarray, what: str) -> None:
+    if a.size and (a.min() < _INT32_MIN or a.max() > _INT32_MAX):
+        raise ValueError(f"{what} does not fit in sint32; use a smaller scale")
+
+
+# --- Batch encode / decode ---
+
+def _fill_pand_batch(batch: pand_pb2.PandBatch, features: List[GeoJSON], scale: int) -> None:
+    n = len(features)
+    uuids = bytearray(16 * n)
+    nil_uuids: List[bool] = []
+    identificatie: List[int] = []
+    bouwjaar: List[int] = []
+    status: List[int] = []
+    aantal_vo: List[int] = []
+    doel_mask: List[int] = []
+    opp_min: List[int] = []
+    opp_max: List[int] = []
+    ring_counts: List[int] = []
+    ring_sizes: List[int] = []
+    points: List[Any] = []
+    bbox: List[float] = []
+    bbox_present: List[bool] = []
+
+    status_unspecified = 0
+    for i, feat in enumerate(features):
+        if not isinstance(feat, dict) or feat.get("type") != "Feature":
+            raise ValueError("Each item in features must be a GeoJSON Feature object")
+
+        fid = feat.get("id")
+        u = _uuid_bytes(fid) if fid is not None else bytes(16)
+        uuids[16 * i:16 * i + 16] = u
+        nil_uuids.append(fid is not None and not any(u))
+
+        props = feat.get("properties", {})
+        if not isinstance(props, dict):
+            raise ValueError("Feature.properties must be an object")
+
+        ident_str = props.get("identificatie")
+        if not isinstance(ident_str, str) or not ident_str.isdigit():
+            raise ValueError("properties.identificatie must be a numeric string")
+        identificatie.append(int(ident_str))
+
+        bj = props.get("bouwjaar")
+        if not isinstance(bj, int):
+            raise ValueError("properties.bouwjaar must be an int")
+        bouwjaar.append(bj)
+
+        status.append(STATUS_MAP.get(str(props.get("status", "")), status_unspecified))
+        doel_mask.append(_gebruiksdoel_mask(props.get("gebruiksdoel", "")))
+
+        avo = props.get("aantal_verblijfsobjecten", 0)
+        if not isinstance(avo, int):
+            raise ValueError("properties.aantal_verblijfsobjecten must be an int")
+        aantal_vo.append(avo)
+
+        v = props.get("oppervlakte_min")
+        opp_min.append(0 if v is None else int(v) + 1)
+        v = props.get("oppervlakte_max")
+        opp_max.append(0 if v is None else int(v) + 1)
+
+        geom = feat.get("geometry")
+        if not isinstance(geom, dict):
+            raise ValueError("Feature.geometry must be an object")
+        if geom.get("type") != "Polygon":
+            raise ValueError(f"Expected geometry type Polygon, got {geom.get('type')!r}")
+        coords = geom.get("coordinates")
+        if not isinstance(coords, list) or not coords:
+            raise ValueError("Polygon.coordinates must be a non-empty list")
+        for ring in coords:
+            if not isinstance(ring, list) or not ring:
+                raise ValueError("Polygon ring must be a non-empty list")
+            ring = _ring_drop_closing_point(ring)
+            if len(ring) < 3:
+                raise ValueError("Ring must have at least 3 distinct points (excluding closure)")
+            ring_sizes.append(len(ring))
+            points.extend(ring)
+        ring_counts.append(len(coords))
+
+        b = feat.get("bbox")
+        has_bbox = isinstance(b, list) and len(b) == 4
+        if has_bbox:
+            bbox.extend(b)
+        bbox_present.append(has_bbox)
+
+    # geometry: one delta chain over all points of the batch
+    q = quantize_points(points, scale)
+    d = np.empty_like(q)
+    if len(q):
+        d[0] = q[0]
+        d[1:] = q[1:] - q[:-1]
+    _check_int32(d, "Coordinate delta")
+
+    batch.count = n
+    batch.uuids = bytes(uuids)
+    if any(nil_uuids):
+        batch.nil_uuids = np.packbits(np.asarray(nil_uuids, dtype=bool)).tobytes()
+    batch.identificatie.extend(identificatie)
+    batch.bouwjaar.extend(bouwjaar)
+    batch.status.extend(status)
+    batch.aantal_verblijfsobjecten.extend(aantal_vo)
+    batch.gebruiksdoel_mask.extend(doel_mask)
+    batch.oppervlakte_min.extend(opp_min)
+    batch.oppervlakte_max.extend(opp_max)
+    batch.ring_counts.extend(ring_counts)
+    batch.ring_sizes.extend(ring_sizes)
+    batch.dxy.extend(d.ravel().tolist())
+
+    if bbox:
+        bq = np.rint(np.asarray(bbox, dtype=np.float64) * scale).astype(np.int64)
+        _check_int32(bq, "Feature bbox")
+        batch.bbox.extend(bq.tolist())
+        if not all(bbox_present):
+            batch.bbox_present = np.packbits(np.asarray(bbox_present, dtype=bool)).tobytes()
+
+
+def _decode_pand_batch(batch: pand_pb2.PandBatch, scale: int) -> List[GeoJSON]:
+    n = int(batch.count)
+    columns = (
+        batch.identificatie, batch.bouwjaar, batch.status, batch.aantal_verblijfsobjecten,
+        batch.gebruiksdoel_mask, batch.oppervlakte_min, batch.oppervlakte_max, batch.ring_counts,
+    )
+    if len(batch.uuids) != 16 * n or any(len(c) != n for c in columns):
+        raise ValueError("Invalid PandBatch: column length does not match count")
+    if len(batch.dxy) % 2 != 0:
+        raise ValueError("Invalid PandBatch: dxy length must be even")
+
+    # geometry
+    d = np.asarray(batch.dxy, dtype=np.int64).reshape(-1, 2)
+    pts = (np.cumsum(d, axis=0) / float(scale)).tolist()
+    ring_sizes = list(batch.ring_sizes)
+    if sum(ring_sizes) != len(pts):
+        raise ValueError("Invalid PandBatch: ring sizes do not match the number of points")
+
+    # feature bbox
+    bboxes: List[Optional[List[float]]]
+    if len(batch.bbox) == 0:
+        bboxes = [None] * n
+    else:
+        values = (np.asarray(batch.bbox, dtype=np.int64).reshape(-1, 4) / float(scale)).tolist()
+        if len(values) == n:
+            bboxes = values
+        else:
+            present = np.unpackbits(np.frombuffer(batch.bbox_present, dtype=np.uint8), count=n).astype(bool)
+            if int(present.sum()) != len(values):
+                raise ValueError("Invalid PandBatch: bbox_present does not match bbox")
+            it = iter(values)
+            bboxes = [next(it) if p else None for p in present.tolist()]
+
+    ids = _format_uuids(batch.uuids, n)
+    missing = _missing_ids(batch, n).tolist()
+
+    out: List[GeoJSON] = []
+    idx = 0
+    ring_idx = 0
+    for i, (ident, bj, st, avo, mask, omin, omax, n_rings) in enumerate(zip(*columns)):
+        rings = []
+        for size in ring_sizes[ring_idx:ring_idx + n_rings]:
+            ring = pts[idx:idx + size]
+            ring.append(list(ring[0]))  # close ring for GeoJSON
+            rings.append(ring)
+            idx += size
+        ring_idx += n_rings
+
+        ident_str = f"{ident:016d}"
+        props: GeoJSON = {
+            "identificatie": ident_str,
+            "bouwjaar": bj,
+            "status": STATUS_MAP_REV.get(st, ""),
+            "aantal_verblijfsobjecten": avo,
+            "rdf_seealso": _RDF_SEEALSO + ident_str,
+            "gebruiksdoel": _gebruiksdoel_string(mask),
+        }
+        if omin:
+            props["oppervlakte_min"] = omin - 1
+        if omax:
+            props["oppervlakte_max"] = omax - 1
+
+        feat: GeoJSON = {
+            "type": "Feature",
+            "properties": props,
+            "geometry": {"type": "Polygon", "coordinates": rings},
+        }
+        if not missing[i]:
+            feat["id"] = ids[i]
+        if bboxes[i] is not None:
+            feat["bbox"] = bboxes[i]
+        out.append(feat)
+
+    return out
+
+
+# --- Public API ---
+
+def geojson_pand_featurecollection_to_bytes_v4(
+    obj_or_json: Union[GeoJSON, str],
+    srid: int = DEFAULT_SRID,
+    scale: int = DEFAULT_SCALE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sort: Optional[str] = None,
+    store_order: bool = False,
+) -> bytes:
+    """
+    Convert BAG 'pand' GeoJSON FeatureCollection -> columnar PandColumnarCollection bytes.
+
+    Same assumptions as the v3_BAG encoder (Polygon geometry, implicit ring closure,
+    identificatie as uint64). gebruiksdoel is stored as a bitmask, so on decode the
+    functions come back in enum order.
+
+    batch_size: panden per PandBatch.
+    sort / store_order: as in geojson_pand_featurecollection_to_bytes (v3_BAG).
+    """
+    if isinstance(obj_or_json, str):
+        obj = json.loads(obj_or_json)
+    else:
+        obj = obj_or_json
+
+    if obj.get("type") != "FeatureCollection":
+        raise ValueError(f"Expected GeoJSON type=FeatureCollection, got: {obj.get('type')!r}")
+
+    features = obj.get("features")
+    if not isinstance(features, list):
+        raise ValueError("FeatureCollection.features must be a list")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    fc = pand_pb2.PandColumnarCollection()
+    fc.crs.srid = int(srid)
+    fc.crs.scale = int(scale)
+
+    # collection bbox (optional)
+    bbox = obj.get("bbox")
+    if isinstance(bbox, list) and len(bbox) == 4:
+        fc.bbox.minx, fc.bbox.miny, fc.bbox.maxx, fc.bbox.maxy = (int(round(v * scale)) for v in bbox)
+
+    if sort is not None and features:
+        order = feature_sort_order(features, scale, sort)
+        features = [features[i] for i in order]
+        if store_order:
+            fc.original_index.extend(order)
+
+    for start in range(0, len(features), batch_size):
+        _fill_pand_batch(fc.batches.add(), features[start:start + batch_size], scale)
+
+    return fc.SerializeToString()
+
+
+def bytes_to_geojson_pand_featurecollection_v4(data: bytes, preserve_order: bool = False) -> GeoJSON:
+    """
+    Convert columnar PandColumnarCollection bytes -> GeoJSON FeatureCollection
+    (same output as the v3_BAG decoder).
+    """
+    fc = pand_pb2.PandColumnarCollection()
+    fc.ParseFromString(data)
+
+    scale = int(fc.crs.scale) if fc.HasField("crs") else DEFAULT_SCALE
+    srid = int(fc.crs.srid) if fc.HasField("crs") else 0
+
+    out: GeoJSON = {
+        "type": "FeatureCollection",
+        "name": "pand",
+        "crs": {
+            "type": "name",
+            "properties": {"name": f"urn:ogc:def:crs:EPSG::{srid}"} if srid else {"name": "unknown"},
+        },
+        "features": [],
+    }
+
+    if fc.HasField("bbox"):
+        b = fc.bbox
+        out["bbox"] = [b.minx / float(scale), b.miny / float(scale), b.maxx / float(scale), b.maxy / float(scale)]
+
+    for batch in fc.batches:
+        out["features"].extend(_decode_pand_batch(batch, scale))
+
+    if preserve_order and len(fc.original_index):
+        out["features"] = restore_order(out["features"], fc.original_index)
+
+    return out
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Union
 
 from google.protobuf.struct_pb2 import Struct
 from google.protobuf.json_format import MessageToDict
@@ -26,14 +26,6 @@ _RESERVED_TOPLEVEL = {"type", "geometry", "properties", "id", "bbox"}
 def _loads_if_needed(obj_or_json: GeoJSONInput) -> GeoJSON:
     return json.loads(obj_or_json) if isinstance(obj_or_json, str) else obj_or_json
 
-def _dict_to_struct(d: Optional[Dict[str, Any]]) -> Struct:
-    s = Struct()
-    if d is None:
-        return s  # empty struct represents null (your v4 convention)
-    s.update(d)
-    return s
-
-
 def _struct_to_dict(s: Struct) -> Dict[str, Any]:
     return MessageToDict(s)
 
@@ -59,16 +51,20 @@ def _encode_geometry_v2_bytes(geometry: GeoJSON, srid: int, scale: int) -> bytes
 
     raise ValueError(f"Unsupported Feature geometry type: {gtype!r}")
 
-def geojson_feature_to_bytes_v5(
-    obj_or_json: GeoJSONInput,
+
+def _fill_feature_v5(
+    feat: geometry_pb2.Feature,
+    obj: GeoJSON,
     srid: int = 0,
     scale: int = DEFAULT_SCALE,
-) -> bytes:
+    fill_geometry: Optional[Callable[[geometry_pb2.Geometry, GeoJSON, int, int], bool]] = None,
+) -> None:
     """
-    Convert GeoJSON Feature -> Protobuf sf.v5.Feature bytes.
-    Properties are encoded (unlike v2).
+    Fill an empty sf.v5.Feature in place (e.g. fc.features.add()),
+    without temporary messages that would be deep-copied with CopyFrom.
+    fill_geometry: fast path that sets feat.geometry itself and returns True,
+    or False to leave the geometry to the v2 encoders.
     """
-    obj = _loads_if_needed(obj_or_json)
     if obj.get("type") != "Feature":
         raise ValueError(f"Expected GeoJSON type=Feature, got: {obj.get('type')!r}")
 
@@ -80,13 +76,14 @@ def geojson_feature_to_bytes_v5(
     if props is not None and not isinstance(props, dict):
         raise ValueError("Feature.properties must be an object or null")
 
-    geom_bytes_v2 = _encode_geometry_v2_bytes(geometry, srid=srid, scale=scale)
-    geom_msg_v5 = geometry_pb2.Geometry.FromString(geom_bytes_v2)
+    if fill_geometry is None or not fill_geometry(feat.geometry, geometry, srid, scale):
+        # v2 geometry bytes parse straight into feat.geometry (same wire layout)
+        feat.geometry.MergeFromString(_encode_geometry_v2_bytes(geometry, srid=srid, scale=scale))
 
-    feat = geometry_pb2.Feature()
-    feat.geometry.CopyFrom(geom_msg_v5)
-
-    feat.properties.CopyFrom(_dict_to_struct(props))
+    if props:
+        feat.properties.update(props)
+    else:
+        feat.properties.SetInParent()  # empty struct represents null
 
     fid = obj.get("id")
     if fid is not None:
@@ -98,7 +95,20 @@ def geojson_feature_to_bytes_v5(
 
     extra = _extract_extra(obj)
     if extra:
-        feat.extra.CopyFrom(_dict_to_struct(extra))
+        feat.extra.update(extra)
+
+
+def geojson_feature_to_bytes_v5(
+    obj_or_json: GeoJSONInput,
+    srid: int = 0,
+    scale: int = DEFAULT_SCALE,
+) -> bytes:
+    """
+    Convert GeoJSON Feature -> Protobuf sf.v5.Feature bytes.
+    Properties are encoded (unlike v2).
+    """
+    feat = geometry_pb2.Feature()
+    _fill_feature_v5(feat, _loads_if_needed(obj_or_json), srid=srid, scale=scale)
     return feat.SerializeToString()
 
 
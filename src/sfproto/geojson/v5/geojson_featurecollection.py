@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Union, Optional
+from typing import Any, Dict, List, Union
 
 from google.protobuf.struct_pb2 import Struct
 from google.protobuf.json_format import MessageToDict
 
 from sfproto.sf.v5 import geometry_pb2
 
-from sfproto.geojson.v5.geojson_feature import geojson_feature_to_bytes_v5, bytes_to_geojson_feature_v5
+from sfproto.geojson.v5.geojson_feature import _fill_feature_v5, bytes_to_geojson_feature_v5
 
 GeoJSON = Dict[str, Any]
 GeoJSONInput = Union[GeoJSON, str]
@@ -21,14 +21,6 @@ def _loads_if_needed(obj_or_json: GeoJSONInput) -> GeoJSON:
     return json.loads(obj_or_json) if isinstance(obj_or_json, str) else obj_or_json
 
 
-def _dict_to_struct(d: Optional[Dict[str, Any]]) -> Struct:
-    s = Struct()
-    if d is None:
-        return s
-    s.update(d)
-    return s
-
-
 def _struct_to_dict(s: Struct) -> Dict[str, Any]:
     return MessageToDict(s)
 
@@ -86,8 +78,7 @@ def geojson_featurecollection_to_bytes_v5(obj_or_json: GeoJSONInput, srid: int =
 
     # --- features ---
     for f in feats:
-        feat_bytes = geojson_feature_to_bytes_v5(f, srid=srid, scale=scale)
-        fc.features.append(geometry_pb2.Feature.FromString(feat_bytes))
+        _fill_feature_v5(fc.features.add(), _loads_if_needed(f), srid=srid, scale=scale)
 
     # --- bbox (optional) ---
     bbox = obj.get("bbox")
@@ -111,7 +102,7 @@ def geojson_featurecollection_to_bytes_v5(obj_or_json: GeoJSONInput, srid: int =
     # --- extra (optional) ---
     extra = _extract_extra_fcol(obj)
     if extra:
-        fc.extra.CopyFrom(_dict_to_struct(extra))
+        fc.extra.update(extra)
 
     return fc.SerializeToString()
 
@@ -2,23 +2,14 @@ from __future__ import annotations
 
 import json
 import struct
-from typing import Any, Dict, List, Tuple, Union, Callable
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, Callable
 
-# Reuse v2 geometry codecs (no attributes in pure geometries)
-from sfproto.geojson.v2.geojson_point import geojson_point_to_bytes_v2, bytes_to_geojson_point_v2
-from sfproto.geojson.v2.geojson_multipoint import geojson_multipoint_to_bytes_v2, bytes_to_geojson_multipoint_v2
-from sfproto.geojson.v2.geojson_linestring import geojson_linestring_to_bytes_v2, bytes_to_geojson_linestring_v2
-from sfproto.geojson.v2.geojson_multilinestring import geojson_multilinestring_to_bytes_v2, bytes_to_geojson_multilinestring_v2
-from sfproto.geojson.v2.geojson_polygon import geojson_polygon_to_bytes_v2, bytes_to_geojson_polygon_v2
-from sfproto.geojson.v2.geojson_multipolygon import geojson_multipolygon_to_bytes_v2, bytes_to_geojson_multipolygon_v2
-
-# --- v5 Feature fallback (optional but useful for Feature outside collections) ---
-from sfproto.geojson.v5.geojson_feature import geojson_feature_to_bytes_v5, bytes_to_geojson_feature_v5
-from sfproto.geojson.v5.geojson_featurecollection import geojson_featurecollection_to_bytes_v5, bytes_to_geojson_featurecollection_v5
-
-# --- v7 stream containers (attributes + v6-style packed deltas) ---
-from sfproto.geojson.v7.geojson_featurecollection import geojson_featurecollection_to_bytes_v7, bytes_to_geojson_featurecollection_v7
-from sfproto.geojson.v7.geojson_geometrycollection import geojson_geometrycollection_to_bytes_v7, bytes_to_geojson_geometrycollection_v7
+# Codec modules are imported lazily in the dispatch functions below, so only the
+# codec that is actually used gets loaded (together with its generated
+# geometry_pb2 descriptors). This keeps the CLI and worker processes cheap to start.
+#   - v2 geometry codecs (standalone geometries, no attributes)
+#   - v5 Feature / FeatureCollection (standalone Feature, legacy FCOL)
+#   - v7 stream containers (attributes + v6-style packed deltas)
 
 GeoJSON = Dict[str, Any]
 GeoJSONInput = Union[GeoJSON, str]
@@ -39,6 +30,9 @@ _TAG_FCOL = b"FCOL"  # featurecollection payload (v5)
 # New v7 tags
 _TAG_GC7 = b"GCV7"   # GeometryCollection v7 (single protobuf payload)
 _TAG_FC7 = b"FCV7"   # FeatureCollection v7 (single protobuf payload)
+_TAG_FCB7 = b"FCB7"  # batched FeatureCollection v7 (length-prefixed FCV7 frames, see geojson_batched.py)
+_TAG_STV7 = b"STV7"  # statistics frame of the next batch in an FCB7 payload (see geojson_stats.py)
+_TAG_DLV7 = b"DLV7"  # delta segment (added, replaced and deleted features) of an FCB7 payload (see geojson_delta.py)
 
 # -------------------- helpers --------------------
 # if input geojson is string, convert to dict
@@ -93,32 +87,46 @@ def _geometry_to_bytes_v2(geometry: GeoJSON, srid: int, scale: int) -> bytes:
     t = geometry.get("type")
     # use correct function for the input type (also with using scaling factor)
     if t == "Point":
+        from sfproto.geojson.v2.geojson_point import geojson_point_to_bytes_v2
         return geojson_point_to_bytes_v2(geometry, srid=srid, scale=scale)
     if t == "MultiPoint":
+        from sfproto.geojson.v2.geojson_multipoint import geojson_multipoint_to_bytes_v2
         return geojson_multipoint_to_bytes_v2(geometry, srid=srid, scale=scale)
     if t == "LineString":
+        from sfproto.geojson.v2.geojson_linestring import geojson_linestring_to_bytes_v2
         return geojson_linestring_to_bytes_v2(geometry, srid=srid, scale=scale)
     if t == "MultiLineString":
+        from sfproto.geojson.v2.geojson_multilinestring import geojson_multilinestring_to_bytes_v2
         return geojson_multilinestring_to_bytes_v2(geometry, srid=srid, scale=scale)
     if t == "Polygon":
+        from sfproto.geojson.v2.geojson_polygon import geojson_polygon_to_bytes_v2
         return geojson_polygon_to_bytes_v2(geometry, srid=srid, scale=scale)
     if t == "MultiPolygon":
+        from sfproto.geojson.v2.geojson_multipolygon import geojson_multipolygon_to_bytes_v2
         return geojson_multipolygon_to_bytes_v2(geometry, srid=srid, scale=scale)
     raise ValueError(f"Unsupported geometry type: {t!r}")
 
 
-_GEOM_DECODERS_V2: Tuple[Callable[[bytes], GeoJSON], ...] = (
-    bytes_to_geojson_point_v2,
-    bytes_to_geojson_multipoint_v2,
-    bytes_to_geojson_polygon_v2,
-    bytes_to_geojson_multipolygon_v2,
-    bytes_to_geojson_linestring_v2,
-    bytes_to_geojson_multilinestring_v2,
-)
+def _geom_decoders_v2() -> Tuple[Callable[[bytes], GeoJSON], ...]:
+    from sfproto.geojson.v2.geojson_point import bytes_to_geojson_point_v2
+    from sfproto.geojson.v2.geojson_multipoint import bytes_to_geojson_multipoint_v2
+    from sfproto.geojson.v2.geojson_linestring import bytes_to_geojson_linestring_v2
+    from sfproto.geojson.v2.geojson_multilinestring import bytes_to_geojson_multilinestring_v2
+    from sfproto.geojson.v2.geojson_polygon import bytes_to_geojson_polygon_v2
+    from sfproto.geojson.v2.geojson_multipolygon import bytes_to_geojson_multipolygon_v2
+
+    return (
+        bytes_to_geojson_point_v2,
+        bytes_to_geojson_multipoint_v2,
+        bytes_to_geojson_polygon_v2,
+        bytes_to_geojson_multipolygon_v2,
+        bytes_to_geojson_linestring_v2,
+        bytes_to_geojson_multilinestring_v2,
+    )
 
 
 def _bytes_to_geometry_v2(data: bytes) -> GeoJSON:
-    for dec in _GEOM_DECODERS_V2:
+    for dec in _geom_decoders_v2():
         try:
             return dec(data)
         except Exception:
@@ -127,28 +135,54 @@ def _bytes_to_geometry_v2(data: bytes) -> GeoJSON:
 
 
 # -------------------- actually used functions v6 --------------------
-def geojson_to_bytes_v7(obj_or_json: GeoJSONInput, srid: int = 0, scale: int = DEFAULT_SCALE) -> bytes:
+def geojson_to_bytes_v7(
+    obj_or_json: GeoJSONInput,
+    srid: int = 0,
+    scale: int = DEFAULT_SCALE,
+    sort: Optional[str] = None,
+    store_order: bool = False,
+    wide: Optional[bool] = None,
+    dedup: bool = False,
+    stats: Optional[Dict[str, Any]] = None,
+    wire: bool = False,
+    lod_tolerances: Optional[Sequence[float]] = None,
+) -> bytes:
     """
     Encode GeoJSON into bytes using v7 where applicable:
     - FeatureCollection -> v7 FeatureCollection (single protobuf payload)
     - GeometryCollection -> v7 GeometryCollection (single protobuf payload)
     - Feature -> fallback to v5 Feature (unless you implement standalone v7 Feature)
     - Geometry -> v2 standalone geometry
+
+    sort ("hilbert"/"zorder"), store_order and dedup only apply to FeatureCollections;
+    stats (optional dict) receives the FeatureCollection encode statistics.
+    wire: use the direct wire writer for FeatureCollection geometries (same bytes).
+    lod_tolerances: also store simplified FeatureCollection geometries, one level of detail per tolerance.
+    wide (sint64 starts/deltas, None = automatic) applies to both v7 containers.
     """
     obj = _loads_if_needed(obj_or_json)
     t = obj.get("type")
 
     # v7 containers
     if t == "FeatureCollection":
-        payload = geojson_featurecollection_to_bytes_v7(obj, srid=srid, scale=scale)
+        from sfproto.geojson.v7.geojson_featurecollection import geojson_featurecollection_to_bytes_v7
+
+        payload = geojson_featurecollection_to_bytes_v7(
+            obj, srid=srid, scale=scale, sort=sort, store_order=store_order, wide=wide,
+            dedup=dedup, stats=stats, wire=wire, lod_tolerances=lod_tolerances,
+        )
         return _wrap(_TAG_FC7, _pack_chunks([payload]))
 
     if t == "GeometryCollection":
-        payload = geojson_geometrycollection_to_bytes_v7(obj, srid=srid, scale=scale)
+        from sfproto.geojson.v7.geojson_geometrycollection import geojson_geometrycollection_to_bytes_v7
+
+        payload = geojson_geometrycollection_to_bytes_v7(obj, srid=srid, scale=scale, wide=wide)
         return _wrap(_TAG_GC7, _pack_chunks([payload]))
 
     # Feature: keep your existing v5 Feature codec (properties supported)
     if t == "Feature":
+        from sfproto.geojson.v5.geojson_feature import geojson_feature_to_bytes_v5
+
         payload = geojson_feature_to_bytes_v5(obj, srid=srid, scale=scale)
         return _wrap(_TAG_FEAT, _pack_chunks([payload]))
 
@@ -157,27 +191,41 @@ def geojson_to_bytes_v7(obj_or_json: GeoJSONInput, srid: int = 0, scale: int = D
     return _wrap(_TAG_GEOM, _pack_chunks([payload]))
 
 
-def bytes_to_geojson_v7(data: bytes) -> GeoJSON:
+def bytes_to_geojson_v7(data: bytes, preserve_order: bool = False, lod: Optional[int] = None) -> GeoJSON:
     """
     Decode bytes into GeoJSON.
     Supports:
-    - v7 tags (FCV7/GCV7)
+    - v7 tags (FCV7/GCV7, batched FCB7)
     - legacy v5 tags (FEAT/FCOL)
     - legacy v2 tags (GEOM, GCOL)
+
+    preserve_order: restore the input order of a spatially sorted FeatureCollection.
+    lod: decode FeatureCollection geometries at this level of detail (see geojson_lod.py).
     """
     # get type from tag and input from payload of the encoded binary format
     tag, payload = _unwrap(data)
+
+    # batched files are a stream of frames, not a chunk list
+    if tag == _TAG_FCB7:
+        from sfproto.geojson.v7.geojson_batched import bytes_to_geojson_batched_v7
+
+        return bytes_to_geojson_batched_v7(data, lod=lod)
+
     chunks = _unpack_chunks(payload)
 
     # use tag to find use the correct decoder formula
     if tag == _TAG_FC7:
         if len(chunks) != 1:
             raise ValueError("Invalid FCV7 payload")
-        return bytes_to_geojson_featurecollection_v7(chunks[0])
+        from sfproto.geojson.v7.geojson_featurecollection import bytes_to_geojson_featurecollection_v7
+
+        return bytes_to_geojson_featurecollection_v7(chunks[0], preserve_order=preserve_order, lod=lod)
 
     if tag == _TAG_GC7:
         if len(chunks) != 1:
             raise ValueError("Invalid GCV7 payload")
+        from sfproto.geojson.v7.geojson_geometrycollection import bytes_to_geojson_geometrycollection_v7
+
         return bytes_to_geojson_geometrycollection_v7(chunks[0])
 
     # legacy v2 geometry
@@ -195,11 +243,15 @@ def bytes_to_geojson_v7(data: bytes) -> GeoJSON:
     if tag == _TAG_FEAT:
         if len(chunks) != 1:
             raise ValueError("Invalid FEAT payload")
+        from sfproto.geojson.v5.geojson_feature import bytes_to_geojson_feature_v5
+
         return bytes_to_geojson_feature_v5(chunks[0])
 
     if tag == _TAG_FCOL:
         if len(chunks) != 1:
             raise ValueError("Invalid FCOL payload")
+        from sfproto.geojson.v5.geojson_featurecollection import bytes_to_geojson_featurecollection_v5
+
         return bytes_to_geojson_featurecollection_v5(chunks[0])
 
     raise ValueError(f"Unknown envelope tag: {tag!r}")
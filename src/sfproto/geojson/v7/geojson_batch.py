@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Union
+
+from google.protobuf.json_format import MessageToDict
+
+from sfproto.geojson.v7.geojson import (
+    DEFAULT_SCALE,
+    _TAG_LEN,
+    _TAG_FEAT,
+    _pack_chunks,
+    _unpack_chunks,
+    geojson_to_bytes_v7,
+    bytes_to_geojson_v7,
+)
+
+GeoJSON = Dict[str, Any]
+GeoJSONInput = Union[GeoJSON, str]
+
+# Batch API for many small payloads (e.g. thousands of single Features per tile request).
+# Every item is encoded exactly like geojson_to_bytes_v7 would (same envelope, so
+# blobs are interchangeable), but the per-call setup is done once per batch:
+#   - one reused sf.v5.Feature message (Clear() instead of a new allocation)
+#   - geometry written straight into feat.geometry (no temporary message + CopyFrom),
+#     Points field by field (the rest is the shared v5 _fill_feature_v5)
+#   - envelope header precomputed
+# Items that are not a Feature fall back to geojson_to_bytes_v7 / bytes_to_geojson_v7.
+
+_U32 = struct.Struct(">I")
+
+# envelope of a single-chunk FEAT payload: tag + chunk count (1), then the chunk length
+_FEAT_HEADER = _TAG_FEAT + _U32.pack(1)
+_FEAT_PAYLOAD_OFFSET = len(_FEAT_HEADER) + 4
+
+
+def _loads_if_needed(obj_or_json: GeoJSONInput) -> GeoJSON:
+    return json.loads(obj_or_json) if isinstance(obj_or_json, str) else obj_or_json
+
+
+# -------------------- encode --------------------
+
+def _fill_point(g, geometry: GeoJSON, srid: int, scale: int) -> bool:
+    # fast path for the most common tiny payload: set the Point fields directly
+    # (fill_geometry of _fill_feature_v5)
+    coords = geometry.get("coordinates")
+    if geometry.get("type") != "Point" or not isinstance(coords, (list, tuple)) or len(coords) < 2 \
+            or coords[0] is None or coords[1] is None or scale <= 0:
+        return False
+    g.crs.srid = int(srid)
+    g.crs.scale = int(scale)
+    g.point.coord.x = int(round(float(coords[0]) * scale))
+    g.point.coord.y = int(round(float(coords[1]) * scale))
+    return True
+
+
+def encode_many(
+    objs: Iterable[GeoJSONInput],
+    srid: int = 0,
+    scale: int = DEFAULT_SCALE,
+    framed: bool = False,
+) -> Union[List[bytes], bytes]:
+    """
+    Encode many GeoJSON objects with v7.
+
+    Returns a list of blobs (each identical in layout to geojson_to_bytes_v7(obj)),
+    or with framed=True one buffer with all blobs length-prefixed (see decode_many).
+    """
+    from sfproto.geojson.v5.geojson_feature import _fill_feature_v5
+    from sfproto.sf.v5 import geometry_pb2 as pb2_v5
+
+    feat = pb2_v5.Feature()
+    pack_len = _U32.pack
+    serialize = feat.SerializeToString
+
+    out: List[bytes] = []
+    append = out.append
+    for obj_or_json in objs:
+        obj = _loads_if_needed(obj_or_json)
+        if obj.get("type") != "Feature":
+            append(geojson_to_bytes_v7(obj, srid=srid, scale=scale))
+            continue
+
+        feat.Clear()
+        _fill_feature_v5(feat, obj, srid, scale, fill_geometry=_fill_point)
+        payload = serialize()
+        append(_FEAT_HEADER + pack_len(len(payload)) + payload)
+
+    if framed:
+        return _pack_chunks(out)
+    return out
+
+
+# -------------------- decode --------------------
+
+def _v2_pb_decoders() -> Dict[str, Callable[[Any], GeoJSON]]:
+    # v2 pb_to_geojson_* work on v5 Geometry messages too (same field names)
+    from sfproto.geojson.v2.geojson_point import pb_to_geojson_point
+    from sfproto.geojson.v2.geojson_multipoint import pb_to_geojson_multipoint
+    from sfproto.geojson.v2.geojson_linestring import pb_to_geojson_linestring
+    from sfproto.geojson.v2.geojson_multilinestring import pb_to_geojson_multilinestring
+    from sfproto.geojson.v2.geojson_polygon import pb_to_geojson_polygon
+    from sfproto.geojson.v2.geojson_multipolygon import pb_to_geojson_multipolygon
+
+    return {
+        "point": pb_to_geojson_point,
+        "multipoint": pb_to_geojson_multipoint,
+        "line_string": pb_to_geojson_linestring,
+        "multilinestring": pb_to_geojson_multilinestring,
+        "polygon": pb_to_geojson_polygon,
+        "multipolygon": pb_to_geojson_multipolygon,
+    }
+
+
+def _feature_v5_to_geojson(feat, decoders: Dict[str, Callable[[Any], GeoJSON]]) -> GeoJSON:
+    kind = feat.geometry.WhichOneof("geom")
+    if kind not in decoders:
+        raise ValueError("Feature.geometry contains an unsupported Geometry")
+
+    props_dict = MessageToDict(feat.properties)
+    out: GeoJSON = {
+        "type": "Feature",
+        "geometry": decoders[kind](feat.geometry),
+        "properties": None if props_dict == {} else props_dict,
+    }
+
+    if feat.id:
+        out["id"] = feat.id
+
+    if len(feat.bbox) in (4, 6):
+        out["bbox"] = list(feat.bbox)
+
+    for k, v in MessageToDict(feat.extra).items():
+        if k not in out:
+            out[k] = v
+
+    return out
+
+
+def decode_many(blobs: Union[Sequence[bytes], bytes]) -> List[GeoJSON]:
+    """
+    Decode a list of v7 blobs, or one framed buffer from encode_many(framed=True).
+    """
+    from sfproto.geojson.v5.geojson_feature import _fill_feature_v5
+    from sfproto.sf.v5 import geometry_pb2 as pb2_v5
+
+    if isinstance(blobs, (bytes, bytearray, memoryview)):
+        blobs = _unpack_chunks(bytes(blobs))
+
+    feat = pb2_v5.Feature()
+    decoders = _v2_pb_decoders()
+
+    out: List[GeoJSON] = []
+    append = out.append
+    for blob in blobs:
+        if blob[:_TAG_LEN] != _TAG_FEAT:
+            append(bytes_to_geojson_v7(blob))
+            continue
+
+        # envelope: tag + count (1) + length + payload, checked without _unpack_chunks
+        if blob[_TAG_LEN:_FEAT_PAYLOAD_OFFSET - 4] != _FEAT_HEADER[_TAG_LEN:] \
+                or _U32.unpack_from(blob, _FEAT_PAYLOAD_OFFSET - 4)[0] != len(blob) - _FEAT_PAYLOAD_OFFSET:
+            raise ValueError("Invalid FEAT payload")
+
+        # ParseFromString clears the reused message first
+        feat.ParseFromString(blob[_FEAT_PAYLOAD_OFFSET:])
+        append(_feature_v5_to_geojson(feat, decoders))
+
+    return out
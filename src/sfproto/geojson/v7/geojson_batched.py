@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from sfproto.geojson.v7.geojson import (
+    DEFAULT_SCALE,
+    _TAG_LEN,
+    _TAG_FC7,
+    _TAG_FCB7,
+    _TAG_STV7,
+    _loads_if_needed,
+    geojson_to_bytes_v7,
+    bytes_to_geojson_v7,
+)
+
+GeoJSON = Dict[str, Any]
+GeoJSONInput = Union[GeoJSON, str]
+
+# Batched v7 FeatureCollection (tag FCB7), a streamable container:
+#
+#   b"FCB7" | frame | frame | ...          (until end of data)
+#   frame = uint32 big-endian length | v7 envelope (e.g. FCV7 with one batch of features)
+#
+# Every batch is a complete v7 FeatureCollection (own global_start), so batches can be
+# encoded, written, read and decoded independently (and in parallel). Frames with a
+# tag other than FCV7 carry metadata and are skipped by readers that do not need them.
+# Collection-level members (name, bbox, extra) are stored in the first batch.
+# With stats=True every batch is preceded by a STV7 frame with its property
+# statistics (see geojson_stats.py), used to skip batches when reading with a filter.
+# Mutations are appended as DLV7 delta segments (see geojson_delta.py).
+
+DEFAULT_BATCH_SIZE = 10_000
+
+_U32 = struct.Struct(">I")
+FRAME_HEADER_LEN = _U32.size
+
+
+# -------------------- frames --------------------
+
+def frame(blob: bytes) -> bytes:
+    return _U32.pack(len(blob)) + blob
+
+
+def iter_frames(data: Union[bytes, memoryview], offset: int = _TAG_LEN) -> Iterator[Tuple[int, memoryview]]:
+    """
+    Yield (offset of the frame blob, blob) for every frame, starting after the FCB7 tag.
+    Blobs are memoryviews into data (no copies).
+    """
+    mv = memoryview(data)
+    end = len(mv)
+    while offset < end:
+        if offset + FRAME_HEADER_LEN > end:
+            raise ValueError("Invalid batched payload: truncated frame header")
+        (n,) = _U32.unpack_from(mv, offset)
+        offset += FRAME_HEADER_LEN
+        if offset + n > end:
+            raise ValueError("Invalid batched payload: truncated frame")
+        yield offset, mv[offset:offset + n]
+        offset += n
+
+
+def frame_tag(blob: Union[bytes, memoryview]) -> bytes:
+    return bytes(blob[:_TAG_LEN])
+
+
+# -------------------- encode --------------------
+
+def iter_feature_batches(features: Iterable[GeoJSON], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[GeoJSON]]:
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    batch: List[GeoJSON] = []
+    for f in features:
+        batch.append(f)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def encode_batch_v7(
+    features: List[GeoJSON],
+    srid: int = 0,
+    scale: int = DEFAULT_SCALE,
+    members: Optional[GeoJSON] = None,
+    wide: Optional[bool] = None,
+    stats: bool = False,
+    lod_tolerances: Optional[Sequence[float]] = None,
+) -> bytes:
+    """
+    One batch -> framed FCV7 blob. members: extra FeatureCollection members (name, bbox, ...).
+    stats: prefix the STV7 statistics frame of the batch.
+    lod_tolerances: store levels of detail in the batch (see geojson_lod.py).
+    """
+    fc: GeoJSON = {"type": "FeatureCollection", "features": features}
+    if members:
+        fc.update({k: v for k, v in members.items() if k not in ("type", "features")})
+    blob = frame(geojson_to_bytes_v7(fc, srid=srid, scale=scale, wide=wide, lod_tolerances=lod_tolerances))
+    if stats:
+        from sfproto.geojson.v7.geojson_stats import batch_stats
+
+        blob = frame(_TAG_STV7 + batch_stats(features).SerializeToString()) + blob
+    return blob
+
+
+def geojson_featurecollection_to_batched_bytes_v7(
+    obj_or_json: GeoJSONInput,
+    srid: int = 0,
+    scale: int = DEFAULT_SCALE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    wide: Optional[bool] = None,
+    stats: bool = False,
+    lod_tolerances: Optional[Sequence[float]] = None,
+) -> bytes:
+    """
+    GeoJSON FeatureCollection -> batched v7 (FCB7) bytes.
+    stats: write per-batch property statistics (for filtered reads).
+    lod_tolerances: store levels of detail in every batch (see geojson_lod.py).
+    """
+    obj = _loads_if_needed(obj_or_json)
+    if obj.get("type") != "FeatureCollection":
+        raise ValueError(f"Expected FeatureCollection, got {obj.get('type')!r}")
+
+    feats = obj.get("features")
+    if not isinstance(feats, list) or not feats:
+        raise ValueError("FeatureCollection.features must be a non-empty list")
+
+    members = {k: v for k, v in obj.items() if k not in ("type", "features")}
+
+    out = bytearray(_TAG_FCB7)
+    for i, batch in enumerate(iter_feature_batches(feats, batch_size)):
+        out += encode_batch_v7(
+            batch, srid=srid, scale=scale, members=members if i == 0 else None, wide=wide, stats=stats,
+            lod_tolerances=lod_tolerances,
+        )
+    return bytes(out)
+
+
+# -------------------- decode --------------------
+
+def decode_batch_v7(blob: Union[bytes, memoryview], lod: Optional[int] = None) -> GeoJSON:
+    return bytes_to_geojson_v7(bytes(blob), lod=lod)
+
+
+def iter_batches_v7(data: bytes, lod: Optional[int] = None) -> Iterator[GeoJSON]:
+    """
+    Decode a batched v7 payload batch by batch (FeatureCollection per batch).
+    Delta segments are applied (see geojson_delta.py): their new features follow
+    in a last batch, always at full resolution.
+    """
+    from sfproto.geojson.v7.geojson_delta import apply_deltas, delta_state
+
+    tag = bytes(data[:_TAG_LEN])
+    if tag != _TAG_FCB7:
+        raise ValueError(f"Expected batched v7 payload (FCB7), got tag {tag!r}")
+    batches = (decode_batch_v7(blob, lod=lod) for _, blob in iter_frames(data) if frame_tag(blob) == _TAG_FC7)
+    state = delta_state(data)
+    if state is None:
+        yield from batches
+    else:
+        yield from apply_deltas(batches, state)
+
+
+def merge_batches(batches: Iterable[GeoJSON]) -> GeoJSON:
+    # features of all batches, collection members from the first batch
+    out: Optional[GeoJSON] = None
+    for fc in batches:
+        if out is None:
+            out = fc
+        else:
+            out["features"].extend(fc["features"])
+    if out is None:
+        return {"type": "FeatureCollection", "features": []}
+    return out
+
+
+def bytes_to_geojson_batched_v7(data: bytes, lod: Optional[int] = None) -> GeoJSON:
+    """
+    Batched v7 (FCB7) bytes -> one GeoJSON FeatureCollection.
+    """
+    return merge_batches(iter_batches_v7(data, lod=lod))
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from google.protobuf.struct_pb2 import Struct
+
+from sfproto.geojson.v7.geojson import _TAG_DLV7, _TAG_FC7, _TAG_FCB7, _TAG_LEN, _TAG_STV7, _loads_if_needed
+from sfproto.geojson.v7.geojson_batched import (
+    frame,
+    frame_tag,
+    geojson_featurecollection_to_batched_bytes_v7,
+    iter_batches_v7,
+    iter_frames,
+    merge_batches,
+)
+from sfproto.geojson.v7.geojson_featurecollection import (
+    _decode_featurecollection_pb,
+    geojson_featurecollection_to_bytes_v7,
+)
+from sfproto.scan import _fcv7_payload
+from sfproto.spatial import feature_sort_order
+from sfproto.sf.v7 import geometry_pb2
+from sfproto.util import write_atomic
+
+GeoJSON = Dict[str, Any]
+PathLike = Union[str, "os.PathLike[str]"]
+Features = Union[GeoJSON, str, List[GeoJSON]]
+
+# Delta segments: mutations appended to a batched v7 (FCB7) file.
+#
+#   append_delta(path, features=[changed, new], deleted=["0363100012345678"])
+#   bytes_to_geojson_v7(data)          # base batches with all deltas applied
+#   compact(path)                      # rewrite: deltas merged, sorted, clean batches
+#
+# A segment is one DLV7 frame (geometry_pb2.Delta): the ids of deleted features
+# and a FeatureCollection (same srid and scale as the file) with new features; a
+# feature with the id of an existing one replaces it. Segments apply in file
+# order, the deletions of a segment before its features. Appending never touches
+# the bytes already written, so the scan table positions and the sidecar id index
+# of the base stay valid (the index is re-stamped, not rebuilt).
+#
+# Readers decode the segments first (they are small) into the net change per id
+# and apply it while the base batches stream by: a replacement takes the place of
+# the feature it replaces, deleted features are dropped, and new features follow
+# after the last batch. Readers that do not know DLV7 frames skip them and see the
+# base. Positional access (sfproto.access.read_features, the server's /features/<i>)
+# returns replacements and refuses deleted features; new features get a position
+# when the file is compacted. The tiler refuses files with segments (compact first).
+
+MAX_STATES = 16
+
+_states: "OrderedDict[Tuple[str, int, int], Optional[Dict[str, Any]]]" = OrderedDict()
+_states_lock = threading.Lock()
+
+
+def _features_list(features: Optional[Features]) -> List[GeoJSON]:
+    if features is None:
+        return []
+    if isinstance(features, list):
+        return features
+    obj = _loads_if_needed(features)
+    if obj.get("type") != "FeatureCollection":
+        raise ValueError(f"Expected FeatureCollection or a list of features, got {obj.get('type')!r}")
+    return obj.get("features") or []
+
+
+def encode_delta(
+    features: Optional[Features] = None,
+    deleted: Optional[Iterable[Any]] = None,
+    srid: int = 0,
+    scale: int = 0,
+) -> bytes:
+    """
+    One delta segment -> framed DLV7 blob (srid and scale: those of the file).
+    """
+    feats = _features_list(features)
+    delta = geometry_pb2.Delta(deleted=[str(fid) for fid in deleted or ()])
+    if not feats and not delta.deleted:
+        raise ValueError("A delta needs features or deleted ids")
+    if feats:
+        fc = {"type": "FeatureCollection", "features": feats}
+        delta.features.MergeFromString(geojson_featurecollection_to_bytes_v7(fc, srid=srid, scale=scale))
+    return frame(_TAG_DLV7 + delta.SerializeToString())
+
+
+def _first_batch(buf) -> geometry_pb2.FeatureCollection:
+    for offset, blob in iter_frames(buf):
+        if frame_tag(blob) == _TAG_FC7:
+            start, end = _fcv7_payload(buf, offset, offset + len(blob))
+            del blob
+            return geometry_pb2.FeatureCollection.FromString(buf[start:end])
+    raise ValueError("Invalid batched payload: no FeatureCollection batch")
+
+
+def _check_batched(buf) -> None:
+    if bytes(buf[:_TAG_LEN]) != _TAG_FCB7:
+        raise ValueError(f"Expected batched v7 payload (FCB7), got tag {bytes(buf[:_TAG_LEN])!r}")
+
+
+def append_delta(
+    path: PathLike,
+    features: Optional[Features] = None,
+    deleted: Optional[Iterable[Any]] = None,
+) -> Dict[str, int]:
+    """
+    Append a delta segment to a batched v7 file: features (list, or a FeatureCollection)
+    are added, or replace the features with the same id; deleted are feature ids.
+    Returns features, deleted and bytes of the segment.
+    """
+    from sfproto.index import refresh_index
+
+    deleted = list(deleted or ())
+    with open(path, "r+b") as f:
+        before = os.fstat(f.fileno())
+        if before.st_size == 0:
+            raise ValueError("Invalid payload: empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _check_batched(mm)
+            crs = _first_batch(mm).crs
+        feats = _features_list(features)
+        blob = encode_delta(feats, deleted, srid=int(crs.srid), scale=int(crs.scale))
+
+        f.seek(0, os.SEEK_END)
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+        after = os.fstat(f.fileno())
+
+    refresh_index(path, before, after)
+    return {"features": len(feats), "deleted": len(deleted), "bytes": len(blob)}
+
+
+# -------------------- read --------------------
+
+def delta_state(buf, keep: Optional[Callable[[Struct], bool]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Net effect of the delta segments of a batched payload, None without segments:
+    {"replace": {id: feature, or None when deleted}, "added": [new features without id], "segments": n}.
+    keep: property filter as in _decode_featurecollection_pb; rejected features count as deleted.
+    """
+    segments = [
+        geometry_pb2.Delta.FromString(blob[_TAG_LEN:]) for _, blob in iter_frames(buf) if frame_tag(blob) == _TAG_DLV7
+    ]
+    if not segments:
+        return None
+
+    replace: Dict[str, Optional[GeoJSON]] = {}
+    added: List[GeoJSON] = []
+    for delta in segments:
+        for fid in delta.deleted:
+            replace[fid] = None
+        if not delta.HasField("features"):
+            continue
+        for feat_pb in delta.features.features:
+            if feat_pb.id:
+                replace[feat_pb.id] = None
+        for feat in _decode_featurecollection_pb(delta.features, keep=keep)["features"]:
+            if "id" in feat:
+                replace[feat["id"]] = feat
+            else:
+                added.append(feat)
+    return {"replace": replace, "added": added, "segments": len(segments)}
+
+
+def file_delta_state(key: Tuple[str, int, int], buf) -> Optional[Dict[str, Any]]:
+    """
+    delta_state of a file, cached by (path, mtime, size) like the scan tables; read-only.
+    """
+    with _states_lock:
+        if key in _states:
+            _states.move_to_end(key)
+            return _states[key]
+    state = delta_state(buf)
+    with _states_lock:
+        _states[key] = state
+        while len(_states) > MAX_STATES:
+            _states.popitem(last=False)
+    return state
+
+
+def _apply_batch(fc: GeoJSON, replace: Dict[str, Optional[GeoJSON]], done: set) -> GeoJSON:
+    # one base batch of apply_deltas; done: the ids replaced so far
+    feats: List[GeoJSON] = []
+    for feat in fc["features"]:
+        fid = feat.get("id")
+        if fid not in replace:
+            feats.append(feat)
+        elif fid not in done:
+            done.add(fid)
+            if replace[fid] is not None:
+                feats.append(replace[fid])
+    fc["features"] = feats
+    return fc
+
+
+def _rest_batch(state: Dict[str, Any], done: set) -> Optional[GeoJSON]:
+    # the last batch of apply_deltas: new features and replacements of ids not in the base
+    rest = [feat for fid, feat in state["replace"].items() if feat is not None and fid not in done]
+    rest.extend(state["added"])
+    return {"type": "FeatureCollection", "features": rest} if rest else None
+
+
+def apply_deltas(batches: Iterable[GeoJSON], state: Dict[str, Any]) -> Iterator[GeoJSON]:
+    """
+    Base batches with a delta state applied; the new features follow in a last batch.
+    """
+    done: set = set()
+    for fc in batches:
+        yield _apply_batch(fc, state["replace"], done)
+    rest = _rest_batch(state, done)
+    if rest is not None:
+        yield rest
+
+
+# -------------------- compact --------------------
+
+def compact(
+    path: PathLike,
+    sort: Optional[str] = "hilbert",
+    batch_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Rewrite a batched v7 file with its delta segments applied, spatially sorted
+    (sort=None keeps the merged order), in batches of batch_size (default: the size
+    of the first batch). Statistics frames and levels of detail are kept when the file
+    had them; an existing id index is rebuilt.
+    Returns features, segments, bytes_before and bytes_after.
+    """
+    from sfproto.index import build_index, index_path
+
+    with open(path, "rb") as f:
+        size_before = os.fstat(f.fileno()).st_size
+        if size_before == 0:
+            raise ValueError("Invalid payload: empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _check_batched(mm)
+            first = _first_batch(mm)
+            tags = [frame_tag(blob) for _, blob in iter_frames(mm)]
+            fc = merge_batches(iter_batches_v7(mm))
+
+    segments = tags.count(_TAG_DLV7)
+    srid, scale = int(first.crs.srid), int(first.crs.scale)
+    tolerances = [level.tolerance for level in first.lods]
+    feats = fc["features"]
+    if not feats:
+        raise ValueError("Nothing to compact: all features were deleted")
+    if sort is not None:
+        feats = [feats[i] for i in feature_sort_order(feats, scale, sort)]
+
+    data = geojson_featurecollection_to_batched_bytes_v7(
+        dict(fc, features=feats), srid=srid, scale=scale, batch_size=batch_size or len(first.features),
+        stats=_TAG_STV7 in tags, lod_tolerances=tolerances or None,
+    )
+
+    write_atomic(path, data, fsync=True)
+
+    if os.path.exists(index_path(path)):
+        build_index(path)
+    return {"features": len(feats), "segments": segments, "bytes_before": size_before, "bytes_after": len(data)}
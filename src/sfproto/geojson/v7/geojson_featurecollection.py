@@ -1,32 +1,29 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Tuple, Union, Optional
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Tuple, Union, Optional
 
+import numpy as np
 from google.protobuf.struct_pb2 import Struct
 from google.protobuf.json_format import MessageToDict
 
 from sfproto.sf.v7 import geometry_pb2
-from sfproto.geojson.v6.geojson_featurecollection import _flatten_geometry, _first_coord_of_geometry
+from sfproto.util import copy_geojson
+from sfproto.spatial import feature_sort_order, quantize_points, restore_order
 
 GeoJSON = Dict[str, Any]
 GeoJSONInput = Union[GeoJSON, str]
 
 DEFAULT_SCALE = 10_000_000
 _RESERVED_FCOL = {"type", "features", "bbox", "name", "crs"}
+_RESERVED_FEATURE = {"type", "geometry", "properties", "id", "bbox"}
 
 # ---------- struct helpers (same as v5) ----------
 
 def _loads_if_needed(obj_or_json: GeoJSONInput) -> GeoJSON:
     return json.loads(obj_or_json) if isinstance(obj_or_json, str) else obj_or_json
 
-def _dict_to_struct(d: Optional[Dict[str, Any]]) -> Struct:
-    s = Struct()
-    if d is None:
-        return s
-    s.update(d)
-    return s
-
 def _struct_to_dict(s: Struct) -> Dict[str, Any]:
     return MessageToDict(s)
 
@@ -44,32 +41,184 @@ def _uq(v: int, scale: int) -> float:
 # _ring_drop_closure
 # _first_coord_of_geometry
 # _flatten_geometry
+# imported on first encode only: decoding never needs the v6 module (and its descriptors)
+
+def _first_coord_of_geometry(geom: GeoJSON) -> Tuple[float, float]:
+    from sfproto.geojson.v6.geojson_featurecollection import _first_coord_of_geometry as first_coord
+    return first_coord(geom)
+
+
+# ---------- sint32 range check / 'wide' (sint64) mode ----------
+# Starts and deltas are sint32 by default. With large scales (1e7 for degrees)
+# absolute starts and big jumps can exceed that range, so the whole collection
+# is quantized up front and range checked in one vectorized pass. Only the
+# parts that overflow are written to the sint64 'wide' fields.
+
+_INT32_MIN = -(1 << 31)
+_INT32_MAX = (1 << 31) - 1
+
+
+def _out_of_int32(a: np.ndarray) -> np.ndarray:
+    return (a < _INT32_MIN) | (a > _INT32_MAX)
+
+
+def _flatten_geometries(geoms: List[GeoJSON]) -> Tuple[List[Tuple[int, List[int], List[int]]], List[Tuple[float, float]], List[int]]:
+    """
+    Returns (per-geometry (GeomType, part_sizes, poly_ring_counts), all points, point count per geometry)
+    """
+    from sfproto.geojson.v6.geojson_featurecollection import _flatten_geometry
+
+    meta: List[Tuple[int, List[int], List[int]]] = []
+    points: List[Tuple[float, float]] = []
+    counts: List[int] = []
+    for geom in geoms:
+        gtype, flat_pts, part_sizes, poly_ring_counts = _flatten_geometry(geom)
+        meta.append((int(gtype), part_sizes, poly_ring_counts))
+        points.extend(flat_pts)
+        counts.append(len(flat_pts))
+    return meta, points, counts
+
+
+def _stream_deltas(q: np.ndarray, counts: List[int], global_start_xy: Tuple[int, int]) -> np.ndarray:
+    """
+    Delta per point: the first point of every geometry relative to global_start,
+    the others relative to the previous point of the same geometry.
+    """
+    d = np.empty_like(q)
+    if len(q) == 0:
+        return d
+    d[0] = q[0]
+    d[1:] = q[1:] - q[:-1]
+
+    c = np.asarray(counts, dtype=np.int64)
+    starts = (np.cumsum(c) - c)[c > 0]
+    d[starts] = q[starts] - np.asarray(global_start_xy, dtype=np.int64)
+    return d
+
+
+def _wide_geometries(d: np.ndarray, counts: List[int]) -> List[bool]:
+    # True for every geometry with at least one delta outside the sint32 range
+    if len(d) == 0:
+        return [False] * len(counts)
+    over = _out_of_int32(d).any(axis=1)
+    if not over.any():
+        return [False] * len(counts)
+    c = np.asarray(counts, dtype=np.int64)
+    flags = np.zeros(len(c), dtype=bool)
+    nonempty = c > 0
+    flags[nonempty] = np.logical_or.reduceat(over, (np.cumsum(c) - c)[nonempty])
+    return flags.tolist()
+
+
+def _resolve_wide_flags(d: np.ndarray, counts: List[int], wide: Optional[bool], scale: int) -> List[bool]:
+    # per geometry: write the sint64 dxy_wide field instead of dxy
+    if wide is True:
+        return [True] * len(counts)
+    flags = _wide_geometries(d, counts)
+    if wide is False and any(flags):
+        raise ValueError(
+            f"Coordinate deltas do not fit in sint32 at scale {scale}; "
+            "use wide=True (or wide=None for automatic) or a smaller scale"
+        )
+    return flags
+
+
+def _resolve_wide_start(start_xy: Tuple[int, int], wide: Optional[bool], scale: int) -> bool:
+    overflow = bool(_out_of_int32(np.asarray(start_xy, dtype=np.int64)).any())
+    if wide is False and overflow:
+        raise ValueError(
+            f"global_start {start_xy} does not fit in sint32 at scale {scale}; "
+            "use wide=True (or wide=None for automatic) or a smaller scale"
+        )
+    return bool(wide) or overflow
+
+
+def _set_global_start(msg, start_xy: Tuple[int, int], wide_start: bool) -> None:
+    # msg is a FeatureCollection or GeometryCollection
+    if wide_start:
+        msg.global_start_wide.x, msg.global_start_wide.y = start_xy
+    else:
+        msg.global_start.x, msg.global_start.y = start_xy
+
+
+def _get_global_start(msg) -> Tuple[int, int]:
+    if msg.HasField("global_start_wide"):
+        return int(msg.global_start_wide.x), int(msg.global_start_wide.y)
+    return int(msg.global_start.x), int(msg.global_start.y)
+
+
+def _fill_stream_geometries(
+    targets: List[geometry_pb2.StreamGeometry],
+    geoms: List[GeoJSON],
+    global_start_xy: Tuple[int, int],
+    scale: int,
+    wide: Optional[bool] = None,
+) -> None:
+    """
+    Encode a list of geometries against one global start, written directly into
+    the (empty) target messages, e.g. the geometry fields of fc.features.add().
+    wide: None = sint64 only for geometries whose deltas overflow sint32,
+          True = always sint64, False = raise if anything overflows.
+    """
+    meta, points, counts = _flatten_geometries(geoms)
+    _fill_stream_geometries_q(targets, meta, quantize_points(points, scale), counts, global_start_xy, scale, wide)
+
+
+def _fill_stream_geometries_q(
+    targets: List[geometry_pb2.StreamGeometry],
+    meta: List[Tuple[int, List[int], List[int]]],
+    q: np.ndarray,
+    counts: List[int],
+    global_start_xy: Tuple[int, int],
+    scale: int,
+    wide: Optional[bool] = None,
+) -> None:
+    # _fill_stream_geometries for already flattened and quantized geometries
+    d = _stream_deltas(q, counts, global_start_xy)
+    wide_flags = _resolve_wide_flags(d, counts, wide, scale)
+
+    dxy_all = d.ravel().tolist()
+
+    idx = 0
+    for pb, (gtype, part_sizes, poly_ring_counts), n, is_wide in zip(targets, meta, counts, wide_flags):
+        pb.type = gtype
+
+        if part_sizes:
+            pb.part_sizes.extend([int(x) for x in part_sizes])
+        if poly_ring_counts:
+            pb.poly_ring_counts.extend([int(x) for x in poly_ring_counts])
+
+        # packed dxy: [dx0, dy0, dx1, dy1, ...]
+        if is_wide:
+            pb.dxy_wide.extend(dxy_all[2 * idx: 2 * (idx + n)])
+        else:
+            pb.dxy.extend(dxy_all[2 * idx: 2 * (idx + n)])
+        idx += n
+
+
+def _encode_stream_geometries(
+    geoms: List[GeoJSON],
+    global_start_xy: Tuple[int, int],
+    scale: int,
+    wide: Optional[bool] = None,
+) -> List[geometry_pb2.StreamGeometry]:
+    out = [geometry_pb2.StreamGeometry() for _ in geoms]
+    _fill_stream_geometries(out, geoms, global_start_xy, scale, wide=wide)
+    return out
 
-def _encode_stream_geometry(geom: GeoJSON, global_start_xy: Tuple[int, int], scale: int) -> geometry_pb2.StreamGeometry:
-    gtype, flat_pts, part_sizes, poly_ring_counts = _flatten_geometry(geom)
-
-    cursor_x, cursor_y = global_start_xy
-
-    pb = geometry_pb2.StreamGeometry()
-    pb.type = int(gtype)
-
-    if part_sizes:
-        pb.part_sizes.extend([int(x) for x in part_sizes])
-    if poly_ring_counts:
-        pb.poly_ring_counts.extend([int(x) for x in poly_ring_counts])
-
-    for (x, y) in flat_pts:
-        qx, qy = _q(x, scale), _q(y, scale)
-        pb.dxy.append(int(qx - cursor_x))
-        pb.dxy.append(int(qy - cursor_y))
-        cursor_x, cursor_y = qx, qy
 
-    return pb
+def _encode_stream_geometry(
+    geom: GeoJSON,
+    global_start_xy: Tuple[int, int],
+    scale: int,
+    wide: Optional[bool] = None,
+) -> geometry_pb2.StreamGeometry:
+    return _encode_stream_geometries([geom], global_start_xy, scale, wide=wide)[0]
 
 
 def _decode_stream_geometry(pb: geometry_pb2.StreamGeometry, global_start_xy: Tuple[int, int], scale: int) -> GeoJSON:
     cursor_x, cursor_y = global_start_xy
-    dxy = list(pb.dxy)
+    dxy = list(pb.dxy_wide) if len(pb.dxy_wide) else list(pb.dxy)
     if len(dxy) % 2 != 0:
         raise ValueError("Invalid StreamGeometry: dxy length must be even")
 
@@ -138,9 +287,112 @@ def _decode_stream_geometry(pb: geometry_pb2.StreamGeometry, global_start_xy: Tu
     raise ValueError(f"Unsupported StreamGeometry type enum: {t}")
 
 
+# ---------- dedup ----------
+# Geometries are keyed by their encoded StreamGeometry (every geometry starts from
+# the collection's global_start, so equal quantized geometries encode to equal bytes),
+# properties by their canonical JSON. Only objects used more than once go into the
+# shared tables; features refer to them by 1-based index.
+
+def _properties_key(props: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not props:
+        return None  # null/empty properties are stored as an empty Struct anyway
+    return json.dumps(props, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _shared_refs(keys: List[Optional[Hashable]]) -> Tuple[List[int], List[int]]:
+    """
+    Returns (ref per item: 0 = inline, else 1-based table index,
+             item index of the first occurrence per table entry)
+    """
+    counts = Counter(k for k in keys if k is not None)
+    table: Dict[Hashable, int] = {}
+    first: List[int] = []
+    refs: List[int] = []
+    for i, k in enumerate(keys):
+        if k is None or counts[k] < 2:
+            refs.append(0)
+            continue
+        ref = table.get(k)
+        if ref is None:
+            first.append(i)
+            ref = table[k] = len(first)
+        refs.append(ref)
+    return refs, first
+
+
+def _dedup_stats(n: int, geom_refs: List[int], n_shared_geoms: int, props_refs: List[int], n_shared_props: int) -> Dict[str, Any]:
+    # objects that did not need to be stored because an equal one already was
+    geom_saved = sum(1 for r in geom_refs if r) - n_shared_geoms
+    props_saved = sum(1 for r in props_refs if r) - n_shared_props
+    return {
+        "features": n,
+        "unique_geometries": n - geom_saved,
+        "shared_geometries": n_shared_geoms,
+        "unique_properties": n - props_saved,
+        "shared_properties": n_shared_props,
+        "geometry_dedup_ratio": geom_saved / n if n else 0.0,
+        "properties_dedup_ratio": props_saved / n if n else 0.0,
+        "dedup_ratio": (geom_saved + props_saved) / (2 * n) if n else 0.0,
+    }
+
+
+# ---------- features ----------
+
+def _fill_feature_fields(
+    feat_pb: geometry_pb2.Feature,
+    f: GeoJSON,
+    props: Optional[Dict[str, Any]],
+    props_ref: int = 0,
+) -> None:
+    # all Feature fields except the geometry
+    if props_ref:
+        feat_pb.properties_ref = props_ref
+    elif props:
+        feat_pb.properties.update(props)
+    else:
+        feat_pb.properties.SetInParent()  # empty struct represents null properties
+
+    fid = f.get("id")
+    if fid is not None:
+        feat_pb.id = str(fid)
+
+    bbox = f.get("bbox")
+    if isinstance(bbox, list) and len(bbox) in (4, 6) and all(isinstance(x, (int, float)) for x in bbox):
+        feat_pb.bbox.extend([float(x) for x in bbox])
+
+    # extra keys on Feature
+    extra = {k: v for k, v in f.items() if k not in _RESERVED_FEATURE}
+    if extra:
+        feat_pb.extra.update(extra)
+
+
 # ---------- public API ----------
 
-def geojson_featurecollection_to_bytes_v7(obj_or_json: GeoJSONInput, srid: int, scale: int) -> bytes:
+def geojson_featurecollection_to_bytes_v7(
+    obj_or_json: GeoJSONInput,
+    srid: int,
+    scale: int,
+    sort: Optional[str] = None,
+    store_order: bool = False,
+    wide: Optional[bool] = None,
+    dedup: bool = False,
+    stats: Optional[Dict[str, Any]] = None,
+    wire: bool = False,
+    lod_tolerances: Optional[Sequence[float]] = None,
+) -> bytes:
+    """
+    sort: None (input order), "hilbert" or "zorder" to write the features spatially sorted.
+    store_order: with sort, also store the input position of every feature
+    so the decoder can restore the original order (preserve_order=True).
+    wide: None = automatic sint64 for values that overflow sint32,
+    True = always sint64, False = sint32 only (raises on overflow).
+    dedup: store geometries and properties that occur more than once only once.
+    stats: optional dict, filled with encode statistics (dedup counts and ratios).
+    wire: write the geometries with the direct wire writer (geojson_wire.py)
+    instead of StreamGeometry messages; the output bytes are the same.
+    lod_tolerances: also store the geometries simplified at these tolerances
+    (CRS units), one level of detail each (see geojson_lod.py).
+    """
     obj = _loads_if_needed(obj_or_json)
     if obj.get("type") != "FeatureCollection":
         raise ValueError(f"Expected FeatureCollection, got {obj.get('type')!r}")
@@ -150,6 +402,12 @@ def geojson_featurecollection_to_bytes_v7(obj_or_json: GeoJSONInput, srid: int,
         raise ValueError("FeatureCollection.features must be a non-empty list")
 
     fc = geometry_pb2.FeatureCollection()
+
+    if sort is not None:
+        order = feature_sort_order(feats, scale, sort)
+        feats = [feats[i] for i in order]
+        if store_order:
+            fc.original_index.extend(order)
     fc.crs.srid = int(srid)
     fc.crs.scale = int(scale)
 
@@ -158,12 +416,7 @@ def geojson_featurecollection_to_bytes_v7(obj_or_json: GeoJSONInput, srid: int,
     if not isinstance(first_geom, dict):
         raise ValueError("First feature has no geometry object")
 
-    x0, y0 = _first_coord_of_geometry(first_geom)
-    fc.global_start.x = _q(x0, scale)
-    fc.global_start.y = _q(y0, scale)
-    global_start_xy = (int(fc.global_start.x), int(fc.global_start.y))
-
-    # features
+    geoms: List[GeoJSON] = []
     for f in feats:
         if f.get("type") != "Feature":
             raise ValueError("FeatureCollection.features must contain Features")
@@ -171,30 +424,64 @@ def geojson_featurecollection_to_bytes_v7(obj_or_json: GeoJSONInput, srid: int,
         geom = f.get("geometry")
         if not isinstance(geom, dict):
             raise ValueError("Feature.geometry must be an object (not null)")
+        geoms.append(geom)
+
+    x0, y0 = _first_coord_of_geometry(first_geom)
+    global_start_xy = (_q(x0, scale), _q(y0, scale))
+    _set_global_start(fc, global_start_xy, _resolve_wide_start(global_start_xy, wide, scale))
+
+    if wire:
+        from sfproto.geojson.v7.geojson_wire import stream_geometries_to_wire
 
-        feat_pb = geometry_pb2.Feature()
-        feat_pb.geometry.CopyFrom(_encode_stream_geometry(geom, global_start_xy, scale))
+        # encoded StreamGeometry per feature, spliced into the output below
+        geom_blobs = stream_geometries_to_wire(geoms, global_start_xy, scale, wide=wide)
+    else:
+        # features are filled in place (no temporary messages + CopyFrom)
+        feat_pbs = [fc.features.add() for _ in feats]
 
+        # all geometries in one vectorized pass (quantize, delta, range check)
+        _fill_stream_geometries([fp.geometry for fp in feat_pbs], geoms, global_start_xy, scale, wide=wide)
+
+    if lod_tolerances:
+        from sfproto.geojson.v7.geojson_lod import encode_lod_levels
+
+        encode_lod_levels(fc, geoms, global_start_xy, scale, lod_tolerances)
+
+    all_props: List[Optional[Dict[str, Any]]] = []
+    for f in feats:
         props = f.get("properties")
         if props is not None and not isinstance(props, dict):
             raise ValueError("Feature.properties must be an object or null")
-        feat_pb.properties.CopyFrom(_dict_to_struct(props))
-
-        fid = f.get("id")
-        if fid is not None:
-            feat_pb.id = str(fid)
+        all_props.append(props)
+
+    n = len(feats)
+    geom_refs = props_refs = [0] * n
+    if dedup:
+        if wire:
+            geom_refs, first_geoms = _shared_refs(geom_blobs)
+            for i in first_geoms:
+                fc.shared_geometries.add().MergeFromString(geom_blobs[i])
+        else:
+            geom_refs, first_geoms = _shared_refs([fp.geometry.SerializeToString() for fp in feat_pbs])
+            for i in first_geoms:
+                fc.shared_geometries.append(feat_pbs[i].geometry)
+        props_refs, first_props = _shared_refs([_properties_key(p) for p in all_props])
+        for i in first_props:
+            fc.shared_properties.add().update(all_props[i])
+        if stats is not None:
+            stats.update(_dedup_stats(n, geom_refs, len(first_geoms), props_refs, len(first_props)))
 
-        bbox = f.get("bbox")
-        if isinstance(bbox, list) and len(bbox) in (4, 6) and all(isinstance(x, (int, float)) for x in bbox):
-            feat_pb.bbox.extend([float(x) for x in bbox])
-
-        # extra keys on Feature
-        reserved = {"type", "geometry", "properties", "id", "bbox"}
-        extra = {k: v for k, v in f.items() if k not in reserved}
-        if extra:
-            feat_pb.extra.CopyFrom(_dict_to_struct(extra))
+    # features
+    if wire:
+        from sfproto.geojson.v7.geojson_wire import features_to_wire
 
-        fc.features.append(feat_pb)
+        feature_fields = features_to_wire(feats, geom_blobs, all_props, geom_refs, props_refs)
+    else:
+        for f, feat_pb, props, geom_ref, props_ref in zip(feats, feat_pbs, all_props, geom_refs, props_refs):
+            if geom_ref:
+                feat_pb.ClearField("geometry")
+                feat_pb.geometry_ref = geom_ref
+            _fill_feature_fields(feat_pb, f, props, props_ref)
 
     # collection bbox/name/extra (like v5)
     bbox = obj.get("bbox")
@@ -207,38 +494,107 @@ def geojson_featurecollection_to_bytes_v7(obj_or_json: GeoJSONInput, srid: int,
 
     extra_top = _extract_extra_fcol(obj)
     if extra_top:
-        fc.extra.CopyFrom(_dict_to_struct(extra_top))
+        fc.extra.update(extra_top)
 
+    if wire:
+        # features is field 1, so it comes first in protobuf's own field order too
+        return feature_fields + fc.SerializeToString()
     return fc.SerializeToString()
 
 
-def bytes_to_geojson_featurecollection_v7(data: bytes) -> GeoJSON:
-    fc = geometry_pb2.FeatureCollection.FromString(data)
-    scale = int(fc.crs.scale)
-    global_start_xy = (int(fc.global_start.x), int(fc.global_start.y))
+def _shared_entry(table: List[Any], ref: int) -> Any:
+    if ref > len(table):
+        raise ValueError(f"Invalid FeatureCollection: shared table reference {ref} out of range")
+    return table[ref - 1]
 
-    out: GeoJSON = {"type": "FeatureCollection", "features": []}
 
-    for feat_pb in fc.features:
-        geom = _decode_stream_geometry(feat_pb.geometry, global_start_xy, scale)
+def _feature_from_pb(feat_pb: geometry_pb2.Feature, geom: GeoJSON, props_dict: Dict[str, Any]) -> GeoJSON:
+    # GeoJSON Feature from its decoded geometry and properties plus the other Feature fields
+    properties = None if props_dict == {} else props_dict
 
-        props_dict = _struct_to_dict(feat_pb.properties)
-        properties = None if props_dict == {} else props_dict
+    feat: GeoJSON = {"type": "Feature", "geometry": geom, "properties": properties}
 
-        feat: GeoJSON = {"type": "Feature", "geometry": geom, "properties": properties}
+    if getattr(feat_pb, "id", ""):
+        feat["id"] = feat_pb.id
 
-        if getattr(feat_pb, "id", ""):
-            feat["id"] = feat_pb.id
+    if getattr(feat_pb, "bbox", None) and len(feat_pb.bbox) in (4, 6):
+        feat["bbox"] = list(feat_pb.bbox)
 
-        if getattr(feat_pb, "bbox", None) and len(feat_pb.bbox) in (4, 6):
-            feat["bbox"] = list(feat_pb.bbox)
+    extra = _struct_to_dict(feat_pb.extra) if hasattr(feat_pb, "extra") else {}
+    for k, v in extra.items():
+        if k not in feat:
+            feat[k] = v
+    return feat
 
-        extra = _struct_to_dict(feat_pb.extra) if hasattr(feat_pb, "extra") else {}
-        for k, v in extra.items():
-            if k not in feat:
-                feat[k] = v
 
-        out["features"].append(feat)
+def bytes_to_geojson_featurecollection_v7(data: bytes, preserve_order: bool = False, lod: Optional[int] = None) -> GeoJSON:
+    """
+    preserve_order: restore the input order of a spatially sorted collection
+    (only possible when it was written with store_order=True).
+    lod: decode the geometries of this level of detail (index into the
+    lod_tolerances the collection was written with) instead of the full ones.
+    """
+    return _decode_featurecollection_pb(geometry_pb2.FeatureCollection.FromString(data), preserve_order, lod=lod)
+
+
+def _decode_featurecollection_pb(
+    fc: geometry_pb2.FeatureCollection,
+    preserve_order: bool = False,
+    keep: Optional[Callable[[Struct], bool]] = None,
+    lod: Optional[int] = None,
+) -> GeoJSON:
+    """
+    keep (optional): called with the properties Struct of every feature; features
+    for which it returns False are skipped before anything else is decoded.
+    """
+    scale = int(fc.crs.scale)
+    global_start_xy = _get_global_start(fc)
+
+    lod_geoms = None
+    if lod is not None:
+        from sfproto.geojson.v7.geojson_lod import lod_geometries
+
+        lod_geoms = lod_geometries(fc, lod)
+
+    # dedup tables: decoded once, every feature gets its own copy
+    shared_geoms = [] if lod_geoms is not None else [
+        _decode_stream_geometry(g, global_start_xy, scale) for g in fc.shared_geometries
+    ]
+    shared_props = [_struct_to_dict(p) for p in fc.shared_properties]
+
+    out: GeoJSON = {"type": "FeatureCollection", "features": []}
+    kept: List[int] = []
+
+    for i, feat_pb in enumerate(fc.features):
+        if keep is not None:
+            if feat_pb.properties_ref:
+                props_pb = _shared_entry(fc.shared_properties, feat_pb.properties_ref)
+            else:
+                props_pb = feat_pb.properties
+            if not keep(props_pb):
+                continue
+            kept.append(i)
+
+        if lod_geoms is not None:
+            geom = _decode_stream_geometry(lod_geoms[i], global_start_xy, scale)
+        elif feat_pb.geometry_ref:
+            geom = copy_geojson(_shared_entry(shared_geoms, feat_pb.geometry_ref))
+        else:
+            geom = _decode_stream_geometry(feat_pb.geometry, global_start_xy, scale)
+
+        if feat_pb.properties_ref:
+            props_dict = copy_geojson(_shared_entry(shared_props, feat_pb.properties_ref))
+        else:
+            props_dict = _struct_to_dict(feat_pb.properties)
+
+        out["features"].append(_feature_from_pb(feat_pb, geom, props_dict))
+
+    if preserve_order and len(fc.original_index):
+        if keep is None:
+            out["features"] = restore_order(out["features"], fc.original_index)
+        else:
+            order = sorted(range(len(kept)), key=lambda j: fc.original_index[kept[j]])
+            out["features"] = [out["features"][j] for j in order]
 
     if getattr(fc, "bbox", None) and len(fc.bbox) in (4, 6):
         out["bbox"] = list(fc.bbox)
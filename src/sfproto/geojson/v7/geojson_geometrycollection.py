@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 from google.protobuf.struct_pb2 import Struct
 from google.protobuf.json_format import MessageToDict
@@ -10,7 +10,8 @@ from sfproto.sf.v7 import geometry_pb2
 
 from sfproto.geojson.v7.geojson_featurecollection import (
     _q, _uq, _first_coord_of_geometry,
-    _encode_stream_geometry, _decode_stream_geometry,
+    _fill_stream_geometries, _decode_stream_geometry,
+    _resolve_wide_start, _set_global_start, _get_global_start,
 )
 
 GeoJSON = Dict[str, Any]
@@ -21,16 +22,15 @@ _RESERVED_GCOL = {"type", "geometries", "bbox", "crs"}
 def _loads_if_needed(obj_or_json: GeoJSONInput) -> GeoJSON:
     return json.loads(obj_or_json) if isinstance(obj_or_json, str) else obj_or_json
 
-def _dict_to_struct(d):
-    s = Struct()
-    if d:
-        s.update(d)
-    return s
-
 def _struct_to_dict(s: Struct) -> Dict[str, Any]:
     return MessageToDict(s)
 
-def geojson_geometrycollection_to_bytes_v7(obj_or_json: GeoJSONInput, srid: int, scale: int) -> bytes:
+def geojson_geometrycollection_to_bytes_v7(
+    obj_or_json: GeoJSONInput,
+    srid: int,
+    scale: int,
+    wide: Optional[bool] = None,
+) -> bytes:
     obj = _loads_if_needed(obj_or_json)
     if obj.get("type") != "GeometryCollection":
         raise ValueError(f"Expected GeometryCollection, got {obj.get('type')!r}")
@@ -43,15 +43,15 @@ def geojson_geometrycollection_to_bytes_v7(obj_or_json: GeoJSONInput, srid: int,
     gc.crs.srid = int(srid)
     gc.crs.scale = int(scale)
 
-    x0, y0 = _first_coord_of_geometry(geoms[0])
-    gc.global_start.x = _q(x0, scale)
-    gc.global_start.y = _q(y0, scale)
-    global_start_xy = (int(gc.global_start.x), int(gc.global_start.y))
-
     for g in geoms:
         if not isinstance(g, dict):
             raise ValueError("Each geometry must be an object")
-        gc.geometries.append(_encode_stream_geometry(g, global_start_xy, scale))
+
+    x0, y0 = _first_coord_of_geometry(geoms[0])
+    global_start_xy = (_q(x0, scale), _q(y0, scale))
+    _set_global_start(gc, global_start_xy, _resolve_wide_start(global_start_xy, wide, scale))
+
+    _fill_stream_geometries([gc.geometries.add() for _ in geoms], geoms, global_start_xy, scale, wide=wide)
 
     bbox = obj.get("bbox")
     if isinstance(bbox, list) and len(bbox) in (4, 6) and all(isinstance(x, (int, float)) for x in bbox):
@@ -59,14 +59,14 @@ def geojson_geometrycollection_to_bytes_v7(obj_or_json: GeoJSONInput, srid: int,
 
     extra = {k: v for k, v in obj.items() if k not in _RESERVED_GCOL}
     if extra:
-        gc.extra.CopyFrom(_dict_to_struct(extra))
+        gc.extra.update(extra)
 
     return gc.SerializeToString()
 
 def bytes_to_geojson_geometrycollection_v7(data: bytes) -> GeoJSON:
     gc = geometry_pb2.GeometryCollection.FromString(data)
     scale = int(gc.crs.scale)
-    global_start_xy = (int(gc.global_start.x), int(gc.global_start.y))
+    global_start_xy = _get_global_start(gc)
 
     geoms: List[GeoJSON] = []
     for pb_geom in gc.geometries:
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from google.protobuf.struct_pb2 import Struct
+
+from sfproto.sf.v7 import geometry_pb2
+
+GeoJSON = Dict[str, Any]
+Predicate = Tuple[str, str, Any]
+
+# Per-batch property statistics and predicate pushdown for batched v7 files.
+#
+# A stats frame (tag STV7, a BatchStats message) in front of a batch summarises
+# every property over the features of that batch: null count, min/max of the
+# numbers, min/max and (for low cardinality) the distinct set of the strings, and
+# the number of true/false values. A predicate list such as
+#
+#   where = [("bouwjaar", ">=", 2000), ("status", "==", "Pand in gebruik")]
+#
+# (all must hold) lets a reader skip batches that cannot contain a match
+# (batch_may_match) and test the remaining features on their properties before
+# the geometry is decoded (compile_where).
+#
+# Semantics: a missing or null property matches only ("k", "==", None) and
+# ("k", "in", [..., None, ...]); values of different kinds (number, string, bool)
+# never compare equal or ordered. "!=" needs a value of the same kind.
+
+MAX_DISTINCT = 64  # larger string sets are summarised by min/max only
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_OPS = set(OPERATORS) | {"in"}
+
+
+def _kind(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return "other"
+
+
+def check_where(where: Optional[Sequence[Predicate]]) -> List[Predicate]:
+    out: List[Predicate] = []
+    for pred in where or ():
+        if len(pred) != 3:
+            raise ValueError(f"where: expected (name, op, value), got {pred!r}")
+        name, op, value = pred
+        if op not in _OPS:
+            raise ValueError(f"where: unsupported operator {op!r} (use one of {sorted(_OPS)})")
+        if op == "in":
+            value = list(value)
+            if any(_kind(v) == "other" for v in value):
+                raise ValueError(f"where: 'in' needs numbers, strings, booleans or None, got {value!r}")
+        elif op in ("==", "!="):
+            if _kind(value) == "other":
+                raise ValueError(f"where: {op!r} needs a number, string, boolean or None, got {value!r}")
+        elif _kind(value) not in ("number", "string"):
+            raise ValueError(f"where: {op!r} needs a number or string, got {value!r}")
+        out.append((str(name), op, value))
+    return out
+
+
+# -------------------- stats (encode) --------------------
+
+def batch_stats(features: Iterable[GeoJSON]) -> geometry_pb2.BatchStats:
+    columns: Dict[str, Dict[str, Any]] = {}
+    n = 0
+    for f in features:
+        n += 1
+        for name, value in (f.get("properties") or {}).items():
+            c = columns.get(name)
+            if c is None:
+                c = columns[name] = {"values": 0, "numbers": [], "strings": set(), "trues": 0, "falses": 0, "others": 0}
+            kind = _kind(value)
+            if kind is None:
+                continue
+            c["values"] += 1
+            if kind == "number":
+                c["numbers"].append(value)
+            elif kind == "string":
+                c["strings"].add(value)
+            elif kind == "bool":
+                c["trues" if value else "falses"] += 1
+            else:
+                c["others"] += 1
+
+    out = geometry_pb2.BatchStats(features=n)
+    for name in sorted(columns):
+        c = columns[name]
+        col = out.columns.add(name=name, nulls=n - c["values"])
+        if c["numbers"]:
+            col.has_number = True
+            col.number_min, col.number_max = min(c["numbers"]), max(c["numbers"])
+        if c["strings"]:
+            col.has_string = True
+            col.string_min, col.string_max = min(c["strings"]), max(c["strings"])
+            if len(c["strings"]) <= MAX_DISTINCT:
+                col.distinct.extend(sorted(c["strings"]))
+                col.distinct_complete = True
+        col.trues, col.falses, col.others = c["trues"], c["falses"], c["others"]
+    return out
+
+
+# -------------------- pruning (per batch) --------------------
+
+def _range_may_match(lo: Any, hi: Any, op: str, value: Any) -> bool:
+    if op == "==":
+        return lo <= value <= hi
+    if op == "!=":
+        return not (lo == hi == value)
+    if op == "<":
+        return lo < value
+    if op == "<=":
+        return lo <= value
+    if op == ">":
+        return hi > value
+    return hi >= value  # ">="
+
+
+def _column_may_match(col: Optional[geometry_pb2.ColumnStats], features: int, op: str, value: Any) -> bool:
+    if op == "in":
+        return any(_column_may_match(col, features, "==", v) for v in value)
+
+    kind = _kind(value)
+    if kind is None:
+        nulls = features if col is None else col.nulls
+        return nulls > 0 if op == "==" else nulls < features
+    if col is None:
+        return False
+
+    if kind == "number":
+        return col.has_number and _range_may_match(col.number_min, col.number_max, op, value)
+    if kind == "string":
+        if not col.has_string:
+            return False
+        if op == "==" and col.distinct_complete:
+            return value in col.distinct
+        return _range_may_match(col.string_min, col.string_max, op, value)
+    # bool
+    if op == "==":
+        return (col.trues if value else col.falses) > 0
+    return (col.falses if value else col.trues) > 0
+
+
+def batch_may_match(stats: geometry_pb2.BatchStats, where: Sequence[Predicate]) -> bool:
+    """
+    False only when no feature of the batch can satisfy all predicates.
+    """
+    columns = {c.name: c for c in stats.columns}
+    return all(_column_may_match(columns.get(name), stats.features, op, value) for name, op, value in where)
+
+
+# -------------------- evaluation (per feature) --------------------
+
+def _struct_value(s: Struct, name: str) -> Any:
+    # the plain Python value of one Struct field, without converting the whole Struct
+    if name not in s.fields:
+        return None
+    v = s.fields[name]
+    kind = v.WhichOneof("kind")
+    if kind == "number_value":
+        return v.number_value
+    if kind == "string_value":
+        return v.string_value
+    if kind == "bool_value":
+        return v.bool_value
+    if kind in ("struct_value", "list_value"):
+        return v  # only matched by kind, never by value
+    return None
+
+
+def _matches(actual: Any, op: str, value: Any) -> bool:
+    if op == "in":
+        return any(_matches(actual, "==", v) for v in value)
+    kind = _kind(value)
+    if kind is None:
+        return (actual is None) == (op == "==")
+    if _kind(actual) != kind:
+        return False
+    return OPERATORS[op](actual, value)
+
+
+def compile_where(where: Sequence[Predicate]) -> Callable[[Struct], bool]:
+    """
+    Properties Struct -> True when all predicates hold.
+    """
+    preds = check_where(where)
+
+    def keep(s: Struct) -> bool:
+        for name, op, value in preds:
+            if not _matches(_struct_value(s, name), op, value):
+                return False
+        return True
+
+    return keep
+
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sfproto.sf.v7 import geometry_pb2
+from sfproto.spatial import quantize_points
+from sfproto.wire import (
+    WIRETYPE_LEN,
+    WIRETYPE_VARINT,
+    encode_varint,
+    field_tag,
+    varint_pack,
+    varint_sizes,
+    zigzag_encode,
+)
+from sfproto.geojson.v7.geojson_featurecollection import (
+    _fill_feature_fields,
+    _flatten_geometries,
+    _resolve_wide_flags,
+    _stream_deltas,
+)
+
+GeoJSON = Dict[str, Any]
+
+# Direct wire writer for v7 StreamGeometries: produces exactly the bytes
+# StreamGeometry.SerializeToString() would, without building the messages.
+#
+# StreamGeometry on the wire (fields in number order, as protobuf writes them):
+#   1 type              varint          (omitted when 0)
+#   2 dxy               packed sint32   (zigzag varints; omitted when empty)
+#   3 part_sizes        packed uint32
+#   4 poly_ring_counts  packed uint32
+#   5 dxy_wide          packed sint64   (instead of dxy for 'wide' geometries)
+#
+# All varints of a collection are packed in one NumPy pass per field; per geometry
+# only the small tag/length headers are built and the packed bytes sliced out.
+
+_TAG_TYPE = field_tag(1, WIRETYPE_VARINT)
+_TAG_DXY = field_tag(2, WIRETYPE_LEN)
+_TAG_PART_SIZES = field_tag(3, WIRETYPE_LEN)
+_TAG_POLY_RING_COUNTS = field_tag(4, WIRETYPE_LEN)
+_TAG_DXY_WIDE = field_tag(5, WIRETYPE_LEN)
+
+_TAG_FEATURE_GEOMETRY = field_tag(1, WIRETYPE_LEN)      # Feature.geometry
+_TAG_COLLECTION_FEATURE = field_tag(1, WIRETYPE_LEN)    # FeatureCollection.features
+
+
+def _packed_segments(values: np.ndarray, lengths: Sequence[int]) -> Tuple[bytes, List[int]]:
+    """
+    Varint-pack all values at once; lengths = number of values per segment.
+    Returns (packed bytes, byte offset of every segment boundary).
+    """
+    bounds = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=bounds[1:])
+
+    sizes = varint_sizes(values)
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    return varint_pack(values, sizes), offsets[bounds].tolist()
+
+
+def stream_geometries_to_wire(
+    geoms: List[GeoJSON],
+    global_start_xy: Tuple[int, int],
+    scale: int,
+    wide: Optional[bool] = None,
+) -> List[bytes]:
+    """
+    Encoded StreamGeometry per geometry (same bytes as _encode_stream_geometries
+    followed by SerializeToString).
+    """
+    meta, points, counts = _flatten_geometries(geoms)
+    d = _stream_deltas(quantize_points(points, scale), counts, global_start_xy)
+    wide_flags = _resolve_wide_flags(d, counts, wide, scale)
+
+    dxy, dxy_off = _packed_segments(zigzag_encode(d.ravel()), [2 * n for n in counts])
+
+    part_sizes = [x for _, ps, _ in meta for x in ps]
+    parts, parts_off = _packed_segments(np.asarray(part_sizes, dtype=np.uint64), [len(ps) for _, ps, _ in meta])
+
+    ring_counts = [x for _, _, rc in meta for x in rc]
+    rings, rings_off = _packed_segments(np.asarray(ring_counts, dtype=np.uint64), [len(rc) for _, _, rc in meta])
+
+    out: List[bytes] = []
+    for i, ((gtype, _, _), is_wide) in enumerate(zip(meta, wide_flags)):
+        chunks: List[bytes] = []
+        if gtype:
+            chunks += (_TAG_TYPE, encode_varint(gtype))
+
+        s, e = dxy_off[i], dxy_off[i + 1]
+        if e > s and not is_wide:
+            chunks += (_TAG_DXY, encode_varint(e - s), dxy[s:e])
+
+        ps, pe = parts_off[i], parts_off[i + 1]
+        if pe > ps:
+            chunks += (_TAG_PART_SIZES, encode_varint(pe - ps), parts[ps:pe])
+
+        rs, re = rings_off[i], rings_off[i + 1]
+        if re > rs:
+            chunks += (_TAG_POLY_RING_COUNTS, encode_varint(re - rs), rings[rs:re])
+
+        if e > s and is_wide:
+            chunks += (_TAG_DXY_WIDE, encode_varint(e - s), dxy[s:e])
+
+        out.append(b"".join(chunks))
+    return out
+
+
+def features_to_wire(
+    feats: List[GeoJSON],
+    geom_blobs: List[bytes],
+    all_props: List[Optional[Dict[str, Any]]],
+    geom_refs: List[int],
+    props_refs: List[int],
+) -> bytes:
+    """
+    The repeated FeatureCollection.features field, with the encoded geometries
+    spliced in front of the other Feature fields (geometry is field 1).
+    """
+    feat_pb = geometry_pb2.Feature()  # reused for the non-geometry fields
+    serialize = feat_pb.SerializeToString
+
+    out: List[bytes] = []
+    append = out.append
+    for f, geom, props, geom_ref, props_ref in zip(feats, geom_blobs, all_props, geom_refs, props_refs):
+        feat_pb.Clear()
+        _fill_feature_fields(feat_pb, f, props, props_ref)
+        if geom_ref:
+            feat_pb.geometry_ref = geom_ref
+            body = serialize()
+        else:
+            body = _TAG_FEATURE_GEOMETRY + encode_varint(len(geom)) + geom + serialize()
+        append(_TAG_COLLECTION_FEATURE)
+        append(encode_varint(len(body)))
+        append(body)
+    return b"".join(out)
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from sfproto.access import _bag_decoder, _file_key, _v7_decoder
+from sfproto.scan import _gather, _last, _walk, scan
+from sfproto.util import copy_geojson, write_atomic
+
+GeoJSON = Dict[str, Any]
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Sidecar index for id lookups in v7 (FCV7 / FCB7) and BAG v3 files.
+#
+#   build_index(path)                    # writes <path>.idx (also: sfproto encode --index)
+#   feat = get_by_id(path, "0363100012345678")
+#
+# Keys are the feature id (v7 Feature.id; BAG "pand.<uuid>") and, for BAG, also the
+# identificatie. The sidecar holds the 64-bit key hashes (FNV-1a) sorted, with the byte range
+# and batch of every feature, plus what is needed to decode one feature on its own
+# (scale and global_start per batch, the v7 dedup tables). A lookup is a binary
+# search in the mmapped sidecar and one small parse in the mmapped data file;
+# hash collisions are resolved by comparing the decoded feature.
+#
+# The sidecar records size and mtime of the data file; get_by_id (re)builds a missing
+# or stale sidecar on the first lookup (sfproto.serve does not, it only reads them). Delta segments appended to a batched file are not
+# indexed: append_delta re-stamps the sidecar and lookups check the (cached) net
+# change of the segments first (see geojson_delta.py).
+#
+# Layout (little endian):
+#   header | batches (_BATCH) | shared rows (_SHARED) | hashes (uint64, sorted) | entries (_ENTRY)
+# (the hashes are a contiguous array of their own, so a lookup only touches log2(n) pages)
+
+INDEX_SUFFIX = ".idx"
+
+_MAGIC = b"SFIX"
+_VERSION = 2  # 2: BAG schema revision per batch
+# magic, version, size, mtime_ns, format, entries, batches, shared rows (padded: all sections 8-byte aligned)
+_HEADER = struct.Struct("<4sIQqIQII4x")
+
+_FORMATS = ("v7", "v7_batched", "bag_v3")
+
+_BATCH = np.dtype([
+    ("srid", "<u4"), ("scale", "<u4"), ("x", "<i8"), ("y", "<i8"),
+    ("geometries_start", "<u4"), ("geometries", "<u4"), ("properties_start", "<u4"), ("properties", "<u4"),
+    ("revision", "<u4"), ("reserved", "<u4"),
+])
+_SHARED = np.dtype([("offset", "<u8"), ("length", "<u8")])
+_ENTRY = np.dtype([("offset", "<u8"), ("length", "<u4"), ("batch", "<u4")])
+
+_FNV_OFFSET = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+_U64 = (1 << 64) - 1
+
+
+def index_path(path: PathLike) -> str:
+    return os.fspath(path) + INDEX_SUFFIX
+
+
+def _hash_key(key: str) -> int:
+    # 64-bit FNV-1a of the utf-8 key
+    h = _FNV_OFFSET
+    for byte in key.encode("utf-8"):
+        h = ((h ^ byte) * _FNV_PRIME) & _U64
+    return h
+
+
+def _hash_keys(keys: List[str]) -> np.ndarray:
+    # _hash_key of many keys, one column (byte position) at a time
+    raw = [k.encode("utf-8") for k in keys]
+    lengths = np.fromiter(map(len, raw), dtype=np.int64, count=len(raw))
+    width = int(lengths.max()) if len(raw) else 0
+    chars = np.array(raw, dtype=f"S{max(width, 1)}").view(np.uint8).reshape(len(raw), -1)
+
+    h = np.full(len(raw), _FNV_OFFSET, dtype=np.uint64)
+    prime = np.uint64(_FNV_PRIME)
+    with np.errstate(over="ignore"):
+        for k in range(width):
+            mixed = (h ^ chars[:, k]) * prime
+            h = np.where(lengths > k, mixed, h)
+    return h
+
+
+# -------------------- build --------------------
+
+def _feature_keys(buf, b: np.ndarray, table: Dict[str, Any]) -> Tuple[np.ndarray, List[str]]:
+    # (feature index, key) for every key of every feature
+    off, ln = table["offset"], table["length"]
+    n = len(off)
+    rows: List[int] = []
+    keys: List[str] = []
+
+    if table["format"] == "bag_v3":
+        from sfproto.geojson.v3_BAG.geojson_bag import _uuid_bytes_to_feature_id
+        from sfproto.geojson.v4_BAG.geojson_bag import _format_uuids
+
+        # PandFeature: uuid = 1, properties = 2 -> PandProperties: identificatie = 1
+        feat = _walk(b, off, off + ln, (0x0A, 0x12))
+        uuid = _last(n, feat[0x0A], 0)
+        props = _last(n, feat[0x12], 0)
+        ident = _last(n, _walk(b, props[:, 0], props[:, 0] + props[:, 1], (0x08,))[0x08], -1)
+
+        # the regular 16-byte uuids formatted in one go
+        ids: List[Optional[str]] = [None] * n  # other lengths: formatted one by one
+        regular = np.flatnonzero(uuid[:, 1] == 16)
+        blob = _gather(b, uuid[regular, 0], uuid[regular, 1]).tobytes()
+        for i, fid in zip(regular.tolist(), _format_uuids(blob, len(regular))):
+            ids[i] = fid
+        for i, ((s, m), ident_i) in enumerate(zip(uuid.tolist(), ident.tolist())):
+            if m:
+                rows.append(i)
+                keys.append(ids[i] or _uuid_bytes_to_feature_id(bytes(buf[s:s + m])))
+            if ident_i >= 0:
+                rows.append(i)
+                keys.append(f"{ident_i:016d}")
+    else:
+        # Feature: id = 3
+        fid = _last(n, _walk(b, off, off + ln, (0x1A,))[0x1A], 0)
+        for i, (s, m) in enumerate(fid.tolist()):
+            if m:
+                rows.append(i)
+                keys.append(bytes(buf[s:s + m]).decode("utf-8"))
+
+    return np.asarray(rows, dtype=np.int64), keys
+
+
+def _index_bytes(buf, st: os.stat_result) -> bytes:
+    table = scan(buf)
+    rows, keys = _feature_keys(buf, np.frombuffer(buf, dtype=np.uint8), table)
+
+    hashes = _hash_keys(keys)
+    order = np.argsort(hashes, kind="stable")
+    rows = rows[order]
+    entries = np.empty(len(keys), dtype=_ENTRY)
+    entries["offset"] = table["offset"][rows]
+    entries["length"] = table["length"][rows]
+    entries["batch"] = table["batch"][rows]
+
+    batches = np.zeros(len(table["batches"]), dtype=_BATCH)
+    shared: List[np.ndarray] = []
+    n_shared = 0
+    for rec, info in zip(batches, table["batches"]):
+        rec["srid"], rec["scale"] = info["srid"], info["scale"]
+        rec["x"], rec["y"] = info["global_start"]
+        rec["revision"] = info.get("revision", 0)
+        for name in ("geometries", "properties"):
+            rows_i = info.get("shared_" + name, np.zeros((0, 2), dtype=np.int64))
+            rec[name + "_start"], rec[name] = n_shared, len(rows_i)
+            shared.append(rows_i)
+            n_shared += len(rows_i)
+    shared_rows = np.zeros(n_shared, dtype=_SHARED)
+    if n_shared:
+        rows_all = np.concatenate(shared)
+        shared_rows["offset"], shared_rows["length"] = rows_all[:, 0], rows_all[:, 1]
+
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, st.st_size, st.st_mtime_ns, _FORMATS.index(table["format"]),
+        len(entries), len(batches), n_shared,
+    )
+    return header + batches.tobytes() + shared_rows.tobytes() + hashes[order].tobytes() + entries.tobytes()
+
+
+def build_index(path: PathLike) -> str:
+    """
+    Write the sidecar index of a data file; returns its path.
+    """
+    out = index_path(path)
+    error: Optional[str] = None
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if st.st_size == 0:
+            raise ValueError("Invalid payload: empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            try:
+                blob = _index_bytes(mm, st)
+            except ValueError as e:
+                # re-raised once the mmap is closed: the traceback holds views of it
+                error = str(e)
+    if error is not None:
+        raise ValueError(error)
+
+    write_atomic(out, blob)
+    return out
+
+
+def refresh_index(path: PathLike, before: os.stat_result, after: os.stat_result) -> bool:
+    """
+    Re-stamp a sidecar that matched the data file before frames were appended to it
+    (stat results before and after); returns whether there was one.
+    """
+    try:
+        f = open(index_path(path), "r+b")
+    except FileNotFoundError:
+        return False
+    with f:
+        head = f.read(_HEADER.size)
+        if len(head) < _HEADER.size:
+            return False
+        header = list(_HEADER.unpack(head))
+        if header[0] != _MAGIC or header[1] != _VERSION or header[2:4] != [before.st_size, before.st_mtime_ns]:
+            return False
+        header[2:4] = [after.st_size, after.st_mtime_ns]
+        f.seek(0)
+        f.write(_HEADER.pack(*header))
+    return True
+
+
+# -------------------- lookup --------------------
+
+def _read_header(mm: mmap.mmap) -> Optional[Tuple[int, ...]]:
+    if len(mm) < _HEADER.size:
+        return None
+    header = _HEADER.unpack_from(mm, 0)
+    if header[0] != _MAGIC or header[1] != _VERSION:
+        return None
+    return header
+
+
+def _sections(mm: mmap.mmap, header: Tuple[int, ...]) -> Tuple[np.ndarray, ...]:
+    _, _, _, _, _, n_entries, n_batches, n_shared = header
+    pos = _HEADER.size
+    batches = np.frombuffer(mm, dtype=_BATCH, count=n_batches, offset=pos)
+    pos += batches.nbytes
+    shared = np.frombuffer(mm, dtype=_SHARED, count=n_shared, offset=pos)
+    pos += shared.nbytes
+    hashes = np.frombuffer(mm, dtype="<u8", count=n_entries, offset=pos)
+    pos += hashes.nbytes
+    entries = np.frombuffer(mm, dtype=_ENTRY, count=n_entries, offset=pos)
+    return batches, shared, hashes, entries
+
+
+def _batch_info(batches: np.ndarray, shared: np.ndarray) -> List[Dict[str, Any]]:
+    # the per-batch part of a scan table, as the single-feature decoders need it
+    rows = np.column_stack((shared["offset"], shared["length"])).astype(np.int64)
+    out: List[Dict[str, Any]] = []
+    for rec in batches:
+        g0, p0 = int(rec["geometries_start"]), int(rec["properties_start"])
+        out.append({
+            "srid": int(rec["srid"]),
+            "scale": int(rec["scale"]),
+            "global_start": (int(rec["x"]), int(rec["y"])),
+            "revision": int(rec["revision"]),
+            "shared_geometries": rows[g0:g0 + int(rec["geometries"])],
+            "shared_properties": rows[p0:p0 + int(rec["properties"])],
+        })
+    return out
+
+
+def _matches(feat: GeoJSON, key: str) -> bool:
+    if str(feat.get("id")) == key:
+        return True
+    props = feat.get("properties") or {}
+    return props.get("identificatie") == key
+
+
+def _lookup(data: mmap.mmap, idx: mmap.mmap, header: Tuple[int, ...], key: str) -> Optional[GeoJSON]:
+    batches, shared, hashes, entries = _sections(idx, header)
+    h = np.uint64(_hash_key(key))
+    lo = int(np.searchsorted(hashes, h, side="left"))
+    hi = int(np.searchsorted(hashes, h, side="right"))
+    if lo == hi:
+        return None
+
+    candidates = entries[lo:hi]
+    table = {
+        "offset": candidates["offset"].astype(np.int64),
+        "length": candidates["length"].astype(np.int64),
+        "batch": candidates["batch"].astype(np.int64),
+        "batches": _batch_info(batches, shared),
+    }
+    fmt = _FORMATS[header[4]]
+    decode = _bag_decoder(data, table) if fmt == "bag_v3" else _v7_decoder(data, table)
+    for i in range(hi - lo):
+        feat = decode(i)
+        if _matches(feat, key):
+            return feat
+    return None
+
+
+def _open_index(path: PathLike, size: int, mtime_ns: int):
+    # mmapped sidecar matching the data file (size, mtime), or None
+    try:
+        f = open(index_path(path), "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header = _read_header(mm)
+    if header is None or header[2] != size or header[3] != mtime_ns:
+        mm.close()
+        return None
+    return mm, header
+
+
+def _find(
+    path: PathLike, data: mmap.mmap, key: Tuple[str, int, int], feature_id: Any, build: bool,
+) -> Optional[GeoJSON]:
+    # get_by_id on a data file that is already mmapped (key: access._file_key of it).
+    # Without build a missing or stale sidecar raises FileNotFoundError.
+    from sfproto.geojson.v7.geojson import _TAG_FCB7, _TAG_LEN
+    from sfproto.geojson.v7.geojson_delta import file_delta_state
+
+    _, mtime_ns, size = key
+    fid = str(feature_id)
+    # net change of the delta segments of a batched v7 file first
+    state = file_delta_state(key, data) if data[:_TAG_LEN] == _TAG_FCB7 else None
+    if state is not None and fid in state["replace"]:
+        feat = state["replace"][fid]
+        return None if feat is None else copy_geojson(feat)
+
+    opened = _open_index(path, size, mtime_ns)
+    if opened is None:
+        if not build:
+            raise FileNotFoundError(f"No up-to-date index for {os.fspath(path)!r} (build_index)")
+        build_index(path)
+        opened = _open_index(path, size, mtime_ns)
+        if opened is None:
+            raise ValueError(f"Could not build a valid index for {os.fspath(path)!r}")
+
+    idx, header = opened
+    with idx:
+        return _lookup(data, idx, header, fid)
+
+
+def get_by_id(path: PathLike, feature_id: Any) -> Optional[GeoJSON]:
+    """
+    Feature with the given id (BAG: also identificatie), or None.
+    Builds the sidecar index first when it is missing or stale.
+    """
+    with open(path, "rb") as f:
+        key = _file_key(path, f)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _find(path, data, key, feature_id, build=True)
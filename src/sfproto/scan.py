@@ -0,0 +1,498 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from sfproto.spatial import segment_bboxes
+from sfproto.wire import varint_unpack, zigzag_decode
+
+PathLike = Union[str, "os.PathLike[str]"]
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# Wire scanner: per-feature offsets, lengths, vertex counts and bboxes of a v7
+# (FCV7 / FCB7) or BAG v3 (PandFeatureCollection) payload, without parsing it into
+# protobuf messages. Only the feature boundaries are found in a Python loop; the
+# fields inside the features are walked for all features at once (one NumPy round
+# per field, everything not needed is skipped) and the coordinate deltas of all
+# features are decoded in one vectorized pass (sfproto.wire).
+#
+#   table = scan(data)          # or scan_file(path), which uses mmap
+#   table["offset"], table["length"]   # Feature message bytes: data[offset:offset + length]
+#   table["vertices"]                  # stored vertices (closing points of rings are implicit)
+#   table["bbox"]                      # (n, 4) minx, miny, maxx, maxy; NaN without geometry
+#   table["batch"]                     # index into table["batches"] (srid, scale, global_start, ...)
+#
+# Offsets are absolute positions in data, so a feature can be parsed on its own
+# (Feature.FromString); its coordinates are relative to the global_start of its batch.
+# Columnar BAG v4 payloads are not scanned: their batches are column arrays already.
+
+_TAG_LEN = 4
+_TAG_FC7 = b"FCV7"
+_TAG_FCB7 = b"FCB7"
+
+_U32 = struct.Struct(">I")
+
+_WT_VARINT = 0
+_WT_I64 = 1
+_WT_LEN = 2
+_WT_I32 = 5
+
+_MAX_VARINT_LEN = 10
+
+
+# -------------------- wire primitives (scalar) --------------------
+
+def _varint(buf, pos: int) -> Tuple[int, int]:
+    b = buf[pos]
+    if b < 0x80:
+        return b, pos + 1
+    value, shift = b & 0x7F, 7
+    while True:
+        pos += 1
+        b = buf[pos]
+        value |= (b & 0x7F) << shift
+        if b < 0x80:
+            return value, pos + 1
+        shift += 7
+        if shift >= 70:
+            raise ValueError("Invalid payload: varint too long")
+
+
+def _skip(buf, pos: int, wire_type: int) -> int:
+    if wire_type == _WT_VARINT:
+        return _varint(buf, pos)[1]
+    if wire_type == _WT_LEN:
+        n, pos = _varint(buf, pos)
+        return pos + n
+    if wire_type == _WT_I64:
+        return pos + 8
+    if wire_type == _WT_I32:
+        return pos + 4
+    raise ValueError(f"Invalid payload: unsupported wire type {wire_type}")
+
+
+def _zigzag(u: int) -> int:
+    return (u >> 1) ^ -(u & 1)
+
+
+def _coordinate(buf, pos: int, end: int) -> Tuple[int, int]:
+    # CoordinateQ / CoordinateQ64: sint x = 1, sint y = 2
+    x = y = 0
+    while pos < end:
+        key, pos = _varint(buf, pos)
+        if key == 0x08:
+            u, pos = _varint(buf, pos)
+            x = _zigzag(u)
+        elif key == 0x10:
+            u, pos = _varint(buf, pos)
+            y = _zigzag(u)
+        else:
+            pos = _skip(buf, pos, key & 7)
+    return x, y
+
+
+def _crs(buf, pos: int, end: int) -> Tuple[int, int]:
+    # Crs: uint32 srid = 1, uint32 scale = 2
+    srid = scale = 0
+    while pos < end:
+        key, pos = _varint(buf, pos)
+        if key == 0x08:
+            srid, pos = _varint(buf, pos)
+        elif key == 0x10:
+            scale, pos = _varint(buf, pos)
+        else:
+            pos = _skip(buf, pos, key & 7)
+    return srid, scale
+
+
+# -------------------- vectorized helpers --------------------
+
+def _varints_at(b: np.ndarray, pos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # the varint starting at every position -> (values, positions after them)
+    value = np.zeros(pos.size, dtype=np.int64)
+    todo = np.arange(pos.size)
+    for k in range(_MAX_VARINT_LEN):
+        p = pos[todo] + k
+        if p.size and p.max() >= b.size:
+            raise ValueError("Invalid payload: truncated varint")
+        byte = b[p]
+        value[todo] |= (byte & 0x7F).astype(np.int64) << (7 * k)
+        more = byte >= 0x80
+        done = todo[~more]
+        pos_done = p[~more] + 1
+        if k == 0:
+            after = np.empty_like(pos)
+        after[done] = pos_done
+        todo = todo[more]
+        if not todo.size:
+            return value, after
+    raise ValueError("Invalid payload: varint too long")
+
+
+def _walk(b: np.ndarray, pos: np.ndarray, end: np.ndarray, keys: Tuple[int, ...]) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Walk the fields of many messages at once (one round per field). For every
+    wanted key (field number << 3 | wire type): (message index, value) per occurrence,
+    in message order; the value of a length-delimited field is (body start, body length)
+    as an (n, 2) array. Other fields are skipped.
+    """
+    found: Dict[int, List[Tuple[np.ndarray, np.ndarray]]] = {k: [] for k in keys}
+    p, e = pos.astype(np.int64), end.astype(np.int64)
+    msg = np.flatnonzero(p < e)
+    p, e = p[msg], e[msg]
+    while msg.size:
+        key, p = _varints_at(b, p)
+        wt = key & 7
+        value = np.zeros(p.size, dtype=np.int64)
+        varlen = (wt == _WT_VARINT) | (wt == _WT_LEN)
+        value[varlen], p[varlen] = _varints_at(b, p[varlen])
+        if not np.isin(wt, (_WT_VARINT, _WT_I64, _WT_LEN, _WT_I32)).all():
+            raise ValueError("Invalid payload: unsupported wire type")
+
+        for k in keys:
+            hit = key == k
+            if hit.any():
+                v = np.column_stack((p[hit], value[hit])) if k & 7 == _WT_LEN else value[hit]
+                found[k].append((msg[hit], v))
+
+        p += np.where(wt == _WT_LEN, value, 0) + np.where(wt == _WT_I64, 8, 0) + np.where(wt == _WT_I32, 4, 0)
+        if (p > e).any():
+            raise ValueError("Invalid payload: truncated message")
+        more = p < e
+        msg, p, e = msg[more], p[more], e[more]
+
+    out: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    for k, parts in found.items():
+        width = (0, 2) if k & 7 == _WT_LEN else (0,)
+        if not parts:
+            out[k] = (np.zeros(0, dtype=np.int64), np.zeros(width, dtype=np.int64))
+            continue
+        m = np.concatenate([m for m, _ in parts])
+        v = np.concatenate([v for _, v in parts])
+        order = np.argsort(m, kind="stable")  # occurrences of one message in field order
+        out[k] = (m[order], v[order])
+    return out
+
+
+def _last(n: int, found: Tuple[np.ndarray, np.ndarray], default) -> np.ndarray:
+    # per message: value of the last occurrence of a (singular) field
+    m, v = found
+    out = np.full((n,) + v.shape[1:], default, dtype=np.int64)
+    out[m] = v  # in field order, so the last occurrence wins (as in protobuf)
+    return out
+
+
+def _gather(b: np.ndarray, starts: List[int], lengths: List[int]) -> np.ndarray:
+    # concatenation of the byte ranges b[s:s + n] (packed field bodies end on a varint boundary)
+    n = np.asarray(lengths, dtype=np.int64)
+    if n.size == 0 or not n.any():
+        return np.zeros(0, dtype=np.uint8)
+    s = np.asarray(starts, dtype=np.int64)
+    out_starts = np.cumsum(n) - n
+    idx = np.arange(int(n.sum()), dtype=np.int64) + np.repeat(s - out_starts, n)
+    return b[idx]
+
+
+def _values_per_range(packed: np.ndarray, lengths: List[int]) -> np.ndarray:
+    # number of varints in every range of a _gather result
+    n = np.asarray(lengths, dtype=np.int64)
+    counts = np.zeros(n.size, dtype=np.int64)
+    nonempty = n > 0
+    if nonempty.any():
+        ends = (packed < 0x80).astype(np.int64)
+        counts[nonempty] = np.add.reduceat(ends, (np.cumsum(n) - n)[nonempty])
+    return counts
+
+
+def _segment_extents(d: np.ndarray, counts: np.ndarray, start_xy: np.ndarray) -> np.ndarray:
+    """
+    d: (n, 2) deltas of consecutive segments (counts[i] points each); the first delta of
+    every segment is relative to start_xy[i]. Returns (len(counts), 4) quantized bbox
+    (NaN for empty segments).
+    """
+    nonempty = counts > 0
+    first = (np.cumsum(counts) - counts)[nonempty]
+
+    c = np.cumsum(d, axis=0)
+    base = np.zeros((counts.size, 2), dtype=np.int64)
+    base[nonempty] = c[first] - d[first]  # running sum before the segment
+    xy = c - np.repeat(base - start_xy, counts, axis=0)
+
+    out = segment_bboxes(xy, counts).astype(np.float64)
+    out[~nonempty] = np.nan
+    return out
+
+
+def _empty_table() -> Dict[str, Any]:
+    return {
+        "offset": np.zeros(0, dtype=np.int64),
+        "length": np.zeros(0, dtype=np.int64),
+        "vertices": np.zeros(0, dtype=np.int64),
+        "bbox": np.zeros((0, 4)),
+        "batch": np.zeros(0, dtype=np.int32),
+    }
+
+
+def _concat_tables(tables: List[Dict[str, Any]], batches: List[Dict[str, Any]], fmt: str) -> Dict[str, Any]:
+    if not tables:
+        out = _empty_table()
+    else:
+        out = {k: np.concatenate([t[k] for t in tables]) for k in tables[0]}
+    out["batches"] = batches
+    out["format"] = fmt
+    return out
+
+
+# -------------------- top-level messages --------------------
+
+def _top_level(buf, pos: int, end: int, repeated_key: int, fields: Dict[int, Any]) -> Tuple[List[int], List[int]]:
+    """
+    Walk a collection message: (body offsets, body lengths) of the repeated
+    message field repeated_key; fields[key](start, end) is called for other wanted
+    length-delimited fields, fields[key](value) for wanted varint fields.
+    This is the only per-feature Python loop.
+    """
+    offsets: List[int] = []
+    lengths: List[int] = []
+    add_offset, add_length = offsets.append, lengths.append
+    while pos < end:
+        key = buf[pos]
+        if key == repeated_key:
+            n = buf[pos + 1]
+            if n < 0x80:
+                pos += 2
+            else:
+                n, pos = _varint(buf, pos + 1)
+            add_offset(pos)
+            add_length(n)
+            pos += n
+            continue
+        key, pos = _varint(buf, pos)
+        handler = fields.get(key)
+        if handler is None:
+            pos = _skip(buf, pos, key & 7)
+        elif key & 7 == 0:
+            value, pos = _varint(buf, pos)
+            handler(value)
+        else:
+            n, pos = _varint(buf, pos)
+            handler(pos, pos + n)
+            pos += n
+    if pos != end:
+        raise ValueError("Invalid payload: truncated message")
+    return offsets, lengths
+
+
+# -------------------- v7 --------------------
+
+def _scan_fc_v7(buf, b: np.ndarray, pos: int, end: int, batch: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    info: Dict[str, Any] = {"srid": 0, "scale": 0, "global_start": (0, 0)}
+    shared: List[Tuple[int, int]] = []
+    shared_props: List[Tuple[int, int]] = []
+
+    def crs(s: int, e: int) -> None:
+        info["srid"], info["scale"] = _crs(buf, s, e)
+
+    def global_start(s: int, e: int) -> None:
+        info["global_start"] = _coordinate(buf, s, e)
+
+    # FeatureCollection: features = 1, crs = 5, global_start = 6, global_start_wide = 8,
+    # shared_geometries = 9, shared_properties = 10
+    offsets, lengths = _top_level(buf, pos, end, 0x0A, {
+        0x2A: crs, 0x32: global_start, 0x42: global_start,
+        0x4A: lambda s, e: shared.append((s, e - s)),
+        0x52: lambda s, e: shared_props.append((s, e - s)),
+    })
+    nf, ns = len(offsets), len(shared)
+    off = np.asarray(offsets, dtype=np.int64)
+    ln = np.asarray(lengths, dtype=np.int64)
+
+    # Feature: geometry = 1, geometry_ref = 6 (a reference wins, like in the decoder)
+    feat = _walk(b, off, off + ln, (0x0A, 0x30))
+    geom = _last(nf, feat[0x0A], 0)
+    ref = _last(nf, feat[0x30], 0)
+    if ref.size and ref.max() > ns:
+        raise ValueError(f"Invalid FeatureCollection: shared table reference {int(ref.max())} out of range")
+
+    # StreamGeometry (inline ones, then the shared table): dxy = 2, dxy_wide = 5
+    geom = np.concatenate([geom, np.asarray(shared, dtype=np.int64).reshape(-1, 2)])
+    sg = _walk(b, geom[:, 0], geom[:, 0] + geom[:, 1], (0x12, 0x2A))
+    body = _last(len(geom), sg[0x12], 0)
+    wide = _last(len(geom), sg[0x2A], 0)
+    body[wide[:, 1] > 0] = wide[wide[:, 1] > 0]  # same varint encoding
+
+    packed = _gather(b, body[:, 0], body[:, 1])
+    values = _values_per_range(packed, body[:, 1])
+    if (values % 2).any():
+        raise ValueError("Invalid StreamGeometry: dxy length must be even")
+    d = zigzag_decode(varint_unpack(packed)).reshape(-1, 2)
+    counts = values // 2
+    extents = _segment_extents(d, counts, np.asarray(info["global_start"], dtype=np.int64))
+
+    src = np.where(ref > 0, nf + ref - 1, np.arange(nf))
+    scale = info["scale"]
+    table = {
+        "offset": off,
+        "length": ln,
+        "vertices": counts[src],
+        "bbox": extents[src] / scale if scale else extents[src],
+        "batch": np.full(nf, batch, dtype=np.int32),
+    }
+    # dedup tables, (offset, length) per entry; needed to decode single features
+    info["features"] = nf
+    info["shared_geometries"] = np.asarray(shared, dtype=np.int64).reshape(-1, 2)
+    info["shared_properties"] = np.asarray(shared_props, dtype=np.int64).reshape(-1, 2)
+    return table, info
+
+
+def _fcv7_payload(buf, offset: int, end: int) -> Tuple[int, int]:
+    # FCV7 envelope: tag | uint32 chunk count (1) | uint32 length | FeatureCollection
+    if end - offset < _TAG_LEN + 2 * _U32.size:
+        raise ValueError("Invalid payload: too short")
+    (count,) = _U32.unpack_from(buf, offset + _TAG_LEN)
+    (n,) = _U32.unpack_from(buf, offset + _TAG_LEN + _U32.size)
+    pos = offset + _TAG_LEN + 2 * _U32.size
+    if count != 1 or pos + n != end:
+        raise ValueError("Invalid FCV7 payload: expected one chunk")
+    return pos, pos + n
+
+
+def _indexable(data: Buffer):
+    # bytes and mmap index faster than a memoryview
+    return data if isinstance(data, (bytes, mmap.mmap)) else memoryview(data)
+
+
+def scan_v7(data: Buffer) -> Dict[str, Any]:
+    """
+    Scan a v7 FeatureCollection payload (FCV7, or batched FCB7).
+    """
+    mv = _indexable(data)
+    b = np.frombuffer(mv, dtype=np.uint8)
+    tag = bytes(mv[:_TAG_LEN])
+
+    if tag == _TAG_FC7:
+        start, end = _fcv7_payload(mv, 0, len(mv))
+        table, info = _scan_fc_v7(mv, b, start, end, 0)
+        info.update(offset=start, length=end - start)
+        return _concat_tables([table], [info], "v7")
+
+    if tag == _TAG_FCB7:
+        from sfproto.geojson.v7.geojson_batched import iter_frames
+
+        tables: List[Dict[str, Any]] = []
+        batches: List[Dict[str, Any]] = []
+        for offset, blob in iter_frames(data):
+            if bytes(blob[:_TAG_LEN]) != _TAG_FC7:
+                continue  # metadata frame
+            start, end = _fcv7_payload(mv, offset, offset + len(blob))
+            table, info = _scan_fc_v7(mv, b, start, end, len(batches))
+            info.update(offset=start, length=end - start)
+            tables.append(table)
+            batches.append(info)
+        return _concat_tables(tables, batches, "v7_batched")
+
+    raise ValueError(f"Expected v7 FeatureCollection payload (FCV7/FCB7), got tag {tag!r}")
+
+
+# -------------------- BAG v3 --------------------
+
+def scan_bag(data: Buffer) -> Dict[str, Any]:
+    """
+    Scan a BAG v3 PandFeatureCollection payload.
+    """
+    from sfproto.geojson.v3_BAG.geojson_bag import DEFAULT_SCALE as BAG_DEFAULT_SCALE
+
+    mv = _indexable(data)
+    b = np.frombuffer(mv, dtype=np.uint8)
+    end = len(mv)
+    info: Dict[str, Any] = {
+        "srid": 0, "scale": BAG_DEFAULT_SCALE, "global_start": (0, 0), "offset": 0, "length": end, "revision": 0,
+    }
+
+    def crs(s: int, e: int) -> None:
+        info["srid"], info["scale"] = _crs(mv, s, e)
+
+    def revision(value: int) -> None:
+        info["revision"] = value
+
+    # PandFeatureCollection: crs = 1, features = 3, revision = 5
+    offsets, lengths = _top_level(mv, 0, end, 0x1A, {0x0A: crs, 0x28: revision})
+    nf = len(offsets)
+    off = np.asarray(offsets, dtype=np.int64)
+    ln = np.asarray(lengths, dtype=np.int64)
+
+    # PandFeature: geometry = 4 -> Polygon: rings = 1 (repeated)
+    poly = _last(nf, _walk(b, off, off + ln, (0x22,))[0x22], 0)
+    ring_feature, ring = _walk(b, poly[:, 0], poly[:, 0] + poly[:, 1], (0x0A,))[0x0A]
+    nr = len(ring)
+
+    # DeltaRing: start = 1 (CoordinateQ: x = 1, y = 2), dx = 2, dy = 3
+    parts = _walk(b, ring[:, 0], ring[:, 0] + ring[:, 1], (0x0A, 0x12, 0x1A))
+    start = _last(nr, parts[0x0A], 0)
+    dx, dy = _last(nr, parts[0x12], 0), _last(nr, parts[0x1A], 0)
+    xy = _walk(b, start[:, 0], start[:, 0] + start[:, 1], (0x08, 0x10))
+    start_xy = np.column_stack((_last(nr, xy[0x08], 0), _last(nr, xy[0x10], 0)))
+    start_xy = zigzag_decode(start_xy.view(np.uint64))
+
+    dx_packed, dy_packed = _gather(b, dx[:, 0], dx[:, 1]), _gather(b, dy[:, 0], dy[:, 1])
+    n_dx = _values_per_range(dx_packed, dx[:, 1])
+    if not np.array_equal(n_dx, _values_per_range(dy_packed, dy[:, 1])):
+        raise ValueError("DeltaRing dx/dy length mismatch")
+
+    # every ring as one segment: its start (relative to 0) followed by the deltas
+    counts = n_dx + 1
+    d = np.empty((int(counts.sum()), 2), dtype=np.int64)
+    first = np.cumsum(counts) - counts
+    is_delta = np.ones(len(d), dtype=bool)
+    is_delta[first] = False
+    d[first] = start_xy
+    d[is_delta, 0] = zigzag_decode(varint_unpack(dx_packed))
+    d[is_delta, 1] = zigzag_decode(varint_unpack(dy_packed))
+    ring_extents = _segment_extents(d, counts, np.zeros(2, dtype=np.int64))
+
+    # rings -> features (rings of one feature are consecutive)
+    rc = np.bincount(ring_feature, minlength=nf)
+    vertices = np.zeros(nf, dtype=np.int64)
+    bbox = np.full((nf, 4), np.nan)
+    has_rings = rc > 0
+    if has_rings.any():
+        first_ring = (np.cumsum(rc) - rc)[has_rings]
+        vertices[has_rings] = np.add.reduceat(counts, first_ring)
+        bbox[has_rings, 0:2] = np.minimum.reduceat(ring_extents[:, 0:2], first_ring, axis=0)
+        bbox[has_rings, 2:4] = np.maximum.reduceat(ring_extents[:, 2:4], first_ring, axis=0)
+
+    scale = info["scale"]
+    table = {
+        "offset": off,
+        "length": ln,
+        "vertices": vertices,
+        "bbox": bbox / scale if scale else bbox,
+        "batch": np.zeros(nf, dtype=np.int32),
+    }
+    info["features"] = nf
+    return _concat_tables([table], [info], "bag_v3")
+
+
+# -------------------- entry points --------------------
+
+def scan(data: Buffer) -> Dict[str, Any]:
+    """
+    Scan a v7 (FCV7 / FCB7) or BAG v3 payload (detected by the v7 tag).
+    """
+    tag = bytes(memoryview(data)[:_TAG_LEN])
+    if tag in (_TAG_FC7, _TAG_FCB7):
+        return scan_v7(data)
+    return scan_bag(data)
+
+
+def scan_file(path: PathLike) -> Dict[str, Any]:
+    # mmap: only the pages that are walked are read
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Invalid payload: empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return scan(mm)
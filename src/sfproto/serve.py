@@ -0,0 +1,458 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import mmap
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+from sfproto.access import _bag_decoder, _deltas, _file_key, _patch, _table, _v7_decoder
+from sfproto.index import INDEX_SUFFIX, _find, _open_index, build_index
+from sfproto.spatial import bbox_hits, feature_bboxes
+from sfproto.util import copy_geojson
+
+GeoJSON = Dict[str, Any]
+PathLike = Union[str, "os.PathLike[str]"]
+Response = Tuple[int, Dict[str, str], Union[bytes, memoryview], Optional[Callable[[], None]]]
+CloseFn = Callable[[], Awaitable[None]]
+
+# Local HTTP server for encoded files (sfproto serve <dir>), stdlib asyncio only.
+#
+#   GET /                                  files under the root (JSON)
+#   GET /files/<name>                      the file itself; Range: bytes=... -> 206
+#   GET /files/<name>/features/<i>         feature i (random access, sfproto.access)
+#   GET /files/<name>/ids/<id>             feature by id (sidecar index, sfproto.index)
+#   GET /files/<name>/bbox?bbox=x0,y0,x1,y1[&limit=n]
+#                                          features whose bbox intersects (scan table bboxes)
+#
+# Connections are kept alive (HTTP/1.1, until KEEPALIVE_TIMEOUT idle). Files are
+# served from an LRU of open mmaps (MAX_OPEN_FILES; a file in use by a request is
+# closed when that request is done). Scans and decodes run in a bounded thread pool:
+# at most workers * MAX_PENDING_PER_WORKER jobs are queued, further requests wait.
+# Only the requested features are decoded, never whole files, and the JSON bodies are
+# encoded in the pool too. Delta segments of a batched v7 file apply to every route
+# (see sfproto.access).
+#
+# GETs never write: /ids/<id> answers 404 while a file has no up-to-date sidecar
+# index. Write them beforehand (build_index, sfproto encode --index) or start the
+# server with index=True (sfproto serve --index), which builds the missing and
+# stale ones of the files under root before serving.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+MAX_OPEN_FILES = 32
+MAX_PENDING_PER_WORKER = 4
+MAX_BBOX_FEATURES = 10_000
+KEEPALIVE_TIMEOUT = 15.0
+MAX_HEADER_BYTES = 16 * 1024
+WRITE_CHUNK_SIZE = 1 << 20
+
+_ROUTES = [
+    ("feature", re.compile(r"^/files/(?P<name>.+)/features/(?P<index>-?\d+)$")),
+    ("id", re.compile(r"^/files/(?P<name>.+)/ids/(?P<id>[^/]+)$")),
+    ("bbox", re.compile(r"^/files/(?P<name>.+)/bbox$")),
+    ("file", re.compile(r"^/files/(?P<name>.+)$")),
+]
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+# -------------------- open files --------------------
+
+def _file_cache(max_open: int):
+    # acquire(path) -> entry {"f", "mm", "key", ...}; every acquire needs a release(entry)
+    if max_open <= 0:
+        raise ValueError("max_open must be positive")
+    entries: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+
+    def close(entry: Dict[str, Any]) -> None:
+        entry["mm"].close()
+        entry["f"].close()
+
+    def acquire(path: str) -> Dict[str, Any]:
+        # path: a realpath (see _resolve), so keys are those of access._file_key
+        st = os.stat(path)
+        entry = entries.get((path, st.st_mtime_ns, st.st_size))
+        if entry is None:
+            f = open(path, "rb")
+            try:
+                key = _file_key(path, f)  # of the version that is opened
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except BaseException:
+                f.close()
+                raise
+            entry = entries[key] = {"f": f, "mm": mm, "key": key, "users": 0, "evicted": False}
+        entries.move_to_end(entry["key"])
+        entry["users"] += 1
+        while len(entries) > max_open:
+            _, old = entries.popitem(last=False)
+            old["evicted"] = True
+            if old["users"] == 0:
+                close(old)
+        return entry
+
+    def release(entry: Dict[str, Any]) -> None:
+        entry["users"] -= 1
+        if entry["evicted"] and entry["users"] == 0:
+            close(entry)
+
+    def close_all() -> None:
+        while entries:
+            _, entry = entries.popitem()
+            entry["evicted"] = True
+            if entry["users"] == 0:
+                close(entry)
+
+    return acquire, release, close_all
+
+
+# -------------------- requests --------------------
+
+def _resolve(root: str, name: str) -> str:
+    # a file under root (no escaping it with .. or symlinks)
+    path = os.path.realpath(os.path.join(root, unquote(name)))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        raise FileNotFoundError(name)
+    return path
+
+
+def _parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range header -> (start, stop); None = serve the whole file (no / unsupported range).
+    Raises ValueError when the range cannot be satisfied.
+    """
+    m = _RANGE.match(value.strip())
+    if m is None:
+        return None  # e.g. several ranges: answered with the whole file
+    first, last = m.groups()
+    if not first and not last:
+        return None
+    if not first:
+        n = int(last)
+        if n == 0:
+            raise ValueError("empty suffix range")
+        return max(size - n, 0), size
+    start = int(first)
+    stop = min(int(last) + 1, size) if last else size
+    if start >= size or stop <= start:
+        raise ValueError("range not satisfiable")
+    return start, stop
+
+
+def _json(status: int, obj: Any, content_type: str = "application/json") -> Response:
+    body = json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return status, {"Content-Type": content_type}, body, None
+
+
+def _error(status: int, message: str) -> Response:
+    return _json(status, {"error": message})
+
+
+def _decoder(mm: mmap.mmap, table: Dict[str, Any]):
+    return _bag_decoder(mm, table) if table["format"] == "bag_v3" else _v7_decoder(mm, table)
+
+
+def _feature_at(entry: Dict[str, Any], i: int) -> GeoJSON:
+    table = _table(entry["key"], entry["mm"])
+    n = len(table["offset"])
+    if not -n <= i < n:
+        raise IndexError(f"feature index {i} out of range ({n} features)")
+    return _patch(_decoder(entry["mm"], table)(i % n), _deltas(entry["key"], entry["mm"], table), i)
+
+
+def _features_in_bbox(entry: Dict[str, Any], bbox: Tuple[float, ...], limit: int) -> GeoJSON:
+    # base features by their scanned bbox, then the delta features (replacements, new) that intersect
+    table = _table(entry["key"], entry["mm"])
+    state = _deltas(entry["key"], entry["mm"], table)
+    replace = state["replace"] if state is not None else {}
+    decode = _decoder(entry["mm"], table)
+
+    def candidates():
+        for i in np.flatnonzero(bbox_hits(table["bbox"], bbox)):
+            feat = decode(int(i))
+            if feat.get("id") not in replace:
+                yield feat
+        if state is not None:
+            extra = [f for f in replace.values() if f is not None] + state["added"]
+            extra = [f for f in extra if isinstance(f.get("geometry"), dict)]
+            if extra:
+                for feat, hit in zip(extra, bbox_hits(feature_bboxes(extra), bbox).tolist()):
+                    if hit:
+                        yield copy_geojson(feat)
+
+    feats = list(itertools.islice(candidates(), limit + 1))
+    out: GeoJSON = {"type": "FeatureCollection", "features": feats[:limit]}
+    if len(feats) > limit:
+        out["truncated"] = True
+    return out
+
+
+def _bbox_query(query: str) -> Tuple[Tuple[float, ...], int]:
+    params = parse_qs(query)
+    try:
+        bbox = tuple(float(v) for v in params["bbox"][0].split(","))
+        limit = int(params.get("limit", [MAX_BBOX_FEATURES])[0])
+    except (KeyError, ValueError):
+        raise ValueError("expected ?bbox=minx,miny,maxx,maxy[&limit=n]")
+    if len(bbox) != 4 or not 0 < limit <= MAX_BBOX_FEATURES:
+        raise ValueError(f"expected 4 bbox values and 0 < limit <= {MAX_BBOX_FEATURES}")
+    return bbox, limit
+
+
+def _geojson(fn: Callable[..., Any], *args: Any) -> Response:
+    # fn(*args) as a GeoJSON response, decoded and encoded in a worker
+    return _json(200, fn(*args), "application/geo+json")
+
+
+def _feature_by_id(entry: Dict[str, Any], feature_id: str) -> GeoJSON:
+    feat = _find(entry["key"][0], entry["mm"], entry["key"], feature_id, build=False)
+    if feat is None:
+        raise FileNotFoundError(f"no feature with id {feature_id!r}")
+    return feat
+
+
+def _listing(root: str) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for folder, _, names in os.walk(root):
+        for name in sorted(names):
+            if name.endswith((INDEX_SUFFIX, ".tmp")):
+                continue
+            path = os.path.join(folder, name)
+            out.append({"name": os.path.relpath(path, root).replace(os.sep, "/"), "size": os.path.getsize(path)})
+    return out
+
+
+def _build_indexes(root: str) -> None:
+    # sidecar index of every v7 / BAG v3 file under root that lacks an up-to-date one
+    for item in _listing(root):
+        path = os.path.join(root, item["name"])
+        st = os.stat(path)
+        opened = _open_index(path, st.st_size, st.st_mtime_ns)
+        if opened is not None:
+            opened[0].close()
+            continue
+        try:
+            build_index(path)
+        except ValueError:
+            pass  # not a v7 / BAG v3 file
+
+
+def _handler(root: str, workers: int, max_open: int):
+    # (handle(method, target, headers) -> Response, close())
+    root = os.path.realpath(root)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sfproto-serve")
+    slots = asyncio.Semaphore(workers * MAX_PENDING_PER_WORKER)
+    acquire, release, close_all = _file_cache(max_open)
+
+    async def run(fn, *args):
+        async with slots:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    def serve_file(entry: Dict[str, Any], headers: Dict[str, str]) -> Response:
+        size = len(entry["mm"])
+        out = {"Content-Type": "application/octet-stream", "Accept-Ranges": "bytes"}
+        try:
+            rng = _parse_range(headers["range"], size) if "range" in headers else None
+        except ValueError:
+            release(entry)
+            return 416, {**out, "Content-Range": f"bytes */{size}"}, b"", None
+        start, stop = rng if rng is not None else (0, size)
+        body = memoryview(entry["mm"])[start:stop]
+
+        def done() -> None:
+            body.release()
+            release(entry)
+
+        if rng is None:
+            return 200, out, body, done
+        return 206, {**out, "Content-Range": f"bytes {start}-{stop - 1}/{size}"}, body, done
+
+    async def handle(method: str, target: str, headers: Dict[str, str]) -> Response:
+        if method not in ("GET", "HEAD"):
+            return _error(405, f"method {method} not allowed")
+        url = urlsplit(target)
+        if url.path in ("/", "/files", "/files/"):
+            return await run(lambda: _json(200, {"files": _listing(root)}))
+
+        for route, pattern in _ROUTES:
+            m = pattern.match(url.path)
+            if m is not None:
+                break
+        else:
+            return _error(404, f"no such endpoint: {url.path}")
+
+        entry = acquire(_resolve(root, m["name"]))
+        if route == "file":
+            return serve_file(entry, headers)
+        try:
+            if route == "feature":
+                return await run(_geojson, _feature_at, entry, int(m["index"]))
+            if route == "id":
+                return await run(_geojson, _feature_by_id, entry, unquote(m["id"]))
+            bbox, limit = _bbox_query(url.query)
+            return await run(_geojson, _features_in_bbox, entry, bbox, limit)
+        finally:
+            release(entry)
+
+    async def safe_handle(method: str, target: str, headers: Dict[str, str]) -> Response:
+        try:
+            return await handle(method, target, headers)
+        except (FileNotFoundError, IndexError) as e:
+            return _error(404, str(e) or "not found")
+        except ValueError as e:
+            return _error(400, str(e))
+        except Exception as e:  # keep serving; the client gets the message
+            return _error(500, f"{type(e).__name__}: {e}")
+
+    def close() -> None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        close_all()
+
+    return safe_handle, close
+
+
+# -------------------- connections --------------------
+
+def _parse_head(head: bytes) -> Optional[Tuple[str, str, str, Dict[str, str]]]:
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        return None
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            return None
+        headers[name.strip().lower()] = value.strip()
+    return parts[0], parts[1], parts[2], headers
+
+
+def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+async def _write_response(writer: asyncio.StreamWriter, response: Response, head_only: bool, keep_alive: bool) -> None:
+    status, headers, body, done = response
+    try:
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        headers = {**headers, "Content-Length": str(len(body)), "Connection": "keep-alive" if keep_alive else "close"}
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head_only:
+            for pos in range(0, len(body), WRITE_CHUNK_SIZE):
+                writer.write(body[pos:pos + WRITE_CHUNK_SIZE])
+                await writer.drain()
+        await writer.drain()
+    finally:
+        if done is not None:
+            done()
+
+
+async def _connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, handle) -> None:
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+            except asyncio.LimitOverrunError:
+                await _write_response(writer, _error(431, "request header too large"), False, False)
+                break
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                break
+
+            request = _parse_head(head)
+            if request is None:
+                await _write_response(writer, _error(400, "malformed request"), False, False)
+                break
+            method, target, version, headers = request
+            length = headers.get("content-length", "0")
+            if not length.isdigit():
+                await _write_response(writer, _error(400, "invalid Content-Length"), False, False)
+                break
+            if int(length):
+                await reader.readexactly(int(length))  # requests bodies are not used
+
+            keep_alive = _keep_alive(version, headers)
+            await _write_response(writer, await handle(method, target, headers), method == "HEAD", keep_alive)
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(
+    root: PathLike,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = DEFAULT_WORKERS,
+    max_open: int = MAX_OPEN_FILES,
+    index: bool = False,
+) -> Tuple[asyncio.AbstractServer, CloseFn]:
+    """
+    Start serving root (see above); port 0 picks a free port (server.sockets[0]).
+    index: first build the missing and stale sidecar indexes under root.
+    Returns (server, close); await close() stops the server, its open connections,
+    worker pool and files.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+    if not os.path.isdir(root):
+        raise ValueError(f"Not a directory: {os.fspath(root)!r}")
+    if index:
+        await asyncio.get_running_loop().run_in_executor(None, _build_indexes, os.path.realpath(root))
+    handle, close_handler = _handler(os.fspath(root), workers, max_open)
+    connections: Set[asyncio.Task] = set()
+
+    async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        connections.add(task)
+        try:
+            await _connection(reader, writer, handle)
+        finally:
+            connections.discard(task)
+
+    server = await asyncio.start_server(connection, host, port, limit=MAX_HEADER_BYTES)
+
+    async def close() -> None:
+        server.close()
+        for task in list(connections):
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+        close_handler()
+
+    return server, close
+
+
+def serve(
+    root: PathLike,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = DEFAULT_WORKERS,
+    max_open: int = MAX_OPEN_FILES,
+    index: bool = False,
+) -> None:
+    """
+    Serve root until interrupted.
+    """
+    async def main() -> None:
+        server, close = await start_server(root, host, port, workers, max_open, index)
+        try:
+            await server.serve_forever()
+        finally:
+            await close()
+
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: sf/mvt/vector_tile.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'sf/mvt/vector_tile.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18sf/mvt/vector_tile.proto\x12\x06sf.mvt\"\x91\x04\n\x04Tile\x12\"\n\x06layers\x18\x03 \x03(\x0b\x32\x12.sf.mvt.Tile.Layer\x1a\x97\x01\n\x05Value\x12\x14\n\x0cstring_value\x18\x01 \x01(\t\x12\x13\n\x0b\x66loat_value\x18\x02 \x01(\x02\x12\x14\n\x0c\x64ouble_value\x18\x03 \x01(\x01\x12\x11\n\tint_value\x18\x04 \x01(\x03\x12\x12\n\nuint_value\x18\x05 \x01(\x04\x12\x12\n\nsint_value\x18\x06 \x01(\x12\x12\x12\n\nbool_value\x18\x07 \x01(\x08\x1an\n\x07\x46\x65\x61ture\x12\r\n\x02id\x18\x01 \x01(\x04:\x01\x30\x12\x10\n\x04tags\x18\x02 \x03(\rB\x02\x10\x01\x12,\n\x04type\x18\x03 \x01(\x0e\x32\x15.sf.mvt.Tile.GeomType:\x07UNKNOWN\x12\x14\n\x08geometry\x18\x04 \x03(\rB\x02\x10\x01\x1a\x99\x01\n\x05Layer\x12\x12\n\x07version\x18\x0f \x02(\r:\x01\x31\x12\x0c\n\x04name\x18\x01 \x02(\t\x12&\n\x08\x66\x65\x61tures\x18\x02 \x03(\x0b\x32\x14.sf.mvt.Tile.Feature\x12\x0c\n\x04keys\x18\x03 \x03(\t\x12\"\n\x06values\x18\x04 \x03(\x0b\x32\x12.sf.mvt.Tile.Value\x12\x14\n\x06\x65xtent\x18\x05 \x01(\r:\x04\x34\x30\x39\x36\"?\n\x08GeomType\x12\x0b\n\x07UNKNOWN\x10\x00\x12\t\n\x05POINT\x10\x01\x12\x0e\n\nLINESTRING\x10\x02\x12\x0b\n\x07POLYGON\x10\x03')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'sf.mvt.vector_tile_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_TILE_FEATURE'].fields_by_name['tags']._loaded_options = None
+  _globals['_TILE_FEATURE'].fields_by_name['tags']._serialized_options = b'\020\001'
+  _globals['_TILE_FEATURE'].fields_by_name['geometry']._loaded_options = None
+  _globals['_TILE_FEATURE'].fields_by_name['geometry']._serialized_options = b'\020\001'
+  _globals['_TILE']._serialized_start=37
+  _globals['_TILE']._serialized_end=566
+  _globals['_TILE_VALUE']._serialized_start=82
+  _globals['_TILE_VALUE']._serialized_end=233
+  _globals['_TILE_FEATURE']._serialized_start=235
+  _globals['_TILE_FEATURE']._serialized_end=345
+  _globals['_TILE_LAYER']._serialized_start=348
+  _globals['_TILE_LAYER']._serialized_end=501
+  _globals['_TILE_GEOMTYPE']._serialized_start=503
+  _globals['_TILE_GEOMTYPE']._serialized_end=566
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: sf/v4_BAG/geometry.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'sf/v4_BAG/geometry.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x18sf/v4_BAG/geometry.proto\x12\x0b\x62\x61g.pand.v4\"\"\n\x03\x43rs\x12\x0c\n\x04srid\x18\x01 \x01(\r\x12\r\n\x05scale\x18\x02 \x01(\r\"?\n\x05\x42\x42oxQ\x12\x0c\n\x04minx\x18\x01 \x01(\x11\x12\x0c\n\x04miny\x18\x02 \x01(\x11\x12\x0c\n\x04maxx\x18\x03 \x01(\x11\x12\x0c\n\x04maxy\x18\x04 \x01(\x11\"\xbe\x02\n\tPandBatch\x12\r\n\x05\x63ount\x18\x01 \x01(\r\x12\r\n\x05uuids\x18\x02 \x01(\x0c\x12\x15\n\ridentificatie\x18\x03 \x03(\x04\x12\x10\n\x08\x62ouwjaar\x18\x04 \x03(\r\x12\x0e\n\x06status\x18\x05 \x03(\r\x12 \n\x18\x61\x61ntal_verblijfsobjecten\x18\x06 \x03(\r\x12\x19\n\x11gebruiksdoel_mask\x18\x07 \x03(\r\x12\x17\n\x0foppervlakte_min\x18\x08 \x03(\r\x12\x17\n\x0foppervlakte_max\x18\t \x03(\r\x12\x13\n\x0bring_counts\x18\n \x03(\r\x12\x12\n\nring_sizes\x18\x0b \x03(\r\x12\x0b\n\x03\x64xy\x18\x0c \x03(\x11\x12\x0c\n\x04\x62\x62ox\x18\r \x03(\x11\x12\x14\n\x0c\x62\x62ox_present\x18\x0e \x01(\x0c\x12\x11\n\tnil_uuids\x18\x0f \x01(\x0c\"\x9a\x01\n\x16PandColumnarCollection\x12\x1d\n\x03\x63rs\x18\x01 \x01(\x0b\x32\x10.bag.pand.v4.Crs\x12 \n\x04\x62\x62ox\x18\x02 \x01(\x0b\x32\x12.bag.pand.v4.BBoxQ\x12\'\n\x07\x62\x61tches\x18\x03 \x03(\x0b\x32\x16.bag.pand.v4.PandBatch\x12\x16\n\x0eoriginal_index\x18\x04 \x03(\rb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'sf.v4_BAG.geometry_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_CRS']._serialized_start=41
+  _globals['_CRS']._serialized_end=75
+  _globals['_BBOXQ']._serialized_start=77
+  _globals['_BBOXQ']._serialized_end=140
+  _globals['_PANDBATCH']._serialized_start=143
+  _globals['_PANDBATCH']._serialized_end=461
+  _globals['_PANDCOLUMNARCOLLECTION']._serialized_start=464
+  _globals['_PANDCOLUMNARCOLLECTION']._serialized_end=618
+# @@protoc_insertion_point(module_scope)
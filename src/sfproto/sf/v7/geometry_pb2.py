@@ -25,25 +25,35 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14sf/v7/geometry.proto\x12\x05sf.v7\x1a\x1cgoogle/protobuf/struct.proto\"\"\n\x03\x43rs\x12\x0c\n\x04srid\x18\x01 \x01(\r\x12\r\n\x05scale\x18\x02 \x01(\r\"#\n\x0b\x43oordinateQ\x12\t\n\x01x\x18\x01 \x01(\x11\x12\t\n\x01y\x18\x02 \x01(\x11\"j\n\x0eStreamGeometry\x12\x1d\n\x04type\x18\x01 \x01(\x0e\x32\x0f.sf.v7.GeomType\x12\x0b\n\x03\x64xy\x18\x02 \x03(\x11\x12\x12\n\npart_sizes\x18\x03 \x03(\r\x12\x18\n\x10poly_ring_counts\x18\x04 \x03(\r\"\xa1\x01\n\x07\x46\x65\x61ture\x12\'\n\x08geometry\x18\x01 \x01(\x0b\x32\x15.sf.v7.StreamGeometry\x12+\n\nproperties\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\n\n\x02id\x18\x03 \x01(\t\x12\x0c\n\x04\x62\x62ox\x18\x04 \x03(\x01\x12&\n\x05\x65xtra\x18\x05 \x01(\x0b\x32\x17.google.protobuf.Struct\"\xbc\x01\n\x11\x46\x65\x61tureCollection\x12 \n\x08\x66\x65\x61tures\x18\x01 \x03(\x0b\x32\x0e.sf.v7.Feature\x12\x0c\n\x04\x62\x62ox\x18\x02 \x03(\x01\x12&\n\x05\x65xtra\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\x17\n\x03\x63rs\x18\x05 \x01(\x0b\x32\n.sf.v7.Crs\x12(\n\x0cglobal_start\x18\x06 \x01(\x0b\x32\x12.sf.v7.CoordinateQ\"\xb8\x01\n\x12GeometryCollection\x12)\n\ngeometries\x18\x01 \x03(\x0b\x32\x15.sf.v7.StreamGeometry\x12\x0c\n\x04\x62\x62ox\x18\x02 \x03(\x01\x12&\n\x05\x65xtra\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x17\n\x03\x63rs\x18\x04 \x01(\x0b\x32\n.sf.v7.Crs\x12(\n\x0cglobal_start\x18\x05 \x01(\x0b\x32\x12.sf.v7.CoordinateQ*\x7f\n\x08GeomType\x12\x14\n\x10GEOM_UNSPECIFIED\x10\x00\x12\t\n\x05POINT\x10\x01\x12\x0e\n\nMULTIPOINT\x10\x02\x12\x0e\n\nLINESTRING\x10\x03\x12\x13\n\x0fMULTILINESTRING\x10\x04\x12\x0b\n\x07POLYGON\x10\x05\x12\x10\n\x0cMULTIPOLYGON\x10\x06\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14sf/v7/geometry.proto\x12\x05sf.v7\x1a\x1cgoogle/protobuf/struct.proto\"\"\n\x03\x43rs\x12\x0c\n\x04srid\x18\x01 \x01(\r\x12\r\n\x05scale\x18\x02 \x01(\r\"#\n\x0b\x43oordinateQ\x12\t\n\x01x\x18\x01 \x01(\x11\x12\t\n\x01y\x18\x02 \x01(\x11\"%\n\rCoordinateQ64\x12\t\n\x01x\x18\x01 \x01(\x12\x12\t\n\x01y\x18\x02 \x01(\x12\"|\n\x0eStreamGeometry\x12\x1d\n\x04type\x18\x01 \x01(\x0e\x32\x0f.sf.v7.GeomType\x12\x0b\n\x03\x64xy\x18\x02 \x03(\x11\x12\x12\n\npart_sizes\x18\x03 \x03(\r\x12\x18\n\x10poly_ring_counts\x18\x04 \x03(\r\x12\x10\n\x08\x64xy_wide\x18\x05 \x03(\x12\"\xcf\x01\n\x07\x46\x65\x61ture\x12\'\n\x08geometry\x18\x01 \x01(\x0b\x32\x15.sf.v7.StreamGeometry\x12+\n\nproperties\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\n\n\x02id\x18\x03 \x01(\t\x12\x0c\n\x04\x62\x62ox\x18\x04 \x03(\x01\x12&\n\x05\x65xtra\x18\x05 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x14\n\x0cgeometry_ref\x18\x06 \x01(\r\x12\x16\n\x0eproperties_ref\x18\x07 \x01(\r\"\x8a\x03\n\x11\x46\x65\x61tureCollection\x12 \n\x08\x66\x65\x61tures\x18\x01 \x03(\x0b\x32\x0e.sf.v7.Feature\x12\x0c\n\x04\x62\x62ox\x18\x02 \x03(\x01\x12&\n\x05\x65xtra\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\x17\n\x03\x63rs\x18\x05 \x01(\x0b\x32\n.sf.v7.Crs\x12(\n\x0cglobal_start\x18\x06 \x01(\x0b\x32\x12.sf.v7.CoordinateQ\x12\x16\n\x0eoriginal_index\x18\x07 \x03(\r\x12/\n\x11global_start_wide\x18\x08 \x01(\x0b\x32\x14.sf.v7.CoordinateQ64\x12\x30\n\x11shared_geometries\x18\t \x03(\x0b\x32\x15.sf.v7.StreamGeometry\x12\x32\n\x11shared_properties\x18\n \x03(\x0b\x32\x17.google.protobuf.Struct\x12\x1d\n\x04lods\x18\x0b \x03(\x0b\x32\x0f.sf.v7.LodLevel\"H\n\x08LodLevel\x12\x11\n\ttolerance\x18\x01 \x01(\x01\x12)\n\ngeometries\x18\x02 \x03(\x0b\x32\x15.sf.v7.StreamGeometry\"\xe9\x01\n\x12GeometryCollection\x12)\n\ngeometries\x18\x01 \x03(\x0b\x32\x15.sf.v7.StreamGeometry\x12\x0c\n\x04\x62\x62ox\x18\x02 \x03(\x01\x12&\n\x05\x65xtra\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x17\n\x03\x63rs\x18\x04 \x01(\x0b\x32\n.sf.v7.Crs\x12(\n\x0cglobal_start\x18\x05 \x01(\x0b\x32\x12.sf.v7.CoordinateQ\x12/\n\x11global_start_wide\x18\x06 \x01(\x0b\x32\x14.sf.v7.CoordinateQ64\"\xfe\x01\n\x0b\x43olumnStats\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05nulls\x18\x02 \x01(\r\x12\x12\n\nhas_number\x18\x03 \x01(\x08\x12\x12\n\nnumber_min\x18\x04 \x01(\x01\x12\x12\n\nnumber_max\x18\x05 \x01(\x01\x12\x12\n\nhas_string\x18\x06 \x01(\x08\x12\x12\n\nstring_min\x18\x07 \x01(\t\x12\x12\n\nstring_max\x18\x08 \x01(\t\x12\x10\n\x08\x64istinct\x18\t \x03(\t\x12\x19\n\x11\x64istinct_complete\x18\n \x01(\x08\x12\r\n\x05trues\x18\x0b \x01(\r\x12\x0e\n\x06\x66\x61lses\x18\x0c \x01(\r\x12\x0e\n\x06others\x18\r \x01(\r\"C\n\nBatchStats\x12\x10\n\x08\x66\x65\x61tures\x18\x01 \x01(\r\x12#\n\x07\x63olumns\x18\x02 \x03(\x0b\x32\x12.sf.v7.ColumnStats\"D\n\x05\x44\x65lta\x12\x0f\n\x07\x64\x65leted\x18\x01 \x03(\t\x12*\n\x08\x66\x65\x61tures\x18\x02 \x01(\x0b\x32\x18.sf.v7.FeatureCollection*\x7f\n\x08GeomType\x12\x14\n\x10GEOM_UNSPECIFIED\x10\x00\x12\t\n\x05POINT\x10\x01\x12\x0e\n\nMULTIPOINT\x10\x02\x12\x0e\n\nLINESTRING\x10\x03\x12\x13\n\x0fMULTILINESTRING\x10\x04\x12\x0b\n\x07POLYGON\x10\x05\x12\x10\n\x0cMULTIPOLYGON\x10\x06\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'sf.v7.geometry_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_GEOMTYPE']._serialized_start=784
-  _globals['_GEOMTYPE']._serialized_end=911
+  _globals['_GEOMTYPE']._serialized_start=1612
+  _globals['_GEOMTYPE']._serialized_end=1739
   _globals['_CRS']._serialized_start=61
   _globals['_CRS']._serialized_end=95
   _globals['_COORDINATEQ']._serialized_start=97
   _globals['_COORDINATEQ']._serialized_end=132
-  _globals['_STREAMGEOMETRY']._serialized_start=134
-  _globals['_STREAMGEOMETRY']._serialized_end=240
-  _globals['_FEATURE']._serialized_start=243
-  _globals['_FEATURE']._serialized_end=404
-  _globals['_FEATURECOLLECTION']._serialized_start=407
-  _globals['_FEATURECOLLECTION']._serialized_end=595
-  _globals['_GEOMETRYCOLLECTION']._serialized_start=598
-  _globals['_GEOMETRYCOLLECTION']._serialized_end=782
+  _globals['_COORDINATEQ64']._serialized_start=134
+  _globals['_COORDINATEQ64']._serialized_end=171
+  _globals['_STREAMGEOMETRY']._serialized_start=173
+  _globals['_STREAMGEOMETRY']._serialized_end=297
+  _globals['_FEATURE']._serialized_start=300
+  _globals['_FEATURE']._serialized_end=507
+  _globals['_FEATURECOLLECTION']._serialized_start=510
+  _globals['_FEATURECOLLECTION']._serialized_end=904
+  _globals['_LODLEVEL']._serialized_start=906
+  _globals['_LODLEVEL']._serialized_end=978
+  _globals['_GEOMETRYCOLLECTION']._serialized_start=981
+  _globals['_GEOMETRYCOLLECTION']._serialized_end=1214
+  _globals['_COLUMNSTATS']._serialized_start=1217
+  _globals['_COLUMNSTATS']._serialized_end=1471
+  _globals['_BATCHSTATS']._serialized_start=1473
+  _globals['_BATCHSTATS']._serialized_end=1540
+  _globals['_DELTA']._serialized_start=1542
+  _globals['_DELTA']._serialized_end=1610
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+# Douglas–Peucker line simplification on quantized (integer) coordinates,
+# vectorized over all parts of a collection.
+#
+# Every part (a line, or a polygon ring stored without its closing point) is a
+# slice of one (N, 2) point array. All parts are simplified together: one NumPy
+# round per recursion level measures the distance of every remaining interior
+# point to the chord of its interval and splits the intervals whose farthest
+# point is more than the tolerance away. Lines keep their end points, rings keep
+# at least 3 points, so simplified geometries stay valid GeoJSON.
+
+
+def _group_argmax(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    # index of the (first) maximum of every non-empty group values[starts[k]:starts[k + 1]]
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64)
+    group = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(values))))
+    best = np.maximum.reduceat(values, starts)
+    hit = np.flatnonzero(values == best[group])
+    _, first = np.unique(group[hit], return_index=True)
+    return hit[first]
+
+
+def _segment_distances(p: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # distance of the points p to the segments a-b (row by row)
+    ab = b - a
+    ap = p - a
+    den = (ab * ab).sum(axis=1)
+    t = np.divide((ap * ab).sum(axis=1), den, out=np.zeros(len(p)), where=den > 0)
+    t = np.clip(t, 0.0, 1.0)
+    d = ap - t[:, None] * ab
+    return np.sqrt((d * d).sum(axis=1))
+
+
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # concatenated arange(s, s + n) for every (s, n)
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(total) - np.repeat(offsets - starts, lengths)
+
+
+def simplify_mask(
+    q: np.ndarray,
+    starts: Sequence[int],
+    lengths: Sequence[int],
+    closed: Sequence[bool],
+    tolerance: float,
+) -> np.ndarray:
+    """
+    q: (N, 2) quantized points; parts q[starts[k]:starts[k] + lengths[k]],
+    closed[k] = ring (stored without its closing point).
+    tolerance: in quantized units.
+
+    Returns a boolean keep mask over q; points outside the parts are kept.
+    """
+    q = np.asarray(q, dtype=np.int64)
+    keep = np.ones(len(q), dtype=bool)
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    closed = np.asarray(closed, dtype=bool)
+    # parts that are already minimal stay as they are
+    work = lengths > np.where(closed, 3, 2)
+    starts, lengths, closed = starts[work], lengths[work], closed[work]
+    if len(starts) == 0:
+        return keep
+
+    # working copy of the parts, rings with their closing point appended
+    wlen = lengths + closed
+    wstart = np.cumsum(wlen) - wlen
+    src = _ranges(starts, wlen)
+    src[(wstart + lengths)[closed]] = starts[closed]
+    pts = q[src].astype(np.float64)
+
+    wkeep = np.zeros(len(src), dtype=bool)
+    wkeep[wstart] = True
+    wkeep[wstart + wlen - 1] = True
+
+    a, b = wstart, wstart + wlen - 1
+    while len(a):
+        m = b - a - 1
+        a, b, m = a[m > 0], b[m > 0], m[m > 0]
+        if len(a) == 0:
+            break
+        idx = _ranges(a + 1, m)
+        group = np.repeat(np.arange(len(a)), m)
+        d = _segment_distances(pts[idx], pts[a[group]], pts[b[group]])
+
+        far = _group_argmax(d, np.cumsum(m) - m)
+        split = d[far] > tolerance
+        mid = idx[far[split]]
+        wkeep[mid] = True
+        a, b = np.concatenate((a[split], mid)), np.concatenate((mid, b[split]))
+
+    keep[_ranges(starts, lengths)] = False
+    keep[src[wkeep]] = True
+
+    # rings that collapsed below 3 points: the start, the point farthest from it
+    # and the point farthest from that chord
+    cs = np.concatenate(([0], np.cumsum(keep)))
+    kept = cs[starts + lengths] - cs[starts]
+    thin = np.flatnonzero(closed & (kept < 3))
+    if len(thin):
+        s, n = starts[thin], lengths[thin]
+        idx = _ranges(s, n)
+        group = np.repeat(np.arange(len(thin)), n)
+        p = q[idx].astype(np.float64)
+        first = q[s].astype(np.float64)[group]
+        far = idx[_group_argmax(np.sqrt(((p - first) ** 2).sum(axis=1)), np.cumsum(n) - n)]
+        third = idx[_group_argmax(
+            _segment_distances(p, first, q[far].astype(np.float64)[group]), np.cumsum(n) - n,
+        )]
+        keep[idx] = False
+        keep[s] = keep[far] = keep[third] = True
+    return keep
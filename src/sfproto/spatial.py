@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# Spatial ordering helpers shared by the v7 and BAG encoders.
+# Features are ordered by a space-filling-curve key computed from the centroid
+# of their (quantized) bbox, so features that are close in space end up close
+# in the encoded stream.
+
+SORT_METHODS = ("hilbert", "zorder")
+
+DEFAULT_BITS = 16  # grid of 2^16 x 2^16 cells over the collection extent
+
+
+def _check_method(method: str) -> str:
+    if method not in SORT_METHODS:
+        raise ValueError(f"Unsupported sort method: {method!r} (expected one of {SORT_METHODS})")
+    return method
+
+
+# ------------------- per-feature bboxes -------------------
+
+def segment_bboxes(xy: np.ndarray, counts: Sequence[int]) -> np.ndarray:
+    """
+    xy: (N, 2) array with the points of all features after each other.
+    counts: number of points per feature (sum(counts) == N).
+
+    Returns an (F, 4) array [minx, miny, maxx, maxy] per feature.
+    Features without points get a bbox of zeros.
+    """
+    xy = np.asarray(xy)
+    counts = np.asarray(counts, dtype=np.int64)
+    out = np.zeros((len(counts), 4), dtype=xy.dtype if xy.size else np.float64)
+    if len(counts) == 0 or xy.size == 0:
+        return out
+
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    nonempty = counts > 0
+    # reduceat needs valid start offsets, so only pass the non-empty segments
+    idx = starts[nonempty]
+    out[nonempty, 0] = np.minimum.reduceat(xy[:, 0], idx)
+    out[nonempty, 1] = np.minimum.reduceat(xy[:, 1], idx)
+    out[nonempty, 2] = np.maximum.reduceat(xy[:, 0], idx)
+    out[nonempty, 3] = np.maximum.reduceat(xy[:, 1], idx)
+    return out
+
+
+def _feature_points(features: Sequence[dict]) -> Tuple[List[Tuple[float, float]], List[int]]:
+    # all coordinates of the features after each other, and the count per feature
+    # (imported here: the v7 encoder imports this module)
+    from sfproto.geojson.v7.geojson_featurecollection import _flatten_geometries
+
+    geoms = [f.get("geometry") if isinstance(f, dict) else None for f in features]
+    if any(not isinstance(g, dict) for g in geoms):
+        raise ValueError("Feature.geometry must be an object (not null)")
+    _, points, counts = _flatten_geometries(geoms)
+    return points, counts
+
+
+def feature_bboxes(features: Sequence[dict]) -> np.ndarray:
+    """
+    (F, 4) bbox per GeoJSON feature, in CRS units.
+    """
+    points, counts = _feature_points(features)
+    return segment_bboxes(np.asarray(points, dtype=np.float64).reshape(-1, 2), counts)
+
+
+def bbox_hits(bboxes: np.ndarray, bbox: Sequence[float]) -> np.ndarray:
+    """
+    Boolean mask of the bboxes ([minx, miny, maxx, maxy] rows) that intersect bbox;
+    NaN rows (no coordinates) never do.
+    """
+    minx, miny, maxx, maxy = bbox
+    b = np.asarray(bboxes)
+    with np.errstate(invalid="ignore"):
+        return (b[:, 0] <= maxx) & (b[:, 2] >= minx) & (b[:, 1] <= maxy) & (b[:, 3] >= miny)
+
+
+# ------------------- curve keys -------------------
+
+def _normalize(v: np.ndarray, vmin: float, vmax: float, bits: int) -> np.ndarray:
+    # map [vmin, vmax] onto the integer grid [0, 2^bits - 1]
+    n = (1 << bits) - 1
+    span = float(vmax) - float(vmin)
+    if span <= 0:
+        return np.zeros(v.shape, dtype=np.int64)
+    g = np.floor((v.astype(np.float64) - float(vmin)) / span * n)
+    return np.clip(g, 0, n).astype(np.int64)
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    # insert a zero bit between every bit of a 32-bit integer
+    v = v.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+
+def zorder_keys(gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+    """
+    Morton (Z-order) keys for integer grid coordinates (at most 32 bits each).
+    """
+    return _spread_bits(gx) | (_spread_bits(gy) << np.uint64(1))
+
+
+def hilbert_keys(gx: np.ndarray, gy: np.ndarray, bits: int = DEFAULT_BITS) -> np.ndarray:
+    """
+    Hilbert curve keys for integer grid coordinates in [0, 2^bits).
+    Vectorized version of the classic xy2d algorithm.
+    """
+    x = np.asarray(gx, dtype=np.int64).copy()
+    y = np.asarray(gy, dtype=np.int64).copy()
+    d = np.zeros(x.shape, dtype=np.uint64)
+    n = 1 << bits
+
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += np.uint64(s) * np.uint64(s) * ((3 * rx.astype(np.uint64)) ^ ry.astype(np.uint64))
+
+        # rotate the quadrant
+        rot = ~ry
+        flip = rot & rx
+        x[flip] = n - 1 - x[flip]
+        y[flip] = n - 1 - y[flip]
+        tmp = x[rot].copy()
+        x[rot] = y[rot]
+        y[rot] = tmp
+        s >>= 1
+
+    return d
+
+
+def spatial_keys(bboxes: np.ndarray, method: str, bits: int = DEFAULT_BITS) -> np.ndarray:
+    """
+    Curve keys for the centroids of an (F, 4) bbox array.
+    """
+    _check_method(method)
+    bboxes = np.asarray(bboxes, dtype=np.float64)
+    if len(bboxes) == 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    cx = (bboxes[:, 0] + bboxes[:, 2]) * 0.5
+    cy = (bboxes[:, 1] + bboxes[:, 3]) * 0.5
+    gx = _normalize(cx, cx.min(), cx.max(), bits)
+    gy = _normalize(cy, cy.min(), cy.max(), bits)
+
+    if method == "hilbert":
+        return hilbert_keys(gx, gy, bits=bits)
+    return zorder_keys(gx, gy)
+
+
+def spatial_order(bboxes: np.ndarray, method: str, bits: int = DEFAULT_BITS) -> np.ndarray:
+    """
+    Permutation that sorts features by their curve key.
+    order[i] is the original index of the i-th feature in the sorted stream.
+    Ties keep their input order (stable sort).
+    """
+    keys = spatial_keys(bboxes, method, bits=bits)
+    return np.argsort(keys, kind="stable")
+
+
+def feature_sort_order(features: Sequence[dict], scale: int, method: str) -> List[int]:
+    """
+    Permutation of GeoJSON features along a space-filling curve, keyed on the
+    centroid of their quantized bbox (as spatial_order).
+    """
+    _check_method(method)
+    points, counts = _feature_points(features)
+    bboxes = segment_bboxes(quantize_points(points, scale), counts)
+    return [int(i) for i in spatial_order(bboxes, method)]
+
+
+def restore_order(items: list, original_index: Sequence[int]) -> list:
+    """
+    Undo a spatial sort: put items[i] back at position original_index[i].
+    """
+    if len(original_index) != len(items):
+        raise ValueError("original_index length does not match number of features")
+    out: list = [None] * len(items)
+    for item, idx in zip(items, original_index):
+        out[int(idx)] = item
+    return out
+
+
+def quantize_points(points: Sequence[Tuple[float, float]], scale: int) -> np.ndarray:
+    """
+    Quantize a list of (x, y) float pairs to an (N, 2) int64 array.
+    """
+    if not points:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.rint(np.asarray(points, dtype=np.float64) * scale).astype(np.int64)
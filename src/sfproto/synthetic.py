@@ -0,0 +1,478 @@
+from __future__ import annotations
+
+import functools
+import gc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from sfproto.benchmark_profiles import (
+    ATTRIBUTE_PROFILE_MAP,
+    ATTRIBUTE_PROFILES,
+    ATTRIBUTES,
+    GEOMETRY_RATIOS,
+    GEOMETRY_REGIMES,
+)
+
+GeoJSON = Dict[str, Any]
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Seeded synthetic datasets shaped like the benchmark inputs, for machines that
+# cannot download them (scripts/download_data/generate_synthetic.py writes them
+# under the paths the benchmarks read).
+#
+#   fc = generate("osm", 100_000, regime="geometry_heavy", profile="medium", seed=1)
+#   fc = generate("bag", 10_000)          # EPSG:28992 panden, valid for the BAG codecs
+#   fc = generate("overture", 1_000_000)  # building footprints with GERS-like ids
+#
+# osm mirrors scripts/download_data/filter_osm.py, both shaped by sfproto.benchmark_profiles:
+# the geometry mix of a regime (Points, LineStrings, Polygons in that order), the
+# property keys of an attribute profile (values may be null), no feature ids. The same (size, regime, seed) gives
+# the same geometries for every profile.
+#
+# Geometries are built with NumPy for all features at once: feature centers are
+# clustered around weighted "towns", polygons are star-shaped (so always simple)
+# with mostly 4-8 vertices, a long tail and a few holes (clockwise, within the
+# inradius of the outer ring), lines are random walks with lognormal vertex counts. Only the final
+# assembly of the GeoJSON dicts is a Python loop, run with the cyclic garbage
+# collector paused (millions of new lists and dicts, none of them cyclic, would
+# otherwise trigger a collection pass every few hundred allocations).
+
+SHAPES = ("osm", "overture", "bag")
+
+# lon/lat extents (osm: Amsterdam, overture: Rotterdam) and RD New (bag: the Randstad)
+REGIONS = {
+    "osm": (4.75, 52.30, 5.05, 52.43),
+    "overture": (4.38, 51.86, 4.58, 51.97),
+    "bag": (75_000.0, 425_000.0, 145_000.0, 500_000.0),
+}
+
+FEATURES_PER_TOWN = 5_000
+_ASPECT = (1.0, 2.5)  # range of the x stretch of a ring
+_HOLE_MARGIN = 0.9    # holes stay within this fraction of the outer ring's inradius
+_DECIMALS_DEGREES = 7  # OSM / Overture precision
+_DECIMALS_METRES = 3   # BAG (mm)
+_M_PER_DEGREE = 111_320.0
+
+_KINDS = {
+    "Point": ["bench", "waste_basket", "parking", "restaurant", "cafe", "bicycle_parking", "post_box", None],
+    "LineString": ["residential", "service", "footway", "cycleway", "tertiary", "secondary", "primary", "path"],
+    "Polygon": ["yes", "house", "apartments", "commercial", "industrial", "garage", "shed", "school"],
+}
+_NAME_ROOTS = [
+    "Amstel", "Keizers", "Heren", "Prinsen", "Linden", "Rozen", "Eiken", "Berken", "Molen", "Kerk",
+    "Water", "Haven", "Vondel", "Rembrandt", "Spinoza", "Erasmus", "Oranje", "Nassau", "Tulp", "Beuken",
+    "Zuider", "Noorder", "Ooster", "Wester", "Sloter", "Bos", "Dijk", "Veld", "Hof", "Brug",
+]
+_NAME_SUFFIXES = ["straat", "weg", "laan", "gracht", "plein", "kade", "dijk", "pad"]
+_SOURCES = ["bing", "survey", "BAG", "PDOK", "Bing;survey"]
+_SURFACES = ["asphalt", "paved", "paving_stones", "sett", "concrete", "unpaved", "gravel"]
+
+_STATUSES = ["Pand in gebruik", "Verbouwing pand", "Bouw gestart", "Bouwvergunning verleend", "Sloopvergunning verleend"]
+_STATUS_WEIGHTS = [0.95, 0.015, 0.015, 0.01, 0.01]
+_GEBRUIKSDOELEN = [
+    "woonfunctie", "kantoorfunctie", "winkelfunctie", "industriefunctie", "bijeenkomstfunctie",
+    "onderwijsfunctie", "gezondheidszorgfunctie", "sportfunctie", "logiesfunctie", "overige gebruiksfunctie",
+]
+_GEBRUIKSDOEL_WEIGHTS = [0.62, 0.06, 0.06, 0.07, 0.04, 0.01, 0.02, 0.01, 0.01, 0.10]
+_GEMEENTECODES = [363, 599, 518, 344, 34, 307, 394, 503, 546, 772]
+_RDF_SEEALSO = "http://bag.basisregistraties.overheid.nl/bag/id/pand/"
+
+
+def _without_gc(fn: F) -> F:
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if enabled:
+                gc.enable()
+
+    return wrapper  # type: ignore[return-value]
+
+
+# -------------------- geometry --------------------
+
+def _units(region: Sequence[float], degrees: bool) -> np.ndarray:
+    # coordinate units per metre (x, y)
+    if not degrees:
+        return np.array([1.0, 1.0])
+    lat = np.radians((region[1] + region[3]) / 2)
+    return np.array([1 / (_M_PER_DEGREE * np.cos(lat)), 1 / _M_PER_DEGREE])
+
+
+def _centers(rng: np.random.Generator, n: int, region: Sequence[float], spread_m: float, units: np.ndarray) -> np.ndarray:
+    # feature centers clustered around towns of zipf-like weight
+    towns = max(1, n // FEATURES_PER_TOWN + 1)
+    minx, miny, maxx, maxy = region
+    town_xy = rng.uniform((minx, miny), (maxx, maxy), size=(towns, 2))
+    weights = 1.0 / np.arange(1, towns + 1)
+    town = rng.choice(towns, size=n, p=weights / weights.sum())
+    xy = town_xy[town] + rng.normal(0.0, spread_m, size=(n, 2)) * units
+    return np.clip(xy, (minx, miny), (maxx, maxy))
+
+
+def _tile_order(xy: np.ndarray, tile: np.ndarray) -> np.ndarray:
+    # points ordered tile by tile (column-major), as a tiled download returns them
+    t = np.floor(xy / tile)
+    return xy[np.lexsort((t[:, 1], t[:, 0]))]
+
+
+def _ring_counts(rng: np.random.Generator, n: int, p: float, tail: float, cap: int) -> np.ndarray:
+    # vertices per ring (without the closing point): mostly 4-8, a long tail up to cap
+    counts = 3 + rng.geometric(p, size=n)
+    long = rng.random(n) < tail
+    counts[long] = np.rint(rng.lognormal(np.log(30), 0.8, size=int(long.sum())))
+    return np.clip(counts, 4, cap)
+
+
+def _rings(
+    rng: np.random.Generator,
+    centers: np.ndarray,
+    radii: np.ndarray,
+    counts: np.ndarray,
+    units: np.ndarray,
+    clockwise: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Star-shaped rings around centers -> (vertices (N, 2) without closing points, ring starts).
+    Angles increase within a ring (counter-clockwise). Vertices are at most
+    radius * _ASPECT[1] from the center; 4-vertex rings are rhombi (square corners
+    stretched along one axis), not rectangles.
+    """
+    total = int(counts.sum())
+    starts = np.cumsum(counts) - counts
+    j = np.arange(total) - np.repeat(starts, counts)
+    n = np.repeat(counts, counts)
+
+    jitter = np.where(n == 4, 0.05, 0.6) * rng.random(total)
+    a = 2 * np.pi * (j + jitter) / n
+    r = np.repeat(radii, counts) * rng.uniform(0.8, 1.0, total)
+    aspect = np.repeat(rng.uniform(*_ASPECT, len(counts)), counts)
+    lx, ly = r * np.cos(a) * aspect, r * np.sin(a)
+
+    theta = np.repeat(rng.uniform(0, 2 * np.pi, len(counts)), counts)
+    c, s = np.cos(theta), np.sin(theta)
+    xy = np.repeat(centers, counts, axis=0) + np.column_stack((lx * c - ly * s, lx * s + ly * c)) * units
+
+    if clockwise:
+        xy = xy[np.repeat(starts, counts) + (n - 1 - j)]
+    return xy, starts
+
+
+def _inradii(xy: np.ndarray, centers: np.ndarray, starts: np.ndarray, counts: np.ndarray, units: np.ndarray) -> np.ndarray:
+    # per ring: distance in metres from its center to the nearest edge; a ring is
+    # star-shaped around its center, so the disk of that radius lies inside it
+    p = (xy - np.repeat(centers, counts, axis=0)) / units
+    j = np.arange(len(p)) - np.repeat(starts, counts)
+    q = p[np.repeat(starts, counts) + (j + 1) % np.repeat(counts, counts)]
+    e = q - p
+    t = np.clip(-(p * e).sum(axis=1) / np.maximum((e * e).sum(axis=1), 1e-300), 0.0, 1.0)
+    dist = np.hypot(*(p + t[:, None] * e).T)
+    return np.minimum.reduceat(dist, starts) if len(starts) else np.zeros(0)
+
+
+def _walks(
+    rng: np.random.Generator,
+    starts_xy: np.ndarray,
+    counts: np.ndarray,
+    step_m: float,
+    units: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # random walks (gently turning) -> (vertices (N, 2), line starts)
+    total = int(counts.sum())
+    starts = np.cumsum(counts) - counts
+    turn = rng.normal(0.0, 0.35, total)
+    turn[starts] = rng.uniform(0, 2 * np.pi, len(counts))
+    heading = np.cumsum(turn)
+    step = rng.uniform(0.5, 1.5, total) * step_m
+    step[starts] = 0.0
+    d = np.column_stack((np.cos(heading), np.sin(heading))) * step[:, None] * units
+
+    pos = np.cumsum(d, axis=0)
+    pos -= np.repeat(pos[starts] - d[starts], counts, axis=0)  # restart the sum at every line
+    return np.repeat(starts_xy, counts, axis=0) + pos, starts
+
+
+def _polygons(
+    rng: np.random.Generator,
+    centers: np.ndarray,
+    radius_m: Tuple[float, float],
+    counts: np.ndarray,
+    hole_rate: float,
+    units: np.ndarray,
+    decimals: int,
+) -> Tuple[List[List[List[List[float]]]], List[float]]:
+    # (Polygon coordinates (closed rings, some with one hole) per center, bbox)
+    n = len(centers)
+    radii = rng.lognormal(np.log(radius_m[0]), radius_m[1], size=n)
+    outer, starts = _rings(rng, centers, radii, counts, units)
+    holed = np.flatnonzero(rng.random(n) < hole_rate)
+    hole_counts = np.full(len(holed), 4)
+    # a hole vertex is at most radius * _ASPECT[1] from the center: keep that inside the outer ring
+    inradii = _inradii(outer, centers, starts, counts, units)[holed]
+    hole_radii = np.minimum(radii[holed] * 0.25, inradii * _HOLE_MARGIN / _ASPECT[1])
+    holes, hole_starts = _rings(rng, centers[holed], hole_radii, hole_counts, units, clockwise=True)
+
+    outer = np.round(outer, decimals)
+    bbox = [*outer.min(axis=0).tolist(), *outer.max(axis=0).tolist()] if len(outer) else []
+    pts = outer.tolist()
+    hole_pts = np.round(holes, decimals).tolist()
+    out: List[List[List[List[float]]]] = []
+    for s, m in zip(starts.tolist(), counts.tolist()):
+        ring = pts[s:s + m]
+        ring.append(list(ring[0]))
+        out.append([ring])
+    for i, s in zip(holed.tolist(), hole_starts.tolist()):
+        ring = hole_pts[s:s + 4]
+        ring.append(list(ring[0]))
+        out[i].append(ring)
+    return out, bbox
+
+
+def _lines(
+    rng: np.random.Generator, starts_xy: np.ndarray, step_m: float, units: np.ndarray, decimals: int,
+) -> List[List[List[float]]]:
+    counts = np.clip(np.rint(rng.lognormal(np.log(8), 0.9, size=len(starts_xy))), 2, 2000).astype(np.int64)
+    xy, starts = _walks(rng, starts_xy, counts, step_m, units)
+    pts = np.round(xy, decimals).tolist()
+    return [pts[s:s + m] for s, m in zip(starts.tolist(), counts.tolist())]
+
+
+# -------------------- ids --------------------
+
+_HEX = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+_UUID_GROUPS = (8, 4, 4, 4, 12)
+
+
+def _hex_chars(raw: np.ndarray) -> np.ndarray:
+    # (n, k) bytes -> (n, 2k) lowercase hex digits (ASCII codes)
+    out = np.empty((raw.shape[0], 2 * raw.shape[1]), dtype=np.uint8)
+    out[:, 0::2] = _HEX[raw >> 4]
+    out[:, 1::2] = _HEX[raw & 0x0F]
+    return out
+
+
+def _uuid_chars(raw: np.ndarray, prefix: bytes = b"") -> np.ndarray:
+    # (n, 16) bytes -> (n, len(prefix) + 36) canonical uuid strings (ASCII codes)
+    digits = _hex_chars(raw)
+    parts = [np.broadcast_to(np.frombuffer(prefix, dtype=np.uint8), (len(raw), len(prefix)))]
+    pos = 0
+    for k, width in enumerate(_UUID_GROUPS):
+        if k:
+            parts.append(np.full((len(raw), 1), ord("-"), dtype=np.uint8))
+        parts.append(digits[:, pos:pos + width])
+        pos += width
+    return np.hstack(parts)
+
+
+def _strings(chars: np.ndarray) -> List[str]:
+    # rows of ASCII codes -> str, through one decode of the whole block
+    width = chars.shape[1]
+    text = np.ascontiguousarray(chars).tobytes().decode("ascii")
+    return [text[i:i + width] for i in range(0, len(text), width)]
+
+
+# -------------------- datasets --------------------
+
+def _streams(seed: int, *key: int) -> List[np.random.Generator]:
+    # independent generators per purpose, so e.g. attributes never shift the geometries
+    children = np.random.SeedSequence([seed, *key]).spawn(1 + len(ATTRIBUTES))
+    return [np.random.default_rng(c) for c in children]
+
+
+def _pick(rng: np.random.Generator, values: Sequence[Any], n: int, present: Any = 1.0, p=None) -> List[Any]:
+    # n values (None where absent; present: probability, scalar or per row)
+    idx = rng.choice(len(values), size=n, p=p)
+    keep = rng.random(n) < present
+    return [values[i] if k else None for i, k in zip(idx.tolist(), keep.tolist())]
+
+
+def _geometry_counts(size: int, regime: str) -> Dict[str, int]:
+    # as filter_osm.py: rounded down per type, the rest goes to the Points
+    ratios = GEOMETRY_RATIOS[regime]
+    counts = {g: int(size * ratios[g]) for g in ratios}
+    counts["Point"] += size - sum(counts.values())
+    return counts
+
+
+@_without_gc
+def generate_osm(size: int, regime: str = "mixed", profile: str = "many", seed: int = 0) -> GeoJSON:
+    """
+    OSM-like FeatureCollection (EPSG:4326) as written by filter_osm.py.
+    """
+    if regime not in GEOMETRY_RATIOS:
+        raise ValueError(f"Unknown geometry regime {regime!r} (expected one of {GEOMETRY_REGIMES})")
+    if profile not in ATTRIBUTE_PROFILE_MAP:
+        raise ValueError(f"Unknown attribute profile {profile!r} (expected one of {ATTRIBUTE_PROFILES})")
+
+    geo, *attr_rngs = _streams(seed, size, GEOMETRY_REGIMES.index(regime))
+    attr = dict(zip(ATTRIBUTES, attr_rngs))
+    counts = _geometry_counts(size, regime)
+    region = REGIONS["osm"]
+    units = _units(region, degrees=True)
+    centers = _centers(geo, size, region, 800.0, units)
+
+    n_pt, n_ln, n_pg = counts["Point"], counts["LineString"], counts["Polygon"]
+    geoms: List[GeoJSON] = [
+        {"type": "Point", "coordinates": c} for c in np.round(centers[:n_pt], _DECIMALS_DEGREES).tolist()
+    ]
+    geoms += [
+        {"type": "LineString", "coordinates": c}
+        for c in _lines(geo, centers[n_pt:n_pt + n_ln], 25.0, units, _DECIMALS_DEGREES)
+    ]
+    ring_counts = _ring_counts(geo, n_pg, 0.45, 0.03, 400)
+    geoms += [
+        {"type": "Polygon", "coordinates": c}
+        for c in _polygons(geo, centers[n_pt + n_ln:], (8.0, 0.5), ring_counts, 0.02, units, _DECIMALS_DEGREES)[0]
+    ]
+
+    keys = ATTRIBUTE_PROFILE_MAP[profile]
+    columns: Dict[str, List[Any]] = {}
+    gtype = ["Point"] * n_pt + ["LineString"] * n_ln + ["Polygon"] * n_pg
+    is_line = np.array([t == "LineString" for t in gtype])
+    if "id" in keys:
+        ids = np.sort(attr["id"].choice(12_000_000_000, size=size, replace=False))
+        columns["id"] = [("node/" if t == "Point" else "way/") + str(i) for t, i in zip(gtype, ids.tolist())]
+    if "kind" in keys:
+        columns["kind"] = []
+        for t in ("Point", "LineString", "Polygon"):
+            columns["kind"] += _pick(attr["kind"], _KINDS[t], counts[t])
+    if "name" in keys:
+        roots = _pick(attr["name"], _NAME_ROOTS, size, np.where(is_line, 0.5, 0.15))
+        suffixes = _pick(attr["name"], _NAME_SUFFIXES, size)
+        columns["name"] = [r + s if r else None for r, s in zip(roots, suffixes)]
+    if "source" in keys:
+        columns["source"] = _pick(attr["source"], _SOURCES, size, 0.2)
+    if "surface" in keys:
+        columns["surface"] = _pick(attr["surface"], _SURFACES, size, np.where(is_line, 0.6, 0.02))
+    if "lanes" in keys:
+        columns["lanes"] = _pick(attr["lanes"], ["1", "2", "2", "3", "4"], size, np.where(is_line, 0.3, 0.0))
+
+    rows = zip(*(columns[k] for k in keys)) if keys else ((),) * size
+    features = [
+        {"type": "Feature", "geometry": g, "properties": dict(zip(keys, row))}
+        for g, row in zip(geoms, rows)
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+@_without_gc
+def generate_overture(size: int, seed: int = 0) -> GeoJSON:
+    """
+    Overture-like building footprints (EPSG:4326): Polygons, some with holes, about
+    1% MultiPolygons; properties {"id": GERS-like hex id}; spatially clustered order.
+    """
+    geo, ids_rng, *_ = _streams(seed, size, len(GEOMETRY_REGIMES))
+    region = REGIONS["overture"]
+    units = _units(region, degrees=True)
+    centers = _tile_order(_centers(geo, size, region, 600.0, units), 2000.0 * units)
+
+    multi = np.flatnonzero(geo.random(size) < 0.01)
+    parts = np.concatenate((centers, centers[multi] + geo.normal(0.0, 25.0, size=(len(multi), 2)) * units))
+    ring_counts = _ring_counts(geo, len(parts), 0.35, 0.05, 600)
+    polys, _ = _polygons(geo, parts, (7.0, 0.6), ring_counts, 0.01, units, _DECIMALS_DEGREES)
+
+    geoms: List[GeoJSON] = [{"type": "Polygon", "coordinates": p} for p in polys[:size]]
+    for i, extra in zip(multi.tolist(), polys[size:]):
+        geoms[i] = {"type": "MultiPolygon", "coordinates": [geoms[i]["coordinates"], extra]}
+
+    raw = ids_rng.integers(0, 256, size=(size, 16), dtype=np.uint8)
+    raw[:, 0] = 0x08
+    raw[:, 1] = (raw[:, 1] & 0x0F) | 0xB0  # "08b..."
+    hex_ids = _strings(_hex_chars(raw))
+    features = [
+        {"type": "Feature", "geometry": g, "properties": {"id": fid}} for g, fid in zip(geoms, hex_ids)
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+@_without_gc
+def generate_bag(size: int, seed: int = 0) -> GeoJSON:
+    """
+    BAG pand-like FeatureCollection (EPSG:28992, as the PDOK WFS returns it): Polygons
+    in mm precision, "pand.<uuid>" ids and the pand properties the BAG codecs store.
+    Features come tile by tile (2 km), like the download script fetches them.
+    """
+    geo, ids_rng, year_rng, status_rng, doel_rng, opp_rng, vo_rng = _streams(seed, size, len(GEOMETRY_REGIMES) + 1)
+    region = REGIONS["bag"]
+    units = _units(region, degrees=False)
+    centers = _tile_order(_centers(geo, size, region, 1500.0, units), 2000.0 * units)
+
+    ring_counts = _ring_counts(geo, size, 0.4, 0.02, 200)
+    polys, bbox = _polygons(geo, centers, (6.0, 0.45), ring_counts, 0.005, units, _DECIMALS_METRES)
+
+    gemeente = ids_rng.choice(_GEMEENTECODES, size=size).tolist()
+    volgnr = ids_rng.choice(10_000_000_000, size=size, replace=False).tolist()
+    idents = [f"{g:04d}10{v:010d}" for g, v in zip(gemeente, volgnr)]
+    uuids = ids_rng.integers(0, 256, size=(size, 16), dtype=np.uint8)
+    uuids[:, 6] = (uuids[:, 6] & 0x0F) | 0x40  # version 4
+    uuids[:, 8] = (uuids[:, 8] & 0x3F) | 0x80  # variant
+    fids = _strings(_uuid_chars(uuids, b"pand."))
+
+    years = np.clip(np.rint(2025 - year_rng.gamma(2.0, 25.0, size=size)), 1600, 2025).astype(int).tolist()
+    statuses = _pick(status_rng, _STATUSES, size, p=_STATUS_WEIGHTS)
+    first = doel_rng.choice(len(_GEBRUIKSDOELEN), size=size, p=_GEBRUIKSDOEL_WEIGHTS)
+    second = doel_rng.choice(len(_GEBRUIKSDOELEN), size=size)
+    second[(doel_rng.random(size) >= 0.08) | (second == first)] = -1
+    doelen = [
+        _GEBRUIKSDOELEN[a] if b < 0 else ",".join(_GEBRUIKSDOELEN[k] for k in sorted((a, b)))
+        for a, b in zip(first.tolist(), second.tolist())
+    ]
+    vo = np.maximum(1, np.rint(vo_rng.lognormal(0.0, 1.0, size=size))).astype(int)
+    opp_min = np.maximum(1, np.rint(opp_rng.lognormal(np.log(70), 0.7, size=size))).astype(int)
+    opp_max = opp_min + np.rint(opp_rng.exponential(20.0, size=size)).astype(int)
+
+    features = [
+        {
+            "type": "Feature",
+            "id": fid,
+            "geometry": {"type": "Polygon", "coordinates": poly},
+            "properties": {
+                "identificatie": ident,
+                "rdf_seealso": _RDF_SEEALSO + ident,
+                "bouwjaar": year,
+                "status": status,
+                "gebruiksdoel": doel,
+                "oppervlakte_min": lo,
+                "oppervlakte_max": hi,
+                "aantal_verblijfsobjecten": n_vo,
+            },
+        }
+        for fid, poly, ident, year, status, doel, lo, hi, n_vo in zip(
+            fids, polys, idents, years, statuses, doelen, opp_min.tolist(), opp_max.tolist(), vo.tolist(),
+        )
+    ]
+    return {
+        "type": "FeatureCollection",
+        "name": "pand",
+        "crs": {"type": "name", "properties": {"name": "urn:ogc:def:crs:EPSG::28992"}},
+        "features": features,
+        "bbox": bbox or None,
+    }
+
+
+def generate(
+    shape: str = "osm",
+    size: int = 1000,
+    seed: int = 0,
+    regime: Optional[str] = None,
+    profile: Optional[str] = None,
+) -> GeoJSON:
+    """
+    Synthetic FeatureCollection of a shape (osm, overture, bag); regime and
+    profile only apply to osm (default mixed / many).
+    """
+    if size < 0:
+        raise ValueError("size must not be negative")
+    if shape == "osm":
+        return generate_osm(size, regime or "mixed", profile or "many", seed)
+    if regime is not None or profile is not None:
+        raise ValueError("regime and profile only apply to the osm shape")
+    if shape == "overture":
+        return generate_overture(size, seed)
+    if shape == "bag":
+        return generate_bag(size, seed)
+    raise ValueError(f"Unknown shape {shape!r} (expected one of {SHAPES})")
@@ -0,0 +1,587 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from sfproto.access import feature_table, file_deltas, read_features
+
+GeoJSON = Dict[str, Any]
+PathLike = Union[str, "os.PathLike[str]"]
+Bounds = Tuple[float, float, float, float]
+Point = Tuple[int, int]
+TileJob = Tuple[int, int, int, np.ndarray]  # z, x, y, feature indices
+
+# Tiler: z/x/y tiles from a v7 (FCV7 / FCB7) or BAG v3 file.
+#
+#   stats = generate_tiles("bag.sfproto", "tiles/", minzoom=10, maxzoom=16)       # tiles/z/x/y.mvt
+#   stats = generate_tiles("bag.sfproto", "tiles.zip", format="sfproto")          # one archive
+#
+# Features are assigned to tiles by the bboxes of the wire scanner (sfproto.scan),
+# so nothing is decoded to plan the work (and a feature covering millions of tiles
+# is planned block by block, see MAX_TILE_PAIRS). Tiles are rendered in worker processes,
+# a task of up to TILES_PER_TASK neighbouring tiles at a time; every feature of a task
+# is decoded once (random access, sfproto.access) and reused for all its tiles.
+# Per tile the geometries are quantized to the tile's integer grid (extent x extent,
+# y down) and clipped there, with a buffer of `buffer` units around the tile.
+#
+# Tile grids: Web Mercator for EPSG:3857 and EPSG:4326 (projected on the fly), the
+# Dutch tiling scheme for EPSG:28992, otherwise the square around the data (or grid=).
+#
+# Formats: "mvt" (Mapbox Vector Tile 2.1, one layer) or "sfproto" (a v7
+# FeatureCollection in tile coordinates, srid 0, scale 1).
+
+TILE_FORMATS = ("mvt", "sfproto")
+TILE_SUFFIXES = {"mvt": ".mvt", "sfproto": ".sfproto"}
+
+DEFAULT_EXTENT = 4096
+DEFAULT_BUFFER = 64
+MAX_ZOOM = 24
+TILES_PER_TASK = 64
+MAX_TILE_PAIRS = 1 << 20  # (feature, tile) pairs enumerated at a time, per zoom
+MAX_PENDING_PER_WORKER = 2
+
+_MERCATOR_HALF = 20037508.342789244
+_MAX_LATITUDE = 85.0511287798066
+
+WEB_MERCATOR: Bounds = (-_MERCATOR_HALF, -_MERCATOR_HALF, _MERCATOR_HALF, _MERCATOR_HALF)
+RD_NEW: Bounds = (-285401.92, 22598.08, 595401.92, 903401.92)
+GRIDS: Dict[int, Bounds] = {3857: WEB_MERCATOR, 4326: WEB_MERCATOR, 28992: RD_NEW}
+
+
+# -------------------- grid --------------------
+
+def lonlat_to_mercator(xy: np.ndarray) -> np.ndarray:
+    xy = np.asarray(xy, dtype=np.float64)
+    lat = np.clip(xy[..., 1], -_MAX_LATITUDE, _MAX_LATITUDE)
+    x = xy[..., 0] * (_MERCATOR_HALF / 180.0)
+    y = np.log(np.tan((90.0 + lat) * (math.pi / 360.0))) * (_MERCATOR_HALF / math.pi)
+    return np.stack((x, y), axis=-1)
+
+
+def _projection(srid: int) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+    return lonlat_to_mercator if srid == 4326 else None
+
+
+def _grid(srid: int, bbox: np.ndarray, grid: Optional[Sequence[float]]) -> Bounds:
+    if grid is not None:
+        minx, miny, maxx, maxy = (float(v) for v in grid)
+        if not (maxx > minx and maxy > miny):
+            raise ValueError(f"Invalid tile grid: {grid!r}")
+        return minx, miny, maxx, maxy
+    if srid in GRIDS:
+        return GRIDS[srid]
+    if len(bbox) == 0:
+        raise ValueError("No geometries to tile")
+    minx, miny = bbox[:, 0].min(), bbox[:, 1].min()
+    side = max(bbox[:, 2].max() - minx, bbox[:, 3].max() - miny) or 1.0
+    return float(minx), float(miny), float(minx + side), float(miny + side)
+
+
+def tile_bounds(z: int, x: int, y: int, grid: Bounds = WEB_MERCATOR) -> Bounds:
+    """
+    (minx, miny, maxx, maxy) of tile z/x/y; rows count from the top of the grid.
+    """
+    gx0, gy0, gx1, gy1 = grid
+    n = 1 << z
+    sx, sy = (gx1 - gx0) / n, (gy1 - gy0) / n
+    return gx0 + x * sx, gy1 - (y + 1) * sy, gx0 + (x + 1) * sx, gy1 - y * sy
+
+
+def _tile_ranges(bbox: np.ndarray, grid: Bounds, z: int, margin: float) -> Tuple[np.ndarray, ...]:
+    # (features, x0, x1, y0, y1): the tile range of zoom z that a feature bbox (plus margin,
+    # in tiles) touches, for the features touching the grid at all
+    gx0, gy0, gx1, gy1 = grid
+    n = 1 << z
+    sx, sy = (gx1 - gx0) / n, (gy1 - gy0) / n
+    with np.errstate(invalid="ignore"):
+        x0 = np.floor((bbox[:, 0] - gx0) / sx - margin)
+        x1 = np.floor((bbox[:, 2] - gx0) / sx + margin)
+        y0 = np.floor((gy1 - bbox[:, 3]) / sy - margin)
+        y1 = np.floor((gy1 - bbox[:, 1]) / sy + margin)
+        inside = (x1 >= 0) & (x0 < n) & (y1 >= 0) & (y0 < n)
+    feats = np.flatnonzero(inside)
+    return (feats, *(np.clip(v[feats], 0, n - 1).astype(np.int64) for v in (x0, x1, y0, y1)))
+
+
+def _pairs(
+    feats: np.ndarray, x0: np.ndarray, x1: np.ndarray, y0: np.ndarray, y1: np.ndarray,
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    # (x, y, features) per tile of the ranges, sorted by x then y; every
+    # (feature, tile) pair is enumerated at once
+    width = x1 - x0 + 1
+    counts = width * (y1 - y0 + 1)
+    k = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    tx = np.repeat(x0, counts) + k % np.repeat(width, counts)
+    ty = np.repeat(y0, counts) + k // np.repeat(width, counts)
+    owner = np.repeat(feats, counts)
+
+    key = (tx << MAX_ZOOM) | ty  # x, y < 2^MAX_ZOOM
+    order = np.argsort(key, kind="stable")
+    key, owner = key[order], owner[order]
+    keys, first = np.unique(key, return_index=True)
+    for tk, members in zip(keys.tolist(), np.split(owner, first[1:])):
+        yield tk >> MAX_ZOOM, tk & ((1 << MAX_ZOOM) - 1), members
+
+
+def _expand(
+    feats: np.ndarray, x0: np.ndarray, x1: np.ndarray, y0: np.ndarray, y1: np.ndarray,
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    # _pairs, a block of 2^shift x 2^shift tiles at a time when there are more than
+    # MAX_TILE_PAIRS pairs (large features at high zooms)
+    total = int(((x1 - x0 + 1) * (y1 - y0 + 1)).sum())
+    span = int(max((x1 - x0).max(), (y1 - y0).max())) + 1
+    if total <= MAX_TILE_PAIRS or span <= 2:
+        yield from _pairs(feats, x0, x1, y0, y1)
+        return
+
+    # the smallest shift with few enough (feature, block) pairs; blocks stay smaller
+    # than span, so every block has fewer tiles per feature than the ranges here
+    shift = 1
+    while 2 << shift < span:
+        blocks = ((x1 >> shift) - (x0 >> shift) + 1) * ((y1 >> shift) - (y0 >> shift) + 1)
+        if int(blocks.sum()) <= MAX_TILE_PAIRS:
+            break
+        shift += 1
+    side = 1 << shift
+    rows = np.arange(len(feats))
+    for bx, by, members in _pairs(rows, x0 >> shift, x1 >> shift, y0 >> shift, y1 >> shift):
+        lo_x, lo_y = bx * side, by * side
+        yield from _expand(
+            feats[members],
+            np.maximum(x0[members], lo_x), np.minimum(x1[members], lo_x + side - 1),
+            np.maximum(y0[members], lo_y), np.minimum(y1[members], lo_y + side - 1),
+        )
+
+
+def _tile_jobs(bbox: np.ndarray, grid: Bounds, z: int, margin: float) -> Iterator[TileJob]:
+    # every tile of zoom z that a feature bbox (plus margin, in tiles) touches, with its features
+    feats, x0, x1, y0, y1 = _tile_ranges(bbox, grid, z, margin)
+    if len(feats) == 0:
+        return
+    for x, y, members in _expand(feats, x0, x1, y0, y1):
+        yield z, x, y, members
+
+
+def _tasks(bbox: np.ndarray, grid: Bounds, minzoom: int, maxzoom: int, margin: float) -> Iterator[List[TileJob]]:
+    task: List[TileJob] = []
+    for z in range(minzoom, maxzoom + 1):
+        for job in _tile_jobs(bbox, grid, z, margin):
+            task.append(job)
+            if len(task) >= TILES_PER_TASK:
+                yield task
+                task = []
+    if task:
+        yield task
+
+
+# -------------------- clipping (tile coordinates) --------------------
+
+def _to_tile(coords: Any, project, bounds: Bounds, extent: int) -> List[Point]:
+    a = np.asarray(coords, dtype=np.float64)[:, :2]
+    if project is not None:
+        a = project(a)
+    minx, miny, maxx, maxy = bounds
+    px = np.rint((a[:, 0] - minx) * (extent / (maxx - minx))).astype(np.int64)
+    py = np.rint((maxy - a[:, 1]) * (extent / (maxy - miny))).astype(np.int64)
+    return list(zip(px.tolist(), py.tolist()))
+
+
+def _dedup(points: List[Point]) -> List[Point]:
+    out: List[Point] = []
+    for p in points:
+        if not out or out[-1] != p:
+            out.append(p)
+    return out
+
+
+def _clip_line(points: List[Point], lo: int, hi: int) -> List[List[Point]]:
+    # Liang–Barsky per segment; a line leaving and re-entering the box is split
+    out: List[List[Point]] = []
+    cur: List[Point] = []
+    for (ax, ay), (bx, by) in zip(points, points[1:]):
+        t0, t1 = 0.0, 1.0
+        dx, dy = bx - ax, by - ay
+        visible = True
+        for p, q in ((-dx, ax - lo), (dx, hi - ax), (-dy, ay - lo), (dy, hi - ay)):
+            if p == 0:
+                if q < 0:
+                    visible = False
+                    break
+            else:
+                t = q / p
+                if p < 0:
+                    t0 = max(t0, t)
+                else:
+                    t1 = min(t1, t)
+                if t0 > t1:
+                    visible = False
+                    break
+        if not visible:
+            if len(cur) > 1:
+                out.append(cur)
+            cur = []
+            continue
+        start = (round(ax + t0 * dx), round(ay + t0 * dy))
+        end = (round(ax + t1 * dx), round(ay + t1 * dy))
+        if not cur or cur[-1] != start:
+            if len(cur) > 1:
+                out.append(cur)
+            cur = [start]
+        if end != cur[-1]:
+            cur.append(end)
+        if t1 < 1.0:
+            if len(cur) > 1:
+                out.append(cur)
+            cur = []
+    if len(cur) > 1:
+        out.append(cur)
+    return out
+
+
+def _clip_ring(ring: List[Point], lo: int, hi: int) -> List[Point]:
+    # Sutherland–Hodgman against the four edges; ring without closing point
+    if all(lo <= x <= hi and lo <= y <= hi for x, y in ring):
+        return ring if len(ring) >= 3 else []
+    for axis, bound, keep_below in ((0, lo, False), (0, hi, True), (1, lo, False), (1, hi, True)):
+        if not ring:
+            break
+        src, ring = ring, []
+        prev = src[-1]
+        prev_in = prev[axis] <= bound if keep_below else prev[axis] >= bound
+        for cur in src:
+            cur_in = cur[axis] <= bound if keep_below else cur[axis] >= bound
+            if cur_in != prev_in:
+                t = (bound - prev[axis]) / (cur[axis] - prev[axis])
+                other = prev[1 - axis] + t * (cur[1 - axis] - prev[1 - axis])
+                ring.append((bound, round(other)) if axis == 0 else (round(other), bound))
+            if cur_in:
+                ring.append(cur)
+            prev, prev_in = cur, cur_in
+    ring = _dedup(ring)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    return ring if len(ring) >= 3 else []
+
+
+def _signed_area(ring: List[Point]) -> int:
+    # twice the shoelace area; > 0 is clockwise with y down (MVT exterior rings)
+    return sum(ax * by - bx * ay for (ax, ay), (bx, by) in zip(ring, ring[1:] + ring[:1]))
+
+
+def clip_geometry(geom: GeoJSON, bounds: Bounds, extent: int, buffer: int, project=None) -> Optional[Tuple[str, list]]:
+    """
+    Geometry -> ("point", points) | ("line", lines) | ("polygon", polygons of rings)
+    in tile coordinates, clipped to the tile plus buffer; None when nothing is left.
+    """
+    lo, hi = -buffer, extent + buffer
+    t = geom.get("type")
+    coords = geom.get("coordinates")
+
+    if t in ("Point", "MultiPoint"):
+        pts = _to_tile([coords] if t == "Point" else coords, project, bounds, extent) if coords else []
+        pts = [p for p in pts if lo <= p[0] <= hi and lo <= p[1] <= hi]
+        return ("point", pts) if pts else None
+
+    if t in ("LineString", "MultiLineString"):
+        lines: List[List[Point]] = []
+        for line in ([coords] if t == "LineString" else coords):
+            if len(line) >= 2:
+                lines.extend(_clip_line(_dedup(_to_tile(line, project, bounds, extent)), lo, hi))
+        return ("line", lines) if lines else None
+
+    if t in ("Polygon", "MultiPolygon"):
+        polygons: List[List[List[Point]]] = []
+        for poly in ([coords] if t == "Polygon" else coords):
+            rings: List[List[Point]] = []
+            for k, ring in enumerate(poly):
+                pts = _dedup(_to_tile(ring, project, bounds, extent)) if ring else []
+                if len(pts) > 1 and pts[0] == pts[-1]:
+                    pts.pop()
+                clipped = _clip_ring(pts, lo, hi) if len(pts) >= 3 else []
+                if k == 0 and not clipped:
+                    break  # exterior gone: so are its holes
+                if clipped:
+                    rings.append(clipped)
+            if rings:
+                polygons.append(rings)
+        return ("polygon", polygons) if polygons else None
+
+    raise ValueError(f"Unsupported geometry type: {t!r}")
+
+
+# -------------------- encoders --------------------
+
+def _zigzag(v: int) -> int:
+    return 2 * v if v >= 0 else -2 * v - 1
+
+
+def _command(cmd: int, count: int) -> int:
+    return (cmd & 0x7) | (count << 3)
+
+
+def _mvt_commands(kind: str, parts: list) -> List[int]:
+    out: List[int] = []
+    cx = cy = 0
+
+    def points(pts: List[Point]) -> None:
+        nonlocal cx, cy
+        for x, y in pts:
+            out.extend((_zigzag(x - cx), _zigzag(y - cy)))
+            cx, cy = x, y
+
+    if kind == "point":
+        out.append(_command(1, len(parts)))
+        points(parts)
+        return out
+
+    rings: List[List[Point]] = []
+    if kind == "polygon":
+        for poly in parts:
+            for k, ring in enumerate(poly):
+                # exterior rings clockwise (positive area), holes counter-clockwise
+                area = _signed_area(ring)
+                if area == 0:
+                    continue
+                rings.append(ring if (area > 0) == (k == 0) else ring[::-1])
+    for part in (rings if kind == "polygon" else parts):
+        out.append(_command(1, 1))
+        points(part[:1])
+        out.append(_command(2, len(part) - 1))
+        points(part[1:])
+        if kind == "polygon":
+            out.append(_command(7, 1))
+    return out
+
+
+def _mvt_value(tile_value, v: Any) -> None:
+    if isinstance(v, bool):
+        tile_value.bool_value = v
+    elif isinstance(v, int):
+        if v < 0:
+            tile_value.sint_value = v
+        else:
+            tile_value.uint_value = v
+    elif isinstance(v, float):
+        tile_value.double_value = v
+    elif isinstance(v, str):
+        tile_value.string_value = v
+    else:
+        tile_value.string_value = json.dumps(v, separators=(",", ":"), ensure_ascii=False)
+
+
+def encode_mvt(features: List[Tuple[GeoJSON, str, list]], layer: str, extent: int) -> bytes:
+    """
+    (feature, kind, parts) from clip_geometry -> one-layer Mapbox Vector Tile.
+    """
+    from sfproto.sf.mvt import vector_tile_pb2
+
+    tile = vector_tile_pb2.Tile()
+    lyr = tile.layers.add(version=2, name=layer, extent=extent)
+    keys: Dict[str, int] = {}
+    values: Dict[Tuple[str, Any], int] = {}
+    mvt_types = {"point": vector_tile_pb2.Tile.POINT, "line": vector_tile_pb2.Tile.LINESTRING,
+                 "polygon": vector_tile_pb2.Tile.POLYGON}
+
+    for feat, kind, parts in features:
+        commands = _mvt_commands(kind, parts)
+        if len(commands) <= 1:
+            continue
+        f = lyr.features.add(type=mvt_types[kind])
+        f.geometry.extend(commands)
+
+        props = dict(feat.get("properties") or {})
+        fid = feat.get("id")
+        if isinstance(fid, int) and not isinstance(fid, bool) and fid >= 0:
+            f.id = fid
+        elif isinstance(fid, str) and fid.isdigit() and int(fid) < 1 << 64:
+            f.id = int(fid)
+        elif fid is not None:
+            props.setdefault("id", fid)
+
+        tags: List[int] = []
+        for k, v in props.items():
+            if v is None:
+                continue
+            vkey = (type(v).__name__, v if isinstance(v, (bool, int, float, str)) else json.dumps(v, sort_keys=True))
+            if k not in keys:
+                keys[k] = len(lyr.keys)
+                lyr.keys.append(k)
+            if vkey not in values:
+                values[vkey] = len(lyr.values)
+                _mvt_value(lyr.values.add(), v)
+            tags.extend((keys[k], values[vkey]))
+        f.tags.extend(tags)
+
+    return tile.SerializeToString() if lyr.features else b""
+
+
+def _tile_geometry(kind: str, parts: list) -> GeoJSON:
+    if kind == "point":
+        pts = [list(p) for p in parts]
+        return {"type": "Point", "coordinates": pts[0]} if len(pts) == 1 else {"type": "MultiPoint", "coordinates": pts}
+    if kind == "line":
+        lines = [[list(p) for p in line] for line in parts]
+        return {"type": "LineString", "coordinates": lines[0]} if len(lines) == 1 else {"type": "MultiLineString", "coordinates": lines}
+    polys = [[[list(p) for p in ring + ring[:1]] for ring in poly] for poly in parts]
+    return {"type": "Polygon", "coordinates": polys[0]} if len(polys) == 1 else {"type": "MultiPolygon", "coordinates": polys}
+
+
+def encode_sfproto_tile(features: List[Tuple[GeoJSON, str, list]]) -> bytes:
+    """
+    (feature, kind, parts) from clip_geometry -> v7 FeatureCollection in tile coordinates.
+    """
+    from sfproto.geojson.v7.geojson import geojson_to_bytes_v7
+
+    out = []
+    for feat, kind, parts in features:
+        f = {k: v for k, v in feat.items() if k not in ("geometry", "bbox")}
+        f["geometry"] = _tile_geometry(kind, parts)
+        out.append(f)
+    if not out:
+        return b""
+    return geojson_to_bytes_v7({"type": "FeatureCollection", "features": out}, srid=0, scale=1)
+
+
+def render_tile(features: Iterable[GeoJSON], bounds: Bounds, options: Dict[str, Any]) -> bytes:
+    """
+    Features (GeoJSON, in the CRS of options["srid"]) -> encoded tile; b"" when empty.
+    """
+    project = _projection(options["srid"])
+    extent, buffer = options["extent"], options["buffer"]
+    clipped = []
+    for feat in features:
+        geom = feat.get("geometry")
+        if not isinstance(geom, dict):
+            continue
+        c = clip_geometry(geom, bounds, extent, buffer, project)
+        if c is not None:
+            clipped.append((feat, c[0], c[1]))
+    if options["format"] == "mvt":
+        return encode_mvt(clipped, options["layer"], extent)
+    return encode_sfproto_tile(clipped)
+
+
+def _render_task(path: str, task: List[TileJob], options: Dict[str, Any]) -> List[Tuple[int, int, int, bytes, int]]:
+    # worker: decode the features of all tiles of the task once, render every tile
+    ids = np.unique(np.concatenate([members for _, _, _, members in task])).tolist()
+    feats = dict(zip(ids, read_features(path, ids)))
+    out = []
+    for z, x, y, members in task:
+        data = render_tile([feats[i] for i in members.tolist()], tile_bounds(z, x, y, options["grid"]), options)
+        if data:
+            out.append((z, x, y, data, len(members)))
+    return out
+
+
+# -------------------- output --------------------
+
+def _tile_writer(out: PathLike, fmt: str):
+    # (write(z, x, y, data), close()) for a directory or a .zip archive
+    suffix = TILE_SUFFIXES[fmt]
+    out = os.fspath(out)
+    if out.endswith(".zip"):
+        archive = zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED)
+
+        def write(z: int, x: int, y: int, data: bytes) -> None:
+            archive.writestr(f"{z}/{x}/{y}{suffix}", data)
+
+        return write, archive.close
+
+    def write(z: int, x: int, y: int, data: bytes) -> None:
+        folder = os.path.join(out, str(z), str(x))
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"{y}{suffix}"), "wb") as f:
+            f.write(data)
+
+    return write, lambda: None
+
+
+def _bounded_map(executor: Executor, path: str, tasks: Iterator[List[TileJob]], options: Dict[str, Any], max_pending: int):
+    # executor.map(_render_task, ...) without submitting everything up front
+    pending: Deque = deque()
+    for task in tasks:
+        pending.append(executor.submit(_render_task, path, task, options))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def generate_tiles(
+    path: PathLike,
+    out: PathLike,
+    minzoom: int = 0,
+    maxzoom: int = 14,
+    format: str = "mvt",
+    extent: int = DEFAULT_EXTENT,
+    buffer: int = DEFAULT_BUFFER,
+    layer: Optional[str] = None,
+    grid: Optional[Sequence[float]] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Write the tiles of zooms minzoom..maxzoom to out (a directory, or a .zip archive).
+    workers: processes (None = all cores, 0 or 1 = render in this process).
+    Returns stats: tiles, features (feature-tile pairs), bytes, seconds, tiles_per_second.
+    """
+    if format not in TILE_FORMATS:
+        raise ValueError(f"Unsupported tile format: {format!r} (expected one of {TILE_FORMATS})")
+    if not 0 <= minzoom <= maxzoom <= MAX_ZOOM:
+        raise ValueError(f"Invalid zoom range {minzoom}..{maxzoom} (0..{MAX_ZOOM})")
+    if extent <= 0 or buffer < 0:
+        raise ValueError("extent must be positive and buffer non-negative")
+
+    t0 = time.perf_counter()
+    path = os.fspath(path)
+    table = feature_table(path)
+    if file_deltas(path) is not None:
+        raise ValueError(f"{path!r} has delta segments; compact it before tiling (sfproto compact)")
+    srid = int(table["batches"][0]["srid"]) if table["batches"] else 0
+
+    bbox = np.asarray(table["bbox"], dtype=np.float64)
+    project = _projection(srid)
+    if project is not None and len(bbox):
+        bbox = np.concatenate((project(bbox[:, 0:2]), project(bbox[:, 2:4])), axis=1)
+    options = {
+        "format": format,
+        "extent": int(extent),
+        "buffer": int(buffer),
+        "layer": layer or os.path.splitext(os.path.basename(path))[0],
+        "srid": srid,
+        "grid": _grid(srid, bbox[np.isfinite(bbox).all(axis=1)], grid),
+    }
+    tasks = _tasks(bbox, options["grid"], minzoom, maxzoom, buffer / extent)
+
+    stats = {"tiles": 0, "features": 0, "bytes": 0}
+    write, close = _tile_writer(out, format)
+    executor: Optional[Executor] = None
+    try:
+        if workers is not None and workers <= 1:
+            results = (_render_task(path, task, options) for task in tasks)
+        else:
+            workers = workers or os.cpu_count() or 1
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = _bounded_map(executor, path, tasks, options, workers * MAX_PENDING_PER_WORKER)
+        for rendered in results:
+            for z, x, y, data, n in rendered:
+                write(z, x, y, data)
+                stats["tiles"] += 1
+                stats["features"] += n
+                stats["bytes"] += len(data)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        close()
+
+    seconds = time.perf_counter() - t0
+    stats["seconds"] = seconds
+    stats["tiles_per_second"] = stats["tiles"] / seconds if seconds > 0 else 0.0
+    return stats
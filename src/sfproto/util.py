@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Iterator, Union
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Small helpers shared by the codecs, the index and the dataset writers, with no
+# dependencies of their own.
+
+
+def copy_geojson(obj: Any) -> Any:
+    """
+    Deep copy of a decoded (JSON-like) value; much faster than copy.deepcopy.
+    """
+    if isinstance(obj, dict):
+        return {k: copy_geojson(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [copy_geojson(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(copy_geojson(v) for v in obj)
+    return obj  # str, int, float, bool, None are immutable
+
+
+@contextmanager
+def atomic_writer(path: PathLike, fsync: bool = False) -> Iterator[BinaryIO]:
+    """
+    Binary file written next to path and renamed over it when the block succeeds,
+    so readers never see a partial file; on an exception the temporary file is removed.
+    """
+    path = os.fspath(path)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_atomic(path: PathLike, data: bytes, fsync: bool = False) -> None:
+    with atomic_writer(path, fsync=fsync) as f:
+        f.write(data)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+# Protobuf wire format helpers on NumPy arrays (no per-value Python loop).
+#   zigzag_encode: sint32/sint64 values -> unsigned (the encoding of sint fields)
+#   varint_pack:   unsigned values -> concatenated LEB128 varints (a packed field body)
+#   varint_unpack / zigzag_decode: the reverse
+# varint_sizes gives the encoded size per value, so callers can slice the packed
+# buffer per element (cumsum of the sizes = byte offsets).
+#
+# A packed sint32/sint64 field body (dxy, BAG dx/dy) round-trips as
+#   body = varint_pack(zigzag_encode(values))
+#   values = zigzag_decode(varint_unpack(body))
+# and a packed uint32 field (part_sizes) without the zigzag step.
+
+WIRETYPE_VARINT = 0
+WIRETYPE_LEN = 2
+
+_MAX_VARINT_LEN = 10
+_VARINT_LIMITS = np.array([1 << (7 * k) for k in range(1, _MAX_VARINT_LEN)], dtype=np.uint64)
+
+
+def zigzag_encode(values) -> np.ndarray:
+    """
+    int64 array -> uint64 array: 0, -1, 1, -2, ... -> 0, 1, 2, 3, ...
+    Same result as protobuf for sint32 and sint64 (for values in range).
+    """
+    a = np.asarray(values, dtype=np.int64)
+    return ((a << 1) ^ (a >> 63)).view(np.uint64)
+
+
+def zigzag_decode(values) -> np.ndarray:
+    """
+    uint64 array -> int64 array (inverse of zigzag_encode).
+    """
+    u = np.asarray(values, dtype=np.uint64)
+    return ((u >> np.uint64(1)) ^ (np.uint64(0) - (u & np.uint64(1)))).view(np.int64)
+
+
+def varint_sizes(values) -> np.ndarray:
+    """
+    Encoded varint length (1..10 bytes) of every value of a uint64 array.
+    """
+    u = np.asarray(values, dtype=np.uint64)
+    sizes = np.ones(u.shape, dtype=np.int64)
+    top = u.max() if u.size else 0
+    for limit in _VARINT_LIMITS:
+        if limit > top:
+            break
+        sizes += u >= limit
+    return sizes
+
+
+def varint_pack(values, sizes: Optional[np.ndarray] = None) -> bytes:
+    """
+    uint64 array -> concatenated varints (the body of a packed repeated field).
+    sizes: varint_sizes(values), if already computed.
+    """
+    u = np.ascontiguousarray(values, dtype=np.uint64).ravel()
+    if u.size == 0:
+        return b""
+    if sizes is None:
+        sizes = varint_sizes(u)
+    width = int(sizes.max())
+    if width == 1:
+        return u.astype(np.uint8).tobytes()
+
+    # one row of `width` bytes per value (continuation bit on all but its last byte),
+    # then keep the first sizes[i] bytes of row i; row-major order = wire order
+    rows = np.empty((u.size, width), dtype=np.uint8)
+    for k in range(width):
+        col = rows[:, k]
+        np.bitwise_and((u >> np.uint64(7 * k)).astype(np.uint8), 0x7F, out=col)
+        col |= (sizes > k + 1).view(np.uint8) << 7
+    keep = np.arange(width) < sizes[:, None]
+    return np.compress(keep.ravel(), rows.ravel()).tobytes()
+
+
+def varint_unpack(data) -> np.ndarray:
+    """
+    Concatenated varints (bytes, bytearray, memoryview or uint8 array) -> uint64 array.
+    Raises ValueError on a truncated last varint or one longer than 10 bytes.
+    """
+    b = data if isinstance(data, np.ndarray) else np.frombuffer(data, dtype=np.uint8)
+    if b.size == 0:
+        return np.zeros(0, dtype=np.uint64)
+    if b[-1] & 0x80:
+        raise ValueError("truncated varint")
+
+    ends = np.flatnonzero(b < 0x80)  # last byte of every varint
+    if ends.size == b.size:
+        return b.astype(np.uint64)  # all single-byte
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    sizes = ends - starts + 1
+    width = int(sizes.max())
+    if width > _MAX_VARINT_LEN:
+        raise ValueError("varint longer than %d bytes" % _MAX_VARINT_LEN)
+
+    out = (b[starts] & 0x7F).astype(np.uint64)
+    for k in range(1, width):
+        # byte k of every varint; shorter varints read their own last byte, masked out
+        byte = (b[np.minimum(starts + k, ends)] & 0x7F).astype(np.uint64)
+        byte[sizes <= k] = 0
+        out |= byte << np.uint64(7 * k)
+    return out
+
+
+def encode_varint(value: int) -> bytes:
+    # single (non-negative) varint, e.g. a length prefix
+    if value < 0x80:
+        return bytes((value,))
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def field_tag(field_number: int, wire_type: int) -> bytes:
+    return encode_varint((field_number << 3) | wire_type)
+
+
+def len_field(field_number: int, body: bytes) -> bytes:
+    # one length-delimited field (sub-message, packed repeated, bytes, string)
+    return field_tag(field_number, WIRETYPE_LEN) + encode_varint(len(body)) + body
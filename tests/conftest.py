@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+import pytest
+
+GeoJSON = Dict[str, Any]
+
+# Shared collection factories for the file-level tests (access, index, scan,
+# serve, stats, dataset). Feature i has id "f<i>"; everything else can be set
+# per test as a function of i.
+
+GeometryArg = Union[None, Sequence[GeoJSON], Callable[[int], GeoJSON]]
+
+_RING = [[100.0, 400.0], [110.0, 400.0], [110.0, 412.5], [100.0, 400.0]]
+_HOLE = [[102.0, 402.0], [104.0, 402.0], [104.0, 404.0], [102.0, 402.0]]
+
+
+def _geometry(geometry: GeometryArg, i: int) -> GeoJSON:
+    if geometry is None:
+        return {"type": "Point", "coordinates": [4.9 + i * 0.01, 52.37]}
+    if callable(geometry):
+        return geometry(i)
+    return geometry[i % len(geometry)]
+
+
+def _make_fc(
+    n: int,
+    geometry: GeometryArg = None,
+    properties: Optional[Callable[[int], Optional[GeoJSON]]] = None,
+    **members: Any,
+) -> GeoJSON:
+    """
+    FeatureCollection of n Features. geometry: a list (cycled) or a function of i,
+    default Points along 52.37 N; properties: a function of i, default {"kind": "a"/"b"};
+    members: extra collection members (name, crs, ...).
+    """
+    return {
+        "type": "FeatureCollection",
+        **members,
+        "features": [
+            {
+                "type": "Feature",
+                "id": f"f{i}",
+                "geometry": _geometry(geometry, i),
+                "properties": properties(i) if properties else {"kind": "ab"[i % 2]},
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def _make_panden(
+    n: int,
+    step: float = 0.0,
+    holes: bool = False,
+    properties: Optional[Callable[[int], GeoJSON]] = None,
+) -> GeoJSON:
+    """
+    BAG-style panden (EPSG:28992) with uuid ids: the same square-ish ring
+    shifted step metres east per pand, optionally with a hole.
+    """
+    rings = (_RING, _HOLE) if holes else (_RING,)
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "id": "pand.%08x-0000-4000-8000-%012x" % (i, i),
+                "geometry": {"type": "Polygon", "coordinates": [[[x + step * i, y] for x, y in r] for r in rings]},
+                "properties": properties(i) if properties else {"identificatie": f"{i:016d}", "bouwjaar": 1990 + i},
+            }
+            for i in range(n)
+        ],
+    }
+
+
+@pytest.fixture
+def make_fc() -> Callable[..., GeoJSON]:
+    return _make_fc
+
+
+@pytest.fixture
+def make_panden() -> Callable[..., GeoJSON]:
+    return _make_panden
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+
+from sfproto.access import read_feature, read_features
+from sfproto.geojson.v3_BAG.geojson_bag import (
+    bytes_to_geojson_pand_featurecollection,
+    geojson_pand_featurecollection_to_bytes,
+)
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.geojson.v7.geojson_batched import geojson_featurecollection_to_batched_bytes_v7
+
+GEOMETRIES = [
+    {"type": "Point", "coordinates": [4.9, 52.37]},
+    {"type": "LineString", "coordinates": [[4.9, 52.37], [4.95, 52.3], [5.1, 52.4]]},
+    {"type": "Polygon", "coordinates": [[[4.0, 52.0], [4.2, 52.0], [4.2, 52.1], [4.0, 52.0]]]},
+]
+
+
+
+@pytest.mark.parametrize("encode", [
+    lambda fc: geojson_to_bytes_v7(fc, srid=4326),
+    lambda fc: geojson_to_bytes_v7(fc, srid=4326, dedup=True),
+    lambda fc: geojson_featurecollection_to_batched_bytes_v7(fc, srid=4326, batch_size=4),
+])
+def test_read_v7(tmp_path, make_fc, encode):
+    data = encode(make_fc(10, GEOMETRIES, lambda i: {"kind": "abc"[i % 3]}))
+    path = tmp_path / "fc.pb"
+    path.write_bytes(data)
+    expected = bytes_to_geojson_v7(data)["features"]
+
+    assert read_feature(path, 5) == expected[5]
+    assert read_features(path, [9, 0, -1]) == [expected[9], expected[0], expected[9]]
+    with pytest.raises(IndexError):
+        read_feature(path, 10)
+
+
+def test_read_bag(tmp_path, make_panden):
+    fc = make_panden(5, step=1.0, properties=lambda i: {
+        "identificatie": f"{i:016d}", "bouwjaar": 1990 + i, "gebruiksdoel": "woonfunctie",
+    })
+    data = geojson_pand_featurecollection_to_bytes(fc)
+    path = tmp_path / "panden.pb"
+    path.write_bytes(data)
+
+    expected = bytes_to_geojson_pand_featurecollection(data)["features"]
+    assert read_features(path, [3, 1]) == [expected[3], expected[1]]
+
+    # rewritten file: the cached scan table is not reused
+    path.write_bytes(geojson_pand_featurecollection_to_bytes({**fc, "features": fc["features"][2:]}))
+    assert read_feature(path, 0)["id"] == expected[2]["id"]
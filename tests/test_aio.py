@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from sfproto.aio import aiter_batches, aiter_features, aread_collection, awrite_collection
+from sfproto.geojson.v7.geojson import _TAG_FC7, _TAG_STV7, bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.geojson.v7.geojson_batched import frame_tag, geojson_featurecollection_to_batched_bytes_v7, iter_frames
+from sfproto.geojson.v7.geojson_delta import append_delta
+from sfproto.synthetic import generate
+
+SCALE = 10_000_000
+
+
+def _fc() -> dict:
+    fc = generate("osm", 230, seed=13, regime="mixed", profile="few")
+    fc["name"] = "roads"
+    return fc
+
+
+def test_write_read_roundtrip(tmp_path):
+    fc = _fc()
+    path = tmp_path / "roads.fcb7"
+
+    async def run():
+        written = await awrite_collection(path, fc, srid=4326, scale=SCALE, batch_size=100, max_pending=2, stats=True)
+        batches = [b async for b in aiter_batches(path, max_pending=1)]
+        return written, batches, await aread_collection(path)
+
+    written, batches, out = asyncio.run(run())
+    data = path.read_bytes()
+    assert written == len(data)
+    assert [frame_tag(blob) for _, blob in iter_frames(data)] == [_TAG_STV7, _TAG_FC7] * 3
+    assert [len(b["features"]) for b in batches] == [100, 100, 30]
+    assert batches[0]["name"] == "roads" and "name" not in batches[1]
+    assert out == bytes_to_geojson_v7(data) == bytes_to_geojson_v7(geojson_to_bytes_v7(fc, srid=4326, scale=SCALE))
+
+
+def test_stream_and_async_iterable(tmp_path):
+    fc = _fc()
+    path = tmp_path / "roads.fcb7"
+
+    async def features():
+        for feat in fc["features"]:
+            yield feat
+
+    async def run():
+        await awrite_collection(path, features(), srid=4326, scale=SCALE, batch_size=64)
+        reader = asyncio.StreamReader()
+        reader.feed_data(path.read_bytes())
+        reader.feed_eof()
+        return [f async for f in aiter_features(reader)]
+
+    feats = asyncio.run(run())
+    assert feats == bytes_to_geojson_v7(geojson_to_bytes_v7(fc, srid=4326, scale=SCALE))["features"]
+
+
+def test_unbatched_and_process_pool(tmp_path):
+    fc = _fc()
+    plain = tmp_path / "roads.fcv7"
+    plain.write_bytes(geojson_to_bytes_v7(fc, srid=4326, scale=SCALE))
+    batched = tmp_path / "roads.fcb7"
+
+    async def run(executor):
+        await awrite_collection(batched, fc, srid=4326, scale=SCALE, batch_size=100, executor=executor)
+        return await aread_collection(plain), await aread_collection(batched, executor=executor)
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        a, b = asyncio.run(run(executor))
+    assert a == b == bytes_to_geojson_v7(plain.read_bytes())
+
+
+def test_delta_segments(tmp_path):
+    fc = _fc()
+    for i, feat in enumerate(fc["features"]):
+        feat["id"] = f"f{i}"
+    path = tmp_path / "roads.fcb7"
+    path.write_bytes(geojson_featurecollection_to_batched_bytes_v7(fc, srid=4326, scale=SCALE, batch_size=100))
+    moved = {**fc["features"][2], "properties": {"kind": "moved"}}
+    new = {"type": "Feature", "id": "f999", "geometry": {"type": "Point", "coordinates": [4.9, 52.4]}, "properties": {}}
+    append_delta(path, features=[moved, new], deleted=["f1", "f150"])
+    expected = bytes_to_geojson_v7(path.read_bytes())
+    assert len(expected["features"]) == len(fc["features"]) - 1
+
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(path.read_bytes())
+        reader.feed_eof()
+        return await aread_collection(path, max_pending=1), [f async for f in aiter_features(reader)]
+
+    out, streamed = asyncio.run(run())
+    assert out == expected
+    assert streamed == expected["features"]
+
+
+def test_failed_write_leaves_no_partial_file(tmp_path):
+    path = tmp_path / "roads.fcb7"
+    path.write_bytes(b"old")
+    feats = _fc()["features"]
+    bad = {"type": "Feature", "geometry": {"type": "Circle", "coordinates": [0, 0]}, "properties": {}}
+
+    async def run():
+        await awrite_collection(path, feats[:150] + [bad], srid=4326, batch_size=100)
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["roads.fcb7"]
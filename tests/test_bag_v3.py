@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+
+from sfproto.access import read_feature
+from sfproto.geojson.v3_BAG.geojson_bag import (
+    GEBRUIKSDOEL_MAP,
+    bytes_to_geojson_pand_featurecollection,
+    geojson_pand_featurecollection_to_bytes,
+    pand_pb2,
+)
+from sfproto.index import get_by_id
+from sfproto.synthetic import generate_bag
+
+DOELEN = ["kantoorfunctie", "woonfunctie"]  # not in enum order: revision 1 keeps the stored order
+
+
+def _revision_1(fc: dict) -> bytes:
+    # a blob as the encoder wrote it before the bitmask: repeated gebruiksdoelen, revision 1
+    msg = pand_pb2.PandFeatureCollection.FromString(geojson_pand_featurecollection_to_bytes(fc))
+    msg.revision = 1
+    for f in msg.features:
+        f.properties.ClearField("gebruiksdoel_mask")
+        f.properties.gebruiksdoelen.extend(GEBRUIKSDOEL_MAP[d] for d in DOELEN)
+    return msg.SerializeToString()
+
+
+def test_decode_revision_1(tmp_path):
+    fc = generate_bag(20, seed=3)
+    data = _revision_1(fc)
+    out = bytes_to_geojson_pand_featurecollection(data)
+    assert [f["properties"]["gebruiksdoel"] for f in out["features"]] == [",".join(DOELEN)] * 20
+    for a, b in zip(out["features"], fc["features"]):
+        assert a["id"] == b["id"]
+        assert a["geometry"]["coordinates"] == b["geometry"]["coordinates"]
+
+    # the random-access paths read the revision from the scan table and the sidecar
+    path = tmp_path / "panden.pb"
+    path.write_bytes(data)
+    assert read_feature(path, 7) == out["features"][7]
+    assert get_by_id(path, fc["features"][7]["id"]) == out["features"][7]
+
+
+def test_decode_revision_2_and_unknown():
+    fc = generate_bag(20, seed=3)
+    data = geojson_pand_featurecollection_to_bytes(fc)
+    out = bytes_to_geojson_pand_featurecollection(data)
+    assert [f["properties"]["gebruiksdoel"] for f in out["features"]] == [
+        f["properties"]["gebruiksdoel"] for f in fc["features"]
+    ]
+
+    msg = pand_pb2.PandFeatureCollection.FromString(data)
+    msg.revision = 3
+    with pytest.raises(ValueError, match="revision 3"):
+        bytes_to_geojson_pand_featurecollection(msg.SerializeToString())
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from sfproto.geojson.v3_BAG.geojson_bag import (
+    bytes_to_geojson_pand_featurecollection,
+    geojson_pand_featurecollection_to_bytes,
+)
+from sfproto.geojson.v4_BAG.geojson_bag import (
+    bytes_to_geojson_pand_featurecollection_v4,
+    geojson_pand_featurecollection_to_bytes_v4,
+)
+from sfproto.synthetic import generate_bag
+
+NIL = "pand.00000000-0000-0000-0000-000000000000"
+
+
+def _panden() -> dict:
+    fc = generate_bag(250, seed=7)
+    fc["features"][3]["id"] = NIL
+    del fc["features"][4]["id"]
+    fc["features"][5]["bbox"] = [100.0, 200.0, 110.5, 212.25]
+    return fc
+
+
+def test_roundtrip_v4():
+    fc = _panden()
+    out = bytes_to_geojson_pand_featurecollection_v4(geojson_pand_featurecollection_to_bytes_v4(fc, batch_size=64))
+    assert [f.get("id") for f in out["features"]] == [f.get("id") for f in fc["features"]]
+    assert out["features"][3]["id"] == NIL and "id" not in out["features"][4]
+    assert [i for i, f in enumerate(out["features"]) if "bbox" in f] == [5]
+    assert out["features"][5]["bbox"] == [100.0, 200.0, 110.5, 212.25]
+    for a, b in zip(out["features"], fc["features"]):
+        assert a["properties"] == b["properties"]
+        assert a["geometry"]["coordinates"] == b["geometry"]["coordinates"]
+
+
+def test_v3_v4_equivalent():
+    fc = _panden()
+    v3 = bytes_to_geojson_pand_featurecollection(geojson_pand_featurecollection_to_bytes(fc))
+    v4 = bytes_to_geojson_pand_featurecollection_v4(geojson_pand_featurecollection_to_bytes_v4(fc, batch_size=100))
+    assert v4 == v3
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.geojson.v7.geojson_batch import decode_many, encode_many
+
+OBJS = [
+    {"type": "Feature", "id": "a", "properties": {"name": "x", "n": 1}, "geometry": {"type": "Point", "coordinates": [4.5, 52.1]}},
+    {"type": "Feature", "properties": None, "bbox": [4.0, 52.0, 4.1, 52.1],
+     "geometry": {"type": "LineString", "coordinates": [[4.0, 52.0], [4.1, 52.1]]}},
+    {"type": "Feature", "properties": {"k": [1, 2]}, "foreign": "member",
+     "geometry": {"type": "Polygon", "coordinates": [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]]]}},
+    # not a Feature: falls back to geojson_to_bytes_v7
+    {"type": "Point", "coordinates": [1.5, 2.5]},
+    {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"v": 1}, "geometry": {"type": "Point", "coordinates": [1.0, 2.0]}},
+    ]},
+]
+
+
+def _expected() -> list:
+    return [bytes_to_geojson_v7(geojson_to_bytes_v7(o, srid=4326, scale=1_000_000)) for o in OBJS]
+
+
+def test_roundtrip():
+    blobs = encode_many(OBJS, srid=4326, scale=1_000_000)
+    assert len(blobs) == len(OBJS)
+    assert decode_many(blobs) == _expected()
+    # every blob is a regular v7 payload
+    assert [bytes_to_geojson_v7(b) for b in blobs] == _expected()
+    # same bytes as the one-by-one encoder (no properties: the Struct map order plays no role)
+    assert blobs[1] == geojson_to_bytes_v7(OBJS[1], srid=4326, scale=1_000_000)
+
+
+def test_framed_and_json_input():
+    framed = encode_many([json.dumps(o) for o in OBJS], srid=4326, scale=1_000_000, framed=True)
+    assert isinstance(framed, bytes)
+    assert decode_many(framed) == _expected()
+
+
+def test_invalid_feat_payload():
+    blob = encode_many(OBJS[:1], srid=4326, scale=1_000_000)[0]
+    with pytest.raises(ValueError, match="Invalid FEAT payload"):
+        decode_many([blob[:-1]])
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from sfproto.geojson.v7.geojson import _TAG_FC7, _TAG_FCB7, _TAG_STV7, bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.geojson.v7.geojson_batched import (
+    encode_batch_v7,
+    frame_tag,
+    geojson_featurecollection_to_batched_bytes_v7,
+    iter_batches_v7,
+    iter_frames,
+    merge_batches,
+)
+from sfproto.synthetic import generate
+
+
+def _fc() -> dict:
+    fc = generate("osm", 250, seed=11, regime="mixed", profile="few")
+    fc["name"] = "roads"
+    return fc
+
+
+def test_roundtrip_framing():
+    fc = _fc()
+    data = geojson_featurecollection_to_batched_bytes_v7(fc, srid=4326, scale=10_000_000, batch_size=100, stats=True)
+    assert data[:4] == _TAG_FCB7
+    # per batch a stats frame, then the FCV7 batch
+    assert [frame_tag(blob) for _, blob in iter_frames(data)] == [_TAG_STV7, _TAG_FC7] * 3
+
+    batches = list(iter_batches_v7(data))
+    assert [len(b["features"]) for b in batches] == [100, 100, 50]
+    # collection members only in the first batch
+    assert batches[0]["name"] == "roads" and "name" not in batches[1]
+
+    single = bytes_to_geojson_v7(geojson_to_bytes_v7(fc, srid=4326, scale=10_000_000))
+    assert merge_batches(batches) == single
+    assert bytes_to_geojson_v7(data) == single
+
+
+def test_encode_batch_frames_concatenate():
+    fc = _fc()
+    feats = fc["features"]
+    data = _TAG_FCB7 + b"".join(
+        encode_batch_v7(feats[i:i + 100], srid=4326, scale=10_000_000, members={"name": "roads"} if i == 0 else None)
+        for i in range(0, len(feats), 100)
+    )
+    assert bytes_to_geojson_v7(data) == bytes_to_geojson_v7(
+        geojson_featurecollection_to_batched_bytes_v7(fc, srid=4326, scale=10_000_000, batch_size=100)
+    )
+
+
+def test_merge_and_errors():
+    assert merge_batches([]) == {"type": "FeatureCollection", "features": []}
+    with pytest.raises(ValueError, match="FCB7"):
+        list(iter_batches_v7(geojson_to_bytes_v7(_fc(), srid=4326)))
+    data = geojson_featurecollection_to_batched_bytes_v7(_fc(), srid=4326, batch_size=100)
+    with pytest.raises(ValueError):
+        bytes_to_geojson_v7(data[:-3])
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# The benchmark suite (scripts/benchmark/suite) end to end on one tiny case:
+# results JSON, then the regression gate against a doctored baseline.
+
+SUITE = Path(__file__).resolve().parents[1] / "scripts" / "benchmark" / "suite"
+CASE = "v7-Point-few-100"
+
+
+def _suite(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", str(SUITE), "-q", "-p", "no:cacheprovider",
+         "--bench-sizes", "tiny", "--bench-runs", "1", "-k", "v7-Point-few", *args],
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_results_and_gate(tmp_path):
+    results = tmp_path / "results.json"
+    proc = _suite("--bench-json", str(results))
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    doc = json.loads(results.read_text())
+    assert doc["format"] == "sfproto-bench" and list(doc["results"]) == [CASE]
+    r = doc["results"][CASE]
+    assert (r["codec"], r["geometry"], r["profile"], r["features"]) == ("v7", "Point", "few", 100)
+    for phase in ("encode", "decode"):
+        assert r[phase]["best_s"] > 0 and r[phase]["features_per_s"] > 0 and r[phase]["peak_bytes"] > 0
+    assert r["encoded_bytes"] < r["geojson_bytes"]
+
+    # the encoded size is deterministic: same size passes, a smaller baseline size fails
+    baseline = tmp_path / "baseline.json"
+    for phase in ("encode", "decode"):
+        r[phase]["best_s"] = r[phase]["peak_bytes"] = 1e12
+    baseline.write_text(json.dumps(doc))
+    proc = _suite("--bench-json", "", "--bench-baseline", str(baseline), "--bench-threshold", "5")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    r["encoded_bytes"] = int(r["encoded_bytes"] / 1.2)
+    baseline.write_text(json.dumps(doc))
+    proc = _suite("--bench-json", "", "--bench-baseline", str(baseline), "--bench-threshold", "5")
+    assert proc.returncode == 1
+    assert f"{CASE} regressed" in proc.stdout and "encoded_bytes" in proc.stdout
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+
+from sfproto.cache import cached_decoder
+from sfproto.geojson.v7.geojson import geojson_to_bytes_v7
+
+
+def _fc(name: str) -> dict:
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [4.9, 52.37]}, "properties": {"name": name}},
+        ],
+    }
+
+
+def test_hits_and_copies():
+    decode = cached_decoder(max_entries=2)
+    data = geojson_to_bytes_v7(_fc("a"), srid=4326)
+
+    first = decode(data)
+    first["features"][0]["properties"]["name"] = "changed"
+    second = decode(data)
+
+    assert second["features"][0]["properties"]["name"] == "a"
+    info = decode.cache_info()
+    assert (info["hits"], info["misses"], info["entries"]) == (1, 1, 1)
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    blobs = [geojson_to_bytes_v7(_fc(n), srid=4326) for n in ("a", "b", "c")]
+
+    decode = cached_decoder(max_entries=2)
+    for b in blobs:
+        decode(b)
+    decode(blobs[0])  # evicted -> miss
+    assert decode.cache_info()["evictions"] == 2
+    assert decode.cache_info()["misses"] == 4
+
+    decode = cached_decoder(max_entries=None, max_bytes=len(blobs[0]) + len(blobs[1]))
+    for b in blobs:
+        decode(b)
+    info = decode.cache_info()
+    assert info["entries"] == 2 and info["bytes"] <= info["max_bytes"]
+
+
+def test_read_keyed_by_path_mtime_size(tmp_path):
+    decode = cached_decoder()
+    path = tmp_path / "fc.bin"
+    path.write_bytes(geojson_to_bytes_v7(_fc("a"), srid=4326))
+
+    assert decode.read(path)["features"][0]["properties"]["name"] == "a"
+    assert decode.read(path)["features"][0]["properties"]["name"] == "a"
+    assert decode.cache_info()["hits"] == 1
+
+    path.write_bytes(geojson_to_bytes_v7(_fc("bb"), srid=4326))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert decode.read(path)["features"][0]["properties"]["name"] == "bb"
+    assert decode.cache_info()["misses"] == 2
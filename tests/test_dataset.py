@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from sfproto.dataset import MANIFEST, read_dataset, read_manifest, write_dataset
+
+
+CRS = {"type": "name", "properties": {"name": "urn:ogc:def:crs:EPSG::28992"}}
+
+
+@pytest.fixture
+def grid_fc(make_fc):
+    return lambda n: make_fc(
+        n,
+        lambda i: {"type": "Point", "coordinates": [1000.0 + (i % 20) * 10, 2000.0 + (i // 20) * 10]},
+        lambda i: {"n": i, "kind": "ab"[i % 2], "flag": None if i else True},
+        name="grid",
+        crs=CRS,
+    )
+
+
+def test_hilbert_dataset(tmp_path, grid_fc):
+    manifest = write_dataset(grid_fc(400), tmp_path / "ds", shards=4, batch_size=30, stats=True)
+    on_disk = json.loads((tmp_path / "ds" / MANIFEST).read_text())
+    assert on_disk == manifest
+    assert read_manifest(tmp_path / "ds")["root"] == str(tmp_path / "ds")
+    assert on_disk["srid"] == 28992 and on_disk["scale"] == 100
+    assert on_disk["features"] == 400 and [s["features"] for s in on_disk["shards"]] == [100] * 4
+    assert on_disk["schema"] == {"n": "number", "kind": "string", "flag": "bool"}
+    assert on_disk["members"] == {"name": "grid"}
+    keys = [s["keys"] for s in on_disk["shards"]]
+    assert all(a[1] <= b[0] for a, b in zip(keys, keys[1:]))  # disjoint key ranges, in order
+
+    fc = read_dataset(tmp_path / "ds")
+    assert fc["name"] == "grid"
+    assert sorted(f["id"] for f in fc["features"]) == sorted(f"f{i}" for i in range(400))
+
+    stats = {}
+    bbox = (1000.0, 2000.0, 1045.0, 2045.0)  # a 5 x 5 corner of the grid
+    hits = read_dataset(tmp_path / "ds", bbox=bbox, where=[("kind", "==", "a")], workers=2, stats=stats)
+    expected = {f"f{i}" for i in range(400) if i % 20 < 5 and i // 20 < 5 and i % 2 == 0}
+    assert {f["id"] for f in hits["features"]} == expected
+    assert stats["shards_skipped"] > 0 and stats["features"] == len(expected)
+
+    corner = read_dataset(tmp_path / "ds", bbox=bbox)  # scan table path
+    assert len(corner["features"]) == 25
+
+
+def test_count_dataset(tmp_path, grid_fc):
+    feats = iter(grid_fc(250)["features"])
+    manifest = write_dataset(feats, tmp_path / "ds", partition="count", shard_size=100, srid=28992)
+    assert [s["features"] for s in manifest["shards"]] == [100, 100, 50]
+    assert "keys" not in manifest["shards"][0]
+    fc = read_dataset(tmp_path / "ds", workers=3)
+    assert [f["id"] for f in fc["features"]] == [f"f{i}" for i in range(250)]  # input order
+
+    with pytest.raises(ValueError):
+        write_dataset(grid_fc(10), tmp_path / "bad", partition="count")
+    with pytest.raises(ValueError):
+        write_dataset(grid_fc(10), tmp_path / "bad", partition="hilbert")
+
+
+def test_failed_shard_leaves_no_tmp(tmp_path, grid_fc):
+    fc = grid_fc(40)
+    fc["features"][25]["properties"]["n"] = object()  # not encodable
+    with pytest.raises(Exception):
+        write_dataset(fc, tmp_path / "ds", partition="count", shard_size=20)
+    assert not [p.name for p in (tmp_path / "ds").iterdir() if p.name.endswith(".tmp")]
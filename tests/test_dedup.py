@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.sf.v7 import geometry_pb2
+
+
+def _fc() -> dict:
+    # 12 features: 3 distinct geometries, 2 distinct property sets, one of them null
+    geoms = [
+        {"type": "Point", "coordinates": [4.5, 52.1]},
+        {"type": "LineString", "coordinates": [[4.5, 52.1], [4.6, 52.2]]},
+        {"type": "Polygon", "coordinates": [[[4.5, 52.1], [4.6, 52.1], [4.6, 52.2], [4.5, 52.1]]]},
+    ]
+    props = [{"kind": "shop", "levels": 2, "tags": {"a": [1, 2]}}, None]
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "id": f"f{i}", "geometry": geoms[i % 3], "properties": props[i % 2]}
+            for i in range(12)
+        ],
+    }
+
+
+def _body(data: bytes) -> geometry_pb2.FeatureCollection:
+    return geometry_pb2.FeatureCollection.FromString(data[8:])  # tag + chunk length
+
+
+def test_dedup_roundtrip_and_stats():
+    fc = _fc()
+    stats: dict = {}
+    data = geojson_to_bytes_v7(fc, srid=4326, scale=10**6, dedup=True, stats=stats)
+    plain = geojson_to_bytes_v7(fc, srid=4326, scale=10**6)
+    assert len(data) < len(plain)
+
+    out = bytes_to_geojson_v7(data)
+    assert out == bytes_to_geojson_v7(plain)
+    assert [f["properties"] for f in out["features"]] == [f["properties"] for f in fc["features"]]
+
+    # 9 geometries and 5 property sets need not be stored (null properties are not shared)
+    assert stats["features"] == 12
+    assert (stats["unique_geometries"], stats["shared_geometries"]) == (3, 3)
+    assert (stats["unique_properties"], stats["shared_properties"]) == (7, 1)
+    assert stats["geometry_dedup_ratio"] == 9 / 12
+    assert stats["properties_dedup_ratio"] == 5 / 12
+    assert stats["dedup_ratio"] == 14 / 24
+
+    # every feature gets its own copy of a shared geometry / property set
+    out["features"][0]["properties"]["kind"] = "changed"
+    out["features"][0]["geometry"]["coordinates"][0] = 0.0
+    assert out["features"][2]["properties"]["kind"] == "shop"
+    assert out["features"][3]["geometry"]["coordinates"][0] == 4.5
+
+
+def test_dedup_off_without_repeats():
+    fc = _fc()
+    fc["features"] = fc["features"][:2]
+    stats: dict = {}
+    geojson_to_bytes_v7(fc, srid=4326, scale=10**6, dedup=True, stats=stats)
+    assert stats["dedup_ratio"] == 0.0 and stats["shared_geometries"] == 0
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from sfproto.access import read, read_features
+from sfproto.geojson.v7.geojson import _TAG_DLV7, bytes_to_geojson_v7
+from sfproto.geojson.v7.geojson_batched import frame_tag, geojson_featurecollection_to_batched_bytes_v7, iter_frames
+from sfproto.geojson.v7.geojson_delta import append_delta, compact
+from sfproto.index import build_index, get_by_id, index_path
+from sfproto.tiles import generate_tiles
+
+
+def _feature(i: int, kind: str = "old", fid=True) -> dict:
+    feat = {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [4.0 + (i % 7) * 0.1, 52.0 + i * 0.01]},
+        "properties": {"kind": kind, "n": i},
+    }
+    if fid:
+        feat["id"] = f"f{i}"
+    return feat
+
+
+def _ids(fc: dict) -> list:
+    return [f.get("id") for f in fc["features"]]
+
+
+@pytest.fixture
+def path(tmp_path):
+    fc = {"type": "FeatureCollection", "name": "base", "features": [_feature(i) for i in range(40)]}
+    p = tmp_path / "base.pb"
+    p.write_bytes(geojson_featurecollection_to_batched_bytes_v7(fc, srid=4326, scale=10**6, batch_size=16, stats=True))
+    return p
+
+
+def test_append_and_read(path):
+    build_index(path)
+    ino = os.stat(index_path(path)).st_ino
+
+    append_delta(path, features=[_feature(3, "new"), _feature(100, "new")], deleted=["f5", "f6"])
+    out = append_delta(path, features=[_feature(6, "new"), _feature(200, "new", fid=False)], deleted=["f100"])
+    assert out["features"] == 2 and out["deleted"] == 1
+
+    fc = bytes_to_geojson_v7(path.read_bytes())
+    assert fc["name"] == "base"
+    assert _ids(fc) == [f"f{i}" for i in range(40) if i != 5] + [None]
+    by_id = {f.get("id"): f for f in fc["features"]}
+    assert by_id["f3"]["properties"]["kind"] == "new"  # replaced in place
+    assert by_id["f6"]["properties"]["kind"] == "new"  # deleted, then added again: net replaced
+
+    # lookups: deltas first, the (re-stamped) index for the base
+    assert get_by_id(path, "f3")["properties"]["kind"] == "new"
+    assert get_by_id(path, "f5") is None
+    assert get_by_id(path, "f100") is None
+    assert get_by_id(path, "f7")["properties"]["kind"] == "old"
+    assert os.stat(index_path(path)).st_ino == ino
+
+    # filtered reads see the replacements, not the replaced features
+    stats = {}
+    new = read(path, where=[("kind", "==", "new")], stats=stats)
+    assert sorted(_ids(new), key=str) == sorted(["f3", "f6", None], key=str)
+    assert read(path, where=[("n", "==", 5)])["features"] == []  # deleted
+
+
+def test_compact(path):
+    build_index(path)
+    append_delta(path, features=[_feature(3, "new"), _feature(100, "new")], deleted=["f5"])
+    merged = {f["id"]: f for f in bytes_to_geojson_v7(path.read_bytes())["features"]}
+
+    out = compact(path)
+    assert out == {"features": 40, "segments": 1, "bytes_before": out["bytes_before"], "bytes_after": path.stat().st_size}
+
+    data = path.read_bytes()
+    assert _TAG_DLV7 not in {frame_tag(blob) for _, blob in iter_frames(data)}
+    fc = bytes_to_geojson_v7(data)
+    assert fc["name"] == "base"
+    assert sorted(_ids(fc)) == sorted(merged)
+    assert _ids(fc) != list(merged)  # spatially sorted
+    for feat in fc["features"]:
+        assert feat["properties"] == merged[feat["id"]]["properties"]
+    assert get_by_id(path, "f100")["properties"]["kind"] == "new"
+    assert get_by_id(path, "f5") is None
+
+
+def test_append_errors(path, tmp_path):
+    with pytest.raises(ValueError):
+        append_delta(path)
+    plain = tmp_path / "plain.pb"
+    plain.write_bytes(b"FCV7" + path.read_bytes()[4:])
+    with pytest.raises(ValueError):
+        append_delta(plain, deleted=["f1"])
+
+
+def test_positional_reads(path, tmp_path):
+    append_delta(path, features=[_feature(3, "new")], deleted=["f5"])
+    feats = read_features(path, [2, 3])
+    assert [f["properties"]["kind"] for f in feats] == ["old", "new"]
+    with pytest.raises(IndexError):
+        read_features(path, [5])
+    with pytest.raises(ValueError):
+        generate_tiles(path, tmp_path / "tiles", minzoom=0, maxzoom=1, workers=1)
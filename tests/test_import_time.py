@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Dict
+
+# Import-time regression checks (python -X importtime).
+# Codec modules are loaded lazily, so the CLI and worker processes only pay
+# for the codec they actually use.
+
+CLI_IMPORT_BUDGET_MS = 50.0  # cumulative import time of sfproto.cli.main
+
+
+def _importtime(code: str) -> Dict[str, int]:
+    """
+    Run code in a fresh interpreter with -X importtime.
+    Returns {module name: cumulative import time in us}.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    out: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        out[name.strip()] = int(cumulative)
+    return out
+
+
+def _codec_modules(modules) -> list:
+    return sorted(
+        m for m in modules
+        if m.startswith("sfproto.geojson.v") or m.startswith("sfproto.sf.")
+    )
+
+
+def test_cli_import_loads_no_codecs():
+    modules = _importtime("import sfproto.cli.main")
+    assert _codec_modules(modules) == []
+    assert "pyproj" not in modules
+    assert "numpy" not in modules
+    assert "google.protobuf" not in modules
+
+
+def test_cli_import_within_budget():
+    # best of a few runs, to be robust against a noisy machine
+    best_ms = min(
+        _importtime("import sfproto.cli.main")["sfproto.cli.main"] / 1000.0
+        for _ in range(3)
+    )
+    assert best_ms < CLI_IMPORT_BUDGET_MS, f"sfproto.cli.main import took {best_ms:.1f} ms"
+
+
+def test_v7_dispatch_import_loads_no_codecs():
+    modules = _importtime("import sfproto.geojson.v7.geojson")
+    assert _codec_modules(modules) == ["sfproto.geojson.v7", "sfproto.geojson.v7.geojson"]
+
+
+def test_v7_decode_only_loads_v7(tmp_path):
+    from sfproto.geojson.v7.geojson import geojson_to_bytes_v7
+
+    fc = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [4.9, 52.37]}, "properties": {"a": 1}},
+        ],
+    }
+    path = tmp_path / "fc.bin"
+    path.write_bytes(geojson_to_bytes_v7(fc, srid=4326))
+
+    code = (
+        "import sys, pathlib\n"
+        "from sfproto.geojson.v7.geojson import bytes_to_geojson_v7\n"
+        f"bytes_to_geojson_v7(pathlib.Path({str(path)!r}).read_bytes())\n"
+        "print('\\n'.join(sorted(sys.modules)))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    loaded = _codec_modules(proc.stdout.split())
+    assert all(m.startswith(("sfproto.geojson.v7", "sfproto.sf.v7")) for m in loaded), loaded
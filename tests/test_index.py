@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from sfproto.geojson.v3_BAG.geojson_bag import geojson_pand_featurecollection_to_bytes
+from sfproto.geojson.v7.geojson import geojson_to_bytes_v7
+from sfproto.geojson.v7.geojson_batched import geojson_featurecollection_to_batched_bytes_v7
+from sfproto.index import build_index, get_by_id, index_path
+
+
+
+def test_get_by_id_v7(tmp_path, make_fc):
+    for name, data in [
+        ("plain.pb", geojson_to_bytes_v7(make_fc(50), srid=4326)),
+        ("dedup.pb", geojson_to_bytes_v7(make_fc(50), srid=4326, dedup=True)),
+        ("batched.pb", geojson_featurecollection_to_batched_bytes_v7(make_fc(50), srid=4326, batch_size=16)),
+    ]:
+        path = tmp_path / name
+        path.write_bytes(data)
+        feat = get_by_id(path, "f37")  # builds the index
+        assert os.path.exists(index_path(path))
+        assert feat["id"] == "f37"
+        assert feat["geometry"]["coordinates"] == pytest.approx([4.9 + 37 * 0.01, 52.37])
+        assert feat["properties"] == {"kind": "b"}
+        assert get_by_id(path, "missing") is None
+
+
+def test_get_by_id_bag_and_stale_index(tmp_path, make_panden):
+    def panden(n: int) -> dict:
+        return make_panden(n, properties=lambda i: {"identificatie": f"{363100012000000 + i:016d}", "bouwjaar": 1900 + i})
+
+    path = tmp_path / "panden.pb"
+    path.write_bytes(geojson_pand_featurecollection_to_bytes(panden(20)))
+    build_index(path)
+
+    assert get_by_id(path, "0363100012000007")["properties"]["bouwjaar"] == 1907
+    assert get_by_id(path, "pand.0000000c-0000-4000-8000-00000000000c")["properties"]["bouwjaar"] == 1912
+
+    # data file rewritten: the index is rebuilt on the next lookup
+    path.write_bytes(geojson_pand_featurecollection_to_bytes(panden(30)))
+    assert get_by_id(path, "0363100012000025")["properties"]["bouwjaar"] == 1925
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from sfproto.access import read
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.geojson.v7.geojson_batched import geojson_featurecollection_to_batched_bytes_v7
+from sfproto.simplify import simplify_mask
+
+
+def _circle(cx: float, cy: float, r: float, n: int) -> list:
+    ring = [[cx + r * math.cos(2 * math.pi * k / n), cy + r * math.sin(2 * math.pi * k / n)] for k in range(n)]
+    return ring + [ring[0]]
+
+
+def _fc() -> dict:
+    line = [[x * 1.0, math.sin(x / 5.0) * 20 + (x % 2) * 0.1] for x in range(200)]
+    geoms = [
+        {"type": "Point", "coordinates": [10.0, 20.0]},
+        {"type": "LineString", "coordinates": line},
+        {"type": "Polygon", "coordinates": [_circle(0, 0, 100, 400), _circle(0, 0, 10, 50)]},
+        {"type": "MultiPolygon", "coordinates": [[_circle(500, 0, 1, 8)], [_circle(300, 0, 50, 100)]]},
+        {"type": "MultiLineString", "coordinates": [line[:50], line[50:52]]},
+    ]
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "id": str(i), "geometry": g, "properties": {"i": i}} for i, g in enumerate(geoms)
+        ],
+    }
+
+
+def _flat(coords) -> list:
+    # the point lists (lines, rings) of a geometry's coordinates
+    if isinstance(coords[0], (int, float)):
+        return [[coords]]
+    if isinstance(coords[0][0], (int, float)):
+        return [coords]
+    return [part for c in coords for part in _flat(c)]
+
+
+def _vertices(geom: dict) -> int:
+    return sum(len(part) for part in _flat(geom["coordinates"]))
+
+
+def test_lod_levels():
+    fc = _fc()
+    data = geojson_to_bytes_v7(fc, srid=28992, scale=1000, lod_tolerances=[0.5, 5.0])
+    full = bytes_to_geojson_v7(data)
+    assert full == bytes_to_geojson_v7(geojson_to_bytes_v7(fc, srid=28992, scale=1000))
+
+    fine, coarse = bytes_to_geojson_v7(data, lod=0), bytes_to_geojson_v7(data, lod=1)
+    for a, b, c in zip(full["features"], fine["features"], coarse["features"]):
+        assert a["properties"] == b["properties"] == c["properties"]
+        assert a["geometry"]["type"] == b["geometry"]["type"] == c["geometry"]["type"]
+        assert len(_flat(a["geometry"]["coordinates"])) == len(_flat(c["geometry"]["coordinates"]))
+        assert _vertices(a["geometry"]) >= _vertices(b["geometry"]) >= _vertices(c["geometry"])
+
+    # points are kept, lines keep their end points, rings stay closed with >= 4 positions
+    assert coarse["features"][0]["geometry"] == full["features"][0]["geometry"]
+    line, coarse_line = full["features"][1]["geometry"]["coordinates"], coarse["features"][1]["geometry"]["coordinates"]
+    assert coarse_line[0] == line[0] and coarse_line[-1] == line[-1]
+    assert len(coarse_line) < len(line) // 4
+    for ring in _flat(coarse["features"][3]["geometry"]["coordinates"]):
+        assert ring[0] == ring[-1] and len(ring) >= 4
+    assert len(coarse["features"][2]["geometry"]["coordinates"][0]) < 100
+
+    with pytest.raises(ValueError):
+        bytes_to_geojson_v7(data, lod=2)
+
+
+def test_lod_error_within_tolerance():
+    # every dropped vertex of a line lies within the tolerance of the simplified line
+    rng = np.random.default_rng(7)
+    q = np.cumsum(rng.integers(-50, 50, size=(500, 2)), axis=0)
+    keep = simplify_mask(q, [0], [500], [False], 40.0)
+    kept = q[keep].astype(float)
+    for p in q[~keep].astype(float):
+        d = min(
+            np.linalg.norm(p - (a + np.clip(np.dot(p - a, b - a) / max(np.dot(b - a, b - a), 1e-12), 0, 1) * (b - a)))
+            for a, b in zip(kept[:-1], kept[1:])
+        )
+        assert d <= 40.0 + 1e-9
+
+
+@pytest.mark.parametrize("dedup", [False, True])
+def test_lod_batched_and_read(tmp_path, dedup):
+    fc = _fc()
+    path = tmp_path / "lod.sfp"
+    path.write_bytes(geojson_featurecollection_to_batched_bytes_v7(fc, srid=28992, scale=1000, batch_size=2, lod_tolerances=[5.0]))
+    assert read(path, lod=0) == bytes_to_geojson_v7(path.read_bytes(), lod=0)
+
+    data = geojson_to_bytes_v7(fc, srid=28992, scale=1000, dedup=dedup, wire=True, lod_tolerances=[5.0])
+    assert data == geojson_to_bytes_v7(fc, srid=28992, scale=1000, dedup=dedup, lod_tolerances=[5.0])
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+import pytest
+
+from sfproto.cli.main import main, parse_scale
+from sfproto.geojson.api import encode_geojson, estimate_scale
+
+
+def _square(x: float, y: float, d: float) -> dict:
+    ring = [[x, y], [x + d, y], [x + d, y + d], [x, y + d], [x + 0.5 * d, y + 0.2 * d], [x, y]]
+    return {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [ring]}, "properties": {}}
+
+
+def test_estimate_scale_samples_the_whole_collection():
+    # head on whole metres, tail at mm precision: the tail decides
+    head = [_square(100_000 + i, 400_000, 10) for i in range(10_000)]
+    tail = [_square(100_000.123 + i, 400_000.456, 10.789) for i in range(10_000)]
+    fc = {"type": "FeatureCollection", "features": head + tail}
+
+    est = estimate_scale(fc, tolerance=0.001, srid=28992)
+    assert est["scale"] == 1000 and est["within_tolerance"]
+    assert est["max_error"] <= 0.001
+    assert estimate_scale(fc, tolerance=0.001, srid=28992, sample_size=None)["scale"] == 1000
+    assert estimate_scale({"type": "FeatureCollection", "features": head}, tolerance=0.001, srid=28992)["scale"] == 1
+
+
+def test_estimate_scale_out_of_reach():
+    fc = {"type": "FeatureCollection", "features": [_square(5.123456789123, 52.1, 0.001)]}
+    est = estimate_scale(fc, tolerance=1e-12, srid=4326)
+    assert not est["within_tolerance"]
+    with pytest.raises(ValueError):
+        encode_geojson(fc, delta=True, scale="auto", tolerance=1e-12)
+
+
+def test_parse_scale():
+    assert parse_scale("auto") == "auto"
+    assert parse_scale("1000") == 1000
+    for bad in ("1e3", "0", "-10"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_scale(bad)
+
+
+def test_cli_rejects_v7_options_without_delta(tmp_path, monkeypatch, capsys):
+    src = tmp_path / "in.geojson"
+    src.write_text(json.dumps({"type": "FeatureCollection", "features": [_square(5.123456789123, 52.1, 0.001)]}))
+    monkeypatch.setattr(sys, "argv", ["sfproto", "encode", str(src), "--scale", "1000"])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2
+    assert "--scale needs --delta" in capsys.readouterr().err
+
+    monkeypatch.setattr(sys, "argv", ["sfproto", "encode", str(src), "--delta", "--scale", "auto", "--tolerance", "1e-12"])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert "no scale keeps the error within tolerance" in str(exc.value.code)
+
+
+@pytest.mark.parametrize("args, message", [
+    (["decode", "in.pb", "--lod", "0"], "--lod needs --delta"),
+    (["decode", "in.pb", "--preserve-order"], "--preserve-order needs --delta"),
+    (["encode", "in.geojson", "--delta", "--tolerance", "0.001"], "--tolerance needs --scale auto"),
+    (["encode", "in.geojson", "--delta", "--scale", "1000", "--tolerance", "0.001"], "--tolerance needs --scale auto"),
+    (["encode", "in.geojson", "--delta", "--store-order"], "--store-order needs --sort"),
+])
+def test_cli_usage_errors(monkeypatch, capsys, args, message):
+    # rejected by the parser, before any file is read
+    monkeypatch.setattr(sys, "argv", ["sfproto", *args])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2
+    assert message in capsys.readouterr().err
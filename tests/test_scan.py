@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import numpy as np
+
+from sfproto.geojson.v3_BAG.geojson_bag import geojson_pand_featurecollection_to_bytes
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.geojson.v7.geojson_batched import geojson_featurecollection_to_batched_bytes_v7
+from sfproto.scan import scan, scan_file
+from sfproto.sf.v7 import geometry_pb2
+
+GEOMETRIES = [
+    {"type": "Point", "coordinates": [4.9, 52.37]},
+    {"type": "LineString", "coordinates": [[4.9, 52.37], [4.95, 52.3], [5.1, 52.4]]},
+    {"type": "Polygon", "coordinates": [[[4.0, 52.0], [4.2, 52.0], [4.2, 52.1], [4.0, 52.0]]]},
+    {"type": "MultiPoint", "coordinates": [[-1.5, 40.0], [3.0, -2.0]]},
+]
+
+
+
+def _bbox(geom: dict) -> list:
+    c = np.asarray(geom["coordinates"], dtype=float).reshape(-1, 2)
+    return [*c.min(axis=0), *c.max(axis=0)]
+
+
+def _check_v7(data: bytes) -> dict:
+    table = scan(data)
+    feats = bytes_to_geojson_v7(data)["features"]
+    assert np.allclose(table["bbox"], [_bbox(f["geometry"]) for f in feats])
+    for i, f in enumerate(feats):
+        off, n = table["offset"][i], table["length"][i]
+        assert geometry_pb2.Feature.FromString(data[off:off + n]).id == f["id"]
+    return table
+
+
+def test_scan_v7(make_fc):
+    fc = make_fc(10, GEOMETRIES)
+    table = _check_v7(geojson_to_bytes_v7(fc, srid=4326))
+    assert table["vertices"].tolist() == [1, 3, 3, 2] * 2 + [1, 3]
+    assert table["batches"][0]["scale"] == 10_000_000
+
+    _check_v7(geojson_to_bytes_v7(fc, srid=4326, dedup=True))
+    _check_v7(geojson_to_bytes_v7(fc, srid=4326, wide=True))
+
+    table = _check_v7(geojson_featurecollection_to_batched_bytes_v7(fc, srid=4326, batch_size=4))
+    assert table["batch"].tolist() == [0] * 4 + [1] * 4 + [2] * 2
+    assert len(table["batches"]) == 3
+
+
+def test_scan_bag(tmp_path, make_panden):
+    fc = make_panden(3, step=5.0, holes=True, properties=lambda i: {
+        "identificatie": f"{i:016d}", "bouwjaar": 1990, "status": "Pand in gebruik",
+    })
+    path = tmp_path / "panden.pb"
+    path.write_bytes(geojson_pand_featurecollection_to_bytes(fc))
+
+    table = scan_file(path)
+    assert table["format"] == "bag_v3"
+    assert table["vertices"].tolist() == [6, 6, 6]
+    assert np.allclose(table["bbox"], [[100 + 5 * i, 400, 110 + 5 * i, 412.5] for i in range(3)])
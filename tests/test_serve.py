@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.geojson.v7.geojson_batched import geojson_featurecollection_to_batched_bytes_v7
+from sfproto.geojson.v7.geojson_delta import append_delta
+from sfproto.index import index_path
+from sfproto.serve import start_server
+
+
+
+@pytest.fixture
+def server(tmp_path, make_fc):
+    fc = make_fc(30, lambda i: {"type": "Point", "coordinates": [4.0 + i * 0.1, 52.0]}, lambda i: {"n": i})
+    (tmp_path / "plain.sfproto").write_bytes(geojson_to_bytes_v7(fc, srid=4326))
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "batched.sfproto").write_bytes(
+        geojson_featurecollection_to_batched_bytes_v7(fc, srid=4326, batch_size=8)
+    )
+
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    state = {}
+
+    async def main():
+        state["server"], state["close"] = await start_server(tmp_path, port=0, workers=2, max_open=1, index=True)
+        started.set()
+
+    thread = threading.Thread(target=lambda: (loop.run_until_complete(main()), loop.run_forever()), daemon=True)
+    thread.start()
+    started.wait(5)
+    port = state["server"].sockets[0].getsockname()[1]
+    yield tmp_path, port
+
+    asyncio.run_coroutine_threadsafe(state["close"](), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def _get(conn, path, headers=None):
+    conn.request("GET", path, headers=headers or {})
+    resp = conn.getresponse()
+    return resp, resp.read()
+
+
+def test_ranges_and_keep_alive(server):
+    root, port = server
+    data = (root / "plain.sfproto").read_bytes()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+
+    resp, body = _get(conn, "/files/plain.sfproto")
+    assert resp.status == 200 and body == data and resp.getheader("Accept-Ranges") == "bytes"
+    sock = conn.sock
+
+    resp, body = _get(conn, "/files/plain.sfproto", {"Range": "bytes=4-11"})
+    assert resp.status == 206 and body == data[4:12]
+    assert resp.getheader("Content-Range") == f"bytes 4-11/{len(data)}"
+
+    resp, body = _get(conn, "/files/plain.sfproto", {"Range": "bytes=-5"})
+    assert resp.status == 206 and body == data[-5:]
+
+    resp, _ = _get(conn, "/files/plain.sfproto", {"Range": f"bytes={len(data)}-"})
+    assert resp.status == 416 and resp.getheader("Content-Range") == f"bytes */{len(data)}"
+
+    assert conn.sock is sock  # one connection for all requests
+    conn.close()
+
+
+def test_features(server):
+    root, port = server
+    expected = bytes_to_geojson_v7((root / "sub" / "batched.sfproto").read_bytes())["features"]
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+
+    # max_open=1: the two files keep replacing each other in the mmap LRU
+    for name in ("sub/batched.sfproto", "plain.sfproto", "sub/batched.sfproto"):
+        resp, body = _get(conn, f"/files/{name}/features/17")
+        assert resp.status == 200
+        assert json.loads(body) == expected[17]
+
+    resp, body = _get(conn, "/files/sub/batched.sfproto/ids/f23")
+    assert resp.status == 200 and json.loads(body) == expected[23]
+
+    # written after the start: no index, and a GET does not build one
+    late = root / "late.sfproto"
+    late.write_bytes(geojson_to_bytes_v7({"type": "FeatureCollection", "features": expected[:3]}, srid=4326))
+    resp, body = _get(conn, "/files/late.sfproto/ids/f1")
+    assert resp.status == 404 and "index" in json.loads(body)["error"]
+    assert not os.path.exists(index_path(late))
+
+    resp, body = _get(conn, "/files/plain.sfproto/bbox?bbox=4.45,51,4.75,53")
+    assert resp.status == 200
+    assert [f["id"] for f in json.loads(body)["features"]] == ["f5", "f6", "f7"]
+
+    resp, body = _get(conn, "/")
+    assert sorted(f["name"] for f in json.loads(body)["files"])[-2:] == ["plain.sfproto", "sub/batched.sfproto"]
+
+    for path, status in [
+        ("/files/plain.sfproto/features/30", 404),
+        ("/files/plain.sfproto/ids/nope", 404),
+        ("/files/../etc/passwd", 404),
+        ("/files/plain.sfproto/bbox?bbox=1,2", 400),
+        ("/nope", 404),
+    ]:
+        resp, body = _get(conn, path)
+        assert resp.status == status, path
+        assert "error" in json.loads(body)
+    conn.close()
+
+
+def test_delta_segments(server):
+    root, port = server
+    path = root / "sub" / "batched.sfproto"
+    moved = {"type": "Feature", "id": "f5", "geometry": {"type": "Point", "coordinates": [10.0, 52.0]}, "properties": {"n": 5}}
+    new = {"type": "Feature", "id": "f100", "geometry": {"type": "Point", "coordinates": [4.72, 52.0]}, "properties": {}}
+    append_delta(path, features=[moved, new], deleted=["f6"])
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+
+    # every route agrees: f6 is gone, f5 moved out of the bbox, f100 is in it
+    resp, body = _get(conn, "/files/sub/batched.sfproto/bbox?bbox=4.45,51,4.75,53")
+    assert resp.status == 200
+    assert [f["id"] for f in json.loads(body)["features"]] == ["f7", "f100"]
+    resp, body = _get(conn, "/files/sub/batched.sfproto/bbox?bbox=4.45,51,4.75,53&limit=1")
+    assert json.loads(body)["truncated"] is True
+
+    for route in ("ids/f6", "features/6"):
+        resp, _ = _get(conn, f"/files/sub/batched.sfproto/{route}")
+        assert resp.status == 404, route
+    for route in ("ids/f5", "features/5"):
+        resp, body = _get(conn, f"/files/sub/batched.sfproto/{route}")
+        assert json.loads(body)["geometry"]["coordinates"] == [10.0, 52.0], route
+    conn.close()
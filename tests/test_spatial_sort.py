@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pytest
+
+from sfproto.geojson.v3_BAG.geojson_bag import (
+    bytes_to_geojson_pand_featurecollection,
+    geojson_pand_featurecollection_to_bytes,
+)
+from sfproto.geojson.v4_BAG.geojson_bag import (
+    bytes_to_geojson_pand_featurecollection_v4,
+    geojson_pand_featurecollection_to_bytes_v4,
+)
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.spatial import feature_sort_order
+from sfproto.synthetic import generate
+
+SCALE = 10_000_000
+
+BAG = {
+    "v3_BAG": (geojson_pand_featurecollection_to_bytes, bytes_to_geojson_pand_featurecollection),
+    "v4_BAG": (
+        lambda fc, **kw: geojson_pand_featurecollection_to_bytes_v4(fc, batch_size=64, **kw),
+        bytes_to_geojson_pand_featurecollection_v4,
+    ),
+}
+
+
+def _ids(fc: dict) -> list:
+    return [f.get("id") for f in fc["features"]]
+
+
+@pytest.mark.parametrize("method", ["hilbert", "zorder"])
+def test_sort_roundtrip_v7(method):
+    fc = generate("osm", 300, seed=5, regime="mixed", profile="few")
+    for i, f in enumerate(fc["features"]):
+        f["id"] = f"way/{i}"
+    plain = bytes_to_geojson_v7(geojson_to_bytes_v7(fc, srid=4326, scale=SCALE))
+    data = geojson_to_bytes_v7(fc, srid=4326, scale=SCALE, sort=method, store_order=True)
+
+    order = feature_sort_order(fc["features"], SCALE, method)
+    assert order != list(range(300))
+    assert _ids(bytes_to_geojson_v7(data)) == [fc["features"][i].get("id") for i in order]
+    assert bytes_to_geojson_v7(data, preserve_order=True) == plain
+
+
+@pytest.mark.parametrize("codec", list(BAG))
+@pytest.mark.parametrize("method", ["hilbert", "zorder"])
+def test_sort_roundtrip_bag(codec, method):
+    encode, decode = BAG[codec]
+    fc = generate("bag", 200, seed=5)
+    plain = decode(encode(fc))
+    data = encode(fc, sort=method, store_order=True)
+
+    order = feature_sort_order(fc["features"], 1000, method)
+    assert order != list(range(200))
+    assert _ids(decode(data)) == [fc["features"][i]["id"] for i in order]
+    assert decode(data, preserve_order=True) == plain
+    # without store_order the input order is gone
+    assert decode(encode(fc, sort=method), preserve_order=True) == decode(data)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pytest
+
+from sfproto.access import read
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.geojson.v7.geojson_batched import geojson_featurecollection_to_batched_bytes_v7
+from sfproto.geojson.v7.geojson_stats import batch_may_match, batch_stats, check_where
+
+STATUS = ["Pand in gebruik", "Bouw gestart", "Sloopvergunning verleend"]
+
+
+def _props(i: int) -> dict:
+    # bouwjaar increases with the index, so batches cover disjoint ranges
+    return {"bouwjaar": 1900 + i, "status": None if i % 7 == 0 else STATUS[i % 3], "monument": i % 5 == 0}
+
+
+@pytest.fixture
+def bag_fc(make_fc):
+    return lambda n: make_fc(n, lambda i: {"type": "Point", "coordinates": [4.9 + i * 1e-3, 52.37]}, _props)
+
+
+def _expected(fc: dict, test) -> list:
+    return [f["id"] for f in fc["features"] if test(f["properties"])]
+
+
+@pytest.mark.parametrize("stats", [False, True])
+def test_read_where_batched(tmp_path, stats, bag_fc):
+    fc = bag_fc(200)
+    path = tmp_path / "b.sfp"
+    path.write_bytes(geojson_featurecollection_to_batched_bytes_v7(fc, srid=4326, batch_size=20, stats=stats))
+
+    info = {}
+    out = read(path, where=[("bouwjaar", ">=", 2050), ("status", "==", "Pand in gebruik")], stats=info)
+    assert [f["id"] for f in out["features"]] == _expected(
+        fc, lambda p: p["bouwjaar"] >= 2050 and p["status"] == "Pand in gebruik"
+    )
+    full = bytes_to_geojson_v7(path.read_bytes())
+    assert {k: v for k, v in out.items() if k != "features"} == {k: v for k, v in full.items() if k != "features"}
+    assert info["batches"] == 10
+    assert info["batches_skipped"] == (7 if stats else 0)
+    assert info["features"] == len(out["features"])
+
+
+def test_read_where_skips_first_batch(tmp_path, bag_fc):
+    fc = bag_fc(60)
+    path = tmp_path / "b.sfp"
+    path.write_bytes(geojson_featurecollection_to_batched_bytes_v7(fc, srid=4326, batch_size=20, stats=True))
+
+    out = read(path, where=[("bouwjaar", ">", 1945)])
+    assert [f["id"] for f in out["features"]] == _expected(fc, lambda p: p["bouwjaar"] > 1945)
+    assert out["type"] == "FeatureCollection"
+    assert read(path, where=[("bouwjaar", "<", 0)])["features"] == []
+
+
+def test_read_where_semantics(tmp_path, bag_fc):
+    fc = bag_fc(50)
+    path = tmp_path / "s.sfp"
+    path.write_bytes(geojson_to_bytes_v7(fc, srid=4326, dedup=True))
+
+    def ids(where):
+        return [f["id"] for f in read(path, where=where)["features"]]
+
+    assert ids(None) == [f["id"] for f in fc["features"]]
+    assert ids([("status", "==", None)]) == _expected(fc, lambda p: p["status"] is None)
+    assert ids([("status", "!=", "Bouw gestart")]) == _expected(
+        fc, lambda p: p["status"] is not None and p["status"] != "Bouw gestart"
+    )
+    assert ids([("status", "in", ["Bouw gestart", None])]) == _expected(
+        fc, lambda p: p["status"] in ("Bouw gestart", None)
+    )
+    assert ids([("monument", "==", True)]) == _expected(fc, lambda p: p["monument"])
+    # a bool never equals a number
+    assert ids([("monument", "==", 1)]) == []
+    assert ids([("missing", ">", 3)]) == []
+
+
+def test_batch_may_match(bag_fc):
+    s = batch_stats(bag_fc(20)["features"])
+    assert batch_may_match(s, check_where([("bouwjaar", "<=", 1900)]))
+    assert not batch_may_match(s, check_where([("bouwjaar", ">", 1919)]))
+    assert batch_may_match(s, check_where([("status", "==", "Bouw gestart")]))
+    assert not batch_may_match(s, check_where([("status", "==", "Gesloopt")]))
+    assert batch_may_match(s, check_where([("status", "==", None)]))
+    assert not batch_may_match(s, check_where([("bouwjaar", "==", None)]))
+    assert not batch_may_match(s, check_where([("missing", "==", 1)]))
+
+
+def test_check_where_errors():
+    with pytest.raises(ValueError):
+        check_where([("bouwjaar", "~", 1)])
+    with pytest.raises(ValueError):
+        check_where([("bouwjaar", ">", None)])
+    with pytest.raises(ValueError):
+        check_where([("bouwjaar", ">=")])
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+
+from sfproto.geojson.v3_BAG.geojson_bag import (
+    bytes_to_geojson_pand_featurecollection,
+    geojson_pand_featurecollection_to_bytes,
+)
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.benchmark_profiles import ATTRIBUTE_PROFILE_MAP
+from sfproto.synthetic import generate
+
+
+def _types(fc: dict) -> dict:
+    out: dict = {}
+    for feat in fc["features"]:
+        out[feat["geometry"]["type"]] = out.get(feat["geometry"]["type"], 0) + 1
+    return out
+
+
+def test_osm_regimes_and_profiles():
+    fc = generate("osm", 1000, seed=1, regime="geometry_heavy", profile="medium")
+    assert _types(fc) == {"Point": 100, "LineString": 200, "Polygon": 700}
+    assert all(list(f["properties"]) == ATTRIBUTE_PROFILE_MAP["medium"] for f in fc["features"])
+    assert all("id" not in f for f in fc["features"])
+
+    # deterministic, and the same geometries for every profile
+    assert generate("osm", 1000, seed=1, regime="geometry_heavy", profile="medium") == fc
+    bare = generate("osm", 1000, seed=1, regime="geometry_heavy", profile="none")
+    assert [f["geometry"] for f in bare["features"]] == [f["geometry"] for f in fc["features"]]
+    assert generate("osm", 1000, seed=2, regime="geometry_heavy", profile="medium") != fc
+
+    with pytest.raises(ValueError):
+        generate("osm", 10, regime="heavy")
+    with pytest.raises(ValueError):
+        generate("bag", 10, profile="few")
+
+
+def test_polygons_closed_and_v7_roundtrip():
+    fc = generate("overture", 500, seed=3)
+    for feat in fc["features"]:
+        polys = feat["geometry"]["coordinates"]
+        for poly in polys if feat["geometry"]["type"] == "MultiPolygon" else [polys]:
+            for ring in poly:
+                assert len(ring) >= 4 and ring[0] == ring[-1]
+    out = bytes_to_geojson_v7(geojson_to_bytes_v7(fc, srid=4326, scale=10**7))
+    assert [f["properties"] for f in out["features"]] == [f["properties"] for f in fc["features"]]
+
+
+def test_bag_codec():
+    fc = generate("bag", 200, seed=4)
+    assert fc["features"][0]["id"].startswith("pand.")
+    out = bytes_to_geojson_pand_featurecollection(geojson_pand_featurecollection_to_bytes(fc))
+    assert [f["id"] for f in out["features"]] == [f["id"] for f in fc["features"]]
+    assert out["features"][7]["properties"] == fc["features"][7]["properties"]
+
+
+def _inside(pt: list, ring: list) -> bool:
+    # even-odd ray casting
+    x, y = pt
+    hit = False
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            hit = not hit
+    return hit
+
+
+# the overture and bag seeds had a hole sticking out of its outer ring before holes were clamped to the inradius
+@pytest.mark.parametrize("shape,size,seed", [("osm", 5000, 5), ("overture", 5000, 15), ("bag", 10_000, 20)])
+def test_holes_inside_outer_ring(shape, size, seed):
+    if shape == "osm":
+        fc = generate(shape, size, seed=seed, regime="geometry_heavy", profile="none")
+    else:
+        fc = generate(shape, size, seed=seed)
+    holes = 0
+    for feat in fc["features"]:
+        geom = feat["geometry"]
+        polys = geom["coordinates"] if geom["type"] == "MultiPolygon" else [geom["coordinates"]] if geom["type"] == "Polygon" else []
+        for outer, *inner in polys:
+            for hole in inner:
+                holes += 1
+                assert all(_inside(p, outer) for p in hole)
+    assert holes > 10
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import zipfile
+
+import numpy as np
+import pytest
+
+from sfproto.geojson.v3_BAG.geojson_bag import geojson_pand_featurecollection_to_bytes
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.sf.mvt import vector_tile_pb2
+from sfproto import tiles
+from sfproto.tiles import RD_NEW, _tile_jobs, clip_geometry, generate_tiles, tile_bounds
+
+
+def _unzigzag(v: int) -> int:
+    return (v >> 1) ^ -(v & 1)
+
+
+def _mvt_parts(commands):
+    # command stream -> list of point lists (one per MoveTo)
+    parts, x, y, i = [], 0, 0, 0
+    while i < len(commands):
+        cmd, count = commands[i] & 7, commands[i] >> 3
+        i += 1
+        if cmd == 7:
+            continue
+        for _ in range(count):
+            x += _unzigzag(commands[i])
+            y += _unzigzag(commands[i + 1])
+            i += 2
+            if cmd == 1:
+                parts.append([])
+            parts[-1].append((x, y))
+    return parts
+
+
+def test_clip_polygon_and_line():
+    bounds = (0.0, 0.0, 100.0, 100.0)
+    square = {"type": "Polygon", "coordinates": [[[-50, -50], [50, -50], [50, 50], [-50, 50], [-50, -50]]]}
+    kind, polys = clip_geometry(square, bounds, extent=100, buffer=10)
+    assert kind == "polygon"
+    ring = polys[0][0]
+    assert min(x for x, _ in ring) == -10 and max(y for _, y in ring) == 110
+    assert max(x for x, _ in ring) == 50 and min(y for _, y in ring) == 50
+
+    line = {"type": "LineString", "coordinates": [[-50, 50], [150, 50], [150, 60], [-50, 60]]}
+    kind, lines = clip_geometry(line, bounds, extent=100, buffer=0)
+    assert kind == "line" and lines == [[(0, 50), (100, 50)], [(100, 40), (0, 40)]]
+
+    assert clip_geometry({"type": "Point", "coordinates": [500, 500]}, bounds, 100, 10) is None
+
+
+def _rd_fc(n: int) -> dict:
+    ring = [[0.0, 0.0], [20.0, 0.0], [20.0, 15.0], [0.0, 15.0], [0.0, 0.0]]
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "id": "pand.%08x-0000-4000-8000-%012x" % (i, i),
+                "geometry": {"type": "Polygon", "coordinates": [[[121000.0 + 30 * i + x, 487000.0 + y] for x, y in ring]]},
+                "properties": {"identificatie": f"{i:016d}", "bouwjaar": 1990 + i, "gebruiksdoel": "woonfunctie"},
+            }
+            for i in range(n)
+        ],
+    }
+
+
+@pytest.mark.parametrize("encode", [
+    lambda fc: geojson_to_bytes_v7(fc, srid=28992, scale=1000),
+    geojson_pand_featurecollection_to_bytes,
+])
+def test_generate_mvt_directory(tmp_path, encode):
+    path = tmp_path / "panden.sfproto"
+    path.write_bytes(encode(_rd_fc(20)))
+
+    stats = generate_tiles(path, tmp_path / "tiles", minzoom=10, maxzoom=12, workers=1)
+    files = sorted((tmp_path / "tiles").rglob("*.mvt"))
+    assert stats["tiles"] == len(files) >= 3
+    assert stats["tiles_per_second"] > 0
+
+    # every zoom holds all 20 buildings once (they lie in one tile per zoom, or are split)
+    for z in (10, 11, 12):
+        ids = set()
+        for f in (tmp_path / "tiles" / str(z)).rglob("*.mvt"):
+            layer = vector_tile_pb2.Tile.FromString(f.read_bytes()).layers[0]
+            assert layer.name == "panden" and layer.extent == 4096
+            for feat in layer.features:
+                assert feat.type == vector_tile_pb2.Tile.POLYGON
+                tags = dict(zip(feat.tags[::2], feat.tags[1::2]))
+                props = {layer.keys[k]: layer.values[v] for k, v in tags.items()}
+                ids.add(props["identificatie"].string_value)
+                ring = _mvt_parts(list(feat.geometry))[0]
+                area = sum(ax * by - bx * ay for (ax, ay), (bx, by) in zip(ring, ring[1:] + ring[:1]))
+                assert area > 0  # exterior rings clockwise
+        assert len(ids) == 20
+
+
+def test_generate_sfproto_zip_in_processes(tmp_path):
+    fc = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "id": "a", "geometry": {"type": "Point", "coordinates": [4.9, 52.37]}, "properties": {"n": 1}},
+            {"type": "Feature", "id": "b", "geometry": {"type": "LineString", "coordinates": [[4.0, 52.0], [5.5, 52.5]]},
+             "properties": {"n": 2}},
+        ],
+    }
+    path = tmp_path / "osm.sfproto"
+    path.write_bytes(geojson_to_bytes_v7(fc, srid=4326))
+    out = tmp_path / "tiles.zip"
+
+    stats = generate_tiles(path, out, minzoom=0, maxzoom=10, format="sfproto", workers=2)
+    with zipfile.ZipFile(out) as archive:
+        names = archive.namelist()
+        assert stats["tiles"] == len(names)
+        # Amsterdam at zoom 10 (Web Mercator XYZ)
+        tile = bytes_to_geojson_v7(archive.read("10/525/336.sfproto"))
+    point = [f for f in tile["features"] if f["id"] == "a"][0]
+    x, y = point["geometry"]["coordinates"]
+    assert 0 <= x <= 4096 and 0 <= y <= 4096
+    assert "0/0/0.sfproto" in names
+
+
+def test_tile_bounds():
+    assert tile_bounds(0, 0, 0, RD_NEW) == pytest.approx(RD_NEW)
+    minx, miny, maxx, maxy = tile_bounds(1, 1, 0, RD_NEW)
+    assert (minx, maxy) == pytest.approx(((RD_NEW[0] + RD_NEW[2]) / 2, RD_NEW[3]))
+
+
+def test_tile_jobs_in_blocks(monkeypatch):
+    # a few large bboxes among small ones: enumerated block by block, same jobs
+    rng = np.random.default_rng(3)
+    lo = rng.uniform(0, 900, size=(300, 2))
+    size = np.where(rng.random((300, 1)) < 0.05, rng.uniform(100, 900, (300, 2)), rng.uniform(0, 5, (300, 2)))
+    bbox = np.hstack((lo, lo + size))
+    grid = (0.0, 0.0, 1024.0, 1024.0)
+
+    def jobs():
+        return {(z, x, y): m.tolist() for z, x, y, m in _tile_jobs(bbox, grid, 8, 0.1)}
+
+    expected = jobs()
+    monkeypatch.setattr(tiles, "MAX_TILE_PAIRS", 500)
+    sizes = []
+    pairs = tiles._pairs
+    monkeypatch.setattr(tiles, "_pairs", lambda f, x0, x1, y0, y1: (
+        sizes.append(int(((x1 - x0 + 1) * (y1 - y0 + 1)).sum())) or pairs(f, x0, x1, y0, y1)
+    ))
+    assert jobs() == expected
+    assert sum(len(m) for m in expected.values()) > 10 * max(sizes)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from sfproto.geojson.v7.geojson_featurecollection import (
+    _encode_stream_geometries,
+    geojson_featurecollection_to_bytes_v7,
+)
+from sfproto.geojson.v7.geojson_wire import stream_geometries_to_wire
+
+GEOMETRIES = [
+    {"type": "Point", "coordinates": [4.9, 52.37]},
+    {"type": "Point", "coordinates": [-179.9, -89.9]},
+    {"type": "MultiPoint", "coordinates": [[4.9, 52.37], [4.91, 52.36], [-4.9, -52.37]]},
+    {"type": "LineString", "coordinates": [[4.9, 52.37], [4.9000001, 52.3700001], [5.9, 51.37]]},
+    {"type": "MultiLineString", "coordinates": [[[0, 0], [1, 1]], [[2, 2], [3, 3], [4, 5]]]},
+    {"type": "Polygon", "coordinates": [
+        [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+        [[2, 2], [3, 2], [3, 3], [2, 2]],
+    ]},
+    {"type": "MultiPolygon", "coordinates": [
+        [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+        [[[5, 5], [6, 5], [6, 6], [5, 5]], [[5.2, 5.2], [5.4, 5.2], [5.4, 5.4], [5.2, 5.2]]],
+    ]},
+]
+
+
+def _serialized(geoms, start, scale, wide):
+    return [g.SerializeToString() for g in _encode_stream_geometries(geoms, start, scale, wide=wide)]
+
+
+def test_stream_geometries_byte_equal():
+    for scale, wide in [(10_000_000, None), (1000, None), (10_000_000, True), (1_000_000_000, None)]:
+        start = (int(round(4.9 * scale)), int(round(52.37 * scale)))
+        assert stream_geometries_to_wire(GEOMETRIES, start, scale, wide=wide) == \
+            _serialized(GEOMETRIES, start, scale, wide)
+
+
+def test_featurecollection_byte_equal():
+    # at most one property per feature: Struct map order is not defined
+    fc = {
+        "type": "FeatureCollection",
+        "name": "wire",
+        "features": [
+            {"type": "Feature", "id": i, "geometry": g, "properties": {"i": i} if i % 3 else None}
+            for i, g in enumerate(GEOMETRIES * 3)
+        ],
+    }
+    for kwargs in ({}, {"dedup": True}, {"sort": "hilbert", "store_order": True}):
+        expected = geojson_featurecollection_to_bytes_v7(fc, 4326, 10_000_000, **kwargs)
+        assert geojson_featurecollection_to_bytes_v7(fc, 4326, 10_000_000, wire=True, **kwargs) == expected
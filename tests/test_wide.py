@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+
+from sfproto.geojson.v7.geojson import bytes_to_geojson_v7, geojson_to_bytes_v7
+from sfproto.geojson.v7.geojson_featurecollection import geojson_featurecollection_to_bytes_v7
+from sfproto.sf.v7 import geometry_pb2
+
+SCALE = 10_000_000
+
+
+def _fc() -> dict:
+    # starts near -180, then jumps across the antimeridian: 359.9 degrees is
+    # ~3.6e9 at scale 1e7, outside sint32
+    geoms = [
+        {"type": "Point", "coordinates": [-179.95, 10.0]},
+        {"type": "Polygon", "coordinates": [[[-179.9, 10.0], [-179.8, 10.0], [-179.8, 10.1], [-179.9, 10.0]]]},
+        {"type": "Point", "coordinates": [179.95, -10.0]},
+        {"type": "LineString", "coordinates": [[179.9, 0.5], [-179.9, 0.5]]},
+    ]
+    return {
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "properties": {"i": i}, "geometry": g} for i, g in enumerate(geoms)],
+    }
+
+
+@pytest.mark.parametrize("wire", [False, True])
+def test_auto_wide_near_antimeridian(wire):
+    fc = _fc()
+    payload = geojson_featurecollection_to_bytes_v7(fc, srid=4326, scale=SCALE, wire=wire)
+    msg = geometry_pb2.FeatureCollection.FromString(payload)
+    assert msg.HasField("global_start") and not msg.HasField("global_start_wide")
+    # sint64 only for the geometries with a delta outside sint32
+    assert [len(f.geometry.dxy_wide) > 0 for f in msg.features] == [False, False, True, True]
+    assert [len(f.geometry.dxy) > 0 for f in msg.features] == [True, True, False, False]
+
+    out = bytes_to_geojson_v7(geojson_to_bytes_v7(fc, srid=4326, scale=SCALE, wire=wire))
+    assert [f["geometry"] for f in out["features"]] == [f["geometry"] for f in fc["features"]]
+
+
+def test_wide_start():
+    # at scale 1e8 even the start (-1.8e10) is outside sint32
+    fc = _fc()
+    msg = geometry_pb2.FeatureCollection.FromString(geojson_featurecollection_to_bytes_v7(fc, srid=4326, scale=10 * SCALE))
+    assert msg.HasField("global_start_wide") and not msg.HasField("global_start")
+    assert msg.global_start_wide.x == -17_995_000_000
+
+    out = bytes_to_geojson_v7(geojson_to_bytes_v7(fc, srid=4326, scale=10 * SCALE))
+    assert [f["geometry"] for f in out["features"]] == [f["geometry"] for f in fc["features"]]
+
+
+def test_wide_false_raises():
+    fc = _fc()
+    with pytest.raises(ValueError, match=r"deltas do not fit in sint32 at scale 10000000; use wide=True"):
+        geojson_to_bytes_v7(fc, srid=4326, scale=SCALE, wide=False)
+    with pytest.raises(ValueError, match=r"global_start .* does not fit in sint32"):
+        geojson_to_bytes_v7(fc, srid=4326, scale=10 * SCALE, wide=False)
+    # within range wide=False is fine
+    fc["features"] = fc["features"][:2]
+    out = bytes_to_geojson_v7(geojson_to_bytes_v7(fc, srid=4326, scale=SCALE, wide=False))
+    assert [f["geometry"] for f in out["features"]] == [f["geometry"] for f in fc["features"]]
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from sfproto.sf.v7 import geometry_pb2
+from sfproto.wire import (
+    encode_varint,
+    len_field,
+    varint_pack,
+    varint_sizes,
+    varint_unpack,
+    zigzag_decode,
+    zigzag_encode,
+)
+
+INT32 = np.array([0, 1, -1, 2, -2, 63, -64, 64, 8191, -8192, 2**31 - 1, -2**31], dtype=np.int64)
+INT64 = np.array([0, -1, 2**31, -2**31 - 1, 2**40, -2**53, 2**63 - 1, -2**63], dtype=np.int64)
+UINT32 = np.array([0, 1, 127, 128, 300, 16383, 16384, 2**32 - 1], dtype=np.uint64)
+
+
+def _packed_body(field: str, values) -> bytes:
+    # body of one packed field as the protobuf runtime writes it
+    g = geometry_pb2.StreamGeometry()
+    getattr(g, field).extend(int(v) for v in values)
+    data = g.SerializeToString()
+    body = data[len(data) - _body_len(data):]
+    assert data == len_field(g.DESCRIPTOR.fields_by_name[field].number, body)
+    return body
+
+
+def _body_len(data: bytes) -> int:
+    # tag is one byte; the length varint follows
+    n, shift, pos = 0, 0, 1
+    while True:
+        b = data[pos]
+        n |= (b & 0x7F) << shift
+        pos += 1
+        if b < 0x80:
+            return n
+        shift += 7
+
+
+@pytest.mark.parametrize("field,values,signed", [
+    ("dxy", INT32, True),
+    ("dxy_wide", INT64, True),
+    ("part_sizes", UINT32, False),
+])
+def test_matches_protobuf(field, values, signed):
+    body = _packed_body(field, values)
+    u = zigzag_encode(values) if signed else values
+    assert varint_pack(u) == body
+    assert int(varint_sizes(u).sum()) == len(body)
+
+    decoded = varint_unpack(body)
+    if signed:
+        decoded = zigzag_decode(decoded)
+        assert decoded.dtype == np.int64
+    assert decoded.tolist() == values.tolist()
+
+
+def test_roundtrip_random():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.integers(-300, 300, 5000), rng.integers(-2**62, 2**62, 5000)])
+    body = varint_pack(zigzag_encode(values))
+    assert np.array_equal(zigzag_decode(varint_unpack(body)), values)
+    assert b"".join(encode_varint(int(v)) for v in zigzag_encode(values[:100])) == \
+        varint_pack(zigzag_encode(values[:100]))
+
+
+def test_unpack_errors():
+    assert varint_unpack(b"").size == 0
+    with pytest.raises(ValueError):
+        varint_unpack(b"\x01\x80")
+    with pytest.raises(ValueError):
+        varint_unpack(b"\xff" * 10 + b"\x01")